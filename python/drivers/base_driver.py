@@ -1,15 +1,44 @@
+import sys
+import os
+import pickle
+import numpy as np
 import USER_INPUT
+from DISPERSION_TABLE import DISPERSION_TABLE_USE
+from helper_objects import FileOutputData, MonteCarloReducer, SweepReducer
+from MONTE_CARLO import MONTE_CARLO_SAMPLE
+
+# Per-case status codes returned by run_batch
+BATCH_OK = 0
+BATCH_CALC_ERROR = 1 # performCalculations set errorMsg
+BATCH_INPUT_ERROR = 2 # wrong number of values or value out of range
+BATCH_EXCEPTION = 3 # performCalculations raised
 
 class BaseDriver(object):
     def __init__(self):
         self.errorMsg = None
+        self.isBatch = False
         
         self.userInput()
 
         self.fileOutputRequestInit()
 
+        # Multi-case runs are spread over a process pool when numWorkers
+        # is defined before this function or ACES_NUM_WORKERS is set
+        if not hasattr(self, "numWorkers"):
+            self.numWorkers = int(os.environ.get("ACES_NUM_WORKERS", "1"))
+
+        # The wave number is interpolated from the dispersion table when
+        # useDispersionTable is defined true before this function or
+        # ACES_DISPERSION_TABLE is set
+        if not hasattr(self, "useDispersionTable"):
+            self.useDispersionTable =\
+                os.environ.get("ACES_DISPERSION_TABLE", "0") != "0"
+        DISPERSION_TABLE_USE(self.useDispersionTable)
+
         if self.isSingleCase:
             self.performCalculations(self.dataOutputList)
+        elif self.numWorkers > 1:
+            self.performCalculationsParallel()
         else:
             caseIndex = 0
             for caseData in self.dataOutputList:
@@ -49,10 +78,17 @@ class BaseDriver(object):
 
         self.defineInputDataList()
 
+        # Case files are streamed instead of read up front when
+        # streamCases is defined before this function or
+        # ACES_STREAM_CASES is set
+        if not hasattr(self, "streamCases"):
+            self.streamCases = os.environ.get("ACES_STREAM_CASES", "0") != "0"
+
         if self.isSingleCase:
             self.getSingleCaseInput()
         else:
-            self.dataOutputList = USER_INPUT.MULTI_MODE(self.inputList)
+            self.dataOutputList = USER_INPUT.MULTI_MODE(self.inputList,\
+                self.streamCases)
     # end userInput
 
     def getSingleCaseInput(self):
@@ -86,6 +122,13 @@ class BaseDriver(object):
     # end fileOutputRequest
 
     def fileOutputWriteMain(self, dataDict, caseIndex = 0):
+        if self.isBatch:
+            self.batchDataDict = dataDict
+            if self.batchWriteList != None:
+                self.batchWriteList.append((caseIndex, dataDict,\
+                    self.errorMsg, self.batchStateChanges()))
+            return
+
         if self.fileOutputData.saveOutput:
             if not self.isSingleCase:
                 if caseIndex != 0:
@@ -102,7 +145,372 @@ class BaseDriver(object):
             self.fileOutputData.filename + "_plot.txt", "w")
     # end fileOutputPlotInit
 
+    # Headless batch run ###############################################
+    # Runs every case in inputs (a 2-D array or any iterable of cases,
+    # each case ordered as in inputList) without prompting, printing or
+    # writing output files. units and water take the same letters as the
+    # interactive prompts. Any other keyword is handed to batchInput to
+    # stand in for the driver's own extra prompts (e.g. option = 5 for
+    # RunupOvertopping). caseStart is the case number of the first case,
+    # for settings given per case (e.g. aList of RunupOvertopping).
+    #
+    # Returns a numpy record array with one row per case holding every
+    # scalar value the driver reported for that case (NaN where absent),
+    # plus "errorCode" (one of the BATCH_* codes) and "errorMsg".
+    @classmethod
+    def run_batch(cls, inputs, units = "S", water = None, caseStart = 0,\
+        **settings):
+        driver = cls.batchDriver(units, water, settings)
+
+        dataDictList = []
+        errorCodeList = []
+        errorMsgList = []
+
+        stdout = sys.stdout
+        sys.stdout = open(os.devnull, "w")
+        try:
+            for caseIndex, caseData in enumerate(inputs, caseStart):
+                caseData = [float(value) for value in caseData]
+
+                driver.errorMsg = driver.batchCheckInput(caseData)
+                driver.batchDataDict = {}
+
+                if driver.errorMsg != None:
+                    errorCode = BATCH_INPUT_ERROR
+                else:
+                    try:
+                        driver.performCalculations(caseData, caseIndex)
+                        if driver.errorMsg == None:
+                            errorCode = BATCH_OK
+                        else:
+                            errorCode = BATCH_CALC_ERROR
+                    except Exception as e:
+                        errorCode = BATCH_EXCEPTION
+                        driver.errorMsg = "%s: %s" % (type(e).__name__, e)
+
+                dataDictList.append(driver.batchDataDict)
+                errorCodeList.append(errorCode)
+                errorMsgList.append(\
+                    "" if driver.errorMsg == None else driver.errorMsg)
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+
+        return BaseDriver.batchRecords(dataDictList, errorCodeList, errorMsgList)
+    # end run_batch
+
+    # Driver set up for a batch run as run_batch uses it (also for the
+    # run_block of vectorized drivers)
+    @classmethod
+    def batchDriver(cls, units, water, settings):
+        driver = cls.__new__(cls)
+        driver.errorMsg = None
+        driver.isBatch = True
+        driver.batchWriteList = None
+        driver.isSingleCase = False
+        driver.fileOutputData = FileOutputData()
+
+        driver.isMetric, driver.g, driver.labelUnitDist, driver.labelUnitWt =\
+            USER_INPUT.UNIT_SYSTEM(units)
+        if water != None:
+            driver.water, driver.rho =\
+                USER_INPUT.WATER_DENSITY(water, driver.isMetric)
+
+        driver.batchInput(settings)
+        driver.defineInputDataList()
+
+        if not hasattr(driver, "useDispersionTable"):
+            driver.useDispersionTable =\
+                os.environ.get("ACES_DISPERSION_TABLE", "0") != "0"
+        DISPERSION_TABLE_USE(driver.useDispersionTable)
+
+        return driver
+    # end batchDriver
+
+    # Block run used by run_design and run_monte_carlo, caseStart being
+    # the case number of the first row of the block. Takes the same
+    # arguments and gives the same records as run_batch. Drivers that can
+    # compute all the cases of a block at once override it with array
+    # code; with errorMessages False they may leave out the errorMsg
+    # field. By default the cases are run one at a time by run_batch.
+    @classmethod
+    def run_block(cls, inputs, units = "S", water = None,\
+        errorMessages = True, caseStart = 0, **settings):
+        return cls.run_batch(inputs, units, water, caseStart = caseStart,\
+            **settings)
+
+    # Runs a case design (a generator of (caseStart, block) such as
+    # SWEEP_GRID or SWEEP_LHS of SWEEP_DESIGN, or MONTE_CARLO_SAMPLE)
+    # through run_block block by block and passes each block's records to
+    # reducer, so that only one block of results is held at a time.
+    # Returns the reducer (a SweepReducer by default); reducer.result()
+    # gives the reductions. blockRunner, when given, is called with each
+    # block in place of run_block and must return its records (for
+    # example a vectorized classmethod such as WavetransPerm.run_sweep).
+    # With numWorkers > 1 the blocks are computed in worker processes
+    # (blockRunner must then be picklable, a module-level function or a
+    # classmethod rather than a lambda) and reduced here in design order;
+    # a reducer with a blockReduction method (MonteCarloReducer) reduces
+    # each block in its worker, so only the reductions are sent back.
+    @classmethod
+    def run_design(cls, design, units = "S", water = None, reducer = None,\
+        blockRunner = None, numWorkers = 1, **settings):
+        if reducer is None:
+            reducer = SweepReducer()
+
+        if numWorkers <= 1:
+            for caseStart, block in design:
+                if blockRunner is not None:
+                    records = blockRunner(block)
+                else:
+                    records = cls.run_block(block, units, water,\
+                        caseStart = caseStart, **settings)
+
+                reducer.update(caseStart, block, records)
+
+            return reducer
+
+        import concurrent.futures
+
+        if hasattr(reducer, "blockReduction"):
+            blockReducer = reducer.emptyCopy()
+        else:
+            blockReducer = None
+
+        with concurrent.futures.ProcessPoolExecutor(numWorkers) as executor:
+            futureList = []
+            designIter = iter(design)
+
+            while True:
+                while len(futureList) < 2*numWorkers:
+                    try:
+                        caseStart, block = next(designIter)
+                    except StopIteration:
+                        break
+
+                    futureList.append((caseStart, block,\
+                        executor.submit(runDesignBlock, cls, units, water,\
+                        settings, caseStart, block, blockRunner,\
+                        blockReducer)))
+
+                if len(futureList) == 0:
+                    break
+
+                caseStart, block, future = futureList.pop(0)
+                if blockReducer is not None:
+                    reducer.merge(future.result())
+                else:
+                    reducer.update(caseStart, block, future.result())
+
+        return reducer
+    # end run_design
+
+    # Monte Carlo run: numSamples samples of the inputs drawn from
+    # distList (one distribution per input of inputList, see
+    # MONTE_CARLO_SAMPLE) in blocks of blockSize, run by run_block (in
+    # numWorkers processes) and reduced by a MonteCarloReducer. Returns
+    # the reducer; reducer.result() gives the statistics, quantiles and
+    # exceedance probabilities of the outputs, and reducer.quantile and
+    # reducer.exceedance can be asked for other values afterwards.
+    # Other keywords are handed to run_block as in run_batch.
+    @classmethod
+    def run_monte_carlo(cls, distList, numSamples, units = "S",\
+        water = None, outputList = None,\
+        quantiles = (0.01, 0.05, 0.5, 0.95, 0.99), thresholdDict = None,\
+        blockSize = 100000, seed = None, numWorkers = 1, **settings):
+        reducer = MonteCarloReducer(outputList, quantiles, thresholdDict)
+        design = MONTE_CARLO_SAMPLE(distList, numSamples, blockSize, seed)
+
+        settings["errorMessages"] = False
+        return cls.run_design(design, units, water, reducer,\
+            numWorkers = numWorkers, **settings)
+    # end run_monte_carlo
+
+    # Parallel multi-case run #########################################
+    # Cases are computed in worker processes, each holding a copy of this
+    # driver in batch mode. Every fileOutputWriteMain call a case makes is
+    # recorded together with its errorMsg and the driver attributes the
+    # case changed, and the console output is captured. The records are
+    # then replayed here in case order, so the text and CSV files are
+    # written by the same code, in the same order, as a serial run.
+    # dataOutputList may be a generator; shards are taken from it as
+    # workers free up, so only a few shards are held at any time.
+    def performCalculationsParallel(self):
+        import concurrent.futures
+        import itertools
+
+        driverState = {}
+        for key, value in self.__dict__.items():
+            if key in ["fileRef", "exporter", "dataOutputList"]:
+                continue
+            try:
+                pickle.dumps(value)
+            except Exception:
+                continue
+            driverState[key] = value
+
+        if isinstance(self.dataOutputList, list):
+            shardSize = -(-len(self.dataOutputList) // (4*self.numWorkers))
+            shardSize = max(1, shardSize)
+        else:
+            shardSize = 1000
+        caseIter = iter(self.dataOutputList)
+
+        with concurrent.futures.ProcessPoolExecutor(self.numWorkers) as executor:
+            futureList = []
+            shardStart = 0
+
+            while True:
+                while len(futureList) < 2*self.numWorkers:
+                    caseList = list(itertools.islice(caseIter, shardSize))
+                    if len(caseList) == 0:
+                        break
+
+                    futureList.append(executor.submit(runCaseShard,\
+                        type(self), driverState, (shardStart, caseList)))
+                    shardStart = shardStart + len(caseList)
+
+                if len(futureList) == 0:
+                    break
+
+                for outputText, writeList in futureList.pop(0).result():
+                    sys.stdout.write(outputText)
+
+                    for caseIndex, dataDict, errorMsg, stateDict in writeList:
+                        self.__dict__.update(stateDict)
+                        self.errorMsg = errorMsg
+                        self.fileOutputWriteMain(dataDict, caseIndex)
+    # end performCalculationsParallel
+
+    def batchStateChanges(self):
+        stateDict = {}
+        for key, value in self.__dict__.items():
+            if key in ["errorMsg", "batchDataDict", "batchWriteList",\
+                "batchStateSnapshot"]:
+                continue
+            if key not in self.batchStateSnapshot or\
+                self.batchStateSnapshot[key] is not value:
+                stateDict[key] = value
+
+        return stateDict
+    # end batchStateChanges
+
+    # batchCheckInput for an array of cases (one row per case) in
+    # run_block. Returns the cases as a float64 array (all NaN when they
+    # have the wrong number of values), a mask of the cases that fail and,
+    # with errorMessages, their messages (None for the other cases)
+    def batchCheckInputArray(self, inputs, errorMessages = True):
+        inputs = np.atleast_2d(np.asarray(inputs, dtype=np.float64))
+        numCases = len(inputs)
+
+        errorMsgList = [None]*numCases
+        if inputs.shape[1] != len(self.inputList):
+            if errorMessages:
+                errorMsgList = ["Error: Expected %d input values, found %d" %\
+                    (len(self.inputList), inputs.shape[1])]*numCases
+
+            return np.full((numCases, len(self.inputList)), np.nan),\
+                np.ones(numCases, dtype=bool), errorMsgList
+
+        inputError = np.zeros(numCases, dtype=bool)
+        for j in range(len(self.inputList)):
+            field = self.inputList[j]
+            failed = ~inputError &\
+                ~((inputs[:, j] >= field.min) & (inputs[:, j] <= field.max))
+            inputError = inputError | failed
+
+            if errorMessages:
+                for i in np.nonzero(failed)[0]:
+                    errorMsgList[i] = "Error: %s must be between %6.2f and %6.2f." %\
+                        (field.desc, field.min, field.max)
+
+        return inputs, inputError, errorMsgList
+    # end batchCheckInputArray
+
+    # Columns of the values getCalcValues would return for an array of
+    # cases, given the names of the attributes holding the values that are
+    # not prompted for, in the order of getCalcValues
+    def batchCalcColumns(self, inputs, attrList):
+        columnList = []
+        currIndex = 0
+        for attr in attrList:
+            if hasattr(self, attr):
+                columnList.append(np.full(len(inputs), float(getattr(self, attr))))
+            else:
+                columnList.append(inputs[:, currIndex])
+                currIndex = currIndex + 1
+
+        return columnList
+    # end batchCalcColumns
+
+    # Record array of a run_block from the columns of values (NaN for the
+    # cases in error), the failed input checks and calculation checks,
+    # and the messages when errorMessages
+    @staticmethod
+    def batchArrayRecords(nameList, columnList, inputError, calcError,\
+        errorMsgList, errorMessages = True):
+        errorCode = np.full(len(inputError), BATCH_OK, dtype=np.int8)
+        errorCode[calcError] = BATCH_CALC_ERROR
+        errorCode[inputError] = BATCH_INPUT_ERROR
+
+        nameList = nameList + ["errorCode"]
+        columnList = columnList + [errorCode]
+        if errorMessages:
+            nameList.append("errorMsg")
+            columnList.append(np.array(["" if errorMsg == None else errorMsg\
+                for errorMsg in errorMsgList], dtype=np.str_))
+
+        return np.rec.fromarrays(columnList, names = nameList)
+    # end batchArrayRecords
+
+    # Returns None when the case is acceptable, otherwise the message
+    # that DATA_VALUE would have given
+    def batchCheckInput(self, caseData):
+        if len(caseData) != len(self.inputList):
+            return "Error: Expected %d input values, found %d" %\
+                (len(self.inputList), len(caseData))
+
+        for field, value in zip(self.inputList, caseData):
+            if not (value >= field.min and value <= field.max):
+                return "Error: %s must be between %6.2f and %6.2f." %\
+                    (field.desc, field.min, field.max)
+
+        return None
+    # end batchCheckInput
+
+    @staticmethod
+    def batchRecords(dataDictList, errorCodeList, errorMsgList):
+        keyList = []
+        for dataDict in dataDictList:
+            for key, value in dataDict.items():
+                if key not in keyList and np.isscalar(value) and\
+                    not isinstance(value, str):
+                    keyList.append(key)
+
+        columnList = []
+        for key in keyList:
+            column = np.full(len(dataDictList), np.nan)
+            for i, dataDict in enumerate(dataDictList):
+                value = dataDict.get(key)
+                if np.isscalar(value) and not isinstance(value, str):
+                    column[i] = np.real(value)
+            columnList.append(column)
+
+        columnList.append(np.array(errorCodeList, dtype=np.int8))
+        columnList.append(np.array(errorMsgList, dtype=np.str_))
+
+        return np.rec.fromarrays(columnList,\
+            names = keyList + ["errorCode", "errorMsg"])
+    # end batchRecords
+
     # Override Methods ###################################################
+    # Override to take the values normally prompted for in userInput
+    # (besides units, water type and the case data) from run_batch
+    # keywords
+    def batchInput(self, settings):
+        for key, value in settings.items():
+            setattr(self, key, value)
+
     # Must be overridden by subclass
     def defineInputDataList(self):
         pass
@@ -126,4 +534,52 @@ class BaseDriver(object):
 
     def fileOutputPlotWriteData(self):
         pass
-# end base_driver
\ No newline at end of file
+# end base_driver
+
+# Worker for performCalculationsParallel. Module level so that it can be
+# pickled by the process pool.
+def runCaseShard(driverClass, driverState, shard):
+    import io
+
+    driver = driverClass.__new__(driverClass)
+    driver.__dict__.update(driverState)
+    driver.isBatch = True
+
+    DISPERSION_TABLE_USE(driver.useDispersionTable)
+
+    shardStart, caseList = shard
+    shardResultList = []
+
+    stdout = sys.stdout
+    try:
+        for caseOffset, caseData in enumerate(caseList):
+            sys.stdout = io.StringIO()
+
+            driver.errorMsg = None
+            driver.batchWriteList = []
+            driver.batchStateSnapshot = dict(driver.__dict__)
+
+            driver.performCalculations(caseData, shardStart + caseOffset)
+
+            shardResultList.append((sys.stdout.getvalue(),\
+                driver.batchWriteList))
+    finally:
+        sys.stdout = stdout
+
+    return shardResultList
+# end runCaseShard
+
+# Worker for run_design. With blockReducer the block is reduced here and
+# only the reduction is returned.
+def runDesignBlock(driverClass, units, water, settings, caseStart, block,\
+    blockRunner, blockReducer):
+    if blockRunner is not None:
+        records = blockRunner(block)
+    else:
+        records = driverClass.run_block(block, units, water,\
+            caseStart = caseStart, **settings)
+
+    if blockReducer is not None:
+        return blockReducer.blockReduction(caseStart, block, records)
+
+    return records
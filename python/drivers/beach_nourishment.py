@@ -243,4 +243,5 @@ class BeachNourishment(BaseDriver):
     # end fileOutputWriteData
 
 
-driver = BeachNourishment()
\ No newline at end of file
+if __name__ == "__main__":
+    driver = BeachNourishment()
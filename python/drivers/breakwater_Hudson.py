@@ -1,5 +1,6 @@
 import sys
 import math
+import numpy as np
 sys.path.append('../functions')
 
 from base_driver import BaseDriver
@@ -181,22 +182,26 @@ class BreakwaterHudson(BaseDriver):
         Nr = 1000.0*n*kdelt*(1.0 - P/100.0)*(unitwt/w)**(2.0/3.0)
         b = 3.0*kdelt*(w/unitwt)**(1.0/3.0)
         
+        # w is kept in force units (N or lbs) in dataDict, so that it is in
+        # one unit for all cases; heavy units are only shown in tons
         if self.isMetric:
             if w > 8000.0:
-                w = w/8896.4 #1 ton = 8896.4 N
+                self.wLrg = w/8896.4 #1 ton = 8896.4 N
                 self.labelUnitWtLrg = "tons"
             else:
+                self.wLrg = w
                 self.labelUnitWtLrg = "N"
         else:
             if w > 2000.0:
-                w = w/2000.0
+                self.wLrg = w/2000.0
                 self.labelUnitWtLrg = "tons"
             else:
+                self.wLrg = w
                 self.labelUnitWtLrg = "lbs"
         # end if
 
         print("Weight of individual unit\t%6.2f %s" %\
-            (w, self.labelUnitWtLrg))
+            (self.wLrg, self.labelUnitWtLrg))
         print("Crest width\t\t\t%6.2f %s" % (b, self.labelUnitDist))
         print("Average cover layer thickness\t%6.2f %s" %\
             (r, self.labelUnitDist))
@@ -206,6 +211,51 @@ class BreakwaterHudson(BaseDriver):
         self.fileOutputWriteMain(dataDict, caseIndex)
     # end performCalculations
 
+    # Vectorized run_block (see base_driver): all the cases of a block
+    # are computed at once. As in run_batch the weight w is in force units
+    # (N or lbs) for every case, heavy units being switched to tons only
+    # in the printed and file output.
+    @classmethod
+    def run_block(cls, inputs, units = "S", water = None,\
+        errorMessages = True, caseStart = 0, **settings):
+        if water == None:
+            raise ValueError("water (S or F) is needed for %s" % cls.__name__)
+
+        driver = cls.batchDriver(units, water, settings)
+
+        inputs, inputError, errorMsgList =\
+            driver.batchCheckInputArray(inputs, errorMessages)
+        unitwt, H, Kd, kdelt, P, cotssl, n = driver.batchCalcColumns(inputs,\
+            ["defaultValue_unitwt", "defaultValueH", "defaultValueKd",\
+            "defaultValue_kdelt", "defaultValueP", "defaultValue_cotssl",\
+            "defaultValue_n"])
+
+        H20weight = driver.rho*driver.g
+
+        specgrav = unitwt / H20weight
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            w = (unitwt*H**3)/(Kd*(specgrav - 1.0)**3 * cotssl)
+            calcError = ~inputError & (w < 0.0)
+            valid = ~inputError & ~calcError
+
+            r = n*kdelt*(w/unitwt)**(1.0/3.0)
+            Nr = 1000.0*n*kdelt*(1.0 - P/100.0)*(unitwt/w)**(2.0/3.0)
+            b = 3.0*kdelt*(w/unitwt)**(1.0/3.0)
+
+        if errorMessages:
+            for i in np.nonzero(calcError)[0]:
+                errorMsgList[i] = "Error: Unit weight must be greater than water weight"
+
+        w, b, r, Nr = [np.where(valid, val, np.nan) for val in [w, b, r, Nr]]
+
+        return BaseDriver.batchArrayRecords(\
+            ["unitwt", "H", "Kd", "kdelt", "P", "cotssl", "n",\
+            "w", "b", "r", "Nr"],\
+            [unitwt, H, Kd, kdelt, P, cotssl, n, w, b, r, Nr],\
+            inputError, calcError, errorMsgList, errorMessages)
+    # end run_block
+
     def fileOutputWriteData(self, dataDict):
         self.fileRef.write("Input\n")
         self.fileRef.write("unitwt                             %6.2f %s/%s^3\n" %\
@@ -222,7 +272,7 @@ class BreakwaterHudson(BaseDriver):
             self.fileRef.write("%s\n" % self.errorMsg)
         else:
             self.fileRef.write("Weight of individual unit\t%6.2f %s\n" %\
-                (dataDict["w"], self.labelUnitWtLrg))
+                (self.wLrg, self.labelUnitWtLrg))
             self.fileRef.write("Crest width\t\t\t%6.2f %s\n" %\
                 (dataDict["b"], self.labelUnitDist))
             self.fileRef.write("Average cover layer thickness\t%6.2f %s\n" %\
@@ -235,10 +285,11 @@ class BreakwaterHudson(BaseDriver):
         if self.errorMsg != None:
             exportData.append(self.errorMsg)
         else:
-            exportData = exportData + [dataDict["w"], dataDict["b"],\
+            exportData = exportData + [self.wLrg, dataDict["b"],\
                 dataDict["r"], dataDict["Nr"]]
         self.exporter.writeData(exportData)
     # end fileOutputWriteData
 
 
-driver = BreakwaterHudson()
\ No newline at end of file
+if __name__ == "__main__":
+    driver = BreakwaterHudson()
@@ -1,14 +1,14 @@
 import sys
-import math
 import numpy as np
-import scipy.special as sp
 import matplotlib.pyplot as plt
 sys.path.append('../functions')
 
 from base_driver import BaseDriver
 from helper_objects import BaseField
 import USER_INPUT
+from CNOIDAL import CNOIDAL
 from ERRWAVBRK1 import ERRWAVBRK1
+from ERRMASK import ERRCODE_OK, ERRCODE_BROKEN, ERRCODE_OUTSIDE, ERRCODE_URSELL
 
 from EXPORTER import EXPORTER
 
@@ -23,6 +23,7 @@ from EXPORTER import EXPORTER
 # Date Modified:7/21/16 -yaprak
 
 # Requires the following functions:
+# CNOIDAL
 # ERRWAVBRK1
 
 # MAIN VARIABLE LIST:
@@ -89,7 +90,7 @@ class CnoidalWaveTheory(BaseDriver):
     def userInput(self):
         super(CnoidalWaveTheory, self).userInput()
 
-        self.waterType, self.rho =\
+        self.water, self.rho =\
             USER_INPUT.SALT_FRESH_WATER(self.isMetric)
 
 #        self.O = USER_INPUT.FINITE_CHOICE(\
@@ -176,204 +177,27 @@ class CnoidalWaveTheory(BaseDriver):
         
         time = 0
 
-        epsi = H/d
+        m, K, L, C, E, Ef, Ur, eta, u, w, dudt, dwdt, pres, errorCode =\
+            CNOIDAL(H, T, d, z, xL, O, self.g, self.rho, time)
 
-        Hb = ERRWAVBRK1(d, 0.78)
-        if not (H < Hb):
+        if errorCode == ERRCODE_BROKEN:
+            Hb = ERRWAVBRK1(d, 0.78)
             self.errorMsg = "Error: Input wave broken (Hb = %6.2f %s)" %\
                 (Hb, self.labelUnitDist)
-            
+        elif errorCode == ERRCODE_URSELL:
+            self.errorMsg = "Error: Ursell parameter test failed."
+        elif errorCode == ERRCODE_OUTSIDE:
+            self.errorMsg = "Error: Point outside waveform."
+
+        if errorCode != ERRCODE_OK:
             print(self.errorMsg)
             self.fileOutputWriteMain(dataDict, caseIndex)
             return
 
-        # First Order Approximation
-        if O == 1: #determining m using bisection method
-            a = 1.0*10**-12
-            b = 1.0-10**-12
-            
-            loopCount = 0
-            while (b - a)/2.0 >= 0.00001:
-                xi = (a + b) / 2.0
-                if self.F1(xi, H, T, d) == 0:
-                    break
-                else:
-                    if self.F1(xi, H, T, d)*self.F1(b, H, T, d) < 0.0:
-                        a = xi
-                    elif self.F1(xi, H, T, d)*self.F1(a, H, T, d) < 0.0:
-                        b = xi
-                
-                loopCount += 1
-                if loopCount >= 20:
-                    break
-            # end while loop
-
-            m = xi
-
-            K = sp.ellipk(m)
-            E = sp.ellipe(m)
-
-            lambdaVal = (1 - m) / m
-            mu = E/(m*K)
-            theta = 2.0*K*(xL-(time/T))
-
-            C0 = 1.0
-            C1 = (1.0 + 2.0*lambdaVal - 3.0*mu)/2.0
-            C = math.sqrt(self.g*d)*(C0 + epsi*C1) # celerity
-
-            L = C*T # wave length
-
-            Ur = (H*(L**2))/(d**3)
-            if not (Ur > 26.0):
-                self.errorMsg = "Error: Ursell parameter test failed."
-                
-                print(self.errorMsg)
-                self.fileOutputWriteMain(dataDict, caseIndex)
-                return
-
-            SN, CN, DN, PH = sp.ellipj(theta, m)
-            CSD = CN*SN*DN
-
-            A0 = epsi*(lambdaVal - mu)
-            A1 = epsi
-            eta = d*(A0 + A1*CN**2) # water surface elevation
-
-            if not (z < eta and (z + d) > 0.0):
-                self.errorMsg = "Error: Point outside waveform."
-                
-                print(self.errorMsg)
-                self.fileOutputWriteMain(dataDict, caseIndex)
-                return
-
-            E0 = (-lambdaVal + 2.0*mu + 4.0*lambdaVal*mu - lambdaVal**2 - 3.0*mu**2)/3.0
-            E = self.rho*self.g*H**2*E0 # average energy density
-
-            F0 = E0
-            Ef = self.rho*self.g*H**2*math.sqrt(self.g*d)*F0 # energy flux
-
-            B00 = epsi*(lambdaVal - mu)
-            B10 = epsi
-            u = math.sqrt(self.g*d)*(B00 + B10*CN**2) # horizontal velocity
-
-            w = math.sqrt(self.g*d)*(4.0*K*d*CSD/L)*((z + d)/d)*B10 # vertical velocity
-
-            dudt = math.sqrt(self.g*d)*B10*(4.0*K/T)*CSD # horizontal acceleration
-
-            term = math.sqrt(self.g*d)*(4*K*d/L)*((z + d)/d)*B10*(2.0*K/T)
-            dwdt = term*((SN*DN)**2 - (CN*DN)**2 + (m*SN*CN)**2) # vertical acceleration
-
-            P1 = (1.0 + 2.0*lambdaVal - 3.0*mu)/2.0
-            P0 = 1.5
-            Pb = self.rho*self.g*d*(P0 + epsi*P1)
-            pres = Pb - (self.rho/2.0)*((u - C)**2 + w**2) - self.g*self.rho*(z + d) # pressure
-
+        if O == 1:
             print("First Order Approximations")
-        # Second Order Approximations
         else:
-            a = 1.0*10**-12
-            b = 1.0-10**-12
-
-            loopCount = 0
-            while (b - a)/2.0 >= 0.00001:
-                xi = (a + b)/2.0
-                if self.F2(xi, H, T, d, epsi) == 0:
-                    break
-                else:
-                    if self.F2(xi, H, T, d, epsi)*self.F2(b, H, T, d, epsi) < 0.0:
-                        a = xi
-                    elif self.F2(xi, H, T, d, epsi)*self.F2(a, H, T, d, epsi) < 0.0:
-                        b = xi
-                
-                loopCount += 1
-                if loopCount >= 20:
-                    break
-            # end while loop
-
-            m = xi
-
-            K = sp.ellipk(m)
-            E = sp.ellipe(m)
-
-            lambdaVal = (1 - m) / m
-            mu = E/(m*K)
-            theta = 2.0*K*(xL-(time/T))
-
-            SN, CN, DN, PH = sp.ellipj(theta, m)
-            CSD = CN*SN*DN
-
-            C2 = (-6.0 - 16.0*lambdaVal + 5.0*mu - 16.0*lambdaVal**2 + 10.0*lambdaVal*mu + 15.0*mu**2)/40.0
-            C1 = (1.0 + 2.0*lambdaVal - 3.0*mu)/2.0
-            C0 = 1.0
-            C = math.sqrt(self.g*d)*(C0 + epsi*C1 + epsi**2*C2) #celerity
-
-            L = C*T #wave length
-
-            Ur = (H*(L**2))/(d**3)
-            if not (Ur > 26.0):
-                self.errorMsg = "Error: Ursell parameter test failed."
-                
-                print(self.errorMsg)
-                self.fileOutputWriteMain(dataDict, caseIndex)
-                return
-
-            A2 = 0.75*epsi**2
-            A1 = epsi - A2
-            A0 = epsi*(lambdaVal - mu) +\
-                epsi**2*((-2.0*lambdaVal + mu - 2.0*lambdaVal**2 + 2.0*lambdaVal*mu)/4.0)
-            eta = d*(A0 + A1*CN**2 + A2*CN**4) #wave surface elevation
-
-            if not (z < eta and (z + d) > 0.0):
-                self.errorMsg = "Error: Point outside waveform."
-                
-                print(self.errorMsg)
-                self.fileOutputWriteMain(dataDict, caseIndex)
-                return
-
-            E1 = (1.0/30.0)*(lambdaVal - 2.0*mu - 17.0*lambdaVal*mu +\
-                3.0*lambdaVal**2 - 17.0*lambdaVal**2*mu +\
-                2.0*lambdaVal**3 + 15.0*mu**3)
-            E0 = (-lambdaVal + 2.0*mu + 4.0*lambdaVal*mu - lambdaVal**2 - 3.0*mu**2)/3.0
-            E = self.rho*self.g*H**2*(E0 + epsi*E1) #average energy density
-
-            F1 = (1.0/30.0)*(-4.0*lambdaVal + 8.0*mu +\
-                53.0*lambdaVal*mu - 12*lambdaVal**2 - 60.0*mu**2 +\
-                53.0*lambdaVal**2*mu - 120.0*lambdaVal*mu**2 -\
-                8.0*lambdaVal**3 + 75.0*mu**3)
-            F0 = E0
-            Ef = self.rho*self.g*H**2*math.sqrt(self.g*d)*(F0 + epsi*F1) #energy flux
-
-            term = (z + d)/d
-
-            B21 = -4.5*epsi**2
-            B11 = 3.0*epsi**2*(1 - lambdaVal)
-            B01 = ((3.0*lambdaVal)/2.0)*epsi**2
-            B20 = -(epsi**2)
-            B10 = epsi + epsi**2*((1.0 - 6.0*lambdaVal + 2.0*mu)/4.0)
-            B00 = epsi*(lambdaVal - mu) + epsi**2*((lambdaVal - mu - 2.0*lambdaVal**2 + 2.0*mu**2)/4.0)
-            u = math.sqrt(self.g*d)*((B00 + B10*CN**2 + B20*CN**4) -\
-                0.5*term**2*(B01 + B11*CN**2 + B21*CN**4)) #horizontal velocity
-
-            w1 = term*(B10 + 2.0*B20*CN**2)
-            w2 = (1.0/6.0)*term**3*(B11 + 2.0*B21*CN**2)
-            w = math.sqrt(self.g*d)*(4.0*K*d*CSD/L)*(w1 - w2) #vertical velocity
-
-            u1 = (B10 - 0.5*term**2*B11)*(4.0*K*CSD/T)
-            u2 = (B20 - 0.5*term**2*B21)*(8.0*K*CN**2*CSD/T)
-            dudt = math.sqrt(self.g*d)*(u1 + u2) #horizontal acceleration
-
-            w1 = (8.0*K*CSD**2/T)*(term*B20 - (1.0/6.0)*term**3*B21)
-            w2 = term*(B10 + 2.0*B20*CN**2)-(1.0/6.0)*term**3*(B11 + 2.0*B21*CN**2)
-            w3 = (2.0*K/T)*((SN*DN)**2 - (CN*DN)**2 + (m*SN*CN)**2)
-            dwdt = math.sqrt(self.g*d)*(4.0*K*d/L)*(w1 + w2*w3) #vertical acceleration
-
-            P2 = (-1.0 - 16.0*lambdaVal + 15.0*mu - 16.0*lambdaVal**2 + 30*lambdaVal*mu)/40.0
-            P1 = (1.0 + 2*lambdaVal - 3.0*mu)/2.0
-            P0 = 1.5
-            Pb = self.rho*self.g*d*(P0 + epsi*P1 + epsi**2*P2)
-            pres = Pb - (self.rho/2.0)*((u - C)**2 + w**2) - self.g*self.rho*(z + d)
-
             print("Second Order Approximations")
-        # end if
 
         print("Wavelength\t\t%-6.2f %s" % (L, self.labelUnitDist))
         print("Celerity\t\t%-6.2f %s/sec" % (C, self.labelUnitDist))
@@ -402,26 +226,10 @@ class CnoidalWaveTheory(BaseDriver):
         self.fileOutputWriteMain(dataDict, caseIndex)
 
         if self.isSingleCase:
-            self.plotDict = {"O": O, "K": K, "time": time, "T": T, "m": m,\
-                "d": d, "A0": A0, "A1": A1, "B00": B00,\
-                "B10": B10, \
-                "z": z, "L": L}
-
-            if O == 2:
-                self.plotDict["A2"] = A2
-                self.plotDict["B01"] = B01
-                self.plotDict["B20"] = B20
-                self.plotDict["B11"] = B11
-                self.plotDict["B21"] = B21
+            self.plotDict = {"H": H, "T": T, "d": d, "z": z, "O": O,\
+                "time": time}
     # end performCalculations
 
-    def F1(self, m, H, T, d):
-        return (16*m*sp.ellipk(m)**2/3)-(self.g*H*T**2/d**2)
-    # end F1
-
-    def F2(self, m, H, T, d, epsi):
-        return (16*m*sp.ellipk(m)**2/3)-(self.g*H*T**2/d**2)*(1-epsi*((1.0 + 2.0*((1.0 - m)/m))/4.0))
-
     def fileOutputWriteData(self, dataDict):
         self.fileRef.write("Input\n")
         self.fileRef.write("Wave height\t\t\t%8.2f %s\n" %\
@@ -481,36 +289,11 @@ class CnoidalWaveTheory(BaseDriver):
 
     def performPlot(self):
         #Plotting waveform
-        plotxL = list(np.arange(-1, 1.001, 0.001))
-        plottheta = [2*self.plotDict["K"]*\
-            (i - (self.plotDict["time"]/self.plotDict["T"])) for i in plotxL]
-        pSN, pCN, pDN, pPH = sp.ellipj(plottheta, self.plotDict["m"])
-        pCSD = pSN*pCN*pDN
-
-        if self.plotDict["O"] == 1:
-            ploteta = self.plotDict["d"]*\
-                (self.plotDict["A0"] + self.plotDict["A1"]*pCN**2)
-            plotu = math.sqrt(self.g*self.plotDict["d"])*\
-                (self.plotDict["B00"] + self.plotDict["B10"]*pCN**2)
-            plotw = math.sqrt(self.g*self.plotDict["d"])*\
-                (4.0*self.plotDict["K"]*self.plotDict["d"]*pCSD/self.plotDict["L"])*\
-                ((self.plotDict["z"] + self.plotDict["d"])/self.plotDict["d"])*self.plotDict["B10"]
-        else:
-            ploteta = self.plotDict["d"]*(self.plotDict["A0"] +\
-                self.plotDict["A1"]*pCN**2 + self.plotDict["A2"]*pCN**4)
-            plotu = math.sqrt(self.g*self.plotDict["d"])*\
-                ((self.plotDict["B00"] + self.plotDict["B10"]*pCN**2 +\
-                self.plotDict["B20"]*pCN**4) -\
-                0.5*((self.plotDict["z"] + self.plotDict["d"]) / self.plotDict["d"])**2 *\
-                (self.plotDict["B01"] + self.plotDict["B11"]*pCN**2 + self.plotDict["B21"]*pCN**4))
-
-            pw1 = ((self.plotDict["z"] + self.plotDict["d"])/self.plotDict["d"])*\
-                (self.plotDict["B10"] + 2.0*self.plotDict["B20"]*pCN**2)
-            pw2 = (1.0/6.0)*(((self.plotDict["z"] + self.plotDict["d"])/self.plotDict["d"])**3)*\
-                (self.plotDict["B11"] + 2.0*self.plotDict["B21"]*pCN**2)
-            plotw = math.sqrt(self.g*self.plotDict["d"])*\
-                (4.0*self.plotDict["K"]*self.plotDict["d"]*pCSD/self.plotDict["L"])*(pw1 - pw2)
-        # end if
+        plotxL = np.arange(-1, 1.001, 0.001)
+        ploteta, plotu, plotw = CNOIDAL(self.plotDict["H"],\
+            self.plotDict["T"], self.plotDict["d"], self.plotDict["z"],\
+            plotxL, self.plotDict["O"], self.g, self.rho,\
+            self.plotDict["time"])[7:10]
 
         plt.figure(1, figsize=(8, 12), dpi=self.plotConfigDict["dpi"])
 
@@ -557,4 +340,5 @@ class CnoidalWaveTheory(BaseDriver):
     # fileOutputPlotWriteData
 
 
-driver = CnoidalWaveTheory()
\ No newline at end of file
+if __name__ == "__main__":
+    driver = CnoidalWaveTheory()
@@ -1,5 +1,4 @@
 import sys
-import math
 import numpy as np
 import matplotlib.pyplot as plt
 sys.path.append('../functions')
@@ -9,6 +8,8 @@ from helper_objects import BaseField
 import USER_INPUT
 from ERRSTP import ERRSTP
 from ERRWAVBRK1 import ERRWAVBRK1
+from EXTREMAL import EXTREMAL_BOOTSTRAP, EXTREMAL_FIT, EXTREMAL_POSITIONS,\
+    EXTREMAL_RETURN, EXTREMAL_SIGR, k_W
 from WAVELEN import WAVELEN
 
 from EXPORTER import EXPORTER
@@ -25,6 +26,7 @@ from EXPORTER import EXPORTER
 
 # Requires the following functions:
 # ERRWAVBRK1
+# EXTREMAL
 
 # MAIN VARIABLE LIST:
 #   INPUT
@@ -49,7 +51,7 @@ from EXPORTER import EXPORTER
 
 class ExtHsAnalysis(BaseDriver):
     def __init__(self, Nt = None, K = None, d = None,\
-        Hs = None, option = None):
+        Hs = None, option = None, numResamples = None, seed = None):
         self.exporter = EXPORTER("output/exportExtHsAnalysis")
 
         self.isSingleCase = True
@@ -65,6 +67,14 @@ class ExtHsAnalysis(BaseDriver):
         if option != None:
             self.defaultValue_option = option
 
+        # Confidence intervals are bootstrapped from numResamples resamples
+        # (run on numWorkers processes) instead of taken from Eq. 10
+        if numResamples != None:
+            self.numResamples = int(numResamples)
+        else:
+            self.numResamples = 0
+        self.bootstrapSeed = seed
+
         super(ExtHsAnalysis, self).__init__()
         
         self.exporter.close()
@@ -74,16 +84,25 @@ class ExtHsAnalysis(BaseDriver):
         super(ExtHsAnalysis, self).userInput()
 
         if not hasattr(self, "defaultValueHs"):
-            hsCount = USER_INPUT.DATA_VALUE(\
-                "the number of significant wave heights", 1, 200)
-            hsCount = int(hsCount)
-
-            self.Hs = []
-            for i in range(hsCount):
-                self.Hs.append(USER_INPUT.DATA_VALUE(\
-                    "significant wave height [%s] #%d" %\
-                    (self.labelUnitDist, (i + 1)),\
-                    0.0, 100.0))
+            inputMode = USER_INPUT.FINITE_CHOICE(\
+                "Significant wave heights:\n[1] Enter values\n[2] Load from file\nSelect option: ",\
+                ["1", "2"])
+
+            if inputMode == "1":
+                hsCount = USER_INPUT.DATA_VALUE(\
+                    "the number of significant wave heights", 1, 200)
+                hsCount = int(hsCount)
+
+                self.Hs = []
+                for i in range(hsCount):
+                    self.Hs.append(USER_INPUT.DATA_VALUE(\
+                        "significant wave height [%s] #%d" %\
+                        (self.labelUnitDist, (i + 1)),\
+                        0.0, 100.0))
+            else:
+                self.Hs = USER_INPUT.DATA_FILE(\
+                    "significant wave heights [%s]" % self.labelUnitDist,\
+                    0.0, 100.0)
         else:
             self.Hs = self.defaultValueHs
 
@@ -101,7 +120,7 @@ class ExtHsAnalysis(BaseDriver):
 
         if not hasattr(self, "defaultValueNt"):
             self.inputList.append(BaseField(\
-                "Nt: estimated total number of events",  0.0, 10000.0))
+                "Nt: estimated total number of events",  0.0, 10000000.0))
 
         if not hasattr(self, "defaultValueK"):
             self.inputList.append(BaseField(\
@@ -143,186 +162,101 @@ class ExtHsAnalysis(BaseDriver):
 
         N = len(self.Hs)
         lambdaVal = Nt / K
-        nu = N / Nt
+        if Nt > 0:
+            nu = N / Nt
+        else:
+            nu = float("inf")
 
         dataDict = {"Nt": Nt, "K": K, "d": d, "N": N,\
             "nu": nu, "lambdaVal": lambdaVal}
-        
+
+        # The sample is a subset of the Nt events (nu = N/Nt <= 1)
+        if not (N <= Nt):
+            self.errorMsg = "Error: Number of wave heights (N = %d) must not exceed Nt (%d)" %\
+                (N, Nt)
+
+            print(self.errorMsg)
+            self.fileOutputWriteMain(dataDict, caseIndex)
+            return
+
         self.Hs = [i / 0.3048 for i in self.Hs]
         d = d / 0.3048
 
         Hb = ERRWAVBRK1(d, 0.78)
-        for j in self.Hs:
-            if not (j < Hb):
-                self.errorMsg = "Error: Input wave broken (Hb = %6.2f %s)" %\
-                    (Hb, self.labelUnitDist)
-                    
-                print(self.errorMsg)
-                self.fileOutputWriteMain(dataDict, caseIndex)
-                return
+        if not np.all(np.asarray(self.Hs) < Hb):
+            self.errorMsg = "Error: Input wave broken (Hb = %6.2f %s)" %\
+                (Hb, self.labelUnitDist)
+
+            print(self.errorMsg)
+            self.fileOutputWriteMain(dataDict, caseIndex)
+            return
 
         ret = [1.0, 1.1, 1.2, 1.3, 1.4, 1.5, 1.6, 1.7, 1.8, 1.9,\
             2.0, 5.0, 10.0, 25.0, 50.0, 100.0]
 
-        #Coefficients
-        k_W = [0.75, 1.00, 1.40, 2.00]
-        a1 = [0.64, 1.65, 1.92, 2.05, 2.24]
-        a2 = [9.0, 11.4, 11.4, 11.4, 11.4]
-        kappa = [0.93, -0.63, 0.00, 0.69, 1.34]
-        c = [0.0, 0.0, 0.3, 0.4, 0.5]
-        epsi = [1.33, 1.15, 0.90, 0.72, 0.54]
-
         pret = [1.0, 2.0, 5.0, 10.0, 25.0, 50.0, 100.0]
         plen = pret
 
-        self.Hs.sort()
-        self.Hs.reverse()
-
-        yact = [[0.0 for j in range(5)] for i in range(N)]
-        ym = [[0.0 for j in range(5)] for i in range(N)]
-        for j in range(N):
-            yact[j][0] = 1.0 - ((j + 1) - 0.44)/(Nt + 0.12) #FT-I
-            ym[j][0] = -math.log(-math.log(yact[j][0]))
+        Hs = -np.sort(-np.asarray(self.Hs, dtype=np.float64))
+        self.Hs = Hs.tolist()
 
-            for m in range(1, 5):
-                k = k_W[m - 1] #Weibull
-                yact[j][m] = 1.0 - ((j + 1) - 0.2 - 0.27/math.sqrt(k))/\
-                    (Nt + 0.2 + 0.23/math.sqrt(k))
-                ym[j][m] = (-math.log(1.0 - yact[j][m]))**(1.0/k)
-        # end for loop
+        yact, ym = EXTREMAL_POSITIONS(N, Nt)
+        alpha, beta, rxy = EXTREMAL_FIT(Hs, ym)
 
-        Sx = sum(self.Hs)
-        Sy = [sum([yact[j][m] for j in range(N)]) for m in range(5)]
-        Sxx = sum([i**2 for i in self.Hs])
-        Slly = [sum([ym[j][m] for j in range(N)]) for m in range(5)]
-        Syy = [sum([ym[j][m]**2 for j in range(N)]) for m in range(5)]
-
-        Sxy = [[0.0 for j in range(5)] for i in range(N)]
-        for j in range(N):
-            for m in range(5):
-                Sxy[j][m] = self.Hs[j]*ym[j][m]
-        Sxy = [sum([Sxy[j][m] for j in range(N)]) for m in range(5)]
-
-        alpha = []
-        beta = []
-        for m in range(5):
-            alpha.append((N*Sxy[m] - Sx*Slly[m])/(N*Syy[m] - Slly[m]**2))
-            beta.append((1.0/N)*(Sx - alpha[m]*Slly[m]))
-
-        yest = []
-        for j in range(N):
-            yest.append([])
-            yest[j].append(\
-                math.exp(-math.exp(-(self.Hs[j] - beta[0])/alpha[0]))) #FT-I
-
-            for m in range(1, 5):
-                k = k_W[m - 1] #Weibull
-                if (self.Hs[j] - beta[m])/alpha[m] >= 0.0:
-                    yest[j].append(\
-                        1.0 - math.exp(-((self.Hs[j] - beta[m])/alpha[m])**k))
-                else:
-                    yest[j].append(0.0)
+        Sx = Hs.sum()
 
-        st = []
-        for j in range(N):
-            st.append([])
-            for m in range(5):
-                st[j].append((yact[j][m] - yest[j][m])**2)
+        yest = np.empty((N, 5))
+        yest[:, 0] = np.exp(-np.exp(-(Hs - beta[0])/alpha[0])) #FT-I
+        reduced = (Hs[:, np.newaxis] - beta[1:])/alpha[1:] #Weibull
+        yest[:, 1:] = np.where(reduced >= 0.0,\
+            1.0 - np.exp(-np.maximum(reduced, 0.0)**k_W), 0.0)
 
         # sumresid = sum(st)/0.3048
-        sumresid = [sum([st[j][m] for j in range(N)]) for m in range(5)]
-        sumresid = [i/0.3048 for i in sumresid] #sum square of residuals
-
-        rxy = []
-        for m in range(5):
-            numer = N*Sxy[m] - Sx*Slly[m]
-            term1d = N*Sxx - Sx**2
-            term2d = N*Syy[m] - Slly[m]**2
-            rxy.append(numer/(math.sqrt(term1d*term2d))) #correlation coefficient
-
-        yr = [[0.0 for m in range(5)] for j in range(len(ret))]
-        Hsr = [[0.0 for m in range(5)] for j in range(len(ret))]
-        for j in range(len(ret)):
-            prob1 = 1.0 - 1.0/(lambdaVal*ret[j])
-
-            if prob1 <= 0.0:
-                prob1 = 1.0*10**(-7)
-
-            yr[j][0] = -math.log(-math.log(prob1)) #FT-I
-            Hsr[j][0] = alpha[0]*yr[j][0] + beta[0]
-
-            for m in range(1, 5):
-                prob2 = lambdaVal*ret[j]
-                if prob2 <= 0.0:
-                    prob2 = 1.0*10**(-7)
-
-                k = k_W[m - 1] #Weibull
-                yr[j][m] = math.log(prob2)**(1.0/k)
-                Hsr[j][m] = alpha[m]*yr[j][m] + beta[m]
-        # end for loop
+        sumresid = ((yact - yest)**2).sum(axis=0)/0.3048 #sum square of residuals
 
-        rtp = []
-        for j in range(N):
-            rtp.append([])
-            rtp[j].append(\
-                1.0/((1.0 - math.exp(-math.exp(-ym[j][0])))*lambdaVal)) #FT-I
+        yr, Hsr = EXTREMAL_RETURN(alpha, beta, lambdaVal, ret)
 
-            for m in range(1, 5):
-                k = k_W[m - 1] #Weibull
-                rtp[j].append(math.exp(ym[j][m]**k)/lambdaVal)
-        # end for loop
+        rtp = np.empty((N, 5))
+        rtp[:, 0] = 1.0/((1.0 - np.exp(-np.exp(-ym[:, 0])))*lambdaVal) #FT-I
+        rtp[:, 1:] = np.exp(ym[:, 1:]**k_W)/lambdaVal #Weibull
 
-        standev = np.std(self.Hs, ddof=1) #standard deviation
+        standev = np.std(Hs, ddof=1) #standard deviation
 
-        #Calculate confidence intervals
-        sigr = [[0.0 for m in range(5)] for j in range(len(ret))]
-        for m in range(5):
-            coeff = a1[m]*math.exp(a2[m]*N**(-1.3) + kappa[m]*math.sqrt(-math.log(nu)))
+        confList = [80, 85, 90, 95, 99]
+        zList = [1.28, 1.44, 1.65, 1.96, 2.58]
+        conf = confList[self.option - 1]
 
-            for j in range(len(ret)):
-                signr = (1.0/math.sqrt(N))*(1.0 + coeff*(yr[j][m] - c[m] + epsi[m]*math.log(nu))**2)**(0.5)
-                sigr[j][m] = signr*standev
-        # end for loop
+        #Calculate confidence intervals
+        if self.numResamples > 0:
+            sigr, lowbound, highbound = EXTREMAL_BOOTSTRAP(Hs, Nt,\
+                lambdaVal, ret, conf, self.numResamples, self.numWorkers,\
+                self.bootstrapSeed)
+        else:
+            sigr = EXTREMAL_SIGR(yr, N, nu, standev)
+            bounds = sigr*zList[self.option - 1]
 
-        if self.option == 1: #80%
-            bounds = [[j*1.28 for j in i] for i in sigr]
-            conf = 80
-        elif self.option == 2: #85%
-            bounds = [[j*1.44 for j in i] for i in sigr]
-            conf = 85
-        elif self.option == 3: #90%
-            bounds = [[j*1.65 for j in i] for i in sigr]
-            conf = 90
-        elif self.option == 4: #95%
-            bounds = [[j*1.96 for j in i] for i in sigr]
-            conf = 95
-        elif self.option == 5: #99%
-            bounds = [[j*2.58 for j in i] for i in sigr]
-            conf = 99
-
-        lowbound = []
-        highbound = []
-        for j in range(len(Hsr)):
-            lowbound.append([])
-            highbound.append([])
-
-            for m in range(5):
-                lowbound[j].append(Hsr[j][m] - bounds[j][m])
-                highbound[j].append(Hsr[j][m] + bounds[j][m])
+            lowbound = Hsr - bounds
+            highbound = Hsr + bounds
 
         #Calculated percent chance for significant wave height
         #equaling or exceeding the return period
-        pe = [[0.0 for j in range(7)] for i in range(7)]
-        for i in range(7):
-            for j in range(7):
-                pe[j][i] = 100.0*(1.0 - (1.0 - 1.0/pret[j])**plen[i])
-
-        xxr = []
-        for i in range(N):
-            xxr.append([])
-
-            for m in range(5):
-                xxr[i].append(ym[i][m]*alpha[m] + beta[m])
+        pe = (100.0*(1.0 - (1.0 - 1.0/np.asarray(pret)[:, np.newaxis])**\
+            np.asarray(plen)[np.newaxis, :])).tolist()
+
+        xxr = ym*alpha + beta
+
+        yact = yact.tolist()
+        ym = ym.tolist()
+        xxr = xxr.tolist()
+        rtp = rtp.tolist()
+        Hsr = Hsr.tolist()
+        sigr = sigr.tolist()
+        lowbound = lowbound.tolist()
+        highbound = highbound.tolist()
+        alpha = alpha.tolist()
+        beta = beta.tolist()
+        rxy = rxy.tolist()
+        sumresid = sumresid.tolist()
 
         printpe = [[j for j in i] for i in pe]
         printside = [2, 5, 10, 25, 50, 100]
@@ -363,6 +297,9 @@ class ExtHsAnalysis(BaseDriver):
         elif C == 4:
             print("\nBest fit distribution function: Weibull Distribution (k=2.00)\n")
 
+        if self.numResamples > 0:
+            print("Bootstrap confidence intervals from %d resamples" %\
+                self.numResamples)
         print("%i%% Confidence Interval, (Lower Bound - Upper Bound)\nReturn period" % conf)
         print("\tFT-I          W (k=0.75)    W (k=1.00)    W (k=1.40)    W (k=2.00)")
 
@@ -553,4 +490,5 @@ class ExtHsAnalysis(BaseDriver):
         pass
 
 
-driver = ExtHsAnalysis()
\ No newline at end of file
+if __name__ == "__main__":
+    driver = ExtHsAnalysis()
@@ -1,9 +1,18 @@
-from helper_functions import *
-import math
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
+sys.path.append('../functions')
 
-## ACES Update to MATLAB
+from base_driver import BaseDriver
+from helper_objects import BaseField
+import USER_INPUT
+from ERRWAVBRK1 import ERRWAVBRK1
+from FWT_ARRAY import FWT_ARRAY
+from FWTKIN import FWTKIN
+
+from EXPORTER import EXPORTER
+
+## ACES Update to python
 #-------------------------------------------------------------
 # Driver for Fourier Series Wave Theory (page 2-3 of ACES User's
 # Guide). Yields various parameters for progressive waves of permanent
@@ -18,18 +27,26 @@ import matplotlib.pyplot as plt
 # Date Modified:
 
 # Requires the following functions:
-# ERRWAVBRK
+# ERRWAVBRK1
+# FWT_ARRAY
+# FWTCALC
+# FWTEQNS
+# FWTKIN
 # FWTPRE
+# FWTRSLT
+# FWTSOL
 
 # MAIN VARIABLE LIST:
 #   INPUT
 #   H: wave height
-#   d: water depth
 #   T: wave period
-#   celdef: celerity defintion
+#   d: water depth
 #   u: mean velocity
+#   xL: horizontal coordinate as fraction of wavelength (x/L)
+#   z: vertical coordinate
+#   celdef: celerity defintion
 #   nofour: number of terms in Fourier series
-#   nosteps: number of steps in wave height ramping
+#   nstep: number of steps in wave height ramping
 
 #   OUTPUT
 #   c: celerity
@@ -47,25 +64,391 @@ import matplotlib.pyplot as plt
 #   Sxx: radiation stress
 #   F: wave power (energy flux)
 #   Q: volume flux
+#   eta: surface elevation
+#   ubig: horizontal particle velocity
+#   wbig: vertical particle velocity
+#   ax: horizontal particle acceleration
+#   ay: vertical particle accleration
+#   pbig: pressure
 
 #   OTHERS
+#   zsol: solution vector of the Fourier series equations
+#   ft: Fourier coefficients of the surface elevation
 #-------------------------------------------------------------
-def fourier(H, d, T, celdef, u, nofour, nosteps, unitSystem):
-    #must be entered in English units
-    H = 4
-    d = 22
-    celdef = 1 #1 for Eulerian, 2 for Stokes
-    T = 9.0
-    u = 0.0
-    nofour = 16
-    nosteps = 5
-
-    g = 32.2
-    [Hbs,error] = ERRWAVBRK(H,T,0,d,0.78)
-    if error == 1
-        str = ['Error: Input wave broken (Hb = ',num2str(Hb),' m)']
-        disp(str)
-        break
-    end
-
-    [Hnon,L,Hod,unon] = FWTPRE(g,T,H,d,u)
+
+class Fourier(BaseDriver):
+    def __init__(self, H = None, T = None, d = None, u = None,\
+        xL = None, z = None, celdef = None, nofour = None, nstep = None):
+        self.exporter = EXPORTER("output/exportFourier")
+
+        if H != None:
+            self.isSingleCase = True
+            self.defaultValueH = H
+        if T != None:
+            self.isSingleCase = True
+            self.defaultValueT = T
+        if d != None:
+            self.isSingleCase = True
+            self.defaultValue_d = d
+        if u != None:
+            self.isSingleCase = True
+            self.defaultValue_u = u
+        if xL != None:
+            self.isSingleCase = True
+            self.defaultValue_xL = xL
+        if z != None:
+            self.isSingleCase = True
+            self.defaultValue_z = z
+        if celdef != None:
+            self.defaultValue_celdef = celdef
+        if nofour != None:
+            self.defaultValue_nofour = nofour
+        if nstep != None:
+            self.defaultValue_nstep = nstep
+
+        super(Fourier, self).__init__()
+
+        self.exporter.close()
+    # end __init__
+
+    def userInput(self):
+        super(Fourier, self).userInput()
+
+        self.water, self.rho =\
+            USER_INPUT.SALT_FRESH_WATER(self.isMetric)
+
+        if hasattr(self, "defaultValue_celdef"):
+            self.celdef = self.defaultValue_celdef
+        else:
+            self.celdef = USER_INPUT.FINITE_CHOICE(\
+                "Enter celdef: celerity definition (1 for Euler, 2 for Stokes): ",\
+                ["1", "2"])
+        self.celdef = int(self.celdef)
+
+        if hasattr(self, "defaultValue_nofour"):
+            self.nofour = self.defaultValue_nofour
+        else:
+            self.nofour = USER_INPUT.DATA_VALUE(\
+                "nofour: the number of terms in Fourier series", 1, 25)
+        self.nofour = int(self.nofour)
+
+        if hasattr(self, "defaultValue_nstep"):
+            self.nstep = self.defaultValue_nstep
+        else:
+            self.nstep = USER_INPUT.DATA_VALUE(\
+                "nstep: the number of steps in wave height ramping", 1, 10)
+        self.nstep = int(self.nstep)
+    # end userInput
+
+    def defineInputDataList(self):
+        self.inputList = []
+
+        if not hasattr(self, "defaultValueH"):
+            self.inputList.append(BaseField(\
+                "H: wave height (%s)" % self.labelUnitDist, 0.1, 200.0))
+        if not hasattr(self, "defaultValueT"):
+            self.inputList.append(BaseField(\
+                "T: wave period (sec)", 1.0, 1000.0))
+        if not hasattr(self, "defaultValue_d"):
+            self.inputList.append(BaseField(\
+                "d: water depth (%s)" % self.labelUnitDist, 0.1, 5000.0))
+        if not hasattr(self, "defaultValue_u"):
+            self.inputList.append(BaseField(\
+                "u: mean velocity (%s/sec)" % self.labelUnitDist, -10.0, 10.0))
+        if not hasattr(self, "defaultValue_xL"):
+            self.inputList.append(BaseField(\
+                "xL: horizontal coordinate as fraction of wavelength (x/L)",\
+                0.0, 1.0))
+        if not hasattr(self, "defaultValue_z"):
+            self.inputList.append(BaseField(\
+                "z: vertical coordinate (%s)" % self.labelUnitDist,\
+                -5100.0, 100.0))
+    # end defineInputDataList
+
+    def fileOutputRequestInit(self):
+        self.fileOutputRequestMain(requestDesc = True)
+
+    def getCalcValues(self, caseInputList):
+        currIndex = 0
+
+        if hasattr(self, "defaultValueH"):
+            H = self.defaultValueH
+        else:
+            H = caseInputList[currIndex]
+            currIndex = currIndex + 1
+
+        if hasattr(self, "defaultValueT"):
+            T = self.defaultValueT
+        else:
+            T = caseInputList[currIndex]
+            currIndex = currIndex + 1
+
+        if hasattr(self, "defaultValue_d"):
+            d = self.defaultValue_d
+        else:
+            d = caseInputList[currIndex]
+            currIndex = currIndex + 1
+
+        if hasattr(self, "defaultValue_u"):
+            u = self.defaultValue_u
+        else:
+            u = caseInputList[currIndex]
+            currIndex = currIndex + 1
+
+        if hasattr(self, "defaultValue_xL"):
+            xL = self.defaultValue_xL
+        else:
+            xL = caseInputList[currIndex]
+            currIndex = currIndex + 1
+
+        if hasattr(self, "defaultValue_z"):
+            z = self.defaultValue_z
+        else:
+            z = caseInputList[currIndex]
+            currIndex = currIndex + 1
+
+        return H, T, d, u, xL, z
+    # end getCalcValues
+
+    def performCalculations(self, caseInputList, caseIndex = 0):
+        H, T, d, u, xL, z = self.getCalcValues(caseInputList)
+        dataDict = {"H": H, "T": T, "d": d, "u": u, "xL": xL, "z": z}
+
+        Hb = ERRWAVBRK1(d, 0.78)
+        if not (H < Hb):
+            self.errorMsg = "Error: Input wave broken (Hb = %6.2f %s)" %\
+                (Hb, self.labelUnitDist)
+
+            print(self.errorMsg)
+            self.fileOutputWriteMain(dataDict, caseIndex)
+            return
+
+        results, zsol, ft, converged = FWT_ARRAY(H, T, d, u, self.celdef,\
+            self.nofour, self.nstep, self.g, self.rho)
+        if not converged:
+            self.errorMsg = "Error: Solution did not converge (wave may exceed the limiting height)."
+
+            print(self.errorMsg)
+            self.fileOutputWriteMain(dataDict, caseIndex)
+            return
+
+        k, C, L, u_e, u_mt, u_m, q, r, I, Ek, Ep, E, Ub2, Sxx, Ef, Q, R =\
+            [float(val) for val in results]
+
+        ubig, wbig, ax, ay, pbig, eta =\
+            FWTKIN(xL, z, self.nofour, k, d, zsol, ft, self.g, self.rho)
+        if np.isnan(ubig):
+            self.errorMsg = "Error: (X/L,Z) pair not in wave domain."
+
+            print(self.errorMsg)
+            self.fileOutputWriteMain(dataDict, caseIndex)
+            return
+
+        print("Celerity\t\t\t\t%-6.2f %s/sec" % (C, self.labelUnitDist))
+        print("Wavelength\t\t\t\t%-6.2f %s" % (L, self.labelUnitDist))
+        print("Mean Eulerian fluid velocity\t\t%-6.2f %s/sec" %\
+            (u_e, self.labelUnitDist))
+        print("Mean mass transport velocity\t\t%-6.2f %s/sec" %\
+            (u_mt, self.labelUnitDist))
+        print("Mean velocity relative to wave\t\t%-6.2f %s/sec" %\
+            (u_m, self.labelUnitDist))
+        print("Volume flux due to wave\t\t\t%-6.2f %s^2/sec" %\
+            (q, self.labelUnitDist))
+        print("Bernoulli constant (mean level)\t\t%-6.2f %s^2/sec^2" %\
+            (r, self.labelUnitDist))
+        print("---- Integral Parameters ----")
+        print("Impulse\t\t\t\t\t%-8.2f %s-sec/%s^2" %\
+            (I, self.labelUnitWt, self.labelUnitDist))
+        print("Kinetic energy\t\t\t\t%-8.2f %s-%s/%s^2" %\
+            (Ek, self.labelUnitDist, self.labelUnitWt, self.labelUnitDist))
+        print("Potential energy\t\t\t%-8.2f %s-%s/%s^2" %\
+            (Ep, self.labelUnitDist, self.labelUnitWt, self.labelUnitDist))
+        print("Energy density\t\t\t\t%-8.2f %s-%s/%s^2" %\
+            (E, self.labelUnitDist, self.labelUnitWt, self.labelUnitDist))
+        print("Mean square of bed velocity\t\t%-6.2f %s^2/sec^2" %\
+            (Ub2, self.labelUnitDist))
+        print("Radiation stress\t\t\t%-8.2f %s-%s/%s^2" %\
+            (Sxx, self.labelUnitDist, self.labelUnitWt, self.labelUnitDist))
+        print("Energy flux (wave power)\t\t%-8.2f %s-%s/sec-%s" %\
+            (Ef, self.labelUnitDist, self.labelUnitWt, self.labelUnitDist))
+        print("Volume flux\t\t\t\t%-6.2f %s^2/sec" % (Q, self.labelUnitDist))
+        print("Bernoulli constant (bed)\t\t%-6.2f %s^2/sec^2" %\
+            (R, self.labelUnitDist))
+        print("---- Surface ----")
+        print("Crest elevation\t\t\t\t%-6.2f %s" %\
+            (zsol[9]/k, self.labelUnitDist))
+        print("Trough elevation\t\t\t%-6.2f %s" %\
+            (zsol[self.nofour + 9]/k, self.labelUnitDist))
+        print("---- Kinematics ----")
+        print("Elevation\t\t\t\t%-6.2f %s" % (eta, self.labelUnitDist))
+        print("Horz. velocity\t\t\t\t%-6.2f %s/sec" % (ubig, self.labelUnitDist))
+        print("Vert. velocity\t\t\t\t%-6.2f %s/sec" % (wbig, self.labelUnitDist))
+        print("Horz. acceleration\t\t\t%-6.2f %s/sec^2" % (ax, self.labelUnitDist))
+        print("Vert. acceleration\t\t\t%-6.2f %s/sec^2" % (ay, self.labelUnitDist))
+        print("Pressure\t\t\t\t%-8.2f %s/%s^2" % (pbig, self.labelUnitWt, self.labelUnitDist))
+
+        dataDict.update({"C": C, "L": L, "u_e": u_e, "u_mt": u_mt,\
+            "u_m": u_m, "q": q, "r": r, "I": I, "Ek": Ek, "Ep": Ep, "E": E,\
+            "Ub2": Ub2, "Sxx": Sxx, "Ef": Ef, "Q": Q, "R": R,\
+            "crest": zsol[9]/k, "trough": zsol[self.nofour + 9]/k,\
+            "B": zsol[self.nofour + 10:], "eta": eta, "ubig": ubig,\
+            "wbig": wbig, "ax": ax, "ay": ay, "pbig": pbig})
+        self.fileOutputWriteMain(dataDict, caseIndex)
+
+        if self.isSingleCase:
+            self.plotDict = {"d": d, "z": z, "k": k, "zsol": zsol, "ft": ft}
+    # end performCalculations
+
+    def fileOutputWriteData(self, dataDict):
+        self.fileRef.write("Input\n")
+        self.fileRef.write("Wave height\t\t\t%8.2f %s\n" %\
+            (dataDict["H"], self.labelUnitDist))
+        self.fileRef.write("Wave period\t\t\t%8.2f s\n" % dataDict["T"])
+        self.fileRef.write("Water depth\t\t\t%8.2f %s\n" %\
+            (dataDict["d"], self.labelUnitDist))
+        self.fileRef.write("Mean velocity\t\t\t%8.2f %s/sec\n" %\
+            (dataDict["u"], self.labelUnitDist))
+        if self.celdef == 1:
+            self.fileRef.write("Celerity definition\t\tEulerian\n")
+        else:
+            self.fileRef.write("Celerity definition\t\tStokes\n")
+        self.fileRef.write("Terms in Fourier series\t\t%8d\n" % self.nofour)
+        self.fileRef.write("Height ramping steps\t\t%8d\n" % self.nstep)
+        self.fileRef.write("Vertical coordinate\t\t%8.2f %s\n" %\
+            (dataDict["z"], self.labelUnitDist))
+        self.fileRef.write("Horizontal coordinate\t\t%8.2f\nas fraction of wavelength (x/L)\n" % dataDict["xL"])
+
+        if self.errorMsg != None:
+            self.fileRef.write("\n%s\n" % self.errorMsg)
+        else:
+            self.fileRef.write("\nCelerity\t\t\t\t%-6.2f %s/sec\n" %\
+                (dataDict["C"], self.labelUnitDist))
+            self.fileRef.write("Wavelength\t\t\t\t%-6.2f %s\n" %\
+                (dataDict["L"], self.labelUnitDist))
+            self.fileRef.write("Mean Eulerian fluid velocity\t\t%-6.2f %s/sec\n" %\
+                (dataDict["u_e"], self.labelUnitDist))
+            self.fileRef.write("Mean mass transport velocity\t\t%-6.2f %s/sec\n" %\
+                (dataDict["u_mt"], self.labelUnitDist))
+            self.fileRef.write("Mean velocity relative to wave\t\t%-6.2f %s/sec\n" %\
+                (dataDict["u_m"], self.labelUnitDist))
+            self.fileRef.write("Volume flux due to wave\t\t\t%-6.2f %s^2/sec\n" %\
+                (dataDict["q"], self.labelUnitDist))
+            self.fileRef.write("Bernoulli constant (mean level)\t\t%-6.2f %s^2/sec^2\n" %\
+                (dataDict["r"], self.labelUnitDist))
+            self.fileRef.write("\nIntegral Parameters\n")
+            self.fileRef.write("Impulse\t\t\t\t\t%-8.2f %s-sec/%s^2\n" %\
+                (dataDict["I"], self.labelUnitWt, self.labelUnitDist))
+            self.fileRef.write("Kinetic energy\t\t\t\t%-8.2f %s-%s/%s^2\n" %\
+                (dataDict["Ek"], self.labelUnitDist, self.labelUnitWt, self.labelUnitDist))
+            self.fileRef.write("Potential energy\t\t\t%-8.2f %s-%s/%s^2\n" %\
+                (dataDict["Ep"], self.labelUnitDist, self.labelUnitWt, self.labelUnitDist))
+            self.fileRef.write("Energy density\t\t\t\t%-8.2f %s-%s/%s^2\n" %\
+                (dataDict["E"], self.labelUnitDist, self.labelUnitWt, self.labelUnitDist))
+            self.fileRef.write("Mean square of bed velocity\t\t%-6.2f %s^2/sec^2\n" %\
+                (dataDict["Ub2"], self.labelUnitDist))
+            self.fileRef.write("Radiation stress\t\t\t%-8.2f %s-%s/%s^2\n" %\
+                (dataDict["Sxx"], self.labelUnitDist, self.labelUnitWt, self.labelUnitDist))
+            self.fileRef.write("Energy flux (wave power)\t\t%-8.2f %s-%s/sec-%s\n" %\
+                (dataDict["Ef"], self.labelUnitDist, self.labelUnitWt, self.labelUnitDist))
+            self.fileRef.write("Volume flux\t\t\t\t%-6.2f %s^2/sec\n" %\
+                (dataDict["Q"], self.labelUnitDist))
+            self.fileRef.write("Bernoulli constant (bed)\t\t%-6.2f %s^2/sec^2\n" %\
+                (dataDict["R"], self.labelUnitDist))
+            self.fileRef.write("\nCrest elevation\t\t\t\t%-6.2f %s\n" %\
+                (dataDict["crest"], self.labelUnitDist))
+            self.fileRef.write("Trough elevation\t\t\t%-6.2f %s\n" %\
+                (dataDict["trough"], self.labelUnitDist))
+            self.fileRef.write("Fourier series coefficients B(i), i = 1 to %d\n" %\
+                self.nofour)
+            for i in range(self.nofour):
+                self.fileRef.write("%-12.8f\n" % dataDict["B"][i])
+            self.fileRef.write("\nKinematics\n")
+            self.fileRef.write("Elevation\t\t\t\t%-6.2f %s\n" %\
+                (dataDict["eta"], self.labelUnitDist))
+            self.fileRef.write("Horz. velocity\t\t\t\t%-6.2f %s/sec\n" %\
+                (dataDict["ubig"], self.labelUnitDist))
+            self.fileRef.write("Vert. velocity\t\t\t\t%-6.2f %s/sec\n" %\
+                (dataDict["wbig"], self.labelUnitDist))
+            self.fileRef.write("Horz. acceleration\t\t\t%-6.2f %s/sec^2\n" %\
+                (dataDict["ax"], self.labelUnitDist))
+            self.fileRef.write("Vert. acceleration\t\t\t%-6.2f %s/sec^2\n" %\
+                (dataDict["ay"], self.labelUnitDist))
+            self.fileRef.write("Pressure\t\t\t\t%-8.2f %s/%s^2\n" %\
+                (dataDict["pbig"], self.labelUnitWt, self.labelUnitDist))
+
+        exportData = [dataDict["H"], dataDict["T"], dataDict["d"],\
+            dataDict["u"], dataDict["xL"], dataDict["z"]]
+        if self.errorMsg != None:
+            exportData.append("Error")
+        else:
+            exportData = exportData + [dataDict["C"], dataDict["L"],\
+                dataDict["u_e"], dataDict["u_mt"], dataDict["u_m"],\
+                dataDict["q"], dataDict["r"], dataDict["I"], dataDict["Ek"],\
+                dataDict["Ep"], dataDict["E"], dataDict["Ub2"],\
+                dataDict["Sxx"], dataDict["Ef"], dataDict["Q"], dataDict["R"],\
+                dataDict["eta"], dataDict["ubig"], dataDict["wbig"],\
+                dataDict["ax"], dataDict["ay"], dataDict["pbig"]]
+        self.exporter.writeData(exportData)
+    # end fileOutputWriteData
+
+    def hasPlot(self):
+        return True
+
+    def performPlot(self):
+        #Plotting waveform
+        plotxL = np.arange(-1, 1.001, 0.001)
+        plotu, plotw, plotax, plotay, plotpress, ploteta =\
+            FWTKIN(plotxL, self.plotDict["z"], self.nofour,\
+            self.plotDict["k"], self.plotDict["d"], self.plotDict["zsol"],\
+            self.plotDict["ft"], self.g, self.rho)
+
+        plt.figure(1, figsize=(8, 12), dpi=self.plotConfigDict["dpi"])
+
+        plt.subplot(3, 1, 1)
+        plt.plot(plotxL, ploteta)
+        plt.axhline(y=0.0, color="r", linestyle="--")
+        plt.ylabel("Elevation [%s]" % self.labelUnitDist)
+
+        plt.subplot(3, 1, 2)
+        plt.plot(plotxL, plotu)
+        plt.axhline(y=0.0, color="r", linestyle="--")
+        plt.ylabel("Velocity, u [%s/s]" % self.labelUnitDist)
+
+        plt.subplot(3, 1, 3)
+        plt.plot(plotxL, plotw)
+        plt.axhline(y=0.0, color="r", linestyle="--")
+        plt.ylabel("Velocity, w [%s/s]" % self.labelUnitDist)
+        plt.xlabel("x/L")
+
+        plt.show()
+
+        self.plotDict.update({"plotxL": plotxL, "ploteta": ploteta,\
+            "plotu": plotu, "plotw": plotw, "plotpress": plotpress,\
+            "plotax": plotax, "plotay": plotay})
+        self.fileOutputPlotWriteData()
+    # end performPlot
+
+    def fileOutputPlotWriteData(self):
+        self.fileRef.write("Kinematics at z for %s\n\n" %\
+            self.fileOutputData.fileDesc)
+
+        self.fileRef.write(\
+            "X/L\tETA (%s)\tU (%s/sec)\tW (%s/sec)\tPressure (%s/%s^2)\ta_x (%s/sec^2)\ta_z (%s/sec^2)\n" %\
+            (self.labelUnitDist, self.labelUnitDist, self.labelUnitDist,\
+            self.labelUnitWt, self.labelUnitDist, self.labelUnitDist,\
+            self.labelUnitDist))
+
+        for i in range(len(self.plotDict["plotxL"])):
+            self.fileRef.write("%-6.3f\t%-6.3f\t\t%-6.3f\t\t%-6.3f\t\t%-8.2f\t\t%-6.3f\t\t%-6.3f\n" %\
+                (self.plotDict["plotxL"][i],\
+                self.plotDict["ploteta"][i],\
+                self.plotDict["plotu"][i],\
+                self.plotDict["plotw"][i],\
+                self.plotDict["plotpress"][i],\
+                self.plotDict["plotax"][i],\
+                self.plotDict["plotay"][i]))
+    # fileOutputPlotWriteData
+
+
+if __name__ == "__main__":
+    driver = Fourier()
@@ -1,92 +1,13 @@
+import sys
 import math
 
-# def fwtcalc(Hnon,Hoverd,unon, nstep, nofour, d, L, deptyp, celdef )
-#     number = 9; % max iteration for each wave height step
-#     crit = 0.001; % convergence criterion.  If sum of magnitudes of corrections is < crit, the iteration stops
-#     num = 2*nofour+10; % initialize
-#     np = 61;
-#     assert(num<np,'Error: Too many terms in Fourier series');
-#     dpi = 4/atan(1);
-#     dhe = Hnon /nstep;
-#     dho = Hoverd / nstep;
-#
-#     for x in nstep
-#         Hnon = ns * dhe;
-#         Hoverd = ns * dho;
-#         if ns<=1  %calculate initial linear solution
-#           [ sol, z, cosa, sina ] = FWTSOL( dpi, Hoverd, Hnon, unon, number, num, nofour, deptyp, celdef );
-#         else % extrapolate for next wave height
-#             for i = 1:num
-#                 z(i) = 2*sol(i,2) - sol(i,1);
-#             end
-#         end
-#         for iter = 1:number
-#         % Calculate right sides of equations and differentiate numerically to obtain Jacobian matrix:
-#             [ rhs1 ] = FWTEQNS( d, L, z, Hoverd, nofour, Hnon, dpi, celdef, unon, cosa, sina );
-#             for i = 1: num
-#                 h = 0.01*z(i);
-#                 if abs(z(i))<crit
-#                     h = 10^-5;
-#                 end
-#                     z(i) = z(i) + h;
-#                     [ rhs2 ] = FWTEQNS( d, L, z, Hoverd, nofour, Hnon, dpi, celdef, unon, cosa, sina );
-#                     z(i) = z(i) - h;
-#                     b(i) = -rhs1(i);
-#                     for j = 1:num
-#                         a(j,i) = (rhs2(j) - rhs1(j)) / h;
-#                     end
-#             end
-#             % Solve matrix equation and correct variables using LINPACK routines
-# % Solve the matrix equation [a(i,j)][correction vector] = [b(i)]
-# % dgefa factors a double precision matrix by gaussian elimination.
-# %call dgefa(a, np, num, ipvt, info)
-#         [ a, ipvt, info ] = zgefa ( a, np, nofour );
-#    % *    assert(info~=0, 'ERROR:  Matrix singular')
-#         %call dgesl(a, np, num, ipvt, b, 0)
-#         % The b(i) are now the corrections to each variable
-#         b = dgesl ( a, np, nofour, ipvt, b, 0 );
-#         sum = 0;
-#         for i = 1:num
-#             sum =  sum + abs(b(i));
-#             z(i) = z(i) + b(i);
-#         end
-#         criter = crit;
-#         if ns == nstep
-#             criter = 0.01*crit;
-#         end
-#   %*      assert(sum>=criter, 'ERROR: Did not converge after iterations')
-#         end
-#         if ns == 1:
-#             for i in num:
-#                 sol(i,2) = z(i)
-#         else
-#             for i in num:
-#                 sol(i,1) = sol(i,2)
-#                 sol(i,2) = z(i)
-#             end
-#         end
-#     end
-# end
-
+sys.path.append('../functions')
+from WAVELEN import WAVELEN
 
+# Linear wavelength and wave number, from WAVELEN (n is the largest
+# number of iterations)
 def wavelen(d, T, n, g):
-    Leck = (g * (T**2) * 0.5 / math.pi) * math.sqrt(math.tanh(4 * math.pi * math.pi * d / (T * T * g)))
-
-    L1 = Leck
-
-    for i in range(0, n):
-        L2 = (g * (T**2) * 0.5 / math.pi) * math.tanh(2 * math.pi * d / L1)
-        L1 = L2
-
-    L = L2
-    k = 2 * math.pi / L
-
-    # ko = find( d < =  0)
-    # L(ko) = 0
-    if  d <=  0:
-        L = 0
-
-    return L, k
+    return WAVELEN(d, T, n, g)
 
 def boverf(x):
     p = 0.3275911
@@ -7,11 +7,7 @@ from base_driver import BaseDriver
 from helper_objects import BaseField
 import USER_INPUT
 from ERRWAVBRK1 import ERRWAVBRK1
-from GODA import GODA
-from GODA2 import GODA2
-from GODA3 import GODA3
-from GODA4 import GODA4
-from GODA5 import GODA5
+from GODA_ARRAY import GODA_ARRAY
 
 from EXPORTER import EXPORTER
 
@@ -28,11 +24,7 @@ from EXPORTER import EXPORTER
 
 # Requires the following functions:
 # ERRWAVBRK1
-# GODA
-# GODA2
-# GODA3
-# GODA4
-# GODA5
+# GODA_ARRAY
 
 # MAIN VARIABLE LIST:
 #   INPUT
@@ -168,9 +160,11 @@ class IrrWaveTrans(BaseDriver):
             self.fileOutputWriteMain(dataDict, caseIndex)
             return
 
+        # The height distributions are only needed for the single case plot
+        godaOutput = GODA_ARRAY(Ho, d, Ts, cotnsl, direc, g,\
+            cdf = self.isSingleCase)
         Ks, Kr, Hmax, Hrms, Hbar, Hs, H10, H02, SBrms, HoLo, dLo,\
-            dHo, deepd, theta, Sw, Hxo, cdfo, Hx, cdfx =\
-            GODA(Ho, d, Ts, cotnsl, direc, g)
+            dHo, deepd, theta, Sw = godaOutput[:15]
 
         print("\tSubject\tDeep\tUnits")
         print("Hs\t%-6.2f\t%-6.2f\t%s" %\
@@ -202,6 +196,7 @@ class IrrWaveTrans(BaseDriver):
         self.fileOutputWriteMain(dataDict, caseIndex)
 
         if self.isSingleCase:
+            Hxo, cdfo, Hx, cdfx = godaOutput[15:]
             self.plotDict = {"Hxo": Hxo, "cdfo": cdfo,\
                 "Hx": Hx, "cdfx": cdfx, "d": d}
     # end performCalculations
@@ -312,4 +307,5 @@ class IrrWaveTrans(BaseDriver):
                 self.plotDict["plot2Hx"][i], self.plotDict["cdfx"][i]))
     # end fileOutputPlotWriteData
 
-driver = IrrWaveTrans()
\ No newline at end of file
+if __name__ == "__main__":
+    driver = IrrWaveTrans()
@@ -174,4 +174,5 @@ class IrregularRunup(BaseDriver):
     # end fileOutputWriteData
 
 
-driver = IrregularRunup()
\ No newline at end of file
+if __name__ == "__main__":
+    driver = IrregularRunup()
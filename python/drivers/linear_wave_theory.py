@@ -81,7 +81,7 @@ class LinearWaveTheory(BaseDriver):
     def userInput(self):
         super(LinearWaveTheory, self).userInput()
 
-        self.waterType, self.rho =\
+        self.water, self.rho =\
             USER_INPUT.SALT_FRESH_WATER(self.isMetric)
     # end userInput
 
@@ -317,4 +317,5 @@ class LinearWaveTheory(BaseDriver):
     # end fileOutputWriteData
 
 
-driver = LinearWaveTheory()
+if __name__ == "__main__":
+    driver = LinearWaveTheory()
@@ -6,6 +6,7 @@ from base_driver import BaseDriver
 from helper_objects import BaseField
 import USER_INPUT
 from DRWEDG import DRWEDG
+from DRWEDG_GRID import DRWEDG_GRID
 from ERRSTP import ERRSTP
 from ERRWAVBRK import ERRWAVBRK
 from ERRWAVBRK1 import ERRWAVBRK1
@@ -26,6 +27,7 @@ from EXPORTER import EXPORTER
 
 # Requires the following functions:
 # DRWEDG
+# DRWEDG_GRID
 # ERRSTP
 # ERRWAVBRK1
 # WAVELEN
@@ -346,33 +348,18 @@ class RefdiffVertWedge(BaseDriver):
                 self.fileOutputWriteMain(dataDict, caseIndex)
                 return
 
-            phi = []
-            beta = []
-            H = []
-
-            for i in range(nypt):
-                phi.append([])
-                beta.append([])
-                H.append([])
-
-                for j in range(nxpt):
-                    xx = xcors[j]
-                    yy = ycors[i]
-
-                    valPhi, valBeta, valH, error = DRWEDG(xx, yy, Hi, alpha, wedgang, L)
+            phi, beta, H, error =\
+                DRWEDG_GRID(xcors, ycors, Hi, alpha, wedgang, L)
+            if error.any():
+                self.errorMsg = "Error: (x,y) location inside structure."
 
-                    phi[i].append(valPhi)
-                    beta[i].append(valBeta)
-                    H[i].append(valH)
+                print(self.errorMsg)
+                self.fileOutputWriteMain(dataDict, caseIndex)
+                return
 
-                    if error == 1:
-                        self.errorMsg = "Error: (x,y) location inside structure."
-                        
-                        print(self.errorMsg)
-                        self.fileOutputWriteMain(dataDict, caseIndex)
-                        return
-                # end for loop
-            # end for loop
+            phi = phi.tolist()
+            beta = beta.tolist()
+            H = H.tolist()
 
             print("Wavelength\t\t%6.2f %s" % (L, self.labelUnitDist))
 
@@ -565,4 +552,5 @@ class RefdiffVertWedge(BaseDriver):
     # end fileOutputWriteData
 
 
-driver = RefdiffVertWedge()
\ No newline at end of file
+if __name__ == "__main__":
+    driver = RefdiffVertWedge()
@@ -1,10 +1,13 @@
 import sys
 import math
+import numpy as np
 sys.path.append('../functions')
 
 from base_driver import BaseDriver
 from helper_objects import BaseField
 import USER_INPUT
+from ERRMASK import ERRMASK_BROKEN, ERRMASK_CODES, ERRMASK_STEEP
+from ERRMASK import ERRCODE_BROKEN, ERRCODE_UNSTABLE, ERRCODE_RANGE
 from ERRWAVBRK2 import ERRWAVBRK2
 from ERRSTP import ERRSTP
 from RUNUPR import RUNUPR
@@ -352,6 +355,143 @@ class RubbleMound(BaseDriver):
         self.fileOutputWriteMain(dataDict, caseIndex)
     # end performCalculations
 
+    # Vectorized run_block (see base_driver): all the cases of a block
+    # are computed at once, with the checks of performCalculations made as
+    # masks (ERRMASK) in the same order. Rock lighter than water, for
+    # which performCalculations fails, is reported as an error as in
+    # breakwater_Hudson.
+    @classmethod
+    def run_block(cls, inputs, units = "S", water = None,\
+        errorMessages = True, caseStart = 0, **settings):
+        if water == None:
+            raise ValueError("water (S or F) is needed for %s" % cls.__name__)
+
+        driver = cls.batchDriver(units, water, settings)
+
+        inputs, inputError, errorMsgList =\
+            driver.batchCheckInputArray(inputs, errorMessages)
+        Hs, Ts, cotnsl, ds, cotssl, unitwt, P, S =\
+            driver.batchCalcColumns(inputs, ["defaultValueHs",\
+            "defaultValueTs", "defaultValue_cotnsl", "defaultValue_ds",\
+            "defaultValue_cotssl", "defaultValue_unitwt", "defaultValueP",\
+            "defaultValueS"])
+
+        N = 7000
+
+        H20weight = driver.g * driver.rho
+
+        m = 1.0 / cotnsl
+
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            Hbs = ERRWAVBRK2(Ts, m, ds)
+
+            L, k = WAVELEN(ds, Ts, 50, driver.g)
+
+            stable, steep, maxstp = ERRMASK_STEEP(Hs, ds, L)
+
+            checkCode, checkIndex = ERRMASK_CODES([\
+                (~inputError, ERRCODE_RANGE),\
+                (ERRMASK_BROKEN(Hs, Hbs), ERRCODE_BROKEN),\
+                (stable, ERRCODE_UNSTABLE),\
+                (unitwt > H20weight, ERRCODE_RANGE)])
+            calcError = checkIndex > 0
+            valid = checkIndex < 0
+
+            tanssl = 1.0 / cotssl
+            Tz = Ts*(0.67/0.80)
+            ssz = tanssl/np.sqrt(2.0*math.pi*Hs/(driver.g*Tz**2))
+
+            arg1 = 1.0 / (P + 0.5)
+            ssp = (6.2*(P**0.31)*np.sqrt(tanssl))**arg1
+
+            CERC_NS = (1.45/1.27)*(cotssl**(1.0/6.0))
+
+            arg2 = (S / math.sqrt(N))**0.2
+            plunge_NS = 6.2*(P**0.18)*arg2*(ssz**-0.5)
+            surging_NS = 1.0*(P**-0.13)*arg2*np.sqrt(cotssl)*(ssz**P)
+
+            Dutch_NS = 1.20*np.where(ssz <= ssp, plunge_NS, surging_NS)
+
+            NS = np.maximum(CERC_NS, Dutch_NS)
+
+            w50 = unitwt*(Hs/(NS*((unitwt/H20weight) - 1.0)))**3
+
+            rarmor = 2.0*((w50/unitwt)**(1.0/3.0))
+            rfilter = np.maximum(rarmor/4.0, 1.0)
+
+            rt = rarmor + rfilter
+            l = rt*np.sqrt(1.0 + (cotssl**2))
+
+            short = l < (2*Hs)
+            rt = np.where(short, 2*Hs / np.sqrt(1.0 + (cotssl**2)), rt)
+            rarmor = np.where(short, rt - rfilter, rarmor)
+            rfilter = np.where(short, np.maximum(rarmor / 4.0, 1.0), rfilter)
+
+            alw0 = (1.0/8.0)*w50
+            alw15 = 0.4*w50
+            alw50 = w50
+            alw85 = 1.96*w50
+            alw100 = 4.0*w50
+
+            ald0 = (alw0/unitwt)**(1.0/3.0)
+            ald15 = (alw15/unitwt)**(1.0/3.0)
+            ald50 = (alw50/unitwt)**(1.0/3.0)
+            ald85 = (alw85/unitwt)**(1.0/3.0)
+            ald100 = (alw100/unitwt)**(1.0/3.0)
+
+            bld85 = ald15/4.0
+            bld50 = bld85/math.exp(0.01157*85.0 - 0.5785)
+            bld0 = bld50*math.exp(0.01157*0.0 - 0.5785)
+            bld15 = bld50*math.exp(0.01157*15.0 - 0.5785)
+            bld100 = bld50*math.exp(0.01157*100.0 - 0.5785)
+
+            blw0 = unitwt*(bld0**3)
+            blw15 = unitwt*(bld15**3)
+            blw50 = unitwt*(bld50**3)
+            blw85 = unitwt*(bld85**3)
+            blw100 = unitwt*(bld100**3)
+
+            Tp = Ts/0.8
+
+            Lp, k = WAVELEN(ds, Tp, 50, driver.g)
+
+            Hm01 = 0.1*Lp*np.tanh(2.0*math.pi*ds/Lp)
+            Hm02 = Hs/np.exp(0.00089*((ds/(driver.g*(Tp**2)))**(-0.834)))
+
+            Hm0 = np.minimum(Hm01, Hm02)
+
+            esp = tanssl / ((2.0*math.pi*Hm0 / (driver.g*(Tp**2)))**0.5)
+
+            runupr_max = RUNUPR(Hm0, esp, 1.022, 0.247)
+            runupr_conserv = RUNUPR(Hm0, esp, 1.286, 0.247)
+
+        if errorMessages:
+            for i in np.nonzero(calcError)[0]:
+                errorMsgList[i] = [None,\
+                    "Error: Wave broken at structure (Hbs = %6.2f %s)" %\
+                        (Hbs[i], driver.labelUnitDist),\
+                    "Error: Wave unstable (Max: %0.4f, [H/L] = %0.4f)" %\
+                        (maxstp[i], steep[i]),\
+                    "Error: Unit weight must be greater than water weight"\
+                    ][checkIndex[i]]
+
+        outputNameList = ["rarmor", "alw0", "ald0", "alw15", "ald15",\
+            "alw50", "ald50", "alw85", "ald85", "alw100", "ald100",\
+            "rfilter", "blw0", "bld0", "blw15", "bld15", "blw50", "bld50",\
+            "blw85", "bld85", "blw100", "bld100", "runupr_conserv",\
+            "runupr_max"]
+        outputList = [rarmor, alw0, ald0, alw15, ald15, alw50, ald50,\
+            alw85, ald85, alw100, ald100, rfilter, blw0, bld0, blw15, bld15,\
+            blw50, bld50, blw85, bld85, blw100, bld100, runupr_conserv,\
+            runupr_max]
+
+        return BaseDriver.batchArrayRecords(\
+            ["Hs", "Ts", "cotnsl", "ds", "cotssl", "unitwt", "P", "S"] +\
+            outputNameList, [Hs, Ts, cotnsl, ds, cotssl, unitwt, P, S] +\
+            [np.where(valid, val, np.nan) for val in outputList],\
+            inputError, calcError, errorMsgList, errorMessages)
+    # end run_block
+
     def fileOutputWriteData(self, dataDict):
         self.fileRef.write("Input\n")
         self.fileRef.write("Hs\t%6.2f %s\n" %\
@@ -423,4 +563,5 @@ class RubbleMound(BaseDriver):
     # end fileOutputWriteData
 
 
-driver = RubbleMound()
\ No newline at end of file
+if __name__ == "__main__":
+    driver = RubbleMound()
@@ -6,6 +6,8 @@ sys.path.append('../functions')
 from base_driver import BaseDriver
 from helper_objects import BaseField
 import USER_INPUT
+from ERRMASK import ERRMASK_BROKEN, ERRMASK_CODES, ERRMASK_STEEP
+from ERRMASK import ERRCODE_BROKEN, ERRCODE_UNSTABLE, ERRCODE_RANGE
 from ERRSTP import ERRSTP
 from ERRWAVBRK2 import ERRWAVBRK2
 from LWTDWS import LWTDWS
@@ -114,6 +116,27 @@ class RunupOvertopping(BaseDriver):
             ["1", "2", "3", "4", "5", "6", "7", "8"])
         self.option = int(self.option)
 
+        R_default = self.setOptionFlags()
+
+        super(RunupOvertopping, self).userInput()
+
+        if self.option != 2:
+            # a streamed case file has no length up front
+            if isinstance(self.dataOutputList, list):
+                numCases = len(self.dataOutputList)
+            else:
+                numCases = None
+
+            self.roughSlopeCoeffDict = USER_INPUT.ROUGH_SLOPE_COEFFICIENTS(\
+                self.has_rough_slope, self.has_overtopping, self.has_runup,\
+                {"numCases": numCases, "R_default": R_default})
+        else:
+            self.roughSlopeCoeffDict = {}
+    # end userInput
+
+    # Sets the slope/calculation flags from self.option and returns the
+    # default runup used when runup is not calculated
+    def setOptionFlags(self):
         self.has_rough_slope = self.option == 1 or\
             self.option == 5 or self.option == 7 or self.option == 8
         self.has_overtopping = self.option > 2
@@ -126,15 +149,25 @@ class RunupOvertopping(BaseDriver):
         else:
             R_default = 0.0
 
-        super(RunupOvertopping, self).userInput()
+        return R_default
+    # end setOptionFlags
 
-        if self.option != 2:
-            self.roughSlopeCoeffDict = USER_INPUT.ROUGH_SLOPE_COEFFICIENTS(\
-                self.has_rough_slope, self.has_overtopping, self.has_runup,\
-                {"numCases": len(self.dataOutputList), "R_default": R_default})
-        else:
-            self.roughSlopeCoeffDict = {}
-    # end userInput
+    # run_batch keywords: option (1 - 8, required) and optionally
+    # roughSlopeCoeffDict in place of the default constants
+    def batchInput(self, settings):
+        super(RunupOvertopping, self).batchInput(settings)
+
+        self.option = int(self.option)
+        R_default = self.setOptionFlags()
+
+        if "roughSlopeCoeffDict" not in settings:
+            if self.option != 2:
+                self.roughSlopeCoeffDict = USER_INPUT.ROUGH_SLOPE_DEFAULTS(\
+                    self.has_rough_slope, self.has_overtopping,\
+                    self.has_runup, {"R_default": R_default})
+            else:
+                self.roughSlopeCoeffDict = {}
+    # end batchInput
 
     def defineInputDataList(self):
         self.inputList = []
@@ -253,7 +286,7 @@ class RunupOvertopping(BaseDriver):
             self.fileOutputWriteMain(dataDict, caseIndex)
             return
 
-        alpha0, H0 = LWTDWS(0.0, c, cg, c0, H)
+        alpha0, H0, errorMsg = LWTDWS(0.0, c, cg, c0, H)
 
         relht0 = ds/H0
         steep0 = H0 / (self.g * T**2)
@@ -318,6 +351,119 @@ class RunupOvertopping(BaseDriver):
         self.fileOutputWriteMain(dataDict, caseIndex)
     # end performCalculations
 
+    # Vectorized run_block (see base_driver): all the cases of a block
+    # are computed at once, with the checks of performCalculations made as
+    # masks (ERRMASK) in the same order. Takes option and
+    # roughSlopeCoeffDict as run_batch does; per-case coefficients (aList
+    # and so on) are taken from caseStart on.
+    @classmethod
+    def run_block(cls, inputs, units = "S", water = None,\
+        errorMessages = True, caseStart = 0, **settings):
+        driver = cls.batchDriver(units, water, settings)
+
+        inputs, inputError, errorMsgList =\
+            driver.batchCheckInputArray(inputs, errorMessages)
+        H, T, cotphi, ds, cottheta, hs = driver.batchCalcColumns(inputs,\
+            ["defaultValueH", "defaultValueT", "defaultValue_cotphi",\
+            "defaultValue_ds", "defaultValue_cottheta", "defaultValue_hs"])
+        numCases = len(H)
+
+        coeffDict = {}
+        for coeffName in ["a", "b", "alpha", "Qstar0", "U", "R"]:
+            if coeffName in driver.roughSlopeCoeffDict:
+                coeffDict[coeffName] = np.full(numCases,\
+                    float(driver.roughSlopeCoeffDict[coeffName]))
+            elif (coeffName + "List") in driver.roughSlopeCoeffDict:
+                coeffList = np.asarray(\
+                    driver.roughSlopeCoeffDict[coeffName + "List"],\
+                    dtype=np.float64)
+                if len(coeffList) < caseStart + numCases:
+                    raise ValueError("%sList has %d values, %d cases needed" %\
+                        (coeffName, len(coeffList), caseStart + numCases))
+                coeffDict[coeffName] = coeffList[caseStart:caseStart + numCases]
+        a, b, alpha, Qstar0, U, R = [coeffDict.get(coeffName)\
+            for coeffName in ["a", "b", "alpha", "Qstar0", "U", "R"]]
+
+        m = 1.0/cotphi
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            Hbs = ERRWAVBRK2(T, m, ds)
+
+            c, c0, cg, cg0, k, L, L0, reldep = LWTGEN(ds, T, driver.g)
+
+            stable, steep, maxstp = ERRMASK_STEEP(H, ds, L)
+
+            # LWTDWS for waves normal to the shore
+            ksf = np.sqrt(c0 / (2 * cg))
+            H0 = H / ksf
+
+            relht0 = ds/H0
+            steep0 = H0 / (driver.g * T**2)
+
+            vertical = np.isclose(cottheta, 0)
+            theta = np.where(vertical, 0.5*math.pi, np.arctan(1.0/cottheta))
+            ssp = np.where(vertical, 1000.0, (1.0/cottheta)/np.sqrt(H/L0))
+
+        checkCode, checkIndex = ERRMASK_CODES([\
+            (~inputError, ERRCODE_RANGE),\
+            (ds < hs, ERRCODE_RANGE),\
+            (ERRMASK_BROKEN(H, Hbs), ERRCODE_BROKEN),\
+            (stable, ERRCODE_UNSTABLE),\
+            (~(vertical & (driver.option == 1)), ERRCODE_RANGE)])
+        calcError = checkIndex > 0
+        valid = checkIndex < 0
+
+        if errorMessages:
+            for i in np.nonzero(calcError)[0]:
+                errorMsgList[i] = [None,\
+                    "Error: Method does not apply to submerged structures.",\
+                    "Error: Wave broken at structure (Hbs = %6.2f %s)" %\
+                        (Hbs[i], driver.labelUnitDist),\
+                    "Error: Input wave unstable (Max: %0.4f. [H/L] = %0.4f" %\
+                        (maxstp[i], steep[i]),\
+                    "Error: Vertical wall cannot have rough slope."\
+                    ][checkIndex[i]]
+
+        freeb = hs - ds
+
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            if driver.option in [1, 5, 7]:
+                R = RUNUPR(H, ssp, a, b)
+            elif driver.option in [2, 6, 8]:
+                R = RUNUPS(H, L, ds, theta, ssp)
+
+            # overtopping of the valid cases only, QOVERT_IRR taking
+            # some thousand operations a case
+            Q = np.full(numCases, np.nan)
+            if driver.option in [3, 4, 5, 6]:
+                Q[valid] = QOVERT(*[val[valid] for val in\
+                    [H0, freeb, R, Qstar0, alpha, theta, U]], g=driver.g)
+            elif driver.option in [7, 8]:
+                Q[valid] = QOVERT_IRR(*[val[valid] for val in\
+                    [H0, freeb, R, Qstar0, alpha, theta, U]], g=driver.g)
+
+        if driver.has_runup:
+            R = np.where(valid, R, np.nan)
+        H0, relht0, steep0 = [np.where(valid, val, np.nan)\
+            for val in [H0, relht0, steep0]]
+
+        nameList = ["H", "T", "cotphi", "ds", "cottheta", "hs"]
+        columnList = [H, T, cotphi, ds, cottheta, hs]
+        for coeffName in ["a", "b", "alpha", "Qstar0", "U"]:
+            if coeffName in coeffDict:
+                nameList.append(coeffName)
+                columnList.append(coeffDict[coeffName])
+
+        nameList = nameList + ["H0", "relht0", "steep0", "R"]
+        columnList = columnList + [H0, relht0, steep0, R]
+        if driver.has_overtopping:
+            nameList.append("Q")
+            columnList.append(Q)
+
+        return BaseDriver.batchArrayRecords(nameList, columnList,\
+            inputError, calcError, errorMsgList, errorMessages)
+    # end run_block
+
     def fileOutputWriteData(self, dataDict):
         self.fileRef.write("Input\n")
         self.fileRef.write("H\t\t%6.2f %s\n" %\
@@ -398,4 +544,5 @@ class RunupOvertopping(BaseDriver):
     # end fileOutputWriteData
 
 
-driver = RunupOvertopping()
\ No newline at end of file
+if __name__ == "__main__":
+    driver = RunupOvertopping()
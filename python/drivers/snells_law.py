@@ -1,11 +1,15 @@
 import sys
 import math
+import numpy as np
 sys.path.append('../functions')
 
 from base_driver import BaseDriver
+from base_driver import BATCH_OK
+from base_driver import BATCH_CALC_ERROR
+from base_driver import BATCH_INPUT_ERROR
 from helper_objects import BaseField
-from helper_objects import ComplexUtil
 import USER_INPUT
+from ERRMASK import ERRCODE_OK, ERRCODE_RANGE
 from ERRSTP import ERRSTP
 from ERRWAVBRK1 import ERRWAVBRK1
 from ERRWAVBRK3 import ERRWAVBRK3
@@ -13,6 +17,7 @@ from LWTDWS import LWTDWS
 from LWTGEN import LWTGEN
 from LWTTWM import LWTTWM
 from LWTTWS import LWTTWS
+from LWT_TRANSECT import LWT_TRANSECT
 
 from EXPORTER import EXPORTER
 
@@ -34,6 +39,7 @@ from EXPORTER import EXPORTER
 # LWTGEN
 # LWTTWM
 # LWTTWS
+# LWT_TRANSECT
 # ERRWAVBRK3
 # WAVELEN
 
@@ -191,9 +197,9 @@ class SnellsLaw(BaseDriver):
         E1, P1, Ur1, setdown1 = LWTTWM(cg1, d1, H1, L1, reldep1, self.rho, self.g, k1)
 
         steep, maxstp = ERRSTP(H1, d1, L1)
-        if not ComplexUtil.lessThan(steep, maxstp):
+        if not (steep < maxstp):
             self.errorMsg = "Error: Known wave unstable (Max: %0.4f, [H/L] = %0.4f)" %\
-                (maxstp.real, steep.real)
+                (maxstp, steep)
             
             print(self.errorMsg)
             self.fileOutputWriteMain(dataDict, caseIndex)
@@ -210,7 +216,7 @@ class SnellsLaw(BaseDriver):
         P0 = E0*cg0
         HL = H0/L0
 
-        if not ComplexUtil.lessThan(HL, (1.0/7.0)):
+        if not (HL < (1.0/7.0)):
             self.errorMsg = "Error: Deepwater wave unstable, [H0/L0] > (1/7)"
             
             print(self.errorMsg)
@@ -223,18 +229,18 @@ class SnellsLaw(BaseDriver):
         E2, P2, Ur2, sedown2 = LWTTWM(cg2, d2, H2, L2, reldep2, self.rho, self.g, k2)
 
         Hb, db = ERRWAVBRK3(H0, L0, T, m)
-        if not ComplexUtil.lessThan(H2, Hb):
+        if not (H2 < Hb):
             self.errorMsg = "Error: Subject wave broken (Hb = %6.2f %s, hb = %6.2f %s)" %\
-                (Hb.real, self.labelUnitDist, db.real, self.labelUnitDist)
+                (Hb, self.labelUnitDist, db, self.labelUnitDist)
             
             print(self.errorMsg)
             self.fileOutputWriteMain(dataDict, caseIndex)
             return
 
         steep, maxstp = ERRSTP(H2, d2, L2)
-        if not ComplexUtil.lessThan(steep, maxstp):
+        if not (steep < maxstp):
             self.errorMsg = "Error: Subject wave unstable (Max: %0.4f, [H/L] = %0.4f)" %\
-                (maxstp.real, steep.real)
+                (maxstp, steep)
             
             print(self.errorMsg)
             self.fileOutputWriteMain(dataDict, caseIndex)
@@ -242,25 +248,25 @@ class SnellsLaw(BaseDriver):
 
         print("\t\t\tKnown\t\tDeepwater\t\tSubject\t\tUnits")
         print("Wave height\t\t%-5.2f\t\t%-5.2f\t\t\t%-5.2f\t\t%s" %\
-            (H1, H0.real, H2.real, self.labelUnitDist))
+            (H1, H0, H2, self.labelUnitDist))
         print("Wave crest angle\t%-5.2f\t\t%-5.2f\t\t\t%-5.2f\t\tdeg" %\
-            (alpha1, alpha0.real, alpha2.real))
+            (alpha1, alpha0, alpha2))
         print("Wavelength\t\t%-5.2f\t\t%-5.2f\t\t\t%-5.2f\t\t%s" %\
-            (L1.real, L0.real, L2.real, self.labelUnitDist))
+            (L1, L0, L2, self.labelUnitDist))
         print("Celerity\t\t%-5.2f\t\t%-5.2f\t\t\t%-5.2f\t\t%s/s" %\
-            (c1.real, c0.real, c2.real, self.labelUnitDist))
+            (c1, c0, c2, self.labelUnitDist))
         print("Group speed\t\t%-5.2f\t\t%-5.2f\t\t\t%-5.2f\t\t%s/s" %\
-            (cg1.real, cg0.real, cg2.real, self.labelUnitDist))
+            (cg1, cg0, cg2, self.labelUnitDist))
         print("Energy density\t\t%-8.2f\t%-8.2f\t\t%-8.2f\t%s-%s/%s^2" %\
-            (E1.real, E0.real, E2.real, self.labelUnitDist, self.labelUnitWt, self.labelUnitDist))
+            (E1, E0, E2, self.labelUnitDist, self.labelUnitWt, self.labelUnitDist))
         print("Energy flux\t\t%-8.2f\t%-8.2f\t\t%-8.2f\t%s-%s/sec-%s" %\
-            (P1.real, P0.real, P2.real, self.labelUnitDist, self.labelUnitWt, self.labelUnitDist))
-        print("Ursell number\t\t%-5.2f\t\t\t\t\t%-5.2f" % (Ur1.real, Ur2.real))
-        print("Wave steepness\t\t\t\t%-5.2f" % HL.real)
+            (P1, P0, P2, self.labelUnitDist, self.labelUnitWt, self.labelUnitDist))
+        print("Ursell number\t\t%-5.2f\t\t\t\t\t%-5.2f" % (Ur1, Ur2))
+        print("Wave steepness\t\t\t\t%-5.2f" % HL)
 
         print("\nBreaking Parameters")
-        print("Breaking height\t\t%-5.2f %s" % (Hb.real, self.labelUnitDist))
-        print("Breaking depth\t\t%-5.2f %s" % (db.real, self.labelUnitDist))
+        print("Breaking height\t\t%-5.2f %s" % (Hb, self.labelUnitDist))
+        print("Breaking depth\t\t%-5.2f %s" % (db, self.labelUnitDist))
 
         dataDict.update({"H0": H0, "H2": H2,\
             "alpha0": alpha0, "alpha2": alpha2, "L1": L1,\
@@ -271,6 +277,130 @@ class SnellsLaw(BaseDriver):
         self.fileOutputWriteMain(dataDict, caseIndex)
     # end performCalculations
 
+    # Transect run #######################################################
+    # Takes the known waves H1, T, d1, alpha1 (arrays or scalars, broadcast
+    # against each other and cotphi) across the depth profile d2 (1-d,
+    # offshore first) without prompting, printing or writing output files;
+    # all waves and nodes are computed together by LWT_TRANSECT. Each node
+    # gives the same values and error message as a single case of this
+    # driver with that node depth as d2. units and water take the same
+    # letters as the interactive prompts. Values outside the ranges of
+    # inputList (d2 of dry nodes included) are rejected as in run_batch,
+    # with checkCode ERRCODE_RANGE and errorCode BATCH_INPUT_ERROR.
+    #
+    # Returns a numpy record array with one row per wave and node (the
+    # nodes of a wave together) holding the inputs, the deepwater H0,
+    # alpha0, L0, HL and breaking Hb, db (NaN where the known wave fails
+    # its checks), the subject H2, alpha2, L2, c2, cg2, E2, P2 and Ur2 (NaN
+    # where the node is in error), "breakNode" (index of the first node
+    # where the wave is broken, -1 if none), "checkCode" (one of the
+    # ERRCODE_* codes of ERRMASK), and "errorCode" (one of the BATCH_*
+    # codes of base_driver) and "errorMsg". The messages take most of the
+    # time and memory for long profiles; with errorMessages False they are
+    # not formed and the errorMsg field is left out.
+    @classmethod
+    def run_transect(cls, H1, T, d1, alpha1, cotphi, d2,\
+        units = "S", water = "S", errorMessages = True):
+        driver = cls.__new__(cls)
+        driver.isMetric, driver.g, driver.labelUnitDist, driver.labelUnitWt =\
+            USER_INPUT.UNIT_SYSTEM(units)
+        driver.water, driver.rho =\
+            USER_INPUT.WATER_DENSITY(water, driver.isMetric)
+
+        H1, T, d1, alpha1, cotphi = [val.ravel() for val in np.broadcast_arrays(\
+            *[np.asarray(val, dtype=np.float64) for val in [H1, T, d1, alpha1, cotphi]])]
+        d2 = np.asarray(d2, dtype=np.float64).ravel()
+        numWaves = len(H1)
+        numNodes = len(d2)
+
+        # The input ranges of run_batch, checked once per wave for the
+        # known wave and once per node for d2; the first field out of range
+        # gives the message, the known wave being checked first
+        driver.defineInputDataList()
+        fieldList = driver.inputList
+        driver.inputList = fieldList[:5]
+        waveInputs, waveInputError, waveInputMsgList = driver.batchCheckInputArray(\
+            np.column_stack([H1, T, d1, alpha1, cotphi]), errorMessages)
+        driver.inputList = fieldList[5:]
+        nodeInputs, nodeInputError, nodeInputMsgList = driver.batchCheckInputArray(\
+            d2[:, np.newaxis], errorMessages)
+        driver.inputList = fieldList
+        inputError = waveInputError[:, np.newaxis] | nodeInputError
+
+        with np.errstate(divide="ignore"):
+            deepList, nodeList, checkCode, checkIndex, breakIndex = LWT_TRANSECT(\
+                H1, T, d1, alpha1, 1.0/cotphi, d2, driver.g, driver.rho)
+        H0, alpha0, L0, c0, cg0, E0, P0, HL, Hb, db = deepList
+        H2, alpha2, L2, c2, cg2, E2, P2, Ur2, kr, ks = nodeList
+
+        deepError = waveInputError |\
+            ((checkIndex[:, 0] >= 0) & (checkIndex[:, 0] <= 4))
+        checkCode[inputError] = ERRCODE_RANGE
+        checkIndex[inputError] = -1
+        broken = checkIndex == 5
+        breakIndex = np.where(broken.any(axis=1), np.argmax(broken, axis=1), -1)
+
+        # Error messages of performCalculations, the same for all the
+        # nodes of a wave except for an unstable subject wave
+        errorMsg = np.full((numWaves, numNodes), "", dtype=object)
+        L1 = LWTGEN(d1, T, driver.g)[5]
+        steep1, maxstp1 = ERRSTP(H1, d1, L1)
+        waveList = np.nonzero((checkIndex >= 0).any(axis=1))[0]
+        if not errorMessages:
+            waveList = []
+        for i in waveList:
+            waveMsgList = [\
+                "Error: Known wave broken (Hb = %6.2f %s)" %\
+                    (ERRWAVBRK1(d1[i], 0.78), driver.labelUnitDist),\
+                "Error: Known wave unstable (Max: %0.4f, [H/L] = %0.4f)" %\
+                    (maxstp1[i], steep1[i]),\
+                "Error: Violation of assumptions for Snells Law",\
+                "Error: Alpha1 data out of range",\
+                "Error: Deepwater wave unstable, [H0/L0] > (1/7)",\
+                "Error: Subject wave broken (Hb = %6.2f %s, hb = %6.2f %s)" %\
+                    (Hb[i], driver.labelUnitDist, db[i], driver.labelUnitDist)]
+            for j in range(len(waveMsgList)):
+                errorMsg[i, checkIndex[i] == j] = waveMsgList[j]
+
+        with np.errstate(invalid="ignore"):
+            steep2, maxstp2 = ERRSTP(H2, d2, L2)
+        for i, j in zip(*np.nonzero((checkIndex == 6) & errorMessages)):
+            errorMsg[i, j] = "Error: Subject wave unstable (Max: %0.4f, [H/L] = %0.4f)" %\
+                (maxstp2[i, j], steep2[i, j])
+
+        if errorMessages:
+            for i, j in zip(*np.nonzero(inputError)):
+                if waveInputError[i]:
+                    errorMsg[i, j] = waveInputMsgList[i]
+                else:
+                    errorMsg[i, j] = nodeInputMsgList[j]
+
+        H0, alpha0, L0, HL, Hb, db = [np.where(deepError, np.nan, val)\
+            for val in [H0, alpha0, L0, HL, Hb, db]]
+        H2, alpha2, L2, c2, cg2, E2, P2, Ur2 =\
+            [np.where(checkCode != ERRCODE_OK, np.nan, val)\
+            for val in [H2, alpha2, L2, c2, cg2, E2, P2, Ur2]]
+
+        errorCode = np.where(checkCode == ERRCODE_OK, BATCH_OK, BATCH_CALC_ERROR).astype(np.int8)
+        errorCode[inputError] = BATCH_INPUT_ERROR
+
+        nameList = ["H1", "T", "d1", "alpha1", "cotphi", "d2",\
+            "H0", "alpha0", "L0", "HL", "Hb", "db",\
+            "H2", "alpha2", "L2", "c2", "cg2", "E2", "P2", "Ur2",\
+            "breakNode", "checkCode", "errorCode"]
+        columnList = [np.repeat(val, numNodes) for val in\
+            [H1, T, d1, alpha1, cotphi]] + [np.tile(d2, numWaves)] +\
+            [np.repeat(val, numNodes) for val in [H0, alpha0, L0, HL, Hb, db]] +\
+            [val.ravel() for val in [H2, alpha2, L2, c2, cg2, E2, P2, Ur2]] +\
+            [np.repeat(breakIndex, numNodes), checkCode.ravel(), errorCode.ravel()]
+
+        if errorMessages:
+            nameList.append("errorMsg")
+            columnList.append(errorMsg.ravel().astype(np.str_))
+
+        return np.rec.fromarrays(columnList, names = nameList)
+    # end run_transect
+
     def fileOutputWriteData(self, dataDict):
         self.fileRef.write("Input\n")
         self.fileRef.write("H1\t%6.2f %s\n" % (dataDict["H1"], self.labelUnitDist))
@@ -285,28 +415,28 @@ class SnellsLaw(BaseDriver):
         else:
             self.fileRef.write("\t\t\tKnown\t\tDeepwater\t\tSubject\t\tUnits\n")
             self.fileRef.write("Wave height\t\t%-5.2f\t\t%-5.2f\t\t\t%-5.2f\t\t%s\n" %\
-                (dataDict["H1"], dataDict["H0"].real, dataDict["H2"].real, self.labelUnitDist))
+                (dataDict["H1"], dataDict["H0"], dataDict["H2"], self.labelUnitDist))
             self.fileRef.write("Wave crest angle\t%-5.2f\t\t%-5.2f\t\t\t%-5.2f\t\tdeg\n" %\
-                (dataDict["alpha1"], dataDict["alpha0"].real, dataDict["alpha2"].real))
+                (dataDict["alpha1"], dataDict["alpha0"], dataDict["alpha2"]))
             self.fileRef.write("Wavelength\t\t%-5.2f\t\t%-5.2f\t\t\t%-5.2f\t\t%s\n" %\
-                (dataDict["L1"].real, dataDict["L0"].real, dataDict["L2"].real, self.labelUnitDist))
+                (dataDict["L1"], dataDict["L0"], dataDict["L2"], self.labelUnitDist))
             self.fileRef.write("Celerity\t\t%-5.2f\t\t%-5.2f\t\t\t%-5.2f\t\t%s/s\n" %\
-                (dataDict["c1"].real, dataDict["c0"].real, dataDict["c2"].real, self.labelUnitDist))
+                (dataDict["c1"], dataDict["c0"], dataDict["c2"], self.labelUnitDist))
             self.fileRef.write("Group speed\t\t%-5.2f\t\t%-5.2f\t\t\t%-5.2f\t\t%s/s\n" %\
-                (dataDict["cg1"].real, dataDict["cg0"].real, dataDict["cg2"].real, self.labelUnitDist))
+                (dataDict["cg1"], dataDict["cg0"], dataDict["cg2"], self.labelUnitDist))
             self.fileRef.write("Energy density\t\t%-8.2f\t%-8.2f\t\t%-8.2f\t%s-%s/%s^2\n" %\
-                (dataDict["E1"].real, dataDict["E0"].real, dataDict["E2"].real, self.labelUnitDist, self.labelUnitWt, self.labelUnitDist))
+                (dataDict["E1"], dataDict["E0"], dataDict["E2"], self.labelUnitDist, self.labelUnitWt, self.labelUnitDist))
             self.fileRef.write("Energy flux\t\t%-8.2f\t%-8.2f\t\t%-8.2f\t%s-%s/sec-%s\n" %\
-                (dataDict["P1"].real, dataDict["P0"].real, dataDict["P2"].real, self.labelUnitDist, self.labelUnitWt, self.labelUnitDist))
+                (dataDict["P1"], dataDict["P0"], dataDict["P2"], self.labelUnitDist, self.labelUnitWt, self.labelUnitDist))
             self.fileRef.write("Ursell number\t\t%-5.2f\t\t\t\t\t%-5.2f\n" %\
-                (dataDict["Ur1"].real, dataDict["Ur2"].real))
-            self.fileRef.write("Wave steepness\t\t\t\t%-5.2f\n" % dataDict["HL"].real)
+                (dataDict["Ur1"], dataDict["Ur2"]))
+            self.fileRef.write("Wave steepness\t\t\t\t%-5.2f\n" % dataDict["HL"])
     
             self.fileRef.write("\nBreaking Parameters\n")
             self.fileRef.write("Breaking height\t\t%-5.2f %s\n" %\
-                (dataDict["Hb"].real, self.labelUnitDist))
+                (dataDict["Hb"], self.labelUnitDist))
             self.fileRef.write("Breaking depth\t\t%-5.2f %s\n" %\
-                (dataDict["db"].real, self.labelUnitDist))
+                (dataDict["db"], self.labelUnitDist))
             
         exportData = [dataDict["H1"], dataDict["T"], dataDict["d1"],\
             dataDict["alpha1"], dataDict["cotphi"], dataDict["d2"]]
@@ -326,4 +456,5 @@ class SnellsLaw(BaseDriver):
     # end fileOutputWriteData
 
 
-driver = SnellsLaw()
\ No newline at end of file
+if __name__ == "__main__":
+    driver = SnellsLaw()
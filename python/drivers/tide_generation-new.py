@@ -212,4 +212,5 @@ class TideGeneration(BaseDriver):
 
     # end performCalculations
 
-driver = TideGeneration()
+if __name__ == "__main__":
+    driver = TideGeneration()
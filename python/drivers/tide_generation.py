@@ -12,7 +12,7 @@ from GAGINI import GAGINI
 from GTERMS import GTERMS
 from NFACS import NFACS
 from ORBIT import ORBIT
-from TIDELV import TIDELV
+from TIDELV_SERIES import TIDELV_SERIES
 
 from EXPORTER import EXPORTER
 
@@ -33,7 +33,7 @@ from EXPORTER import EXPORTER
 # GTERMS
 # NFACS
 # ORBIT
-# TIDELV
+# TIDELV_SERIES
 
 # MAIN VARIABLE LIST:
 #   INPUT
@@ -315,14 +315,12 @@ class TideGeneration(BaseDriver):
 
         ntid = int(tlhrs/delthr) + 1
 
-        tidelv = []
-        xtim = []
-        for i in range(ntid):
-            xtim.append(i*delthr)
-            tidelv.append(TIDELV(\
-                nogauge, xtim[i], self.amp, alpha, fndcst, acst))
+        xtim = np.arange(ntid)*delthr
+        tidelv = TIDELV_SERIES(\
+            xtim, self.amp, alpha, fndcst, acst, nogauge)
 
-        ytide = [gauge0 + i for i in tidelv]
+        xtim = xtim.tolist()
+        ytide = (gauge0 + tidelv).tolist()
 
         self.plotDict = {"xtim": xtim, "ytide": ytide}
     # end performCalculations
@@ -368,4 +366,5 @@ class TideGeneration(BaseDriver):
     # end fileOutputPlotWriteData
 
 
-driver = TideGeneration()
\ No newline at end of file
+if __name__ == "__main__":
+    driver = TideGeneration()
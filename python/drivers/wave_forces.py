@@ -7,7 +7,6 @@ sys.path.append('../functions')
 
 from base_driver import BaseDriver
 from helper_objects import BaseField
-from helper_objects import ComplexUtil
 import USER_INPUT
 from ERRSTP import ERRSTP
 from ERRWAVBRK1 import ERRWAVBRK1
@@ -180,19 +179,19 @@ class WaveForces(BaseDriver):
         
         steep, maxstp = ERRSTP(Hi, d, L)
 #        assert(steep<maxstp,'Error: Input wave unstable (Max: %0.4f, [H/L] = %0.4f)',maxstp,steep')
-        if not ComplexUtil.lessThan(steep, maxstp):
+        if not (steep < maxstp):
             self.errorMsg = "Error: Input wave unstable (Max: %0.4f, [H/L] = %0.4f)" %\
-                (maxstp.real, steep.real)
+                (maxstp, steep)
     
         MR, S, MRintc, MRintt, Sintc, Sintt = WFVW1(d, Hi, chi, L, H20weight)
         print('\n\t\t\t\t %s \t\t %s' % ('Miche-Rundgren','Sainflou'))
         print("Wave Position at Wall\t\tCrest\t\tTrough\t\tCrest\t\tTrough\t\tUnits")
         print("Hgt above bottom \t\t %-6.2f \t %6.2f \t %-6.2f \t %6.2f \t %s" %\
-            (MR[0].real, MR[3].real, S[0].real, S[3].real, self.labelUnitDist))
+            (MR[0], MR[3], S[0], S[3], self.labelUnitDist))
         print("Integrated force \t\t %-6.2f \t %6.2f \t %-6.2f \t %6.2f \t %s/%s" %\
-            (MR[1].real, MR[4].real, S[1].real, S[4].real, self.labelUnitWt, self.labelUnitDist))
+            (MR[1], MR[4], S[1], S[4], self.labelUnitWt, self.labelUnitDist))
         print("Integrated moment \t\t %-6.2f \t %6.2f \t %-6.2f \t %6.2f \t %s-%s/%s" %\
-            (MR[2].real, MR[5].real, S[2].real, S[5].real, self.labelUnitWt, self.labelUnitDist, self.labelUnitDist))
+            (MR[2], MR[5], S[2], S[5], self.labelUnitWt, self.labelUnitDist, self.labelUnitDist))
         
         dataDict.update({"MR": MR, "S": S})
         self.fileOutputWriteMain(dataDict, caseIndex)
@@ -216,15 +215,15 @@ class WaveForces(BaseDriver):
             self.fileRef.write('\n\t\t\t\t %s \t\t %s \n' % ('Miche-Rundgren','Sainflou'))
             self.fileRef.write("Wave Position at Wall\t\tCrest\t\tTrough\t\tCrest\t\tTrough\t\tUnits\n")
             self.fileRef.write("Hgt above bottom \t\t %-6.2f \t %6.2f \t %-6.2f \t %6.2f \t %s \n" %\
-                (dataDict["MR"][0].real, dataDict["MR"][3].real,\
-                dataDict["S"][0].real, dataDict["S"][3].real, self.labelUnitDist))
+                (dataDict["MR"][0], dataDict["MR"][3],\
+                dataDict["S"][0], dataDict["S"][3], self.labelUnitDist))
             self.fileRef.write("Integrated force \t\t %-6.2f \t %6.2f \t %-6.2f \t %6.2f \t %s/%s \n" %\
-                (dataDict["MR"][1].real, dataDict["MR"][4].real,\
-                dataDict["S"][1].real, dataDict["S"][4].real,\
+                (dataDict["MR"][1], dataDict["MR"][4],\
+                dataDict["S"][1], dataDict["S"][4],\
                 self.labelUnitWt, self.labelUnitDist))
             self.fileRef.write("Integrated moment \t\t %-6.2f \t %6.2f \t %-6.2f \t %6.2f \t %s-%s/%s \n" %\
-                (dataDict["MR"][2].real, dataDict["MR"][5].real,\
-                dataDict["S"][2].real, dataDict["S"][5].real,\
+                (dataDict["MR"][2], dataDict["MR"][5],\
+                dataDict["S"][2], dataDict["S"][5],\
                 self.labelUnitWt, self.labelUnitDist, self.labelUnitDist))
         
         exportData = [dataDict["d"], dataDict["Hi"], dataDict["T"],\
@@ -270,11 +269,11 @@ class WaveForces(BaseDriver):
             self.plotDict["MRintt"][0], "r:")
         plt.axhline(y=0.0, color="r", LineStyle="--")
         ax.add_patch(patches.Rectangle(\
-            (-50.0, math.floor(min([i.real for i in self.plotDict["Sintt"][0]]))),\
-            50.0, abs(math.floor(min([i.real for i in self.plotDict["Sintt"][0]]))) + 5,\
+            (-50.0, math.floor(min(self.plotDict["Sintt"][0]))),\
+            50.0, abs(math.floor(min(self.plotDict["Sintt"][0]))) + 5,\
             lineWidth=2, fill=None))
-        plt.ylim([math.floor(min([i.real for i in self.plotDict["Sintt"][0]])),\
-            abs(math.floor(min([i.real for i in self.plotDict["Sintt"][0]]))) - 5])
+        plt.ylim([math.floor(min(self.plotDict["Sintt"][0])),\
+            abs(math.floor(min(self.plotDict["Sintt"][0]))) - 5])
         plt.legend(["Wave Pressure", "Hydrostatic Pressure",\
             "Wave and Hydrostatic Pressure"])
         plt.xlabel("Pressure [%s/%s^2]" % (self.labelUnitWt, self.labelUnitDist))
@@ -307,11 +306,11 @@ class WaveForces(BaseDriver):
             self.plotDict["Sintt"][0], "r:")
         plt.axhline(y=0.0, color="r", LineStyle="--")
         ax.add_patch(patches.Rectangle(\
-            (-50.0, math.floor(min([i.real for i in self.plotDict["Sintt"][0]]))),\
-            50.0, abs(math.floor(min([i.real for i in self.plotDict["Sintt"][0]]))) + 5,\
+            (-50.0, math.floor(min(self.plotDict["Sintt"][0]))),\
+            50.0, abs(math.floor(min(self.plotDict["Sintt"][0]))) + 5,\
             lineWidth=2, fill=None))
-        plt.ylim([math.floor(min([i.real for i in self.plotDict["Sintt"][0]])),\
-            abs(math.floor(min([i.real for i in self.plotDict["Sintt"][0]]))) - 5])
+        plt.ylim([math.floor(min(self.plotDict["Sintt"][0])),\
+            abs(math.floor(min(self.plotDict["Sintt"][0]))) - 5])
         plt.legend(["Wave Pressure", "Hydrostatic Pressure",\
             "Wave and Hydrostatic Pressue"])
         plt.xlabel("Pressure [%s/%s^2]" % (self.labelUnitWt, self.labelUnitDist))
@@ -337,10 +336,10 @@ class WaveForces(BaseDriver):
         
         for i in range(len(self.plotDict["MRintc"][0])):
             self.fileRef.write('%-6d    %-6.2f       %-6.2f           %-6.2f                  %-6.2f\n' %\
-                ((i + 1), self.plotDict["MRintc"][0][i].real,\
-                self.plotDict["MRintc"][1][i].real,\
-                self.plotDict["MRintc"][2][i].real,\
-                self.plotDict["MRintc"][3][i].real))
+                ((i + 1), self.plotDict["MRintc"][0][i],\
+                self.plotDict["MRintc"][1][i],\
+                self.plotDict["MRintc"][2][i],\
+                self.plotDict["MRintc"][3][i]))
         
         self.fileRef.write('\n\nMiche-Rundgren Pressure Distribution\n')
         self.fileRef.write('Trough at Wall \n\n')
@@ -352,10 +351,10 @@ class WaveForces(BaseDriver):
         
         for i in range(len(self.plotDict["MRintt"][0])):
             self.fileRef.write('%-6d    %-6.2f       %-6.2f           %-6.2f                  %-6.2f\n' %\
-                ((i + 1), self.plotDict["MRintt"][0][i].real,\
-                self.plotDict["MRintt"][1][i].real,\
-                self.plotDict["MRintt"][2][i].real,\
-                self.plotDict["MRintt"][3][i].real))
+                ((i + 1), self.plotDict["MRintt"][0][i],\
+                self.plotDict["MRintt"][1][i],\
+                self.plotDict["MRintt"][2][i],\
+                self.plotDict["MRintt"][3][i]))
         
         self.fileRef.write('\n\nSainflou Pressure Distribution\n')
         self.fileRef.write('Crest at Wall \n\n')
@@ -367,10 +366,10 @@ class WaveForces(BaseDriver):
         
         for i in range(len(self.plotDict["Sintc"][0])):
             self.fileRef.write('%-6d    %-6.2f       %-6.2f           %-6.2f                  %-6.2f\n' %\
-                ((i + 1), self.plotDict["Sintc"][0][i].real,\
-                self.plotDict["Sintc"][1][i].real,\
-                self.plotDict["Sintc"][2][i].real,\
-                self.plotDict["Sintc"][3][i].real))
+                ((i + 1), self.plotDict["Sintc"][0][i],\
+                self.plotDict["Sintc"][1][i],\
+                self.plotDict["Sintc"][2][i],\
+                self.plotDict["Sintc"][3][i]))
         
         self.fileRef.write('\n\nSainflou Pressure Distribution\n')
         self.fileRef.write('Trough at Wall \n\n')
@@ -382,11 +381,12 @@ class WaveForces(BaseDriver):
         
         for i in range(len(self.plotDict["Sintt"][0])):
             self.fileRef.write('%-6d    %-6.2f       %-6.2f           %-6.2f                  %-6.2f\n' %\
-                ((i + 1), self.plotDict["Sintt"][0][i].real,\
-                self.plotDict["Sintt"][1][i].real,\
-                self.plotDict["Sintt"][2][i].real,\
-                self.plotDict["Sintt"][3][i].real))
+                ((i + 1), self.plotDict["Sintt"][0][i],\
+                self.plotDict["Sintt"][1][i],\
+                self.plotDict["Sintt"][2][i],\
+                self.plotDict["Sintt"][3][i]))
     # end fileOutputPlotWriteData
 
 
-driver = WaveForces()
\ No newline at end of file
+if __name__ == "__main__":
+    driver = WaveForces()
@@ -390,4 +390,5 @@ class WavetransImperm(BaseDriver):
     # end fileOutputWriteData
 
 
-driver = WavetransImperm()
\ No newline at end of file
+if __name__ == "__main__":
+    driver = WavetransImperm()
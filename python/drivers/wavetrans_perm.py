@@ -4,13 +4,20 @@ import numpy as np
 sys.path.append('../functions')
 
 from base_driver import BaseDriver
+from base_driver import BATCH_OK
+from base_driver import BATCH_CALC_ERROR
+from base_driver import BATCH_INPUT_ERROR
 from helper_objects import BaseField
-from helper_objects import ComplexUtil
 import USER_INPUT
+from ERRMASK import ERRMASK_BROKEN, ERRMASK_CODES, ERRMASK_STEEP
+from ERRMASK import ERRCODE_OK, ERRCODE_BROKEN, ERRCODE_UNSTABLE, ERRCODE_RANGE
+from ERRMASK import ERRMASK_TABLE
 from ERRSTP import ERRSTP
 from ERRWAVBRK1 import ERRWAVBRK1
 from ERRWAVBRK2 import ERRWAVBRK2
 from MADSEELG import MADSEELG
+from MADSEELG_ARRAY import MADSEELG_ARRAY
+from MADSEELG_ARRAY import caseAxis
 from WAVELEN import WAVELEN
 
 from EXPORTER import EXPORTER
@@ -27,11 +34,13 @@ from EXPORTER import EXPORTER
 # Date Modified: July 31, 2017
 
 # Requires the following functions:
+# ERRMASK
 # ERRSTP
 # ERRWAVBRK1
 # EQBWLE
 # EQBWTRCO
 # MADSEELG
+# MADSEELG_ARRAY
 # MADSN1
 # MADSN2
 # WAVELEN
@@ -103,9 +112,7 @@ class WavetransPerm(BaseDriver):
         if hasattr(self, "defaultValue_ds"):
             self.ds = self.defaultValue_ds
         else:
-            self.ds = USER_INPUT.DATA_VALUE(\
-                "ds: water depth at structure toe (%s)" %\
-                self.labelUnitDist, 0.1, 200.0)
+            self.ds = self.promptField("ds")
 
         # define NM and NL if any relevant defaults are used
         if hasattr(self, "defaultValue_d50"):
@@ -133,33 +140,26 @@ class WavetransPerm(BaseDriver):
         if not hasattr(self, "d50"):
             self.d50 = []
             for i in range(self.NM):
-                self.d50.append(USER_INPUT.DATA_VALUE(\
-                    "d50: mean diameter of material #%d (%s)" %\
-                    ((i + 1), self.labelUnitDist), 0.05, 99.0))
+                self.d50.append(self.promptField("d50", i))
 
         if not hasattr(self, "defaultValue_por"):
             self.por = []
             for i in range(self.NM):
-                self.por.append(USER_INPUT.DATA_VALUE(\
-                    "p: porosity of material #%d (%%)" % (i + 1), 0.0, 100.0))
+                self.por.append(self.promptField("por", i))
             self.por = [i / 100.0 for i in self.por]
 
         if not hasattr(self, "defaultValue_hs"):
-            self.hs = USER_INPUT.DATA_VALUE(\
-                "hs: structure height above toe (%s)" %\
-                self.labelUnitDist, 0.1, 200.0)
+            self.hs = self.promptField("hs")
         else:
             self.hs = self.defaultValue_hs
 
         if not hasattr(self, "defaultValue_cottheta"):
-            self.cottheta = USER_INPUT.DATA_VALUE(\
-                "cottheta: cotangent of structure slope", 1.0, 5.0)
+            self.cottheta = self.promptField("cottheta")
         else:
             self.cottheta = self.defaultValue_cottheta
 
         if not hasattr(self, "defaultValue_b"):
-            self.b = USER_INPUT.DATA_VALUE(\
-                "b: structure crest width (%s)" % self.labelUnitDist, 0.1, 200.0)
+            self.b = self.promptField("b")
         else:
             self.b = self.defaultValue_b
 
@@ -171,9 +171,7 @@ class WavetransPerm(BaseDriver):
         if not hasattr(self, "th"):
             self.th = []
             for i in range(self.NL):
-                self.th.append(USER_INPUT.DATA_VALUE(\
-                    "th: thickness of horizontal layer #%d (%s)" %\
-                    ((i + 1), self.labelUnitDist), 0.1, 200.0))
+                self.th.append(self.promptField("th", 0, i))
 
         if not hasattr(self, "hlen"):
             self.hlen = []
@@ -181,14 +179,47 @@ class WavetransPerm(BaseDriver):
                 self.hlen.append([])
 
                 for j in range(self.NL):
-                    self.hlen[i].append(USER_INPUT.DATA_VALUE(\
-                        "hlen: horizontal length of material #%d in layer #%d (%s)" %\
-                        ((i + 1), (j + 1), self.labelUnitDist), 0.0, 200.0))
+                    self.hlen[i].append(self.promptField("hlen", i, j))
 
 
         self.water, self.rho = USER_INPUT.SALT_FRESH_WATER(self.isMetric)
     # end userInput
 
+    # Field of a structure input, for material i and layer j (from 0),
+    # prompted by userInput and range checked by run_sweep; the porosity
+    # is in percent as it is prompted
+    def structureField(self, name, i = 0, j = 0):
+        if name == "ds":
+            return BaseField("ds: water depth at structure toe (%s)" %\
+                self.labelUnitDist, 0.1, 200.0)
+        elif name == "d50":
+            return BaseField("d50: mean diameter of material #%d (%s)" %\
+                ((i + 1), self.labelUnitDist), 0.05, 99.0)
+        elif name == "por":
+            return BaseField("p: porosity of material #%d (%%)" % (i + 1),\
+                0.0, 100.0)
+        elif name == "hs":
+            return BaseField("hs: structure height above toe (%s)" %\
+                self.labelUnitDist, 0.1, 200.0)
+        elif name == "cottheta":
+            return BaseField("cottheta: cotangent of structure slope", 1.0, 5.0)
+        elif name == "b":
+            return BaseField("b: structure crest width (%s)" %\
+                self.labelUnitDist, 0.1, 200.0)
+        elif name == "th":
+            return BaseField("th: thickness of horizontal layer #%d (%s)" %\
+                ((j + 1), self.labelUnitDist), 0.1, 200.0)
+        else:
+            return BaseField(\
+                "hlen: horizontal length of material #%d in layer #%d (%s)" %\
+                ((i + 1), (j + 1), self.labelUnitDist), 0.0, 200.0)
+    # end structureField
+
+    def promptField(self, name, i = 0, j = 0):
+        field = self.structureField(name, i, j)
+        return USER_INPUT.DATA_VALUE(field.desc, field.min, field.max)
+    # end promptField
+
     def defineInputDataList(self):
         self.inputList = []
 
@@ -228,6 +259,33 @@ class WavetransPerm(BaseDriver):
             "hs": hs, "cottheta": cottheta, "b": b, "th": th,\
             "hlen": hlen}
         
+        nu = self.kinematicViscosity()
+
+        self.errorMsg = self.checkCase(H, T, ds, hs, cottheta, th)
+        if self.errorMsg != None:
+            print(self.errorMsg)
+            self.fileOutputWriteMain(dataDict, caseIndex)
+            return
+
+        KTt, Kto, KT, Kr, Ht, L, self.errorMsg = MADSEELG(\
+            H, T, ds, hs, b, self.NL, th, hlen, self.NM, d50, por, cottheta, nu, self.g)
+        if self.errorMsg != None:
+            print(self.errorMsg)
+            self.fileOutputWriteMain(dataDict, caseIndex)
+            return
+
+        print("Reflection coefficient, Kr\t\t%-6.3f" % Kr)
+        print("Wave transmission coefficient")
+        print("Wave Transmission (Through), KTt\t%-6.3f" % KTt)
+        print("Wave Transmission (Overtopping), KTo\t%-6.3f" % Kto)
+        print("Wave Transmission (Total), KT\t\t%-6.3f" % KT)
+        print("Transmitted wave height, Ht\t\t%-6.2f %s" % (Ht, self.labelUnitDist))
+
+        dataDict.update({"Kr": Kr, "KTt": KTt, "Kto": Kto, "KT": KT, "Ht": Ht})
+        self.fileOutputWriteMain(dataDict)
+    # end performCalculations
+
+    def kinematicViscosity(self):
         if not self.isMetric:
             if self.water == "S" or self.water == "s":
                 nu = 14.643223710**(-6) #salt water
@@ -239,64 +297,182 @@ class WavetransPerm(BaseDriver):
             else:
                 nu = 1.307*10**(-6) # m^2/s fresh
 
+        return nu
+    # end kinematicViscosity
+
+    # Returns None when the method applies to the case, otherwise the
+    # error message
+    def checkCase(self, H, T, ds, hs, cottheta, th):
         Hb = ERRWAVBRK1(ds, 0.78)
         if not (H < Hb):
-            self.errorMsg = "Error: Input wave broken (Hb = %6.2f %s)" % (Hb, self.labelUnitDist)
-            
-            print(self.errorMsg)
-            self.fileOutputWriteMain(dataDict, caseIndex)
-            return
+            return "Error: Input wave broken (Hb = %6.2f %s)" % (Hb, self.labelUnitDist)
 
         Hbs = ERRWAVBRK2(T, 1.0/cottheta, ds)
         if not (H < Hbs):
-            self.errorMsg = "Error: Input wave breaking at toe of the structure (Hbs = %6.2f %s)" % (Hbs, self.labelUnitDist)
-            
-            print(self.errorMsg)
-            self.fileOutputWriteMain(dataDict, caseIndex)
-            return
+            return "Error: Input wave breaking at toe of the structure (Hbs = %6.2f %s)" % (Hbs, self.labelUnitDist)
 
         L, k = WAVELEN(ds, T, 50, self.g)
 
         steep, maxstp = ERRSTP(H, ds, L)
-        if not ComplexUtil.lessThan(steep, maxstp):
-            self.errorMsg = "Error: Input wave unstable (Max: %0.4f, [H/L] = %0.4f)" %\
-                (ComplexUtil.getDisplayVal(maxstp), ComplexUtil.getDisplayVal(steep))
-                
-            print(self.errorMsg)
-            self.fileOutputWriteMain(dataDict, caseIndex)
-            return
+        if not (steep < maxstp):
+            return "Error: Input wave unstable (Max: %0.4f, [H/L] = %0.4f)" %\
+                (maxstp, steep)
 
         if not (ds < hs):
-            self.errorMsg = "Error: Method does not apply to submerged structures."
-            
-            print(self.errorMsg)
-            self.fileOutputWriteMain(dataDict, caseIndex)
-            return
+            return "Error: Method does not apply to submerged structures."
 
         if not (np.isclose(sum(th), ds)):
-            self.errorMsg = "Error: Water depth must equal sum of all layer thicknesses."
-            
-            print(self.errorMsg)
-            self.fileOutputWriteMain(dataDict, caseIndex)
-            return
-
-        KTt, Kto, KT, Kr, Ht, L, self.errorMsg = MADSEELG(\
-            H, T, ds, hs, b, self.NL, th, hlen, self.NM, d50, por, cottheta, nu, self.g)
-        if self.errorMsg != None:
-            print(self.errorMsg)
-            self.fileOutputWriteMain(dataDict, caseIndex)
-            return
-
-        print("Reflection coefficient, Kr\t\t%-6.3f" % Kr)
-        print("Wave transmission coefficient")
-        print("Wave Transmission (Through), KTt\t%-6.3f" % KTt)
-        print("Wave Transmission (Overtopping), KTo\t%-6.3f" % Kto)
-        print("Wave Transmission (Total), KT\t\t%-6.3f" % KT)
-        print("Transmitted wave height, Ht\t\t%-6.2f %s" % (Ht, self.labelUnitDist))
-
-        dataDict.update({"Kr": Kr, "KTt": KTt, "Kto": Kto, "KT": KT, "Ht": Ht})
-        self.fileOutputWriteMain(dataDict)
-    # end performCalculations
+            return "Error: Water depth must equal sum of all layer thicknesses."
+
+        return None
+    # end checkCase
+
+    # Sweep run ##########################################################
+    # Runs a set of breakwater cases without prompting, printing or
+    # writing output files, with the transmission of all the cases that
+    # pass the input checks computed together by MADSEELG_ARRAY. The cases
+    # are the trailing dimensions of the inputs, broadcast against each
+    # other: H, T, ds, hs, cottheta and b are arrays of the case shape (or
+    # scalars), d50 and por (porosity as a fraction) have shape
+    # (NM, ...), th (NL, ...) and hlen (NM, NL, ...). For example a sweep
+    # of the core stone size d50[1] over n values takes d50 of shape
+    # (2, n) and scalars elsewhere. units and water take the same letters
+    # as the interactive prompts. Values outside the ranges of the prompts
+    # (of inputList for H and T, as in run_batch) are rejected with the
+    # DATA_VALUE message and BATCH_INPUT_ERROR.
+    #
+    # Returns a numpy record array with one row per case (in C order of
+    # the case shape) holding the inputs (d50_i, por_i, th_j and hlen_i_j
+    # for each material i and layer j), Kr, KTt, Kto, KT and Ht (NaN for
+    # cases in error), the number of passes of the friction angle and head
+    # difference iterations (phiCount, dheCount), "checkCode" (one of the
+    # ERRCODE_* codes of ERRMASK, from the input checks, which are made for
+    # all the cases at once), and "errorCode" (one of the BATCH_* codes of
+    # base_driver) and "errorMsg". With printRejects the counts of rejected
+    # cases by checkCode, and the H, T, ds and hs of each of them, are
+    # printed as an ERRMASK_TABLE.
+    @classmethod
+    def run_sweep(cls, H, T, ds, d50, por, hs, cottheta, b, th, hlen,\
+        units = "S", water = "F", printRejects = False):
+        driver = cls.__new__(cls)
+        driver.isMetric, driver.g, driver.labelUnitDist, driver.labelUnitWt =\
+            USER_INPUT.UNIT_SYSTEM(units)
+        driver.water, driver.rho =\
+            USER_INPUT.WATER_DENSITY(water, driver.isMetric)
+
+        nu = driver.kinematicViscosity()
+
+        d50, por, th, hlen = [np.asarray(val, dtype=np.float64)\
+            for val in [d50, por, th, hlen]]
+        NM, NL = hlen.shape[:2]
+
+        shape = np.broadcast_shapes(np.shape(H), np.shape(T), np.shape(ds),\
+            np.shape(hs), np.shape(cottheta), np.shape(b), d50.shape[1:],\
+            por.shape[1:], th.shape[1:], hlen.shape[2:])
+
+        H, T, ds, hs, cottheta, b = [np.broadcast_to(val, shape).astype(np.float64).ravel()\
+            for val in [H, T, ds, hs, cottheta, b]]
+        d50 = caseAxis(d50[:NM], 1, shape)
+        por = caseAxis(por[:NM], 1, shape)
+        th = caseAxis(th[:NL], 1, shape)
+        hlen = caseAxis(hlen, 2, shape)
+        numCases = len(H)
+
+        # The input ranges of the prompts (and of run_batch for H and T),
+        # the porosity being checked in percent as it is prompted
+        driver.defineInputDataList()
+        fieldList = list(driver.inputList) + [driver.structureField("ds")]
+        columnList = [H, T, ds]
+        for i in range(NM):
+            fieldList.append(driver.structureField("d50", i))
+            columnList.append(d50[i])
+        for i in range(NM):
+            fieldList.append(driver.structureField("por", i))
+            columnList.append(100.0*por[i])
+        for name, column in [("hs", hs), ("cottheta", cottheta), ("b", b)]:
+            fieldList.append(driver.structureField(name))
+            columnList.append(column)
+        for j in range(NL):
+            fieldList.append(driver.structureField("th", 0, j))
+            columnList.append(th[j])
+        for i in range(NM):
+            for j in range(NL):
+                fieldList.append(driver.structureField("hlen", i, j))
+                columnList.append(hlen[i, j])
+
+        driver.inputList = fieldList
+        inputs, inputError, errorMsgList =\
+            driver.batchCheckInputArray(np.column_stack(columnList))
+
+        # The checks of checkCase for all the cases at once
+        Hb = ERRWAVBRK1(ds, 0.78)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            Hbs = ERRWAVBRK2(T, 1.0/cottheta, ds)
+        L, k = WAVELEN(ds, T, 50, driver.g)
+        stable, steep, maxstp = ERRMASK_STEEP(H, ds, L)
+
+        checkCode, checkIndex = ERRMASK_CODES([\
+            (~inputError, ERRCODE_RANGE),\
+            (ERRMASK_BROKEN(H, Hb), ERRCODE_BROKEN),\
+            (ERRMASK_BROKEN(H, Hbs), ERRCODE_BROKEN),\
+            (stable, ERRCODE_UNSTABLE),\
+            (ds < hs, ERRCODE_RANGE),\
+            (np.isclose(th.sum(axis=0), ds), ERRCODE_RANGE)])
+        valid = checkCode == ERRCODE_OK
+
+        for i in np.nonzero(~valid & ~inputError)[0]:
+            errorMsgList[i] = [None,\
+                "Error: Input wave broken (Hb = %6.2f %s)" %\
+                    (Hb[i], driver.labelUnitDist),\
+                "Error: Input wave breaking at toe of the structure (Hbs = %6.2f %s)" %\
+                    (Hbs[i], driver.labelUnitDist),\
+                "Error: Input wave unstable (Max: %0.4f, [H/L] = %0.4f)" %\
+                    (maxstp[i], steep[i]),\
+                "Error: Method does not apply to submerged structures.",\
+                "Error: Water depth must equal sum of all layer thicknesses."\
+                ][checkIndex[i]]
+
+        KTt, Kto, KT, Kr, Ht = [np.full(numCases, np.nan) for i in range(5)]
+        phiCount = np.zeros(numCases, dtype=int)
+        dheCount = np.zeros(numCases, dtype=int)
+        tmin = np.full(numCases, np.nan)
+
+        KTt[valid], Kto[valid], KT[valid], Kr[valid], Ht[valid], L,\
+            tmin[valid], phiCount[valid], dheCount[valid] = MADSEELG_ARRAY(\
+            H[valid], T[valid], ds[valid], hs[valid], b[valid], NL,\
+            th[:, valid], hlen[:, :, valid], NM, d50[:, valid],\
+            por[:, valid], cottheta[valid], nu, driver.g)
+
+        for i in np.nonzero(valid & ~(T > tmin))[0]:
+            checkCode[i] = ERRCODE_RANGE
+            errorMsgList[i] =\
+                "Error: Minimum wave period to be analyzed is %4.2f s." % tmin[i]
+
+        errorCode = np.array([BATCH_OK if errorMsg == None else BATCH_CALC_ERROR\
+            for errorMsg in errorMsgList], dtype=np.int8)
+        errorCode[inputError] = BATCH_INPUT_ERROR
+        errorMsgList = ["" if errorMsg == None else errorMsg\
+            for errorMsg in errorMsgList]
+
+        if printRejects:
+            print(ERRMASK_TABLE(checkCode,\
+                {"H": H, "T": T, "ds": ds, "hs": hs}))
+
+        nameList = ["H", "T", "ds"] +\
+            ["d50_%d" % (i + 1) for i in range(NM)] +\
+            ["por_%d" % (i + 1) for i in range(NM)] +\
+            ["hs", "cottheta", "b"] +\
+            ["th_%d" % (j + 1) for j in range(NL)] +\
+            ["hlen_%d_%d" % (i + 1, j + 1) for i in range(NM) for j in range(NL)] +\
+            ["Kr", "KTt", "Kto", "KT", "Ht", "phiCount", "dheCount",\
+            "checkCode", "errorCode", "errorMsg"]
+        columnList = [H, T, ds] + list(d50) + list(por) + [hs, cottheta, b] +\
+            list(th) + [hlen[i, j] for i in range(NM) for j in range(NL)] +\
+            [Kr, KTt, Kto, KT, Ht, phiCount, dheCount, checkCode, errorCode,\
+            np.array(errorMsgList, dtype=np.str_)]
+
+        return np.rec.fromarrays(columnList, names = nameList)
+    # end run_sweep
 
     def fileOutputWriteData(self, dataDict):
         self.fileRef.write("Input\n")
@@ -352,4 +528,5 @@ class WavetransPerm(BaseDriver):
     # end fileOutputWriteData
 
 
-driver = WavetransPerm()
\ No newline at end of file
+if __name__ == "__main__":
+    driver = WavetransPerm()
@@ -7,8 +7,10 @@ from base_driver import BaseDriver
 from helper_objects import BaseField
 import USER_INPUT
 from WADJ import WADJ
-from WGFET import WGFET
+from WADJ_SERIES import WADJ_SERIES
+from WGFET import WGFET, WGFET_ROSE
 from WGRO import WGRO
+from WGRO_SERIES import WGRO_SERIES, wgroMessages
 
 from EXPORTER import EXPORTER
 
@@ -25,6 +27,7 @@ from EXPORTER import EXPORTER
 # Requires the following functions:
 # ERRWAVBRK1
 # WADJ
+# WADJ_SERIES
 # WAGEOS
 # WAPBL
 # WAPSI
@@ -35,6 +38,7 @@ from EXPORTER import EXPORTER
 # WGFET
 # WGFL
 # WGRO
+# WGRO_SERIES
 
 # MAIN VARIABLE LIST:
 #   INPUT
@@ -47,6 +51,8 @@ from EXPORTER import EXPORTER
 #   windobs: wind observation type
 #   fetchopt: wind fetch options
 #   wgtyp: open water wave growth equation options
+#   windRecord: wind record file (time series mode), one observation per
+#       line as uobs, wdir, dtemp separated by commas
 
 #   OPEN-WATER VARIABLES
 #   F: length of wind fetch [m]
@@ -66,6 +72,11 @@ from EXPORTER import EXPORTER
 #   wg: type of wave-growth
 #   theta: wave direction with respect to N [deg]
 
+#   WIND RECORD OUTPUT (output/wind_adj_record.csv, one line per observation)
+#   uobs, wdir, dtemp, F, ue, ua, theta, Hmo, Tp as above
+#   wgcode: type of wave-growth (index of wgroMessages in WGRO_SERIES, -1
+#       for an observation out of range or not converged)
+
 #   OTHERS
 #-------------------------------------------------------------
 
@@ -73,9 +84,17 @@ class WindAdj(BaseDriver):
     def __init__(self, windobs = None, wgtyp = None, useKnots = None,\
         zobs = None, Uobs = None, dtemp = None, duro = None, durf = None,\
         lat = None, F = None, d = None, wdir = None, dang = None,\
-        ang1 = None, manualOrFile = None, Nfet = None, angs = None):
+        ang1 = None, manualOrFile = None, Nfet = None, angs = None,\
+        windRecord = None):
         self.exporter = EXPORTER("output/exportWindAdj")
 
+        # A wind record is run as a single case whose uobs, dtemp and
+        # wdir are read from the record file
+        if windRecord != None:
+            self.isSingleCase = True
+            self.isWindRecord = True
+            self.defaultValue_windRecord = windRecord
+
         if windobs != None:
             self.isSingleCase = True
             self.defaultValue_windobs = windobs
@@ -173,6 +192,13 @@ class WindAdj(BaseDriver):
         self.isWaterOpen = self.wgtyp == 1 or self.wgtyp == 2
         self.isWaterShallow = self.wgtyp == 2 or self.wgtyp == 4
 
+        if not hasattr(self, "isSingleCase"):
+            caseMode = USER_INPUT.FINITE_CHOICE(\
+                "Single case, multi-case or wind record (time series)? " +\
+                "(s, m or t): ", ["S", "s", "M", "m", "T", "t"])
+            self.isSingleCase = caseMode in ["S", "s", "T", "t"]
+            self.isWindRecord = caseMode in ["T", "t"]
+
         super(WindAdj, self).userInput()
 
         if not self.isWaterOpen:
@@ -228,6 +254,14 @@ class WindAdj(BaseDriver):
                         else:
                             print("File must have between 2 and 360 fetch lengths.")
                     # end while
+
+        if self.isWindRecord:
+            if not hasattr(self, "defaultValue_windRecord"):
+                print("Wind record file: one observation per line as " +\
+                    "uobs [%s], wdir [deg], dtemp [deg C]" % self.labelSpeedFinal)
+                self.windRecord = USER_INPUT.FILE_NAME()
+            else:
+                self.windRecord = self.defaultValue_windRecord
     # end userInput
 
     def defineInputDataList(self):
@@ -252,17 +286,20 @@ class WindAdj(BaseDriver):
             self.labelSpeedFinal = self.labelSpeed
             self.useKnots = False
 
+        if not hasattr(self, "isWindRecord"):
+            self.isWindRecord = False
+
         self.inputList = []
 
         if not hasattr(self, "defaultValue_zobs"):
             self.inputList.append(BaseField(\
                 "zobs: elevation of observed winds [%s]" % (self.labelUnitDist),\
                 1.0, 5000.0))
-        if not hasattr(self, "defaultValueUobs"):
+        if not self.isWindRecord and not hasattr(self, "defaultValueUobs"):
             self.inputList.append(BaseField(\
                 "uobs: observed wind speed [%s]" % self.labelSpeedFinal,\
                 0.1, 200.0))
-        if not hasattr(self, "defaultValue_dtemp"):
+        if not self.isWindRecord and not hasattr(self, "defaultValue_dtemp"):
             self.inputList.append(BaseField(\
                 "dtemp: air-sea temperature difference [deg C]",\
                 -100.0, 100.0))
@@ -286,7 +323,8 @@ class WindAdj(BaseDriver):
                 "d: average depth of fetch [%s]" % self.labelUnitDist,
                 0.1, 10000.0))
 
-        if not self.isWaterOpen and not hasattr(self, "defaultValue_wdir"):
+        if not self.isWaterOpen and not self.isWindRecord and\
+            not hasattr(self, "defaultValue_wdir"):
             self.inputList.append(BaseField(\
                 "wdir: wind direction [deg]", 0.0, 360.0))
     # end defineInputDataList
@@ -303,13 +341,17 @@ class WindAdj(BaseDriver):
             zobs = caseInputList[currIndex]
             currIndex = currIndex + 1
 
-        if hasattr(self, "defaultValueUobs"):
+        if self.isWindRecord:
+            Uobs = None
+        elif hasattr(self, "defaultValueUobs"):
             Uobs = self.defaultValueUobs
         else:
             Uobs = caseInputList[currIndex]
             currIndex = currIndex + 1
 
-        if hasattr(self, "defaultValue_dtemp"):
+        if self.isWindRecord:
+            dtemp = None
+        elif hasattr(self, "defaultValue_dtemp"):
             dtemp = self.defaultValue_dtemp
         else:
             dtemp = caseInputList[currIndex]
@@ -351,7 +393,7 @@ class WindAdj(BaseDriver):
         else:
             d = 0.0
 
-        if not self.isWaterOpen:
+        if not self.isWaterOpen and not self.isWindRecord:
             if hasattr(self, "defaultValue_wdir"):
                 wdir = self.defaultValue_wdir
             else:
@@ -407,6 +449,12 @@ class WindAdj(BaseDriver):
         else:
             conversionSpeed = 1.0
 
+        if self.isWindRecord:
+            dataDict["conversionDist"] = conversionDist
+            dataDict["conversionSpeed"] = conversionSpeed
+            self.performRecordCalculations(dataDict, caseIndex)
+            return
+
         if self.isWaterOpen:
             phi = 0.0
         else:
@@ -484,7 +532,132 @@ class WindAdj(BaseDriver):
         self.fileOutputWriteMain(dataDict, caseIndex)
     # end performCalculations
 
+    # Wind record (time series) mode. The record file is read in blocks;
+    # each block is adjusted and grown with the array forms of WADJ and
+    # WGRO and appended to output/wind_adj_record.csv, so records of any
+    # length are run in bounded memory.
+    def performRecordCalculations(self, dataDict, caseIndex = 0):
+        hr2s = 3600.0
+        deg2rad = math.pi/180.0
+        mi2m = 1609.344
+        km2m = 0.001
+
+        if not self.isMetric:
+            conversionDistLrg = mi2m
+        else:
+            conversionDistLrg = km2m
+        conversionDist = dataDict["conversionDist"]
+        conversionSpeed = dataDict["conversionSpeed"]
+
+        if np.isclose(dataDict["lat"], 0.0):
+            self.errorMsg = "Error: Latitude must be a non-zero value."
+
+            print(self.errorMsg)
+            self.fileOutputWriteMain(dataDict, caseIndex)
+            return
+
+        # Representative fetch for every whole-degree wind direction
+        if not self.isWaterOpen:
+            fetchRose = WGFET_ROSE(self.ang1, self.dang, self.angs)
+
+        recordHeader = "uobs,wdir,dtemp,F,ue,ua,theta,Hmo,Tp,wgcode\n" +\
+            "wgcode: " + ", ".join(["%d = %s" % (i, wgroMessages[i])\
+            for i in range(len(wgroMessages))]) + ", -1 = invalid"
+        recordFormat = ["%.6g"]*9 + ["%d"]
+
+        numRecord = 0
+        numInvalid = 0
+        numBroken = 0
+        HmoMax = np.nan
+        TpMax = np.nan
+        indexMax = -1
+
+        recordRef = open(self.getFilePath() + "wind_adj_record.csv", "w")
+        for chunk in USER_INPUT.MULTI_FILE_CHUNKS(self.windRecord):
+            uobs = chunk[:, 0]
+            wdir = chunk[:, 1]
+            dtemp = chunk[:, 2]
+            n = len(uobs)
+
+            valid = (uobs >= 0.1) & (uobs <= 200.0) &\
+                (dtemp >= -100.0) & (dtemp <= 100.0) &\
+                (wdir >= 0.0) & (wdir <= 360.0)
+
+            if self.isWaterOpen:
+                F = np.full(n, dataDict["F"])
+                phi = np.zeros(n)
+                theta = np.full(n, np.nan)
+            else:
+                # Check WDIR vs Fetch data, as for a single case
+                valid = valid & (self.ang1 - 45 <= wdir) &\
+                    (wdir <= (self.ang1 + (self.Nfet - 1)*self.dang))
+
+                iwdir = np.where(valid, np.round(wdir), 0).astype(int)
+                F, phi, theta = [np.where(valid, rose[iwdir], np.nan)\
+                    for rose in fetchRose]
+                valid = valid & np.isfinite(F)
+
+            ue = np.full(n, np.nan)
+            ue[valid] = WADJ_SERIES(uobs[valid]*conversionSpeed,\
+                dataDict["zobs"]*conversionDist,\
+                dtemp[valid],\
+                F[valid]*conversionDistLrg,\
+                dataDict["duro"]*hr2s,\
+                dataDict["durf"]*hr2s,\
+                dataDict["lat"]*deg2rad,\
+                self.windobs)
+
+            ua, Hmo, Tp, wgcode = WGRO_SERIES(dataDict["d"]*conversionDist,\
+                F*conversionDistLrg,\
+                phi,\
+                dataDict["durf"]*hr2s,\
+                ue,\
+                self.wgtyp)
+            wgcode = np.where(np.isfinite(ue), wgcode, -1)
+
+            np.savetxt(recordRef, np.column_stack([uobs, wdir, dtemp, F,\
+                ue/conversionSpeed, ua/conversionSpeed, theta,\
+                Hmo/conversionDist, Tp, wgcode]), fmt=recordFormat,\
+                delimiter=",", header=recordHeader if numRecord == 0 else "")
+
+            isGrown = np.isfinite(Hmo)
+            if isGrown.any():
+                i = np.nanargmax(Hmo)
+                if not (HmoMax >= Hmo[i]):
+                    HmoMax = Hmo[i]
+                    TpMax = Tp[i]
+                    indexMax = numRecord + i
+
+            numRecord = numRecord + n
+            numInvalid = numInvalid + np.count_nonzero(wgcode == -1)
+            numBroken = numBroken + np.count_nonzero(wgcode == 4)
+        # end for loop
+        recordRef.close()
+
+        print("Wind record observations\t%d" % numRecord)
+        print("Invalid observations\t\t%d" % numInvalid)
+        if self.isWaterShallow:
+            print("Broken waves\t\t\t%d" % numBroken)
+        if indexMax >= 0:
+            print("Maximum wave height\t\t%-6.2f %s (observation #%d)" %\
+                (HmoMax/conversionDist, self.labelUnitDist, indexMax + 1))
+            print("Period of maximum wave\t\t%-6.2f s" % TpMax)
+        print("Results written to %swind_adj_record.csv" % self.getFilePath())
+
+        dataDict["numRecord"] = numRecord
+        dataDict["numInvalid"] = numInvalid
+        dataDict["numBroken"] = numBroken
+        dataDict["HmoMax"] = HmoMax
+        dataDict["TpMax"] = TpMax
+        dataDict["indexMax"] = indexMax
+        self.fileOutputWriteMain(dataDict, caseIndex)
+    # end performRecordCalculations
+
     def fileOutputWriteData(self, dataDict):
+        if self.isWindRecord:
+            self.fileOutputWriteRecord(dataDict)
+            return
+
         self.fileRef.write("Input\n")
         self.fileRef.write("zobs\t%6.2f %s\n" % (dataDict["zobs"], self.labelUnitDist))
         self.fileRef.write("uobs\t%6.2f %s\n" % (dataDict["Uobs"], self.labelSpeedFinal))
@@ -557,4 +730,35 @@ class WindAdj(BaseDriver):
     # end fileOutputWriteData
 
 
-driver = WindAdj()
\ No newline at end of file
+    def fileOutputWriteRecord(self, dataDict):
+        self.fileRef.write("Input\n")
+        self.fileRef.write("record\t%s\n" % self.windRecord)
+        self.fileRef.write("zobs\t%6.2f %s\n" % (dataDict["zobs"], self.labelUnitDist))
+        self.fileRef.write("duro\t%6.2f hr\n" % dataDict["duro"])
+        self.fileRef.write("durf\t%6.2f hr\n" % dataDict["durf"])
+        self.fileRef.write("lat\t%6.2f deg\n" % dataDict["lat"])
+
+        if self.isWaterOpen:
+            self.fileRef.write("F\t%6.2f %s\n" % (dataDict["F"], self.labelUnitDistLrg))
+
+        if self.isWaterShallow:
+            self.fileRef.write("d\t%6.2f %s\n" % (dataDict["d"], self.labelUnitDist))
+
+        if self.errorMsg != None:
+            self.fileRef.write("\n%s\n" % self.errorMsg)
+            return
+
+        self.fileRef.write("\nOutput\n")
+        self.fileRef.write("Wind record observations\t%d\n" % dataDict["numRecord"])
+        self.fileRef.write("Invalid observations\t\t%d\n" % dataDict["numInvalid"])
+        if self.isWaterShallow:
+            self.fileRef.write("Broken waves\t\t\t%d\n" % dataDict["numBroken"])
+        if dataDict["indexMax"] >= 0:
+            self.fileRef.write("Maximum wave height\t\t%-6.2f %s (observation #%d)\n" %\
+                (dataDict["HmoMax"]/dataDict["conversionDist"], self.labelUnitDist,\
+                dataDict["indexMax"] + 1))
+            self.fileRef.write("Period of maximum wave\t\t%-6.2f s\n" % dataDict["TpMax"])
+    # end fileOutputWriteRecord
+
+if __name__ == "__main__":
+    driver = WindAdj()
@@ -0,0 +1,53 @@
+from DAYOYR import DAYOYR
+from GTERMS import GTERMS
+from NFACS import NFACS
+from helper_objects import LruCache
+
+# Memoized astronomical arguments and nodal factors. NFACS and GTERMS
+# are pure functions of the epoch, so repeated predictions for the
+# same (year, Julian day, hour) reuse the earlier results. Each function
+# has its own bounded LRU cache; SET_ASTRO_CACHE_SIZE changes the bound
+# and ASTRO_CACHE_STATS reports hits and misses.
+
+# The year table holds the node factors of each year evaluated at
+# mid-year (July 2, 0:00), the usual convention for annual predictions.
+# It has one entry per year and is not bounded.
+
+nfacsCache = LruCache(1024)
+gtermsCache = LruCache(1024)
+nfacsYearTable = {}
+
+# Copies are returned so that callers cannot modify the cached lists
+def NFACS_CACHED(yr, dayj, hr):
+    return list(nfacsCache.get((yr, dayj, hr), NFACS))
+
+def GTERMS_CACHED(yr, dayj, hr, daym, hrm):
+    return list(gtermsCache.get((yr, dayj, hr, daym, hrm), GTERMS))
+
+# Node factors for year yr from the year table
+def NFACS_YEAR(yr):
+    if yr not in nfacsYearTable:
+        nfacsYearTable[yr] = NFACS(yr, DAYOYR(yr, 7, 2), 0.0)
+
+    return list(nfacsYearTable[yr])
+
+# Fills the year table for years yrStart to yrEnd inclusive
+def NFACS_YEAR_TABLE(yrStart, yrEnd):
+    for yr in range(int(yrStart), int(yrEnd) + 1):
+        NFACS_YEAR(yr)
+
+    return dict((yr, list(nfacsYearTable[yr]))\
+        for yr in range(int(yrStart), int(yrEnd) + 1))
+
+def SET_ASTRO_CACHE_SIZE(maxSize):
+    for cache in [nfacsCache, gtermsCache]:
+        cache.resize(maxSize)
+
+def CLEAR_ASTRO_CACHE():
+    for cache in [nfacsCache, gtermsCache]:
+        cache.clear()
+    nfacsYearTable.clear()
+
+def ASTRO_CACHE_STATS():
+    return {"NFACS": nfacsCache.stats(), "GTERMS": gtermsCache.stats(),\
+        "yearTable": len(nfacsYearTable)}
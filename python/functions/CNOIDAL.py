@@ -0,0 +1,246 @@
+import math
+import numpy as np
+import scipy.special as sp
+
+from ERRMASK import ERRMASK_BROKEN, ERRMASK_CODES, ERRMASK_URSELL,\
+    ERRMASK_WAVEFORM, ERRCODE_BROKEN, ERRCODE_OUTSIDE, ERRCODE_URSELL
+from ERRWAVBRK1 import ERRWAVBRK1
+
+# Cnoidal wave theory (page 2-2 in ACES User's Guide) for arrays of cases.
+
+# The elliptic parameter m solves
+#   O = 1: 16/3*m*K(m)^2 = g*H*T^2/d^2
+#   O = 2: 16/3*m*K(m)^2 = g*H*T^2/d^2*(1 - epsi*(1 + 2*(1 - m)/m)/4)
+# F(m) is evaluated once on a fixed grid of m (clustered towards both
+# ends of (0, 1)) to bracket the root of largest m, which is then refined
+# by Newton's method, falling back to bisection whenever a step leaves
+# the bracket, with one evaluation of K, E and F per step and
+#   dK/dm = (E - (1 - m)*K)/(2*m*(1 - m))
+
+#   INPUT
+#   H: wave height
+#   T: wave period
+#   d: water depth
+#   g: gravitational acceleration
+#   O: order approximation (1 or 2)
+#   tol: convergence tolerance on m
+
+#   OUTPUT
+#   m: elliptic parameter
+
+def CNOIDAL_M(H, T, d, g, O, tol = 1.0e-14):
+    isScalar = np.ndim(H) == 0 and np.ndim(T) == 0 and\
+        np.ndim(d) == 0 and np.ndim(O) == 0
+
+    H, T, d, O = np.broadcast_arrays(np.asarray(H, dtype=np.float64),\
+        np.asarray(T, dtype=np.float64), np.asarray(d, dtype=np.float64),\
+        np.asarray(O))
+    shape = H.shape
+
+    rhs = (g*H*T**2/d**2).ravel()
+    epsi = np.where(O == 2, H/d, 0.0).ravel()
+
+    # Bracketing grid, m from 1e-12 to 1 - 1e-12
+    mGrid = np.concatenate((np.logspace(-12.0, math.log10(0.5), 24),\
+        1.0 - np.logspace(math.log10(0.5), -12.0, 25)[1:]))
+    Fgrid = cnoidalF(mGrid[np.newaxis, :], rhs[:, np.newaxis],\
+        epsi[:, np.newaxis])[0]
+
+    # Interval of largest m over which F changes sign, or the grid point
+    # of smallest |F| when there is none
+    signChange = (Fgrid[:, :-1]*Fgrid[:, 1:]) <= 0.0
+    hasRoot = signChange.any(axis=1)
+    upper = len(mGrid) - 2 - np.argmax(signChange[:, ::-1], axis=1)
+    closest = np.argmin(np.abs(Fgrid), axis=1)
+
+    caseIndex = np.arange(len(rhs))
+    lo = np.where(hasRoot, mGrid[upper], mGrid[closest])
+    hi = np.where(hasRoot, mGrid[upper + 1], mGrid[closest])
+    Flo = np.where(hasRoot, Fgrid[caseIndex, upper], 0.0)
+
+    m = 0.5*(lo + hi)
+    active = hasRoot.copy()
+    for i in range(100):
+        if not active.any():
+            break
+
+        Fm, dFm = cnoidalF(m[active], rhs[active], epsi[active])
+
+        # Shrink the bracket about the root
+        loA = lo[active]
+        hiA = hi[active]
+        FloA = Flo[active]
+        sameSide = Fm*FloA > 0.0
+        loA = np.where(sameSide, m[active], loA)
+        FloA = np.where(sameSide, Fm, FloA)
+        hiA = np.where(sameSide, hiA, m[active])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mNew = m[active] - Fm/dFm
+        outside = ~((mNew > loA) & (mNew < hiA))
+        mNew = np.where(outside, 0.5*(loA + hiA), mNew)
+
+        done = (np.abs(mNew - m[active]) <= tol) | (Fm == 0.0) |\
+            ((hiA - loA) <= tol)
+
+        lo[active] = loA
+        hi[active] = hiA
+        Flo[active] = FloA
+        m[active] = np.where(Fm == 0.0, m[active], mNew)
+
+        activeIndex = np.flatnonzero(active)
+        active[activeIndex[done]] = False
+    # end for loop
+
+    m = np.where(hasRoot, m, mGrid[closest])
+
+    if isScalar:
+        return float(m[0])
+
+    return m.reshape(shape)
+# end CNOIDAL_M
+
+# F(m) and dF/dm for the first (epsi = 0) or second order equation for m
+def cnoidalF(m, rhs, epsi):
+    K = sp.ellipk(m)
+    E = sp.ellipe(m)
+    dK = (E - (1.0 - m)*K)/(2.0*m*(1.0 - m))
+
+    F = 16.0*m*K**2/3.0 - rhs*(1.0 - epsi*(2.0/m - 1.0)/4.0)
+    dF = 16.0*(K**2 + 2.0*m*K*dK)/3.0 - rhs*epsi/(2.0*m**2)
+
+    return F, dF
+# end cnoidalF
+
+# First and second order cnoidal wave kinematics. All inputs broadcast
+# against each other; m is solved once per (H, T, d, O) combination, so
+# a whole profile over xL costs one root solve.
+
+#   INPUT
+#   H: wave height
+#   T: wave period
+#   d: water depth
+#   z: vertical coordinate
+#   xL: horizontal coordinate as fraction of wavelength (x/L)
+#   O: order approximation (1 or 2)
+#   g: gravitational acceleration
+#   rho: density of water
+#   time: time-coordinate
+
+#   OUTPUT
+#   m: elliptic parameter
+#   K: complete elliptic intergral of the first kind
+#   L: wavelength
+#   C: wave celerity
+#   E: energy density
+#   Ef: energy flux
+#   Ur: Ursell number
+#   eta: surface elevation
+#   u: horizontal particle velocity
+#   w: vertical particle velocity
+#   dudt: horizontal particle acceleration
+#   dwdt: vertical particle accleration
+#   pres: pressure
+#   errorCode: ERRCODE_* code of ERRMASK, ERRCODE_OK (0) valid,
+#              ERRCODE_BROKEN (1) wave broken (H >= 0.78*d),
+#              ERRCODE_OUTSIDE (3) point outside waveform,
+#              ERRCODE_URSELL (4) Ursell parameter test failed (Ur <= 26)
+
+def CNOIDAL(H, T, d, z, xL, O, g, rho, time = 0.0):
+    isScalar = all([np.ndim(val) == 0 for val in [H, T, d, z, xL, O, time]])
+
+    H = np.asarray(H, dtype=np.float64)
+    T = np.asarray(T, dtype=np.float64)
+    d = np.asarray(d, dtype=np.float64)
+    z = np.asarray(z, dtype=np.float64)
+    xL = np.asarray(xL, dtype=np.float64)
+    O = np.asarray(O)
+    time = np.asarray(time, dtype=np.float64)
+
+    m = CNOIDAL_M(H, T, d, g, O)
+
+    epsi = H/d
+    second = O == 2
+
+    K = sp.ellipk(m)
+    Eint = sp.ellipe(m)
+
+    lambdaVal = (1 - m) / m
+    mu = Eint/(m*K)
+    theta = 2.0*K*(xL - (time/T))
+
+    SN, CN, DN, PH = sp.ellipj(theta, m)
+    CSD = CN*SN*DN
+
+    C2 = np.where(second, (-6.0 - 16.0*lambdaVal + 5.0*mu - 16.0*lambdaVal**2 +\
+        10.0*lambdaVal*mu + 15.0*mu**2)/40.0, 0.0)
+    C1 = (1.0 + 2.0*lambdaVal - 3.0*mu)/2.0
+    C0 = 1.0
+    C = np.sqrt(g*d)*(C0 + epsi*C1 + epsi**2*C2) # celerity
+
+    L = C*T # wave length
+
+    Ur = (H*(L**2))/(d**3)
+
+    A2 = np.where(second, 0.75*epsi**2, 0.0)
+    A1 = epsi - A2
+    A0 = epsi*(lambdaVal - mu) + np.where(second,\
+        epsi**2*((-2.0*lambdaVal + mu - 2.0*lambdaVal**2 + 2.0*lambdaVal*mu)/4.0), 0.0)
+    eta = d*(A0 + A1*CN**2 + A2*CN**4) # water surface elevation
+
+    E1 = np.where(second, (1.0/30.0)*(lambdaVal - 2.0*mu - 17.0*lambdaVal*mu +\
+        3.0*lambdaVal**2 - 17.0*lambdaVal**2*mu +\
+        2.0*lambdaVal**3 + 15.0*mu**3), 0.0)
+    E0 = (-lambdaVal + 2.0*mu + 4.0*lambdaVal*mu - lambdaVal**2 - 3.0*mu**2)/3.0
+    E = rho*g*H**2*(E0 + epsi*E1) # average energy density
+
+    F1 = np.where(second, (1.0/30.0)*(-4.0*lambdaVal + 8.0*mu +\
+        53.0*lambdaVal*mu - 12*lambdaVal**2 - 60.0*mu**2 +\
+        53.0*lambdaVal**2*mu - 120.0*lambdaVal*mu**2 -\
+        8.0*lambdaVal**3 + 75.0*mu**3), 0.0)
+    F0 = E0
+    Ef = rho*g*H**2*np.sqrt(g*d)*(F0 + epsi*F1) # energy flux
+
+    term = (z + d)/d
+
+    B21 = np.where(second, -4.5*epsi**2, 0.0)
+    B11 = np.where(second, 3.0*epsi**2*(1 - lambdaVal), 0.0)
+    B01 = np.where(second, ((3.0*lambdaVal)/2.0)*epsi**2, 0.0)
+    B20 = np.where(second, -(epsi**2), 0.0)
+    B10 = epsi + np.where(second, epsi**2*((1.0 - 6.0*lambdaVal + 2.0*mu)/4.0), 0.0)
+    B00 = epsi*(lambdaVal - mu) + np.where(second,\
+        epsi**2*((lambdaVal - mu - 2.0*lambdaVal**2 + 2.0*mu**2)/4.0), 0.0)
+    u = np.sqrt(g*d)*((B00 + B10*CN**2 + B20*CN**4) -\
+        0.5*term**2*(B01 + B11*CN**2 + B21*CN**4)) # horizontal velocity
+
+    w1 = term*(B10 + 2.0*B20*CN**2)
+    w2 = (1.0/6.0)*term**3*(B11 + 2.0*B21*CN**2)
+    w = np.sqrt(g*d)*(4.0*K*d*CSD/L)*(w1 - w2) # vertical velocity
+
+    u1 = (B10 - 0.5*term**2*B11)*(4.0*K*CSD/T)
+    u2 = (B20 - 0.5*term**2*B21)*(8.0*K*CN**2*CSD/T)
+    dudt = np.sqrt(g*d)*(u1 + u2) # horizontal acceleration
+
+    w1 = (8.0*K*CSD**2/T)*(term*B20 - (1.0/6.0)*term**3*B21)
+    w2 = term*(B10 + 2.0*B20*CN**2) - (1.0/6.0)*term**3*(B11 + 2.0*B21*CN**2)
+    w3 = (2.0*K/T)*((SN*DN)**2 - (CN*DN)**2 + (m*SN*CN)**2)
+    dwdt = np.sqrt(g*d)*(4.0*K*d/L)*(w1 + w2*w3) # vertical acceleration
+
+    P2 = np.where(second, (-1.0 - 16.0*lambdaVal + 15.0*mu -\
+        16.0*lambdaVal**2 + 30*lambdaVal*mu)/40.0, 0.0)
+    P1 = (1.0 + 2*lambdaVal - 3.0*mu)/2.0
+    P0 = 1.5
+    Pb = rho*g*d*(P0 + epsi*P1 + epsi**2*P2)
+    pres = Pb - (rho/2.0)*((u - C)**2 + w**2) - g*rho*(z + d) # pressure
+
+    errorCode, checkIndex = ERRMASK_CODES([\
+        (ERRMASK_BROKEN(H, ERRWAVBRK1(d, 0.78)), ERRCODE_BROKEN),\
+        (ERRMASK_URSELL(Ur), ERRCODE_URSELL),\
+        (ERRMASK_WAVEFORM(z, eta, d), ERRCODE_OUTSIDE)])
+
+    outputList = [m, K, L, C, E, Ef, Ur, eta, u, w, dudt, dwdt, pres, errorCode]
+    if isScalar:
+        return tuple([np.asarray(val).item() for val in outputList])
+
+    return tuple(outputList)
+# end CNOIDAL
@@ -0,0 +1,186 @@
+import math
+import os
+import numpy as np
+
+# Tabulated solution of the linear dispersion relation
+#   x*tanh(x) = y,   x = k*d, y = ko*d = 2*pi*d/Lo = w^2*d/g
+# shared by WAVELEN and GODA5. ln(x) is tabulated with its exact
+# derivative against log10(y) from -6 to 1.5 (step 0.0025) and
+# interpolated by cubic Hermite polynomials, kept as the coefficients of
+# one cubic per cell. The node slopes are within 0.2% of the cell secants
+# (well inside the Fritsch-Carlson bounds), so the interpolant is
+# monotone like the relation itself. A scalar y is looked up with plain
+# Python arithmetic, which takes a few microseconds against some tens for
+# the numpy solvers; for arrays the lookup costs about as much as the
+# three Newton steps of dispersionExact.
+
+# Error bound: when the table is built the interpolated x is checked
+# against the exact solution at the quarter points of every cell, and the
+# largest relative error is stored for each cell (about 4e-12 at most).
+# Values in cells whose error exceeds tol, and values outside the table,
+# are solved exactly (dispersionExact).
+
+# The table is kept in memory and saved to the directory given by the
+# ACES_CACHE_DIR environment variable (~/.cache/aces by default), as for
+# KREFF_TABLE, so later runs and worker processes load it.
+
+# The table is used by WAVELEN and GODA5 when it is switched on with
+# DISPERSION_TABLE_USE (or the ACES_DISPERSION_TABLE environment variable,
+# or the useDispersionTable attribute of a driver); it is off by default.
+
+#   INPUT
+#   y: ko*d, scalar or array
+#   tol: largest relative interpolation error accepted
+
+#   OUTPUT
+#   x: k*d (NaN where y <= 0)
+
+tableVersion = 1
+logyRange = (-6.0, 1.5, 3001)
+
+dispersionTables = {}
+useTable = [os.environ.get("ACES_DISPERSION_TABLE", "0") != "0"]
+
+def DISPERSION_TABLE(y, tol = 1.0e-10):
+    table = DISPERSION_TABLE_LOAD()
+    n = logyRange[2]
+    h = (logyRange[1] - logyRange[0]) / (n - 1)
+
+    if np.ndim(y) == 0:
+        y = float(y)
+        if y > 0.0:
+            fi = (math.log10(y) - logyRange[0]) / h
+            i = int(fi)
+            if fi >= 0.0 and i < n - 1 and table["cellError"][i] <= tol:
+                c0, c1, c2, c3 = table["coefList"][i]
+                f = fi - i
+                return math.exp(c0 + f * (c1 + f * (c2 + f * c3)))
+
+        return float(dispersionExact(y))
+
+    y = np.asarray(y, dtype=np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fi = (np.log10(y) - logyRange[0]) / h
+    inside = (fi >= 0.0) & (fi < n - 1)
+
+    i = np.where(inside, fi, 0.0).astype(int)
+    f = np.where(inside, fi - i, 0.0)
+
+    exact = ~inside | (table["cellError"][i] > tol)
+
+    c0, c1, c2, c3 = table["coef"][:, i]
+    x = np.exp(c0 + f * (c1 + f * (c2 + f * c3)))
+
+    if exact.any():
+        x[exact] = dispersionExact(y[exact])
+
+    return x
+# end DISPERSION_TABLE
+
+# Switches the table on or off for WAVELEN and GODA5 in this process
+def DISPERSION_TABLE_USE(flag = True):
+    useTable[0] = bool(flag)
+
+def DISPERSION_TABLE_IN_USE():
+    return useTable[0]
+
+# Returns the table, loading it from the cache directory or building and
+# saving it when it is not already in memory
+def DISPERSION_TABLE_LOAD(cacheDir = None):
+    key = "dispersion_table_v%d_%d" % (tableVersion, logyRange[2])
+    if key in dispersionTables:
+        return dispersionTables[key]
+
+    if cacheDir == None:
+        cacheDir = os.environ.get("ACES_CACHE_DIR",\
+            os.path.join(os.path.expanduser("~"), ".cache", "aces"))
+    filePath = os.path.join(cacheDir, key + ".npz")
+
+    table = None
+    if os.path.isfile(filePath):
+        try:
+            with np.load(filePath) as fileData:
+                table = {"coef": fileData["coef"],\
+                    "cellError": fileData["cellError"]}
+        except (OSError, ValueError, KeyError):
+            table = None
+
+    if table == None:
+        table = dispersionTableBuild()
+
+        # Written to a temporary file first so that processes building
+        # the table at the same time do not read a partial file
+        try:
+            os.makedirs(cacheDir, exist_ok=True)
+            tempPath = "%s.%d.tmp.npz" % (os.path.join(cacheDir, key), os.getpid())
+            np.savez(tempPath, coef=table["coef"],\
+                cellError=table["cellError"])
+            os.replace(tempPath, filePath)
+        except OSError:
+            pass
+
+    table["coefList"] = table["coef"].T.tolist()
+
+    dispersionTables[key] = table
+    return table
+# end DISPERSION_TABLE_LOAD
+
+def DISPERSION_TABLE_CLEAR():
+    dispersionTables.clear()
+
+# Largest relative error of the cells interpolated at tolerance tol, and
+# the fraction of cells solved exactly instead
+def DISPERSION_TABLE_ERROR(tol = 1.0e-10):
+    cellError = DISPERSION_TABLE_LOAD()["cellError"]
+    interpolated = cellError <= tol
+
+    return float(cellError[interpolated].max()), float(1.0 - interpolated.mean())
+
+# x*tanh(x) = y from the explicit approximation of the 1984 SPM (p. 2-7,
+# within 5% everywhere) and three Newton steps, after which x is within
+# 2e-15 of the root for any y (NaN where y <= 0)
+def dispersionExact(y):
+    y = np.asarray(y, dtype=np.float64)
+    wet = y > 0.0
+    y = np.where(wet, y, 1.0)
+
+    # 1984 SPM, p.2-7
+    x = y / np.sqrt(np.tanh(y))
+
+    for i in range(3):
+        t = np.tanh(x)
+        x = x - (x * t - y) / (t + x * (1.0 - t * t))
+
+    return np.where(wet, x, np.nan)
+# end dispersionExact
+
+# Coefficients of the cubic in the fraction f of the cell giving ln(x) in
+# each cell, from ln(x) and d(ln(x))/d(log10(y)) on the grid, with the
+# largest relative error of the interpolated x at the quarter points of
+# each cell
+def dispersionTableBuild():
+    logyGrid = np.linspace(*logyRange)
+    h = logyGrid[1] - logyGrid[0]
+
+    y = 10.0**logyGrid
+    x = dispersionExact(y)
+    t = np.tanh(x)
+    q = np.log(x)
+    dq = math.log(10.0) * y / (x * (t + x * (1.0 - t * t)))
+
+    # cubic Hermite polynomial of each cell
+    dq0 = h * dq[:-1]
+    dq1 = h * dq[1:]
+    dqCell = q[1:] - q[:-1]
+    coef = np.array([q[:-1], dq0, 3.0 * dqCell - 2.0 * dq0 - dq1,\
+        dq0 + dq1 - 2.0 * dqCell])
+
+    cellError = np.zeros(len(logyGrid) - 1)
+    for f in [0.25, 0.5, 0.75]:
+        qi = coef[0] + f * (coef[1] + f * (coef[2] + f * coef[3]))
+        xExact = dispersionExact(10.0**(logyGrid[:-1] + f * h))
+        cellError = np.maximum(cellError, np.abs(np.exp(qi) / xExact - 1.0))
+
+    return {"coef": coef, "cellError": cellError}
+# end dispersionTableBuild
@@ -58,7 +58,7 @@ def DRWEDG(x, y, Hi, waveA, wedgeA, L):
     order = []
     Jnu = []
     order.append((n + 1) / nu)
-    Jnu.append(sp.jv(order, kr))
+    Jnu.append(sp.jv(order[0], kr))
     tolr = 10.0**-8
     count = 0
 
@@ -66,7 +66,7 @@ def DRWEDG(x, y, Hi, waveA, wedgeA, L):
         n = n + 1
         order.append((n + 1) / nu)
         Jnu.append(sp.jv(order[n], kr))
-        if Jnu[n] < tolr:
+        if abs(Jnu[n]) < tolr:
             count = count + 1
         else:
             count = 0
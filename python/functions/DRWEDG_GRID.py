@@ -0,0 +1,195 @@
+import math
+import numpy as np
+import scipy.special as sp
+from fractions import Fraction
+
+# Grid version of DRWEDG. Evaluates the wave amplification factor, phase
+# angle and amplified wave height for combined diffraction and reflection
+# at a vertical wedge over every (x, y) point of a grid at once.
+
+# The velocity potential series sums J_v(kr) over the orders v = n/nu,
+# n = 1, 2, ... Points are processed in blocks sorted by radius and each
+# block truncates the series at one order, chosen from its largest kr,
+# beyond which every term is below tolr.
+
+# Direct evaluation of sp.jv over the (point x order) matrix costs several
+# microseconds per term at large kr, so when 1/nu is a ratio P/Q with a
+# small denominator (any wedge angle given to a tenth of a degree or
+# better) the orders are split into Q families f + m, m = 0, 1, ..., and
+# each family is generated for all points by Miller's backward recurrence
+#   J_(v-1) = (2v/kr) J_v - J_(v+1)
+# normalized with Gegenbauer's sum
+#   (kr/2)^f = sum_k (f + 2k) gamma(f + k)/k! J_(f+2k)
+# (for f = 0: 1 = J_0 + 2 sum_k J_2k). Otherwise the matrix of sp.jv
+# values is used.
+
+#   INPUT
+#   xcors: x-coordinates of the grid columns [m]
+#   ycors: y-coordinates of the grid rows [m]
+#   Hi: incident wave height [m]
+#   waveA: approach angle of incident wave [deg] (measured counter-clockwise
+#          from x-axis)
+#   wedgeA: internal angle of wedge [deg] (measured clockwise from x-axis)
+#   L: wavelength [m]
+#   blockSize: number of grid points evaluated per block
+
+#   OUTPUT (arrays of shape (len(ycors), len(xcors)))
+#   phi: modulus of velocity potential
+#   beta: phase angle of velocity potential [rad]
+#   H: modified wave height [m]
+#   error: True where the point is located within the structure
+
+def DRWEDG_GRID(xcors, ycors, Hi, waveA, wedgeA, L, blockSize = 65536):
+    twopi = 2.0 * math.pi
+    deg2rad = math.pi / 180.0
+    tolr = 10.0**-8
+
+    x, y = np.meshgrid(np.asarray(xcors, dtype=np.float64),\
+        np.asarray(ycors, dtype=np.float64))
+
+    r = np.sqrt(x**2 + y**2) #convert to polar coordinates
+    theta = np.arctan2(y, x)
+    theta = np.where(theta < 0.0, twopi + theta, theta)
+    theta = np.where(np.isclose(x, 0.0) & np.isclose(y, 0.0), 0.0, theta)
+
+    #check to see if (x, y) is located within the structure
+    radwed = wedgeA * deg2rad
+    error = (theta + radwed) > twopi
+
+    kr = (2.0 * math.pi / L) * r
+    nu = (360.0 - wedgeA) / 180.0
+    wa = waveA * deg2rad
+
+    ratio = Fraction(180) / (360 - Fraction(repr(float(wedgeA))))
+    if ratio.denominator > 3600:
+        ratio = None
+
+    krFlat = kr.ravel()
+    thetaFlat = theta.ravel()
+    Fpot = np.zeros(krFlat.shape, dtype=np.complex128)
+
+    sortIndex = np.argsort(krFlat)
+    for blockStart in range(0, len(sortIndex), blockSize):
+        index = sortIndex[blockStart:(blockStart + blockSize)]
+        krBlock = krFlat[index]
+        thetaBlock = thetaFlat[index]
+
+        # J_v(x) < 1e-8 for all v beyond x + 10*x^(1/3) + 20
+        krMax = krBlock[-1]
+        nOrder = int(math.ceil(nu * (krMax + 10.0 * krMax**(1.0 / 3.0) + 20.0)))
+
+        if ratio == None:
+            F = wedgeSeriesDirect(krBlock, thetaBlock, nu, wa, nOrder)
+        else:
+            F = wedgeSeriesRecur(krBlock, thetaBlock, ratio, wa, nOrder)
+
+        Fpot[index] = (2.0 / nu) * (sp.j0(krBlock) + 2.0 * F)
+
+    Fpot = Fpot.reshape(kr.shape)
+
+    #determine modulus
+    phi = np.abs(Fpot)
+    if wa < tolr:
+        phi = phi / 2.0
+
+    #determine phase angle
+    beta = np.where(phi < tolr, 0.0, np.arctan2(Fpot.imag, Fpot.real))
+
+    phi = np.where(error, 0.0, phi)
+    beta = np.where(error, 0.0, beta)
+    H = Hi * phi #modified wave height
+
+    return phi, beta, H, error
+
+
+# sum over n = 1..nOrder of exp(i v pi/2) J_v(kr) cos(v wa) cos(v theta),
+# v = n/nu, from the full matrix of Bessel functions
+def wedgeSeriesDirect(kr, theta, nu, wa, nOrder):
+    order = np.arange(1, nOrder + 1) / nu
+
+    Jnu = sp.jv(order[np.newaxis, :], kr[:, np.newaxis])
+    coeff = np.exp(1j * order * math.pi / 2.0) * np.cos(order * wa)
+
+    return (Jnu * np.cos(order[np.newaxis, :] * theta[:, np.newaxis])).dot(coeff)
+
+
+# Same sum as wedgeSeriesDirect for 1/nu = ratio, by backward recurrence
+def wedgeSeriesRecur(kr, theta, ratio, wa, nOrder):
+    P = ratio.numerator
+    Q = ratio.denominator
+
+    # Orders n*P/Q = m + fam/Q, grouped by family fam
+    familyDict = {}
+    for n in range(1, nOrder + 1):
+        m, fam = divmod(n * P, Q)
+        familyDict.setdefault(fam, {})[m] = n
+
+    # Every family starts above the truncation order, where J_v is
+    # negligible for all points of the block
+    mTop = (nOrder * P) // Q + 20
+
+    # J_v(0) = 0 for every order in the series
+    atOrigin = kr < 1.0e-12
+    twoOverX = 2.0 / np.where(atOrigin, 1.0, kr)
+
+    F = np.zeros(kr.shape, dtype=np.complex128)
+    for fam, memberDict in familyDict.items():
+        f = float(fam) / Q
+
+        aNext = np.zeros(kr.shape)
+        aCurr = np.full(kr.shape, 1.0e-30)
+        Sr = np.zeros(kr.shape)
+        Si = np.zeros(kr.shape)
+        normSum = np.zeros(kr.shape)
+
+        # cos(v theta) over the members, which are P orders apart, by
+        # cos((v - P) theta) = 2 cos(P theta) cos(v theta) - cos((v + P) theta)
+        twoCosP = 2.0 * np.cos(P * theta)
+        cosAbove = None
+        cosAbove2 = None
+
+        for m in range(mTop, -1, -1):
+            if m in memberDict:
+                v = m + f
+                if cosAbove2 is None:
+                    cosV = np.cos(v * theta)
+                else:
+                    cosV = twoCosP * cosAbove
+                    cosV -= cosAbove2
+                cosAbove2 = cosAbove
+                cosAbove = cosV
+
+                term = aCurr * cosV
+                Sr += (math.cos(v * math.pi / 2.0) * math.cos(v * wa)) * term
+                Si += (math.sin(v * math.pi / 2.0) * math.cos(v * wa)) * term
+
+            if m % 2 == 0:
+                k = m // 2
+                if fam == 0:
+                    weight = 1.0 if k == 0 else 2.0
+                else:
+                    weight = (f + 2.0 * k) *\
+                        math.exp(math.lgamma(f + k) - math.lgamma(k + 1.0))
+                normSum += weight * aCurr
+
+            if m > 0:
+                aPrev = ((m + f) * twoOverX) * aCurr
+                aPrev -= aNext
+                aNext = aCurr
+                aCurr = aPrev
+
+                # Rescale before overflow. A step grows the values by at
+                # most 2v/kr + 1 < 1e16, so checking every 4th step
+                # against 1e100 is enough.
+                if m % 4 == 0:
+                    big = np.abs(aCurr) > 1.0e100
+                    if big.any():
+                        for arr in [aCurr, aNext, Sr, Si, normSum]:
+                            arr[big] *= 1.0e-100
+        # end for loop
+
+        scale = (1.0 / twoOverX)**f / normSum
+        F = F + (Sr + 1j * Si) * scale
+    # end for loop
+
+    return np.where(atOrigin, 0.0, F)
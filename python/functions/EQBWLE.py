@@ -1,8 +1,12 @@
-import math
+import numpy as np
 
 # Transforms trapezoidal breakwater into a hydraulically equivalent
 # rectangular breakwater
 
+# The breakwater values may carry trailing dimensions for many cases at
+# once: diam and por (nummat, ...), thk (numlay, ...), hlen
+# (nummat, numlay, ...), broadcast against rechd, traphd and d.
+
 #   INPUT
 #   rechd: head difference across equivalent rectangular breakwater
 #   traphd: head difference across trapezoidal breakwater
@@ -24,25 +28,27 @@ import math
 #                   and trapezoidal breakwater
 
 def EQBWLE(rechd, traphd, d, nummat, numlay, diam, por, thk, hlen, pref, dref):
+    diam = np.asarray(diam, dtype=np.float64)[:nummat]
+    por = np.asarray(por, dtype=np.float64)[:nummat]
+    thk = np.asarray(thk, dtype=np.float64)[:numlay]
+    hlen = np.asarray(hlen, dtype=np.float64)[:nummat, :numlay]
+
     # find betar and beta
     beta0 = 2.7
     betar = beta0*((1.0 - pref)/(pref**3*dref))
 
-    beta = []
-    for i in range(nummat):
-        beta.append(beta0*((1.0 - por[i])/(por[i]**3*diam[i])))
+    beta = beta0*((1.0 - por)/(por**3*diam))
 
     # find equivalent rectangular breakwater length
-    ind = [0.0 for i in range(nummat)]
-    ind2 = [0.0 for j in range(numlay)]
-    for j in range(numlay): #layer is columns
-        for k in range(nummat): # material number is rows
-            ind[k] = (beta[k]/betar)*hlen[k][j]
+    # (material number is rows, layer is columns)
+    ind = (beta[:, np.newaxis]/betar)*hlen
+    sum1 = np.sum(ind, axis=0)
+    ind2 = (thk/d)/np.sqrt(sum1)
 
-        sum1 = sum(ind)
-        ind2[j] = (thk[j]/d)/math.sqrt(sum1)
-
-    sum2 = sum(ind2)
+    sum2 = np.sum(ind2, axis=0)
     lequiv = 1.0/sum2**2*(rechd/traphd)
 
-    return lequiv
\ No newline at end of file
+    if np.ndim(lequiv) == 0:
+        return float(lequiv)
+
+    return lequiv
@@ -1,11 +1,15 @@
 import math
+import numpy as np
 
-from helper_objects import ComplexUtil
 from MADSN1 import MADSN1
 
 # Determines wave transmission and reflection coefficients for the
 # equivalent rectangular breakwater found in function EQBWLE
 
+# dref, k, aI, d and lequ may be arrays; each element is iterated until
+# its own friction factor has converged (or 21 passes), the others being
+# left as they are
+
 #   INPUT
 #   pref: porosity of reference material (0.435)
 #   k: wavenumber
@@ -28,6 +32,10 @@ from MADSN1 import MADSN1
 #   betar: hydrodynamic characterisitc of reference material
 
 def EQBWTRCO(pref, k, dref, aI, d, nu, lequ, g):
+    isScalar = all([np.ndim(val) == 0 for val in [k, dref, aI, d, lequ]])
+
+    k, dref, aI, d, lequ = [np.asarray(val, dtype=np.float64)\
+        for val in np.broadcast_arrays(k, dref, aI, d, lequ)]
 
     Rc = 170.0
 
@@ -40,27 +48,31 @@ def EQBWTRCO(pref, k, dref, aI, d, nu, lequ, g):
 
     # guess a lambda (intermediate value) and a value for F...iterate until the
     # difference is less than 2%
-    diff = 100.0
-    lambdaVal = 1.0
-    F = 0.0
-    loopCount = 0
-    while ComplexUtil.greaterThan(diff, 0.02):
-        Fnew = F
-        U = aI*math.sqrt(g/d)/(1.0 + lambdaVal)
-        Rd = U*dref/nu
-        F = pref/(k*lequ)
-        F = F*(math.sqrt(1.0 + (1.0 + Rc/Rd)*(16.0*betar*aI*lequ/(3.0*math.pi*d))) - 1)
-        lambdaVal = k*lequ*F/(2.0*pref); #calculate new lambda
-        diff = abs(Fnew - F)/F
-        
-        loopCount += 1
-        if loopCount > 20:
-            break
-    
+    lambdaVal = np.ones(k.shape)
+    F = np.zeros(k.shape)
+    loopCount = np.zeros(k.shape, dtype=int)
+    active = np.ones(k.shape, dtype=bool)
+    while np.any(active):
+        Fnew = F[active]
+        U = aI[active]*np.sqrt(g/d[active])/(1.0 + lambdaVal[active])
+        Rd = U*dref[active]/nu
+        Fa = pref/(k[active]*lequ[active])
+        Fa = Fa*(np.sqrt(1.0 + (1.0 + Rc/Rd)*\
+            (16.0*betar[active]*aI[active]*lequ[active]/(3.0*math.pi*d[active]))) - 1)
+        lambdaVal[active] = k[active]*lequ[active]*Fa/(2.0*pref) #calculate new lambda
+        F[active] = Fa
+        diff = np.abs(Fnew - Fa)/Fa
+
+        loopCount[active] += 1
+        active[active] = (diff > 0.02) & (loopCount[active] <= 20)
+
     # used in solving the transmission and reflection coefficients
-    fos = F/ss;
+    fos = F/ss
 
     #call function MADSN1 which solves for Ti and Ri
     Ti, Ri = MADSN1(nors, fos, nkol)
 
-    return Ti, Ri
\ No newline at end of file
+    if isScalar:
+        return float(Ti), float(Ri)
+
+    return Ti, Ri
@@ -0,0 +1,128 @@
+import numpy as np
+from ERRSTP import ERRSTP
+
+# Validity masks for the wave breaking, steepness, waveform and Ursell
+# checks, for drivers that compute many cases at once. Each check returns
+# a boolean array, True where the case passes (NaN inputs fail, as they
+# do in the scalar checks of the drivers). ERRMASK_CODES combines the
+# checks in the order a driver makes them into one error code per case,
+# so that the valid cases can be computed together and the rejected ones
+# reported afterwards, for example with ERRMASK_TABLE.
+
+# Error codes
+ERRCODE_OK = 0
+ERRCODE_BROKEN = 1 # wave broken (H >= breaking height)
+ERRCODE_UNSTABLE = 2 # wave unstable (H/L >= maximum steepness)
+ERRCODE_OUTSIDE = 3 # point outside waveform
+ERRCODE_URSELL = 4 # Ursell parameter test failed
+ERRCODE_RANGE = 5 # case outside the range of the method
+
+errorDescList = ["", "Wave broken", "Wave unstable",\
+    "Point outside waveform", "Ursell test failed", "Outside method range"]
+
+# Wave height against a breaking height from ERRWAVBRK1, ERRWAVBRK2 or
+# ERRWAVBRK3
+#   INPUT
+#   H: wave height
+#   Hb: breaking wave height
+#   OUTPUT
+#   valid: H < Hb
+def ERRMASK_BROKEN(H, Hb):
+    return np.asarray(np.asarray(H) < Hb)
+
+# Steepness against the maximum steepness of ERRSTP
+#   INPUT
+#   H: wave height
+#   d: water depth
+#   L: wave length
+#   OUTPUT
+#   valid: steep < maxstp
+#   steep: steepness of supplied conditions
+#   maxstp: maximum wave steepness
+def ERRMASK_STEEP(H, d, L):
+    steep, maxstp = ERRSTP(np.asarray(H), np.asarray(d), np.asarray(L))
+
+    return steep < maxstp, steep, maxstp
+
+# Vertical coordinate within the waveform
+#   INPUT
+#   z: vertical coordinate
+#   eta: surface elevation
+#   d: water depth
+#   OUTPUT
+#   valid: z < eta and z + d > 0
+def ERRMASK_WAVEFORM(z, eta, d):
+    z = np.asarray(z)
+
+    return (z < eta) & ((z + d) > 0.0)
+
+# Ursell parameter test of cnoidal wave theory
+#   INPUT
+#   Ur: Ursell parameter
+#   limit: smallest Ursell parameter for which the theory applies
+#   OUTPUT
+#   valid: Ur > limit
+def ERRMASK_URSELL(Ur, limit = 26.0):
+    return np.asarray(np.asarray(Ur) > limit)
+
+# Error code of each case from a list of (valid, code) pairs in the
+# order of the checks; the first check a case fails gives its code, as
+# with the early returns of a scalar driver.
+#   INPUT
+#   checkList: list of (valid, code), valid broadcasting to a common shape
+#   OUTPUT
+#   errorCode: code of the first failed check, ERRCODE_OK if none failed
+#   checkIndex: index in checkList of the first failed check, -1 if none
+#               (for drivers whose messages differ between checks with
+#               the same code)
+def ERRMASK_CODES(checkList):
+    shape = np.broadcast_shapes(*[np.shape(valid) for valid, code in checkList])
+
+    errorCode = np.zeros(shape, dtype=np.int8)
+    checkIndex = np.full(shape, -1, dtype=np.int8)
+    for i in range(len(checkList)):
+        valid, code = checkList[i]
+        failed = (checkIndex < 0) & ~np.broadcast_to(valid, shape)
+        errorCode[failed] = code
+        checkIndex[failed] = i
+
+    return errorCode, checkIndex
+# end ERRMASK_CODES
+
+# Compact text table of the rejected cases
+#   INPUT
+#   errorCode: error code of each case (1-d)
+#   columnDict: input values to list for each rejected case, by label
+#   OUTPUT
+#   table: a count line per error code, then one line per rejected case
+#          with its index, code, description and the values
+def ERRMASK_TABLE(errorCode, columnDict = None):
+    if columnDict is None:
+        columnDict = {}
+
+    errorCode = np.asarray(errorCode).ravel()
+    rejected = np.nonzero(errorCode != ERRCODE_OK)[0]
+
+    lineList = ["Rejected %d of %d cases" % (len(rejected), len(errorCode))]
+    for code in np.unique(errorCode[rejected]):
+        lineList.append("  %-24s%d" %\
+            (errorDesc(code) + ":", np.count_nonzero(errorCode == code)))
+
+    if len(rejected) > 0:
+        lineList.append("")
+        lineList.append("%8s  %4s  %-24s" % ("Case", "Code", "Error") +\
+            "".join(["%12s" % label for label in columnDict]))
+        for i in rejected:
+            lineList.append("%8d  %4d  %-24s" %\
+                (i, errorCode[i], errorDesc(errorCode[i])) +\
+                "".join(["%12.4g" % np.ravel(column)[i]\
+                for column in columnDict.values()]))
+
+    return "\n".join(lineList)
+# end ERRMASK_TABLE
+
+def errorDesc(code):
+    if 0 <= code < len(errorDescList):
+        return errorDescList[code]
+
+    return "Error %d" % code
@@ -1,5 +1,4 @@
 import math
-import cmath
 import numpy as np
 
 # Error check for wave steepness
@@ -13,13 +12,22 @@ import numpy as np
 #   steep: steepness of supplied conditions
 #   maxstp: maximum wave steepness
 
+# Real valued throughout (inf where L is 0); scalar input returns Python
+# floats, array input returns float64 arrays of the broadcast shape.
+
 def ERRSTP(H, d, L):
-    if np.isclose(L, 0.0):
-        steep = float('inf')
-        k = float('inf')
-    else:
-        steep = H / L
-        k = (2.0 * math.pi) / L
-    maxstp = 0.142 * cmath.tanh(k * d)
+    isScalar = np.ndim(H) == 0 and np.ndim(d) == 0 and np.ndim(L) == 0
+
+    H, d, L = np.broadcast_arrays(np.asarray(H, dtype=np.float64),\
+        np.asarray(d, dtype=np.float64), np.asarray(L, dtype=np.float64))
+
+    dry = np.isclose(L, 0.0)
+    Lw = np.where(dry, 1.0, L)
+    steep = np.where(dry, np.inf, H / Lw)
+    k = np.where(dry, np.inf, (2.0 * math.pi) / Lw)
+    maxstp = 0.142 * np.tanh(k * d)
+
+    if isScalar:
+        return float(steep), float(maxstp)
 
     return steep, maxstp
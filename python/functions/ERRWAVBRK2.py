@@ -1,4 +1,4 @@
-import math
+import numpy as np
 
 # Error check for  wave breaking in the prescence of a structure
 
@@ -10,14 +10,25 @@ import math
 #   OUTPUT
 #   Hbs: breaking wave height
 
+# Scalar input returns a Python float, array input a float64 array of
+# the broadcast shape.
+
 def ERRWAVBRK2(T, m, ds):
-        a = 1.36 * (1 - math.exp(- 19 * m))
-        b = 1 / (0.64 * (1 + math.exp(- 19.5 * m)))
+        isScalar = np.ndim(T) == 0 and np.ndim(m) == 0 and np.ndim(ds) == 0
+
+        T, m, ds = np.broadcast_arrays(np.asarray(T, dtype=np.float64),\
+            np.asarray(m, dtype=np.float64), np.asarray(ds, dtype=np.float64))
+
+        a = 1.36 * (1 - np.exp(- 19 * m))
+        b = 1 / (0.64 * (1 + np.exp(- 19.5 * m)))
         term = (ds / T**2)
         P = a + (1 + 9.25 * m**2 * b - 4 * m * b) / term
 
         term1 = ds / (m * a * (18.5 * m - 8))
         term2 = P**2 - (((4 * m * b * a) / term) * (9.25 * m - 4))
-        Hbs = term1 * (P - math.sqrt(term2))
+        Hbs = term1 * (P - np.sqrt(term2))
+
+        if isScalar:
+            return float(Hbs)
 
         return Hbs
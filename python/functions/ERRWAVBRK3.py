@@ -1,4 +1,4 @@
-import math
+import numpy as np
 
 # Error check for wave breaking where a finite slope is known (m>0)
 
@@ -11,12 +11,23 @@ import math
 #   Hb: breaking wave height
 #   db: breaker depth
 
+# Scalar input returns Python floats, array input float64 arrays of the
+# broadcast shape.
+
 def ERRWAVBRK3(Ho,Lo,T,m):
-    a = 1.36 * (1 - math.exp(-19 * m))
-    b = 1 / (0.64 * (1 + math.exp(-19.5 * m)))
+    isScalar = all([np.ndim(val) == 0 for val in [Ho, Lo, T, m]])
+
+    Ho, Lo, T, m = np.broadcast_arrays(\
+        *[np.asarray(val, dtype=np.float64) for val in [Ho, Lo, T, m]])
+
+    a = 1.36 * (1 - np.exp(-19 * m))
+    b = 1 / (0.64 * (1 + np.exp(-19.5 * m)))
 
     Hb = Ho * 0.575 * (m**0.031) * ((Ho / Lo)**(-0.254))
     gamma = b - a * Hb / (T**2)
     db = Hb / gamma
 
+    if isScalar:
+        return float(Hb), float(db)
+
     return Hb, db
@@ -0,0 +1,208 @@
+import math
+import numpy as np
+
+# Extremal significant wave height analysis (page 1-3 of ACES User's
+# Guide). Fits the Fisher-Tippett Type I (FT-I) and Weibull (k = 0.75,
+# 1.00, 1.40, 2.00) distributions to a ranked sample of significant wave
+# heights by least squares on the reduced variates. Every result has one
+# column per distribution, in that order.
+
+# The plotting positions and reduced variates depend only on the rank, so
+# a fit is a set of sums over the sample and one (N x 5) product, and the
+# sample may also be a stack of resamples, shape (..., N).
+
+k_W = np.array([0.75, 1.00, 1.40, 2.00]) # Weibull shape parameters
+
+# Coefficients of the normalized standard deviation of Hsr
+a1 = np.array([0.64, 1.65, 1.92, 2.05, 2.24])
+a2 = np.array([9.0, 11.4, 11.4, 11.4, 11.4])
+kappa = np.array([0.93, -0.63, 0.00, 0.69, 1.34])
+c = np.array([0.0, 0.0, 0.3, 0.4, 0.5])
+epsi = np.array([1.33, 1.15, 0.90, 0.72, 0.54])
+
+# Plotting positions and reduced variates of ranks 1..N
+
+#   INPUT
+#   N: number of events in the sample
+#   Nt: estimated total number of events during the record
+
+#   OUTPUT
+#   yact: probability as estimated by the plotting formula, shape (N, 5)
+#   ym: reduced variate, shape (N, 5)
+
+def EXTREMAL_POSITIONS(N, Nt):
+    rank = np.arange(1, N + 1, dtype=np.float64)[:, np.newaxis]
+    sqrtk = np.sqrt(k_W)
+
+    yact = np.empty((N, 5))
+    yact[:, 0:1] = 1.0 - (rank - 0.44)/(Nt + 0.12) #FT-I
+    yact[:, 1:] = 1.0 - (rank - 0.2 - 0.27/sqrtk)/(Nt + 0.2 + 0.23/sqrtk) #Weibull
+
+    ym = np.empty((N, 5))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ym[:, 0] = -np.log(-np.log(yact[:, 0]))
+        ym[:, 1:] = (-np.log(1.0 - yact[:, 1:]))**(1.0/k_W)
+
+    return yact, ym
+# end EXTREMAL_POSITIONS
+
+# Least squares fit Hs = alpha*ym + beta
+
+#   INPUT
+#   Hs: significant wave heights sorted in descending order, shape (..., N)
+#   ym: reduced variates from EXTREMAL_POSITIONS, shape (N, 5)
+
+#   OUTPUT (shape (..., 5))
+#   alpha: scale parameter
+#   beta: location parameter
+#   rxy: correlation coefficient
+
+def EXTREMAL_FIT(Hs, ym):
+    Hs = np.asarray(Hs, dtype=np.float64)
+    N = Hs.shape[-1]
+
+    Sx = Hs.sum(axis=-1)[..., np.newaxis]
+    Sxx = (Hs**2).sum(axis=-1)[..., np.newaxis]
+    Slly = ym.sum(axis=0)
+    Syy = (ym**2).sum(axis=0)
+    Sxy = Hs.dot(ym)
+
+    numer = N*Sxy - Sx*Slly
+    alpha = numer/(N*Syy - Slly**2)
+    beta = (1.0/N)*(Sx - alpha*Slly)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rxy = numer/np.sqrt((N*Sxx - Sx**2)*(N*Syy - Slly**2)) #correlation coefficient
+
+    return alpha, beta, rxy
+# end EXTREMAL_FIT
+
+# Return period wave heights
+
+#   INPUT
+#   alpha, beta: fit parameters from EXTREMAL_FIT, shape (..., 5)
+#   lambdaVal: number of events per year
+#   ret: return periods [yr]
+
+#   OUTPUT
+#   yr: reduced variate of each return period, shape (len(ret), 5)
+#   Hsr: significant wave height of each return period,
+#        shape (..., len(ret), 5)
+
+def EXTREMAL_RETURN(alpha, beta, lambdaVal, ret):
+    ret = np.asarray(ret, dtype=np.float64)[:, np.newaxis]
+
+    prob1 = 1.0 - 1.0/(lambdaVal*ret)
+    prob1 = np.where(prob1 <= 0.0, 1.0*10**(-7), prob1)
+
+    prob2 = lambdaVal*ret
+    prob2 = np.where(prob2 <= 0.0, 1.0*10**(-7), prob2)
+
+    yr = np.empty((ret.shape[0], 5))
+    yr[:, 0] = (-np.log(-np.log(prob1)))[:, 0] #FT-I
+    yr[:, 1:] = np.log(prob2)**(1.0/k_W) #Weibull
+
+    alpha = np.asarray(alpha)[..., np.newaxis, :]
+    beta = np.asarray(beta)[..., np.newaxis, :]
+    Hsr = alpha*yr + beta
+
+    return yr, Hsr
+# end EXTREMAL_RETURN
+
+# Standard deviation of the return period wave heights from the
+# normalized standard deviation of the ACES User's Guide (Eq. 10)
+
+#   INPUT
+#   yr: reduced variates from EXTREMAL_RETURN, shape (R, 5)
+#   N: number of events in the sample
+#   nu: censoring parameter (N/Nt)
+#   standev: standard deviation of the sample
+
+#   OUTPUT
+#   sigr: standard deviation of Hsr, shape (R, 5)
+
+def EXTREMAL_SIGR(yr, N, nu, standev):
+    coeff = a1*np.exp(a2*N**(-1.3) + kappa*math.sqrt(-math.log(nu)))
+
+    signr = (1.0/math.sqrt(N))*\
+        (1.0 + coeff*(yr - c + epsi*math.log(nu))**2)**(0.5)
+
+    return signr*standev
+# end EXTREMAL_SIGR
+
+# Bootstrap confidence intervals of the return period wave heights. The
+# sample is resampled with replacement numResamples times and refitted;
+# the bounds are percentiles of the refitted Hsr. Resamples are drawn in
+# shards of shardSize, each with its own seed spawned from seed, so the
+# result does not depend on numWorkers. With numWorkers > 1 the shards
+# run in a process pool.
+
+#   INPUT
+#   Hs: significant wave heights sorted in descending order
+#   Nt: estimated total number of events during the record (not less
+#       than the number of wave heights)
+#   lambdaVal: number of events per year
+#   ret: return periods [yr]
+#   conf: confidence level [%]
+#   numResamples: number of bootstrap resamples
+#   numWorkers: number of worker processes
+#   seed: seed of the random resampling (None for a random seed)
+
+#   OUTPUT (shape (len(ret), 5))
+#   sigr: standard deviation of the resampled Hsr
+#   lowbound: lower confidence bound
+#   highbound: upper confidence bound
+
+def EXTREMAL_BOOTSTRAP(Hs, Nt, lambdaVal, ret, conf, numResamples = 1000,\
+    numWorkers = 1, seed = None, shardSize = 100):
+    Hs = np.asarray(Hs, dtype=np.float64)
+    if not (len(Hs) <= Nt):
+        raise ValueError("Number of wave heights (%d) must not exceed Nt (%d)" %\
+            (len(Hs), Nt))
+
+    ym = EXTREMAL_POSITIONS(len(Hs), Nt)[1]
+
+    shardList = []
+    seedList = np.random.SeedSequence(seed).spawn(-(-numResamples//shardSize))
+    for i in range(len(seedList)):
+        count = min(shardSize, numResamples - i*shardSize)
+        shardList.append((Hs, ym, lambdaVal, ret, count, seedList[i]))
+
+    if numWorkers > 1:
+        import concurrent.futures
+
+        with concurrent.futures.ProcessPoolExecutor(numWorkers) as executor:
+            futureList = [executor.submit(bootstrapShard, *shard)\
+                for shard in shardList]
+            HsrList = [future.result() for future in futureList]
+    else:
+        HsrList = [bootstrapShard(*shard) for shard in shardList]
+
+    Hsr = np.concatenate(HsrList, axis=0)
+
+    sigr = np.std(Hsr, axis=0, ddof=1)
+    lowbound = np.percentile(Hsr, 50.0 - conf/2.0, axis=0)
+    highbound = np.percentile(Hsr, 50.0 + conf/2.0, axis=0)
+
+    return sigr, lowbound, highbound
+# end EXTREMAL_BOOTSTRAP
+
+# Refits count resamples of Hs, holding at most about maxValues resampled
+# heights in memory at once
+def bootstrapShard(Hs, ym, lambdaVal, ret, count, seedSeq, maxValues = 4000000):
+    rng = np.random.default_rng(seedSeq)
+    N = len(Hs)
+    blockSize = max(1, min(count, maxValues//N))
+
+    HsrList = []
+    for blockStart in range(0, count, blockSize):
+        numBlock = min(blockSize, count - blockStart)
+
+        # Hs is in descending order, so sorted indices give a sorted resample
+        index = np.sort(rng.integers(0, N, (numBlock, N)), axis=1)
+
+        alpha, beta, rxy = EXTREMAL_FIT(Hs[index], ym)
+        HsrList.append(EXTREMAL_RETURN(alpha, beta, lambdaVal, ret)[1])
+
+    return np.concatenate(HsrList, axis=0)
+# end bootstrapShard
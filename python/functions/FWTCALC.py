@@ -0,0 +1,107 @@
+import numpy as np
+
+from FWTEQNS import FWTEQNS
+from FWTSOL import FWTSOL
+
+# Calculation of steady waves (on a current) as a Fourier series
+
+#   Source:  "The Numerical Solution of Steady Water Wave Problems"
+#             Computers & Geosciences Vol 14, No 3 pp 357-368, 1988
+#            by J.D.Fenton
+
+# All cases are solved together. The wave height is raised to its final
+# value in nstep equal steps, starting from the linear solution (FWTSOL);
+# each step starts from the linear extrapolation of the two previous
+# solutions (the first from the linear solution and that of zero height)
+# and is solved by Newton's method with the analytic Jacobian of FWTEQNS.
+# Each case stops iterating when the sum of the magnitudes of its
+# corrections is below crit (0.01*crit on the last step). The current is
+# held at its dimensional value u while the height is raised.
+
+#   INPUT
+#   Hnon: dimensionless wave height H/(g*T^2)
+#   Hoverd: H/d
+#   unon: dimensionless current u/sqrt(g*H)
+#   nstep: number of steps in wave height ramping
+#   n: number of terms in the Fourier series (N)
+#   celdef: celerity definition (1 for Eulerian, 2 for Stokes current)
+#   number: maximum number of iterations for each wave height step
+#   crit: convergence criterion
+
+#   OUTPUT
+#   z: solution vectors, shape (number of cases, 2*N + 10) (see FWTSOL)
+#   cosa, sina: cos and sin of i*pi/N for i = 0 to 2*N - 1
+#   converged: False where a case did not converge on the last step
+#   numIter: total number of Newton iterations of each case
+
+def FWTCALC(Hnon, Hoverd, unon, nstep, n, celdef, number = 20, crit = 0.001):
+    Hnon, Hoverd, unon = [np.atleast_1d(val).astype(np.float64).ravel()\
+        for val in np.broadcast_arrays(Hnon, Hoverd, unon)]
+    numCases = len(Hnon)
+
+    dhe = Hnon/nstep
+    dho = Hoverd/nstep
+
+    numIter = np.zeros(numCases, dtype=int)
+    for ns in range(1, nstep + 1):
+        HnonStep = ns*dhe
+        HoverdStep = ns*dho
+        unonStep = unon*np.sqrt(nstep/ns)
+
+        if ns == 1:
+            z, cosa, sina = FWTSOL(HnonStep, HoverdStep, unonStep, n, celdef)
+
+            # zero height
+            sol = z.copy()
+            sol[:, [1, 7]] = 0.0
+            sol[:, 9:] = 0.0
+        else:
+            # extrapolate for the next wave height
+            sol, z = z, 2.0*z - sol
+
+        criter = crit
+        if ns == nstep:
+            criter = 0.01*crit
+
+        # (cases that diverge are left as NaN)
+        active = np.all(np.isfinite(z), axis=1)
+        with np.errstate(all="ignore"):
+            for i in range(number):
+                if not np.any(active):
+                    break
+
+                rhs, a = FWTEQNS(z[active], HoverdStep[active],\
+                    HnonStep[active], unonStep[active], n, celdef, cosa, sina)
+
+                # The corrections to each variable
+                b = fwtSolve(a, -rhs)
+                z[active] = z[active] + b
+                numIter[active] = numIter[active] + 1
+
+                correction = np.sum(np.abs(b), axis=1)
+                active[active] = correction >= criter
+
+        if ns == 1:
+            # sol holds the solution of zero height, z that of step 1
+            sol[:, [0, 2, 3, 4, 5, 6, 8]] = z[:, [0, 2, 3, 4, 5, 6, 8]]
+
+    converged = ~active & np.all(np.isfinite(z), axis=1)
+
+    return z, cosa, sina, converged, numIter
+# end FWTCALC
+
+# Solves a[i] x[i] = b[i] for every case i, giving NaN for the cases with
+# a singular matrix
+def fwtSolve(a, b):
+    try:
+        return np.linalg.solve(a, b[:, :, np.newaxis])[:, :, 0]
+    except np.linalg.LinAlgError:
+        x = np.full(b.shape, np.nan)
+        for i in range(len(b)):
+            try:
+                x[i] = np.linalg.solve(a[i], b[i])
+            except np.linalg.LinAlgError:
+                pass
+
+        return x
+# end fwtSolve
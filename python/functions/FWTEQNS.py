@@ -0,0 +1,146 @@
+import math
+import numpy as np
+
+# Evaluates the equations of Fourier series wave theory (J.D. Fenton,
+# Computers & Geosciences Vol 14, No 3, pp 357-368, 1988) and their
+# Jacobian for an array of cases. The Jacobian is assembled from the
+# analytic derivatives of each equation, so a Newton step takes one
+# evaluation. The equations are, for the solution vector z described in
+# FWTSOL,
+#   rhs[0]: k*H - k*d*(H/d)
+#   rhs[1]: k*H - H/(g*T^2)*(T*sqrt(g*k))^2
+#   rhs[2]: c*T*k - 2*pi
+#   rhs[3]: c_E + ubar - c
+#   rhs[4]: c_S + ubar - c - q/d
+#   rhs[5]: current (c_E or c_S) - u
+#   rhs[6]: mean water level is zero (trapezoidal rule)
+#   rhs[7]: crest - trough - k*H
+#   rhs[8 + m]: stream function at the surface point m is constant
+#   rhs[N + 9 + m]: Bernoulli equation at the surface point m
+# The stream function is
+#   psi = -ubar*Y + sum(B_j*sinh(j*k*Y)/cosh(j*k*d)*cos(j*k*x))
+# with Y measured from the bed. The ratios of hyperbolic functions are
+# written with decaying exponentials only, so any depth can be solved
+# without overflow (deep water needs no separate form).
+
+#   INPUT
+#   z: solution vectors, shape (number of cases, 2*N + 10)
+#   Hoverd: H/d
+#   Hnon: dimensionless wave height H/(g*T^2)
+#   unon: dimensionless current u/sqrt(g*H)
+#   n: number of terms in the Fourier series (N)
+#   celdef: celerity definition (1 for Eulerian, 2 for Stokes current)
+#   cosa, sina: cos and sin of i*pi/N for i = 0 to 2*N - 1
+
+#   OUTPUT
+#   rhs: residuals of the equations, shape (number of cases, 2*N + 10)
+#   a: Jacobian d(rhs)/dz, shape (number of cases, 2*N + 10, 2*N + 10)
+
+def FWTEQNS(z, Hoverd, Hnon, unon, n, celdef, cosa, sina):
+    num = 2*n + 10
+    numCases = z.shape[0]
+    Hoverd, Hnon, unon = [np.broadcast_to(val, (numCases,))\
+        for val in [Hoverd, Hnon, unon]]
+
+    it = 4 if celdef == 1 else 5
+
+    kd = z[:, 0]
+    eta = z[:, 9:n + 10]
+    B = z[:, n + 10:num]
+
+    j = np.arange(1, n + 1)
+    m = np.arange(n + 1)
+    C = cosa[(m[:, np.newaxis]*j) % (2*n)]
+    S = sina[(m[:, np.newaxis]*j) % (2*n)]
+
+    # sinh(j*(kd + eta))/cosh(j*kd) and cosh(j*(kd + eta))/cosh(j*kd)
+    # at each surface point (case, m, j)
+    jkd = j*kd[:, np.newaxis, np.newaxis]
+    ep = np.exp(j*eta[:, :, np.newaxis])
+    em = np.exp(-j*eta[:, :, np.newaxis] - 2.0*jkd)
+    den = 1.0 + np.exp(-2.0*jkd)
+    SD = (ep - em)/den
+    CD = (ep + em)/den
+    Th = np.tanh(jkd)
+
+    BC = B[:, np.newaxis, :]*C
+    BS = B[:, np.newaxis, :]*S
+
+    psi = np.sum(BC*SD, axis=2)
+    u = np.sum(j*BC*CD, axis=2)
+    v = np.sum(j*BS*SD, axis=2)
+
+    # derivatives with respect to k*d, the local k*eta and B_j
+    psi_kd = np.sum(j*BC*(CD - SD*Th), axis=2)
+    u_kd = np.sum(j**2*BC*(SD - CD*Th), axis=2)
+    v_kd = np.sum(j**2*BS*(CD - SD*Th), axis=2)
+    u_eta = np.sum(j**2*BC*SD, axis=2)
+    v_eta = np.sum(j**2*BS*CD, axis=2)
+    psi_B = C*SD
+    u_B = j*C*CD
+    v_B = j*S*SD
+
+    rhs = np.zeros((numCases, num))
+    a = np.zeros((numCases, num, num))
+
+    rhs[:, 0] = z[:, 1] - kd*Hoverd
+    a[:, 0, 1] = 1.0
+    a[:, 0, 0] = -Hoverd
+
+    rhs[:, 1] = z[:, 1] - Hnon*z[:, 2]**2
+    a[:, 1, 1] = 1.0
+    a[:, 1, 2] = -2.0*Hnon*z[:, 2]
+
+    rhs[:, 2] = z[:, 3]*z[:, 2] - 2.0*math.pi
+    a[:, 2, 3] = z[:, 2]
+    a[:, 2, 2] = z[:, 3]
+
+    rhs[:, 3] = z[:, 4] + z[:, 6] - z[:, 3]
+    a[:, 3, 4] = 1.0
+    a[:, 3, 6] = 1.0
+    a[:, 3, 3] = -1.0
+
+    rhs[:, 4] = z[:, 5] + z[:, 6] - z[:, 3] - z[:, 7]/kd
+    a[:, 4, 5] = 1.0
+    a[:, 4, 6] = 1.0
+    a[:, 4, 3] = -1.0
+    a[:, 4, 7] = -1.0/kd
+    a[:, 4, 0] = z[:, 7]/kd**2
+
+    rhs[:, 5] = z[:, it] - unon*np.sqrt(z[:, 1])
+    a[:, 5, it] = 1.0
+    a[:, 5, 1] = -0.5*unon/np.sqrt(z[:, 1])
+
+    rhs[:, 6] = eta[:, 0] + eta[:, n] + 2.0*np.sum(eta[:, 1:n], axis=1)
+    a[:, 6, 9:n + 10] = 2.0
+    a[:, 6, 9] = 1.0
+    a[:, 6, n + 9] = 1.0
+
+    rhs[:, 7] = eta[:, 0] - eta[:, n] - z[:, 1]
+    a[:, 7, 9] = 1.0
+    a[:, 7, n + 9] = -1.0
+    a[:, 7, 1] = -1.0
+
+    # kinematic (rows 8 to N + 8) and dynamic (rows N + 9 to 2*N + 9)
+    # surface conditions
+    kin = np.arange(8, n + 9)
+    dyn = np.arange(n + 9, num)
+    surf = np.arange(9, n + 10)
+    w = u - z[:, [6]]
+
+    rhs[:, kin] = psi - z[:, [7]] - z[:, [6]]*eta
+    a[:, kin, 0] = psi_kd
+    a[:, kin, surf] = w
+    a[:, kin, 6] = -eta
+    a[:, kin, 7] = -1.0
+    a[:, kin, n + 10:num] = psi_B
+
+    rhs[:, dyn] = 0.5*(w**2 + v**2) + eta - z[:, [8]]
+    a[:, dyn, 0] = w*u_kd + v*v_kd
+    a[:, dyn, surf] = w*u_eta + v*v_eta + 1.0
+    a[:, dyn, 6] = -w
+    a[:, dyn, 8] = -1.0
+    a[:, dyn, n + 10:num] = w[:, :, np.newaxis]*u_B +\
+        v[:, :, np.newaxis]*v_B
+
+    return rhs, a
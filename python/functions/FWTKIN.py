@@ -0,0 +1,85 @@
+import math
+import numpy as np
+
+# Velocity, acceleration and pressure at (x/L, y) and the water surface
+# elevation at x/L from Fourier series wave theory. xoverl and y may be
+# arrays (broadcast against each other) and so may the case values k, d,
+# z (leading dimensions of z and ft are the cases, broadcast as well),
+# e.g. a grid of points under one wave or one point under many waves.
+
+#   INPUT
+#   xoverl: horizontal coordinate as fraction of wavelength (x/L)
+#   y: vertical coordinate, positive upwards from the mean water level
+#   n: number of terms in the Fourier series (N)
+#   k: wave number
+#   d: water depth
+#   z: solution vector(s) (see FWTSOL)
+#   ft: Fourier coefficients of k*eta (see FWTRSLT)
+#   g: gravitational acceleration
+#   rho: density of water
+
+#   OUTPUT (NaN where (x/L, y) is not within the wave, except eta)
+#   ubig: horizontal velocity
+#   wbig: vertical velocity
+#   ax: horizontal acceleration
+#   ay: vertical acceleration
+#   pbig: pressure
+#   eta: water surface elevation
+
+def FWTKIN(xoverl, y, n, k, d, z, ft, g, rho):
+    z = np.asarray(z, dtype=np.float64)
+    ft = np.asarray(ft, dtype=np.float64)
+    kd = z[..., 0]
+    ubar = z[..., 6]
+    R = z[..., 8]
+    c = z[..., 3]
+    B = z[..., n + 10:2*n + 10]
+
+    kx = 2.0*math.pi*np.asarray(xoverl, dtype=np.float64)
+    ky = k*np.asarray(y, dtype=np.float64)
+
+    j = np.arange(1, n + 1)
+    cx = np.cos(j*kx[..., np.newaxis])
+    sx = np.sin(j*kx[..., np.newaxis])
+
+    # Determine water surface elevation (k*eta)
+    weight = np.ones(n)
+    weight[n - 1] = 0.5
+    keta = np.sum(weight*ft*cx, axis=-1)
+    eta = keta/k
+
+    # Check to see if (kx, ky) outside of wave domain
+    inWave = (ky <= keta) & (ky >= -kd)
+
+    # sinh(j*(kd + ky))/cosh(j*kd) and cosh(j*(kd + ky))/cosh(j*kd)
+    jkd = j*kd[..., np.newaxis]
+    jky = j*np.where(inWave, ky, 0.0)[..., np.newaxis]
+    ep = np.exp(jky)
+    em = np.exp(-jky - 2.0*jkd)
+    den = 1.0 + np.exp(-2.0*jkd)
+    s = (ep - em)/den
+    ch = (ep + em)/den
+
+    u = -ubar + np.sum(j*B*ch*cx, axis=-1)
+    v = np.sum(j*B*s*sx, axis=-1)
+    ux = np.sum(j*j*B*ch*sx, axis=-1)
+    uy = np.sum(j*j*B*s*cx, axis=-1)
+
+    press = R - ky - 0.5*(u**2 + v**2)
+
+    u = u*np.sqrt(g/k)
+    v = v*np.sqrt(g/k)
+    ux = -np.sqrt(g*k)*ux
+    uy = np.sqrt(g*k)*uy
+
+    ubig = np.where(inWave, u + c*np.sqrt(g/k), np.nan)
+    wbig = np.where(inWave, v, np.nan)
+    pbig = np.where(inWave, (rho*g/k)*press, np.nan)
+    ax = np.where(inWave, u*ux + v*uy, np.nan)
+    ay = np.where(inWave, u*uy - v*ux, np.nan)
+
+    if np.ndim(ubig) == 0:
+        return float(ubig), float(wbig), float(ax), float(ay),\
+            float(pbig), float(eta)
+
+    return ubig, wbig, ax, ay, pbig, eta
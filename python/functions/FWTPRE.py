@@ -0,0 +1,27 @@
+import math
+import numpy as np
+
+# Converts the dimensional input data of Fourier series wave theory into
+# the nondimensional forms used by FWTCALC (arrays are broadcast)
+
+#   INPUT
+#   g: gravitational acceleration
+#   T: wave period
+#   H: wave height
+#   d: water depth
+#   u: mean (current) velocity
+
+#   OUTPUT
+#   Hnon: dimensionless wave height H/(g*T^2)
+#   L: approximate wavelength (1984 SPM, p. 2-7)
+#   Hoverd: H/d
+#   unon: dimensionless current u/sqrt(g*H)
+
+def FWTPRE(g, T, H, d, u):
+    Hnon = H/(g*T**2)
+    L = ((g*T**2)/(2.0*math.pi))*\
+        np.sqrt(np.tanh((4.0*math.pi**2/g)*d/T**2))
+    Hoverd = H/d
+    unon = u/np.sqrt(g*H)
+
+    return Hnon, L, Hoverd, unon
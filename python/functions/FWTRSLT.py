@@ -0,0 +1,77 @@
+import math
+import numpy as np
+
+# General and integral results of Fourier series wave theory from the
+# solution vectors of FWTCALC (one row per case)
+
+#   INPUT
+#   z: solution vectors, shape (number of cases, 2*N + 10) (see FWTSOL)
+#   n: number of terms in the Fourier series (N)
+#   H: wave height
+#   g: gravitational acceleration
+#   rho: density of water
+#   cosa: cos of i*pi/N for i = 0 to 2*N - 1
+#   d: water depth
+
+#   OUTPUT (one value per case)
+#   k: wave number
+#   c: celerity
+#   L: wavelength
+#   u1: mean Eulerian fluid velocity
+#   u2: mean mass transport velocity
+#   ubar: mean velocity relative to wave
+#   q: volume flux due to wave
+#   r: Bernoulli constant (relative to the mean water level)
+#   I: impulse
+#   Ek: kinetic energy
+#   Ep: potential energy
+#   E: energy density
+#   Ub2: mean square of bed velocity
+#   Sxx: radiation stress
+#   Ef: energy flux (wave power)
+#   Q: volume flux
+#   R: Bernoulli constant (relative to the bed)
+#   ft: Fourier coefficients of k*eta, shape (number of cases, N)
+
+def FWTRSLT(z, n, H, g, rho, cosa, d):
+    H = np.broadcast_to(H, z.shape[:1])
+    d = np.broadcast_to(d, z.shape[:1])
+
+    # Determine the Fourier coefficients of surface elevation
+    j = np.arange(1, n + 1)
+    m = np.arange(1, n)
+    ft = 0.5*(z[:, [9]] + z[:, [n + 9]]*(-1.0)**j) +\
+        np.dot(z[:, 10:n + 9], cosa[(m[:, np.newaxis]*j) % (2*n)])
+    ft = 2.0*ft/n
+
+    # Capture dimensional wave properties from solution array
+    k = z[:, 1]/H
+    c = z[:, 3]/np.sqrt(k/g)
+    L = 2.0*math.pi/k
+    u1 = z[:, 4]/np.sqrt(k/g)
+    u2 = z[:, 5]/np.sqrt(k/g)
+    ubar = z[:, 6]/np.sqrt(k/g)
+    q = z[:, 7]/np.sqrt((k**3)/g)
+    r = z[:, 8]*g/k
+
+    # Determine integral parameters (non-dimensional)
+    I = z[:, 7] + z[:, 0]*z[:, 4]
+    Ek = 0.5*(z[:, 3]*I + z[:, 4]*(z[:, 7] - z[:, 6]*z[:, 0]))
+    Ep = 0.5*(z[:, 9]**2 + z[:, n + 9]**2) + np.sum(z[:, 10:n + 9]**2, axis=1)
+    Ep = Ep/(2.0*n)
+    Ub2 = 2.0*z[:, 8] - z[:, 3]**2 + 2.0*z[:, 4]*z[:, 3]
+    Q = z[:, 6]*z[:, 0] - z[:, 7]
+    R = z[:, 8] + z[:, 0]
+
+    # Express integral parameters as dimensional quantities
+    I = I*rho*np.sqrt(g/(k**3))
+    Ek = Ek*rho*g/(k**2)
+    Ep = Ep*rho*g/(k**2)
+    E = Ep + Ek
+    Ub2 = Ub2*g/k
+    Sxx = 4.0*Ek - 3.0*Ep + rho*d*Ub2 - 2.0*u1*I
+    Ef = (3.0*Ek - 2.0*Ep - 2.0*u1*I)*c + Ub2*(I + rho*c*d)/2.0
+    Q = Q/np.sqrt((k**3)/g)
+    R = R*g/k
+
+    return k, c, L, u1, u2, ubar, q, r, I, Ek, Ep, E, Ub2, Sxx, Ef, Q, R, ft
@@ -0,0 +1,62 @@
+import math
+import numpy as np
+
+# Initial solution of the Fourier series wave equations from linear wave
+# theory (J.D. Fenton, "The Numerical Solution of Steady Water Wave
+# Problems", Computers & Geosciences Vol 14, No 3, pp 357-368, 1988),
+# for an array of cases. The wavenumber is from one Newton step on
+# x*tanh(x) = ko*d from the explicit approximation of the 1984 SPM, and
+# the current is added to the linear celerity.
+
+# The solution vector z (one row per case, 2*N + 10 values) holds
+#   z[0]: k*d
+#   z[1]: k*H
+#   z[2]: T*sqrt(g*k)
+#   z[3]: c*sqrt(k/g), celerity
+#   z[4]: c_E*sqrt(k/g), mean Eulerian fluid velocity
+#   z[5]: c_S*sqrt(k/g), mean mass transport velocity
+#   z[6]: ubar*sqrt(k/g), mean fluid speed relative to the wave
+#   z[7]: q*sqrt(k^3/g), volume flux relative to the wave
+#   z[8]: r*k/g, Bernoulli constant (relative to the mean water level)
+#   z[9 + m]: k*eta at x = m*L/(2*N), m = 0 (crest) to N (trough)
+#   z[N + 9 + j]: stream function coefficient B_j, j = 1 to N
+
+#   INPUT
+#   Hnon: dimensionless wave height H/(g*T^2)
+#   Hoverd: H/d
+#   unon: dimensionless current u/sqrt(g*H)
+#   n: number of terms in the Fourier series (N)
+#   celdef: celerity definition (1 for Eulerian, 2 for Stokes current)
+
+#   OUTPUT
+#   z: solution vectors, shape (number of cases, 2*N + 10)
+#   cosa, sina: cos and sin of i*pi/N for i = 0 to 2*N - 1
+
+def FWTSOL(Hnon, Hoverd, unon, n, celdef):
+    Hnon, Hoverd, unon = [np.atleast_1d(val).astype(np.float64).ravel()\
+        for val in np.broadcast_arrays(Hnon, Hoverd, unon)]
+
+    cosa = np.cos(np.arange(2*n)*math.pi/n)
+    sina = np.sin(np.arange(2*n)*math.pi/n)
+
+    z = np.zeros((len(Hnon), 2*n + 10))
+
+    a = 4.0*(math.pi**2)*Hnon/Hoverd
+    b = a/np.sqrt(np.tanh(a))
+    t = np.tanh(b)
+    z[:, 0] = b + (a - b*t)/(t + b*(1.0 - t**2))
+    z[:, 1] = z[:, 0]*Hoverd
+
+    cur = unon*np.sqrt(z[:, 1])
+    z[:, 6] = np.sqrt(np.tanh(z[:, 0]))
+    z[:, 3] = z[:, 6] + cur
+    z[:, 2] = 2.0*math.pi/z[:, 3]
+    z[:, 4] = cur
+    z[:, 5] = cur
+    z[:, 7] = 0.0
+    z[:, 8] = 0.5*z[:, 6]**2
+
+    z[:, 9:n + 10] = 0.5*z[:, [1]]*cosa[:n + 1]
+    z[:, n + 10] = 0.5*z[:, 1]/z[:, 6]
+
+    return z, cosa, sina
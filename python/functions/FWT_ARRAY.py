@@ -0,0 +1,51 @@
+import numpy as np
+
+from FWTCALC import FWTCALC
+from FWTPRE import FWTPRE
+from FWTRSLT import FWTRSLT
+
+# Fourier series wave theory for many waves at once, e.g. the load cases
+# of a structure. All the waves are solved together by FWTCALC; the
+# kinematics of any of them follow from FWTKIN with the returned solution
+# vectors and surface coefficients.
+
+#   INPUT (H, T, d and u are broadcast against each other)
+#   H: wave height
+#   T: wave period
+#   d: water depth
+#   u: mean (current) velocity
+#   celdef: celerity definition (1 for Eulerian, 2 for Stokes current)
+#   n: number of terms in the Fourier series
+#   nstep: number of steps in wave height ramping
+#   g: gravitational acceleration
+#   rho: density of water
+
+#   OUTPUT
+#   results: the 17 results of FWTRSLT (k, c, L, u1, u2, ubar, q, r, I,
+#       Ek, Ep, E, Ub2, Sxx, Ef, Q, R) as arrays of the input shape
+#   z: solution vectors, shape + (2*n + 10,) (see FWTSOL)
+#   ft: Fourier coefficients of k*eta, shape + (n,)
+#   converged: False where the solution did not converge (the results
+#       there are NaN)
+
+def FWT_ARRAY(H, T, d, u, celdef, n, nstep, g, rho):
+    H, T, d, u = np.broadcast_arrays(np.asarray(H, dtype=np.float64),\
+        np.asarray(T, dtype=np.float64), np.asarray(d, dtype=np.float64),\
+        np.asarray(u, dtype=np.float64))
+    shape = H.shape
+
+    Hnon, L, Hoverd, unon = FWTPRE(g, T.ravel(), H.ravel(), d.ravel(), u.ravel())
+
+    z, cosa, sina, converged, numIter =\
+        FWTCALC(Hnon, Hoverd, unon, nstep, n, celdef)
+    z[~converged] = np.nan
+
+    with np.errstate(invalid="ignore"):
+        results = FWTRSLT(z, n, H.ravel(), g, rho, cosa, d.ravel())
+
+    ft = results[-1]
+    results = [val.reshape(shape) for val in results[:-1]]
+
+    return results, z.reshape(shape + (2*n + 10,)),\
+        ft.reshape(shape + (n,)), converged.reshape(shape)
+# end FWT_ARRAY
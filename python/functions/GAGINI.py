@@ -1,8 +1,7 @@
 import math
 
+from ASTRO_CACHE import GTERMS_CACHED, NFACS_CACHED, NFACS_YEAR
 from DAYOYR import DAYOYR
-from GTERMS import GTERMS
-from NFACS import NFACS
 
 # Initialize gage-specific information relevant to harmonic constituents
 
@@ -17,12 +16,15 @@ from NFACS import NFACS
 #   epoch: array of epochs for constituents
 #   acst: orbital speeds of constituents [deg/hr]
 #   pcst: number of tide cycles per day per constiuent
+#   yearTable: take the node factors from the per-year table (mid-year
+#              values of the year containing the middle of the record)
+#              instead of evaluating them at the middle of the record
 
 #   OUTPUT
 #   alpha: array of alphas for constituents
 #   fndcst: node factors at middle of record
 
-def GAGINI(ngag,yr,month,day,hr,tlhrs,glong,epoch,acst,pcst):
+def GAGINI(ngag,yr,month,day,hr,tlhrs,glong,epoch,acst,pcst,yearTable=False):
     # determine Julian day at beginning of record
     dayj=DAYOYR(yr,month,day)
 
@@ -30,10 +32,15 @@ def GAGINI(ngag,yr,month,day,hr,tlhrs,glong,epoch,acst,pcst):
     hrmid=hr+(tlhrs/2.0)
 
     #determine node factors at middle of record
-    fndcst=NFACS(yr,dayj,hrmid)
+    if yearTable:
+        daysInYear=DAYOYR(yr,12,31)
+        yrmid=yr+int(math.floor((dayj-1+hrmid/24.0)/daysInYear))
+        fndcst=NFACS_YEAR(yrmid)
+    else:
+        fndcst=NFACS_CACHED(yr,dayj,hrmid)
 
     #determine greenwich equilibrium terms at beginnong of record
-    eqcst=GTERMS(yr,dayj,hr,dayj,hrmid)
+    eqcst=GTERMS_CACHED(yr,dayj,hr,dayj,hrmid)
 
     #determine alpha values
     alpha = [[0.0 for j in range(ngag)] for i in range(len(eqcst))]
@@ -144,8 +144,9 @@ def GODA(Ho, dloc, Ts, S, direc, g):
             Hop = Ho
             M = 2
             d = dswl + eta
+            # d does not change in the setup iteration
+            Kreff = GODA4(direc, Ts, d, Ho, g)
             while diff2 >= 0.07:
-                Kreff = GODA4(direc, Ts, d, Ho, g)
                 sbrms = 0.01 * Hop / math.sqrt(Hop / Lo * (1.0 + d / Hop))
                 A2 = (1.416 / Ks)**2
                 p = [0.0 for loopIndex in range(150)]
@@ -196,7 +197,6 @@ def GODA(Ho, dloc, Ts, S, direc, g):
                 if diff2 > 0.07:
                     eta = etan
 
-            dL = GODA5(dLo)
             L = d / dL
             Cs = L / Ts
             argum = Cs / Cso * math.sin(direcr)
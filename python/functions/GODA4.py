@@ -1,4 +1,5 @@
 import math
+import numpy as np
 from GODA5 import GODA5
 
 
@@ -19,32 +20,31 @@ def GODA4(direc, Ts, d, Hdeep, g):
     d25 = [0.02, 0.06, 0.23, 0.38, 0.23, 0.06, 0.02]
     d75 = [0.00, 0.02, 0.18, 0.60, 0.18, 0.02, 0.00]
     theta = [0.0 for i in range(8)]
-    Cr = []
     kr = []
     [kr.append([]) for i in range(7)]
     sumsqkr = []
 
-    for i in range(7):
-        direcr = direc * deg2rad
+    # The frequency components are the same for every direction
+    jIndex = np.arange(1, M + 1)
+    F = (1.007 / Ts) * (np.log(2.0 * M / (2.0 * jIndex - 1))**(-0.25))
+    omg = 2.0 * math.pi * F
+    T = 2.0 * math.pi / omg
+    Lo = (g / (2.0 * math.pi)) * T**2
+    Co = Lo / T
+    dL = GODA5(d / Lo)
+    L = d / dL
+    Cr = L / T
 
-        for j in range(10):
-            if j == 0:
-                if direcr > 0:
-                    theta[0] = (direcr - (67.5 * deg2rad))
-                else:
-                    theta[0] = -(abs(direcr) + (67.5 * deg2rad))
+    direcr = direc * deg2rad
+    if direcr > 0:
+        theta[0] = (direcr - (67.5 * deg2rad))
+    else:
+        theta[0] = -(abs(direcr) + (67.5 * deg2rad))
 
-            F = (1.007 / Ts) * (math.log(2.0 * M / (2.0 * (j + 1) - 1))**(-0.25))
-            omg = 2.0 * math.pi * F
-            T = 2.0 * math.pi / omg
-            Lo = (g / (2.0 * math.pi)) * T**2
-            Co = Lo / T
-            dLo = d / Lo
-            dL = GODA5(dLo)
-            L = d / dL
-            Cr.append(L / T)
+    for i in range(7):
+        for j in range(10):
             th = theta[i]
-            argu = (Cr[j] / Co) * math.sin(th)
+            argu = (Cr[j] / Co[j]) * math.sin(th)
             if abs(argu) > 1.00:
                 argu = 0.9999999
             theta2 = math.asin(argu)
@@ -65,12 +65,13 @@ def GODA4(direc, Ts, d, Hdeep, g):
     Kreff2 = 1.0
     N = 0
 
+    Los = (g / (2.0 * math.pi)) * Ts**2
+    dLos = d / Los
+    dLs = GODA5(dLos)
+    L = d / dLs
+
     while diff > 0.005 and N <= 20:
-        Los = (g / (2.0 * math.pi)) * Ts**2
-        dLos = d / Los
-        dLs = GODA5(dLos)
         H = Kreff2 * Hdeep
-        L = d / dLs
         HL = H / L
 
         if Ts <= 10.0:
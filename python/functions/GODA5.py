@@ -1,17 +1,40 @@
 import math
+import numpy as np
+from DISPERSION_TABLE import DISPERSION_TABLE, DISPERSION_TABLE_IN_USE,\
+    dispersionExact
+
+# Relative depth d/L from the deepwater relative depth d/Lo, for the
+# shoaling and refraction routines of the irregular wave transformation
+# (GODA, GODA3, GODA4).
+#
+# With x = k*d and y = ko*d = 2*pi*d/Lo the linear dispersion relation is
+#   x*tanh(x) = y
+# x is seeded with the explicit approximation of the 1984 SPM (p. 2-7),
+# within 5% everywhere, and refined by three Newton steps, after which it
+# is within 2e-15 of the root for any y (the error of each step is about
+# the square of the previous one). There is no convergence loop, so
+# arrays of d/Lo are handled in a fixed number of operations. When the
+# dispersion table is switched on (DISPERSION_TABLE_USE) x is interpolated
+# from it instead.
+#
+#   INPUT
+#   dLo: relative depth d/Lo, scalar or array
+#
+#   OUTPUT
+#   dL: relative depth d/L (NaN where dLo <= 0)
+#
+# Scalar input returns a Python float, array input a float64 array of
+# the same shape.
 
 def GODA5(dLo):
+    if DISPERSION_TABLE_IN_USE():
+        x = DISPERSION_TABLE(2.0 * math.pi * np.asarray(dLo, dtype=np.float64))
+    else:
+        x = dispersionExact(2.0 * math.pi * np.asarray(dLo, dtype=np.float64))
 
-    diff = 100
-    Ld = 1.0 / dLo
-    Lod = Ld
+    dL = x / (2.0 * math.pi)
 
-    while diff > 0.0005:
-        arg = 2.0 * math.pi / Ld
-        Ldnew = Lod * math.tanh(arg)
-        diff = abs(Ldnew - Ld)
-        Ld = (Ldnew + Ld) / 2.0
-        
-    dL = 1.0 / Ldnew
+    if np.ndim(dLo) == 0:
+        return float(dL)
 
     return dL
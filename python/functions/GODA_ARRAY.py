@@ -0,0 +1,602 @@
+import math
+import numpy as np
+
+from GODA5 import GODA5
+
+# Array version of GODA. Transforms many random sea states (Ho, Ts, S,
+# direc) down their profiles to the depths dloc at once, following the
+# same depth march, setup iteration, shoaling (GODA3), refraction (GODA4),
+# statistics (GODA2) and d/L (GODA5) calculations as GODA.
+
+# Sea states are processed in blocks, all stepping together; each keeps
+# its own depth increment, setup and shoaling state and drops out of the
+# block once it reaches its depth. At each depth step the breaking-modified
+# height distribution of the eight surf beat levels,
+#   q_j(x) = b(x)                                   x <= x2_j
+#          = b(x) - (x - x2_j)/(x1_j - x2_j)*c_j    x2_j < x <= x1_j
+#          = 0                                      x > x1_j
+# with b(x) = 2*A2*x*exp(-A2*x^2) on the same 150 bins for every level,
+# is summed over the levels as
+#   p(x) = b(x)*W(x) - x*A(x) + B(x)
+# where W, A and B are sums of level weights over the levels for which
+# the bin lies in each segment, built from difference arrays. The sums of
+# q_j come from prefix sums of b and x, so the (8 x 150) distribution is
+# never formed.
+
+# Input required in centimeters
+
+#   INPUT
+#   Ho: deepwater significant wave height
+#   dloc: water depth of interest
+#   Ts: significant wave period
+#   S: nearshore slope
+#   direc: principal direction of incident waves [deg]
+#   g: gravitational acceleration
+#   cdf: also return the cumulative height distributions used for
+#        plotting (computed per sea state, intended for few sea states)
+#   blockSize: number of sea states stepped together
+#   numWorkers: number of worker processes the blocks are spread over
+#   kreffTable: take the refraction coefficient from the interpolated
+#               table of KREFF_TABLE instead of computing it (GODA4)
+
+#   OUTPUT (as GODA; pairs are (deep water, dloc), shape (2,) + shape of
+#   the broadcast input, other values have the shape of the input. For
+#   scalar input the values are floats and pairs are lists, as in GODA.)
+#   Ks: shoaling coefficient
+#   Kr: effective refraction coefficient at dloc
+#   Hmax, Hrms, Hmean, Hsig, H10, H02: wave height statistics
+#   SB: rms surf beat
+#   HoLo: deepwater wave steepness
+#   dLo: relative depth d/Lo
+#   dHo: relative depth d/Ho
+#   xsave: starting depth of the march
+#   theta2d: principal wave direction [deg]
+#   eta: setup
+#   Sea states whose depth reaches zero with the setup (waves broken
+#   before dloc) stop there and give NaN.
+#   Ht1, cdf1, Ht2, cdf2: (only with cdf set) wave heights and cumulative
+#       probabilities in deep water and at dloc, one list per sea state
+
+sbn = np.array([3.2831, 2.3158, 1.3832, 0.4599, -0.4599, -1.3832, -2.3158, -3.2831])
+delp = np.array([0.0014, 0.0214, 0.1359, 0.3413, 0.3413, 0.1359, 0.0214, 0.0014])
+
+# Directional spreading weights of GODA4
+d10 = np.array([0.05, 0.11, 0.21, 0.26, 0.21, 0.11, 0.05])
+d25 = np.array([0.02, 0.06, 0.23, 0.38, 0.23, 0.06, 0.02])
+d75 = np.array([0.00, 0.02, 0.18, 0.60, 0.18, 0.02, 0.00])
+
+pairKeys = ["Ks", "Hmax", "Hrms", "Hmean", "Hsig", "H10", "H02", "SB",\
+    "dLo", "dHo", "theta2d", "eta"]
+
+def GODA_ARRAY(Ho, dloc, Ts, S, direc, g, cdf = False, blockSize = 2048,\
+    numWorkers = 1, kreffTable = False):
+    isScalar = all([np.ndim(val) == 0 for val in [Ho, dloc, Ts, S, direc]])
+
+    inputList = np.broadcast_arrays(*[np.asarray(val, dtype=np.float64)\
+        for val in [Ho, dloc, Ts, S, direc]])
+    shape = inputList[0].shape
+    inputList = [val.ravel() for val in inputList]
+    numSea = len(inputList[0])
+
+    blockList = []
+    for blockStart in range(0, numSea, blockSize):
+        blockList.append([val[blockStart:(blockStart + blockSize)]\
+            for val in inputList] + [g, cdf, kreffTable])
+
+    # Built or loaded once here rather than in every worker
+    if kreffTable:
+        from KREFF_TABLE import KREFF_TABLE_LOAD
+        KREFF_TABLE_LOAD()
+
+    if numWorkers > 1 and len(blockList) > 1:
+        import concurrent.futures
+
+        with concurrent.futures.ProcessPoolExecutor(numWorkers) as executor:
+            futureList = [executor.submit(godaBlock, *block)\
+                for block in blockList]
+            resultList = [future.result() for future in futureList]
+    else:
+        resultList = [godaBlock(*block) for block in blockList]
+
+    outDict = {}
+    for key in resultList[0].keys():
+        if key in ["Ht1", "cdf1", "Ht2", "cdf2"]:
+            outDict[key] = sum([result[key] for result in resultList], [])
+        else:
+            outDict[key] = np.concatenate([result[key]\
+                for result in resultList], axis=-1)
+
+    outputList = []
+    for key in ["Ks", "Kr", "Hmax", "Hrms", "Hmean", "Hsig", "H10",\
+        "H02", "SB", "HoLo", "dLo", "dHo", "xsave", "theta2d", "eta"]:
+        if isScalar:
+            outputList.append(outDict[key][..., 0].tolist())
+        elif key in pairKeys:
+            outputList.append(outDict[key].reshape((2,) + shape))
+        else:
+            outputList.append(outDict[key].reshape(shape))
+
+    if cdf:
+        for key in ["Ht1", "cdf1", "Ht2", "cdf2"]:
+            if isScalar:
+                outputList.append(outDict[key][0])
+            else:
+                outputList.append(outDict[key])
+
+    return tuple(outputList)
+# end GODA_ARRAY
+
+# Runs the depth march for one block of sea states
+def godaBlock(Ho, dloc, Ts, S, direc, g, cdf, kreffTable):
+    deg2rad = math.pi / 180
+    nb = len(Ho)
+
+    # KREFF_TABLE imports this module
+    if kreffTable:
+        from KREFF_TABLE import KREFF_TABLE
+
+    outDict = {}
+    for key in pairKeys:
+        outDict[key] = np.zeros((2, nb))
+    outDict["Kr"] = np.zeros(nb)
+
+    # Calcuate deepwater wavelength
+    Lo = (g / (2 * math.pi)) * Ts**2
+    xsave = np.maximum(Lo, 20 * Ho)
+    d = xsave.copy()
+
+    # Calculate deepwater wave steepness
+    HoLo = Ho / Lo
+    outDict["HoLo"] = HoLo
+    outDict["xsave"] = xsave
+
+    direcr = direc * deg2rad
+    Seff = S / np.cos(direcr)
+    Cso = Lo / Ts
+
+    Csave = np.zeros(nb)
+    itest = np.zeros(nb, dtype=int)
+    ym1 = np.ones(nb)
+    ym2 = np.zeros(nb)
+    etam1 = np.zeros(nb)
+    etam2 = np.zeros(nb)
+    zm1 = np.zeros(nb)
+    M = np.zeros(nb, dtype=int)
+    deld = np.zeros(nb)
+    broken = np.zeros(nb, dtype=bool)
+
+    if cdf:
+        cdfLists = [[[], [], [], []] for i in range(nb)]
+        jpn = np.zeros(nb, dtype=int)
+
+    N = 0
+    active = d > dloc
+    while active.any():
+        idx = np.flatnonzero(active)
+
+        deld[idx] = np.where(M[idx] == 1, xsave[idx] / 100.0,\
+            np.where(M[idx] == 2, xsave[idx] / 500.0, deld[idx]))
+        if N != 0:
+            d[idx] = d[idx] - deld[idx]
+
+        dI = d[idx]
+        y = Seff[idx] * (xsave[idx] - dI)
+
+        #Find still water depth at location y
+        dswl = dI
+        dHo = dswl / Ho[idx]
+
+        N = N + 1
+
+        diffy = ym1[idx] - ym2[idx]
+        diffy = np.where(np.isclose(diffy, 0.0), 0.125, diffy)
+
+        eta = etam1[idx] + (y - ym1[idx]) * (etam1[idx] - etam2[idx]) / diffy
+        dLo = dI / Lo[idx]
+
+        dL = GODA5(dLo)
+
+        #Final coefficient of shoaling by method of Shuto
+        Ks, Csave[idx], itest[idx] = godaShoal(Ts[idx], Ho[idx], dI, g,\
+            Csave[idx], itest[idx])
+
+        deep = (dLo > 0.5) & (N != 1) & (dI > (dloc[idx] + 30))
+
+        # Deep water, only the direction is updated
+        if deep.any():
+            sub = idx[deep]
+            ym1[sub] = y[deep]
+            M[sub] = 1
+            L = dI[deep] / dL[deep]
+            Cs = L / Ts[sub]
+            argum = Cs / Cso[sub] * np.sin(direcr[sub])
+            theta2 = np.arcsin(argum)
+            Seff[sub] = S[sub] / np.cos(theta2)
+
+        shallow = ~deep
+        if shallow.any():
+            sub = idx[shallow]
+            Hop = Ho[sub]
+            M[sub] = 2
+            dswlS = dswl[shallow]
+            etaS = eta[shallow]
+            dS = dswlS + etaS
+            d[sub] = dS
+            broken[sub[~(dS > 0.0)]] = True
+            dLS = dL[shallow]
+
+            if kreffTable:
+                Kreff = KREFF_TABLE(direc[sub], Ts[sub], dS, Ho[sub], g)
+            else:
+                Kreff = godaKreff(direc[sub], Ts[sub], dS, Ho[sub], g)
+            A2 = (1.416 / Ks[shallow])**2
+
+            stepDict = godaSetup(etaS, dswlS, dS, Lo[sub], Seff[sub], Hop,\
+                Kreff, A2, dLS, etam1[sub], zm1[sub])
+            etaS = stepDict["eta"]
+
+            L = dS / dLS
+            Cs = L / Ts[sub]
+            argum = Cs / Cso[sub] * np.sin(direcr[sub])
+            theta2 = np.arcsin(argum)
+            theta2d = theta2 / deg2rad
+            Seff[sub] = S[sub] / np.cos(theta2)
+
+            slot = 0 if N == 1 else 1
+            outDict["Ks"][slot, sub] = Ks[shallow]
+            if N != 1:
+                outDict["Kr"][sub] = Kreff
+            for key in ["Hmax", "Hrms", "Hmean", "Hsig", "H10", "H02"]:
+                outDict[key][slot, sub] = stepDict[key]
+            outDict["SB"][slot, sub] = stepDict["sbrms"]
+            outDict["dLo"][slot, sub] = dLo[shallow]
+            outDict["dHo"][slot, sub] = dHo[shallow]
+            outDict["theta2d"][slot, sub] = theta2d
+            outDict["eta"][slot, sub] = etaS
+
+            if cdf:
+                for i in range(len(sub)):
+                    jpn[sub[i]] = jpn[sub[i]] + 1
+                    listIndex = 0 if jpn[sub[i]] == 1 else 2
+                    godaCdf(stepDict["p"][i], stepDict["sump"][i],\
+                        stepDict["delxx"][i], Hop[i], stepDict["Hsig"][i],\
+                        cdfLists[sub[i]][listIndex],\
+                        cdfLists[sub[i]][listIndex + 1])
+
+            zm1[sub] = stepDict["z"]
+            etam2[sub] = etam1[sub]
+            etam1[sub] = stepDict["etan"]
+            ym2[sub] = ym1[sub]
+            ym1[sub] = y[shallow]
+        # end if
+
+        active[idx] = d[idx] > dloc[idx]
+    # end while loop
+
+    for key in pairKeys:
+        outDict[key][1, broken] = np.nan
+    outDict["Kr"][broken] = np.nan
+
+    if cdf:
+        outDict["Ht1"] = [cdfList[0][1:] for cdfList in cdfLists]
+        outDict["cdf1"] = [cdfList[1][1:] for cdfList in cdfLists]
+        outDict["Ht2"] = [cdfList[2][1:] for cdfList in cdfLists]
+        outDict["cdf2"] = [cdfList[3][1:] for cdfList in cdfLists]
+
+    return outDict
+# end godaBlock
+
+# Setup iteration at one depth step: the height distribution is computed
+# with the current setup, a new setup is found from the radiation stress,
+# and sea states whose setup changed by more than 7% are repeated
+def godaSetup(eta, dswl, d, Lo, Seff, Hop, Kreff, A2, dL, etam1, zm1):
+    n = len(eta)
+    eta = eta.copy()
+
+    stepDict = {"eta": eta, "p": np.zeros((n, 150))}
+    for key in ["Hmax", "Hrms", "Hmean", "Hsig", "H10", "H02", "etan", "z",\
+        "sbrms", "delxx", "sump"]:
+        stepDict[key] = np.zeros(n)
+
+    slopeTerm = 1.0 + 15.0 * ((1 / Seff)**(4.0 / 3.0))
+
+    it = np.arange(n)
+    for loopCount in range(100):
+        sbrms = 0.01 * Hop[it] / np.sqrt(Hop[it] / Lo[it] * (1.0 + d[it] / Hop[it]))
+
+        di = sbrms[:, np.newaxis] * sbn + (dswl[it] + eta[it])[:, np.newaxis]
+        arg = -1.5 * math.pi * di / Lo[it][:, np.newaxis] * slopeTerm[it][:, np.newaxis]
+        arg = np.clip(arg, -100.0, 100.0)
+
+        x1 = 0.18 * (Lo[it] / Hop[it])[:, np.newaxis] * (1.0 - np.exp(arg)) *\
+            Kreff[it][:, np.newaxis]
+        x1 = np.minimum(x1, 2.8)
+
+        p, delxx, x = godaDistribution(x1, A2[it])
+        sump = p.sum(axis=1)
+
+        statDict = godaStats(p, x, Hop[it], sump, dL[it], etam1[it], d[it], zm1[it])
+
+        for key in statDict.keys():
+            stepDict[key][it] = statDict[key]
+        stepDict["p"][it] = p
+        stepDict["sbrms"][it] = sbrms
+        stepDict["delxx"][it] = delxx
+        stepDict["sump"][it] = sump
+
+        etan = statDict["etan"]
+        diff2 = np.abs((etan - eta[it]) / etan)
+        eta[it] = np.where(diff2 > 0.07, etan, eta[it])
+
+        it = it[diff2 >= 0.07]
+        if len(it) == 0:
+            break
+    # end for loop
+
+    return stepDict
+# end godaSetup
+
+# Breaking-modified height distribution summed over the surf beat levels.
+# x1: upper limit of the heights of each level (relative to Hop), (n, 8)
+# Returns the (n, 150) distribution, the bin width and the bin heights.
+def godaDistribution(x1, A2):
+    n = x1.shape[0]
+    rows = np.arange(n)[:, np.newaxis]
+
+    delxx = x1[:, 0] / 150.0
+    x = np.cumsum(np.repeat(delxx[:, np.newaxis], 150, axis=1), axis=1)
+    x2 = (2.0 / 3.0) * x1
+
+    A2 = A2[:, np.newaxis]
+    base = 2.0 * A2 * x * np.exp(np.clip(-A2 * (x**2), -100.0, 100.0))
+    c = 2.0 * A2 * x1 * np.exp(np.clip(-A2 * (x1**2), -100.0, 100.0))
+
+    # Bins with x <= x2 and x <= x1 for each level
+    k2 = (x[:, np.newaxis, :] <= x2[:, :, np.newaxis]).sum(axis=2)
+    k1 = (x[:, np.newaxis, :] <= x1[:, :, np.newaxis]).sum(axis=2)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.where(x1 > x2, c / (x1 - x2), 0.0)
+
+    zero = np.zeros((n, 1))
+    cumBase = np.concatenate((zero, np.cumsum(base, axis=1)), axis=1)
+    cumX = np.concatenate((zero, np.cumsum(x, axis=1)), axis=1)
+
+    sumq = cumBase[rows, k1] - slope * (cumX[rows, k1] - cumX[rows, k2] -\
+        x2 * (k1 - k2))
+
+    use = (x1 > 0.0) & (sumq > 0.0)
+    fact = np.where(use, delp / np.where(use, sumq, 1.0), 0.0)
+
+    # Difference arrays of the level weights over the bins
+    W = np.zeros((n, 151))
+    A = np.zeros((n, 151))
+    B = np.zeros((n, 151))
+    rowIndex = np.repeat(np.arange(n), 8)
+    np.add.at(W, (rowIndex, np.zeros(n*8, dtype=int)), fact.ravel())
+    np.add.at(W, (rowIndex, k1.ravel()), -fact.ravel())
+    np.add.at(A, (rowIndex, k2.ravel()), (fact * slope).ravel())
+    np.add.at(A, (rowIndex, k1.ravel()), -(fact * slope).ravel())
+    np.add.at(B, (rowIndex, k2.ravel()), (fact * slope * x2).ravel())
+    np.add.at(B, (rowIndex, k1.ravel()), -(fact * slope * x2).ravel())
+    W = np.cumsum(W, axis=1)[:, :150]
+    A = np.cumsum(A, axis=1)[:, :150]
+    B = np.cumsum(B, axis=1)[:, :150]
+
+    p = base * W - x * A + B
+
+    return p, delxx, x
+# end godaDistribution
+
+# Wave and setup statistics of the distributions p (as GODA2)
+def godaStats(p, x, Hop, sump, dL, etam1, d, zm1):
+    w = p / sump[:, np.newaxis]
+    cump = np.cumsum(w, axis=1)
+    xH = x * Hop[:, np.newaxis] * w
+
+    statDict = {}
+    statDict["Hsig"] = np.where(cump > 0.666, xH * 3, 0.0).sum(axis=1)
+    statDict["H10"] = np.where(cump > 0.90, xH * 10, 0.0).sum(axis=1)
+    statDict["H02"] = np.where(cump > 0.98, xH * 50, 0.0).sum(axis=1)
+    statDict["Hmax"] = np.where(cump > 0.996, xH * 250, 0.0).sum(axis=1)
+    statDict["Hmean"] = xH.sum(axis=1)
+    Hrms = np.sqrt((x**2 * w).sum(axis=1)) * Hop
+    statDict["Hrms"] = Hrms
+
+    z = 1.0 / 8.0 * Hrms**2 * (0.5 + 4.0 * math.pi * dL / (np.sinh(4.0 * math.pi * dL)))
+    etan = etam1 - (1.0 / d * (z - zm1)) * 0.7
+    statDict["etan"] = np.where(np.abs(etan) < 10.0**(-20), 0.000001, etan)
+    statDict["z"] = z
+
+    return statDict
+# end godaStats
+
+# Shoaling coefficient by the method of Shuto (as GODA3). itest is the
+# stage of each sea state (0 linear, 1 and 2 Shuto's nonlinear shoaling)
+# and Csave the constant carried between stages.
+def godaShoal(Ts, Hdeep, d, g, Csave, itest):
+    Lo = (g / (2 * math.pi)) * Ts**2
+    dLo = d / Lo
+    dL = GODA5(dLo)
+    n = 0.5 * (1 + 4 * math.pi * dL / np.sinh(4 * math.pi * dL))
+    L = d / dL
+    C = L / Ts
+    Co = (g / (2 * math.pi)) * Ts
+    Ks = np.sqrt(0.5 / n * Co / C)
+    H = Hdeep * Ks
+    F = 980 * H * Ts**2 / (d**2)
+
+    Csave = Csave.copy()
+    itestNew = itest.copy()
+
+    stage = itest == 0
+    change = stage & (F >= 30)
+    itestNew[change] = 1
+    Csave[change] = H[change] * d[change]**(2 / 7)
+
+    stage = itest == 1
+    if stage.any():
+        Ks1 = Csave[stage] / (d[stage]**(2 / 7) * H[stage])
+        H1 = Hdeep[stage] * Ks1
+        F1 = 980 * H1 * Ts[stage]**2 / (d[stage]**2)
+        Ks[stage] = Ks1
+
+        change = np.flatnonzero(stage)[F1 >= 50]
+        changeSub = F1 >= 50
+        itestNew[change] = 2
+        Csave[change] = H1[changeSub] * d[change]**(5 / 2) *\
+            (np.sqrt(980 * H1[changeSub] * Ts[change]**2 / (d[change]**2)) - 2 * (math.sqrt(3)))
+
+    it = np.flatnonzero(itest == 2)
+    Hn = H.copy()
+    while len(it) > 0:
+        HnI = Csave[it] / (d[it]**(5 / 2) *\
+            (np.sqrt(980 * H[it] * Ts[it]**2 / (d[it]**2)) - 2 * math.sqrt(3)))
+        del1 = np.abs((HnI - H[it]) / HnI)
+        Hn[it] = HnI
+        H[it] = HnI
+        it = it[del1 >= 0.05]
+    stage = itest == 2
+    Ks[stage] = Hn[stage] / Hdeep[stage]
+
+    return Ks, Csave, itestNew
+# end godaShoal
+
+# Effective refraction coefficient (as GODA4)
+def godaKreff(direc, Ts, d, Hdeep, g):
+    sumkr = godaKreffSums(direc, Ts, d, g)
+
+    Los = (g / (2.0 * math.pi)) * Ts**2
+    dLs = GODA5(d / Los)
+    L = d / dLs
+
+    return godaKreffIter(sumkr, Ts, Hdeep, L)
+# end godaKreff
+
+# Squared refraction coefficients of the 7 directions x 10 frequencies
+# of the spectrum, summed with the d10, d25 and d75 directional spreading
+# weights, shape (3, n). They depend on direc and d/Lo only.
+def godaKreffSums(direc, Ts, d, g):
+    deg2rad = math.pi / 180.0
+    M = 10
+    n = len(d)
+
+    # Frequency components (n, 10)
+    jIndex = np.arange(1, 11)
+    F = (1.007 / Ts[:, np.newaxis]) *\
+        (np.log(2.0 * M / (2.0 * jIndex - 1))**(-0.25))
+    omg = 2.0 * math.pi * F
+    T = 2.0 * math.pi / omg
+    Lo = (g / (2.0 * math.pi)) * T**2
+    Co = Lo / T
+    dL = GODA5(d[:, np.newaxis] / Lo)
+    L = d[:, np.newaxis] / dL
+    Cr = L / T
+
+    # Direction components (n, 7)
+    direcr = direc * deg2rad
+    theta = np.empty((n, 7))
+    theta[:, 0] = np.where(direcr > 0, direcr - (67.5 * deg2rad),\
+        -(np.abs(direcr) + (67.5 * deg2rad)))
+    for i in range(6):
+        theta[:, i + 1] = theta[:, i] + (22.5 * deg2rad)
+
+    th = theta[:, :, np.newaxis]
+    argu = (Cr / Co)[:, np.newaxis, :] * np.sin(th)
+    argu = np.where(np.abs(argu) > 1.00, 0.9999999, argu)
+    theta2 = np.arcsin(argu)
+    theta2 = np.where(th >= (math.pi / 2.0), math.pi - theta2, theta2)
+    theta2 = np.where(th <= (-math.pi / 2.0), -(math.pi - theta2), theta2)
+    argm = np.cos(th) / np.cos(theta2)
+    sumsqkr = (np.abs(argm)).sum(axis=2)
+
+    return np.stack((sumsqkr.dot(d10 / 10.0), sumsqkr.dot(d25 / 10.0),\
+        sumsqkr.dot(d75 / 10.0)))
+# end godaKreffSums
+
+# Kreff from the sums of godaKreffSums. Ts <= 10 s uses the d10 weights;
+# longer periods use d25 where H/L > 0.02 and d75 otherwise, with
+# H = Kreff*Hdeep found by fixed-point iteration.
+def godaKreffIter(sumkr, Ts, Hdeep, L):
+    n = len(Ts)
+
+    Kreff2 = np.ones(n)
+    Kreff = np.ones(n)
+    it = np.arange(n)
+    for N in range(21):
+        H = Kreff2[it] * Hdeep[it]
+        HL = H / L[it]
+
+        sumkrI = np.where(Ts[it] <= 10.0, sumkr[0, it],\
+            np.where(HL > 0.02, sumkr[1, it], sumkr[2, it]))
+
+        KreffI = np.sqrt(sumkrI)
+        diff = np.abs(Kreff2[it] - KreffI) / Kreff2[it]
+        Kreff[it] = KreffI
+        Kreff2[it] = KreffI
+
+        it = it[diff > 0.005]
+        if len(it) == 0:
+            break
+
+    return Kreff
+# end godaKreffIter
+
+# Cumulative distribution of the heights of one sea state at one depth,
+# written over the start of HtList / cdfList (as in GODA, entries beyond
+# the new ones are left from earlier depths)
+def godaCdf(p, sump, delxx, Hop, Hsig, HtList, cdfList):
+    x = 0.0
+    if Hsig < 20.0:
+        delh = 1.0
+    elif Hsig < 50.0:
+        delh = 2.0
+    else:
+        delh = 10.0
+
+    ijk = 0
+    H1 = 0
+    cump1 = 0
+
+    for i in range(150):
+        x = x + delxx
+        H2 = x * Hop
+        cump2 = cump1 + p[i] / sump
+        if cump2 > 0.9999:
+            cump1 = cump2
+            H1 = H2
+        else:
+            i1 = H1 / delh
+            i2 = H2 / delh
+
+            is1 = i2 - i1
+            if is1 == 0:
+                cump1 = cump2
+                H1 = H2
+            elif is1 > 0:
+                if is1 < 1:
+                    is1 = 1
+
+                for it in range(int(is1)):
+                    Ht = delh * (i1 + it)
+
+                    if np.isclose(H1, H2):
+                        cump = float('inf')
+                    else:
+                        cump = cump1 + (Ht - H1) / (H2 - H1) * (cump2 - cump1)
+
+                    if cump > 0.999:
+                        cump1 = cump2
+                        H1 = H2
+                    else:
+                        if len(HtList) < ijk + 1:
+                            HtList.append(0.0)
+                            cdfList.append(0.0)
+                        HtList[ijk] = Ht
+                        cdfList[ijk] = cump
+
+                        ijk = ijk + 1
+                cump1 = cump2
+                H1 = H2
+    # end for loop
+# end godaCdf
@@ -0,0 +1,161 @@
+import math
+import numpy as np
+import scipy.special as sp
+
+from ERRMASK import ERRMASK_BROKEN, ERRMASK_CODES, ERRMASK_STEEP
+from ERRMASK import ERRCODE_OK, ERRCODE_BROKEN, ERRCODE_UNSTABLE, ERRCODE_RANGE
+from WAVELEN import WAVELEN
+
+# Wave height statistics of the Rayleigh / Beta-Rayleigh distribution
+# (page 1-2 of ACES User's Guide) for one or many sea states at once.
+
+# Deep and intermediate water (d/gT^2 > 0.01) use the Rayleigh
+# distribution with Hrms = Hmo/sqrt(2). With x = H/Hrms,
+#   P(H < h) = 1 - exp(-x^2)
+#   int_h^inf H p(H) dH = Hrms*(x*exp(-x^2) + sqrt(pi)/2*erfc(x))
+# Shallow water uses the Beta-Rayleigh distribution, for which
+# u = (H/Hb)^2 follows a beta distribution with parameters (alpha, beta),
+#   P(H < h) = I_u(alpha, beta)
+#   int_h^Hb H p(H) dH = Hb*B(alpha + 1/2, beta)/B(alpha, beta)*
+#                        (1 - I_u(alpha + 1/2, beta))
+# so the median is a quantile and H1/n is the partial moment above the
+# (1 - 1/n) quantile divided by 1/n.
+
+#   INPUT
+#   Hmo: zero-moment wave height, scalar or array
+#   Tp: peak wave period, scalar or array
+#   d: water depth, scalar or array
+#   g: gravitational acceleration
+
+#   OUTPUT (broadcast shape of the input)
+#   Hrms: root-mean-square wave height
+#   Hmed: median wave height
+#   H13: average of the 1/3 highest waves
+#   H110: average of the 1/10 highest waves
+#   H1100: average of the 1/100 highest waves
+#   isRayleigh: True where the Rayleigh distribution applies
+#   errorCode: ERRCODE_* code of ERRMASK, ERRCODE_OK (0) valid,
+#              ERRCODE_BROKEN (1) wave broken (Hmo >= 0.9*d),
+#              ERRCODE_UNSTABLE (2) wave unstable (H/L >= maximum
+#              steepness), ERRCODE_RANGE (5) d/gT^2 approaching infinity.
+#              The statistics are NaN where errorCode is not 0.
+
+#   OTHERS
+#   Hb: largest wave height of the Beta-Rayleigh distribution (= d)
+#   alpha, beta: Beta-Rayleigh distribution parameters
+
+def HTSTAT(Hmo, Tp, d, g):
+    isScalar = np.ndim(Hmo) == 0 and np.ndim(Tp) == 0 and np.ndim(d) == 0
+
+    Hmo, Tp, d = np.broadcast_arrays(np.asarray(Hmo, dtype=np.float64),\
+        np.asarray(Tp, dtype=np.float64), np.asarray(d, dtype=np.float64))
+    shape = Hmo.shape
+    Hmo, Tp, d = Hmo.ravel(), Tp.ravel(), d.ravel()
+
+    L, k = WAVELEN(d, Tp, 50, g)
+    stable, steep, maxstp = ERRMASK_STEEP(Hmo, d, L)
+
+    errorCode, checkIndex = ERRMASK_CODES([\
+        (ERRMASK_BROKEN(Hmo, 0.9*d), ERRCODE_BROKEN),\
+        (stable, ERRCODE_UNSTABLE)])
+
+    dterm = d/(g*Tp**2)
+    isRayleigh = dterm > 0.01
+
+    Hrms = np.full(Hmo.shape, np.nan)
+    Hmed = np.full(Hmo.shape, np.nan)
+    Hout = np.full((3,) + Hmo.shape, np.nan)
+
+    fracList = [1.0/3.0, 1.0/10.0, 1.0/100.0]
+
+    # Rayleigh distribution
+    index = isRayleigh & (errorCode == ERRCODE_OK)
+    if index.any():
+        HrmsR = Hmo[index]/math.sqrt(2.0)
+
+        Hrms[index] = HrmsR
+        Hmed[index] = HrmsR*math.sqrt(math.log(2.0))
+        for i in range(len(fracList)):
+            x = math.sqrt(-math.log(fracList[i]))
+            Hout[i][index] = HrmsR*(x*math.exp(-x**2) +\
+                0.5*math.sqrt(math.pi)*sp.erfc(x))/fracList[i]
+
+    # Beta-Rayleigh distribution
+    index = ~isRayleigh & (errorCode == ERRCODE_OK)
+    if index.any():
+        HmoB = Hmo[index]
+        Hb = d[index]
+        dtermB = dterm[index]
+
+        d1 = 0.00089*dtermB**(-0.834)
+        d2 = 0.000098*dtermB**(-1.208)
+        valid = (d1 <= 35.0) & (d2 <= 35.0)
+
+        with np.errstate(over="ignore", divide="ignore", invalid="ignore"):
+            HrmsB = (1.0/math.sqrt(2.0))*np.exp(d1)*HmoB # root-mean-square wave height
+            Hrmsq = (1.0/math.sqrt(2.0))*np.exp(d2)*HmoB**2 # root-mean-quad wave height
+
+            K1 = (HrmsB/Hb)**2
+            K2 = (Hrmsq**2)/(Hb**4)
+
+            alpha = (K1*(K2 - K1))/(K1**2 - K2)
+            beta = ((1.0 - K1)*(K2 - K1))/(K1**2 - K2)
+        valid = valid & (alpha > 0.0) & (beta > 0.0)
+
+        alpha = np.where(valid, alpha, 1.0)
+        beta = np.where(valid, beta, 1.0)
+        momentRatio = np.exp(sp.betaln(alpha + 0.5, beta) - sp.betaln(alpha, beta))
+
+        HmedB = Hb*np.sqrt(sp.betaincinv(alpha, beta, 0.5))
+        HoutB = []
+        for i in range(len(fracList)):
+            u = sp.betaincinv(alpha, beta, 1.0 - fracList[i])
+            HoutB.append(Hb*momentRatio*\
+                sp.betaincc(alpha + 0.5, beta, u)/fracList[i])
+
+        subIndex = np.flatnonzero(index)
+        errorCode[subIndex[~valid]] = ERRCODE_RANGE
+        Hrms[subIndex] = np.where(valid, HrmsB, np.nan)
+        Hmed[subIndex] = np.where(valid, HmedB, np.nan)
+        for i in range(len(fracList)):
+            Hout[i][subIndex] = np.where(valid, HoutB[i], np.nan)
+
+    if isScalar:
+        return float(Hrms[0]), float(Hmed[0]), float(Hout[0][0]),\
+            float(Hout[1][0]), float(Hout[2][0]), bool(isRayleigh[0]),\
+            int(errorCode[0])
+
+    return Hrms.reshape(shape), Hmed.reshape(shape), Hout[0].reshape(shape),\
+        Hout[1].reshape(shape), Hout[2].reshape(shape),\
+        isRayleigh.reshape(shape), errorCode.reshape(shape)
+# end HTSTAT
+
+# Probability density of the wave heights for one sea state, on the
+# height grid used for plotting (10,001 points up to sqrt(5)*Hmo for the
+# Rayleigh distribution, 101 points up to d for Beta-Rayleigh)
+def HTSTAT_PDF(Hmo, Tp, d, g):
+    dterm = d/(g*Tp**2)
+
+    if dterm > 0.01:
+        Hrms = Hmo/math.sqrt(2.0)
+        H = np.linspace(0.0, math.sqrt(5.0)*Hmo, 10001)
+        p = np.exp(-(H/Hrms)**2)*(2.0*H)/Hrms**2
+    else:
+        Hb = d
+        Hrms = (1.0/math.sqrt(2.0))*math.exp(0.00089*dterm**(-0.834))*Hmo
+        Hrmsq = (1.0/math.sqrt(2.0))*math.exp(0.000098*dterm**(-1.208))*Hmo**2
+
+        K1 = (Hrms/Hb)**2
+        K2 = (Hrmsq**2)/(Hb**4)
+
+        alpha = (K1*(K2 - K1))/(K1**2 - K2)
+        beta = ((1.0 - K1)*(K2 - K1))/(K1**2 - K2)
+
+        H = np.linspace(0.0, Hb, 101)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            p = (2.0/sp.beta(alpha, beta))*\
+                (H**(2.0*alpha - 1.0)/Hb**(2.0*alpha))*\
+                (1.0 - (H/Hb)**2)**(beta - 1.0)
+
+    return H, p
+# end HTSTAT_PDF
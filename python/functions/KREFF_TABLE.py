@@ -0,0 +1,183 @@
+import math
+import os
+import numpy as np
+
+from GODA5 import GODA5
+from GODA_ARRAY import godaKreff, godaKreffSums, godaKreffIter
+
+# Tabulated effective refraction coefficient (GODA4) for the irregular
+# wave transformation. The squared refraction coefficients of GODA4,
+# summed with each of its three directional spreading weights, depend
+# only on the principal direction and d/Lo (Lo from Ts), so they are
+# tabulated once over
+#   direc: -90 to 90 deg, step 0.5 deg
+#   log10(d/Lo): -4 to 1, step 0.01
+# and bilinearly interpolated. Ts and Hdeep/Lo only choose between the
+# sums, as in GODA4, so Kreff follows from the interpolated sums with the
+# same fixed-point iteration.
+
+# Error bound: when the table is built the interpolated Kreff is checked
+# against GODA4 at the centre and edge midpoints of every cell, and the
+# largest error is stored for each cell. Points in cells whose error
+# exceeds tol, and points outside the table, are computed exactly. The
+# interpolation error elsewhere is about tol at most (1e-4 by default;
+# about 3% of the cells, next to directions where a spectral component
+# travels parallel to the shore, are computed exactly at that tolerance).
+
+# The table is kept in memory and saved to the directory given by the
+# ACES_CACHE_DIR environment variable (~/.cache/aces by default) under a
+# name keyed by its version and grid, so later runs and worker processes
+# load it instead of rebuilding it (a few seconds).
+
+#   INPUT
+#   direc: principal direction of incident waves [deg]
+#   Ts: significant wave period
+#   d: water depth
+#   Hdeep: deepwater significant wave height
+#   g: gravitational acceleration
+#   tol: largest interpolation error accepted
+
+#   OUTPUT
+#   Kreff: effective refraction coefficient
+
+tableVersion = 2
+direcRange = (-90.0, 90.0, 361)
+logdLoRange = (-4.0, 1.0, 501)
+
+kreffTables = {}
+
+def KREFF_TABLE(direc, Ts, d, Hdeep, g, tol = 1.0e-4):
+    isScalar = all([np.ndim(val) == 0 for val in [direc, Ts, d, Hdeep]])
+
+    direc, Ts, d, Hdeep = np.broadcast_arrays(\
+        np.asarray(direc, dtype=np.float64), np.asarray(Ts, dtype=np.float64),\
+        np.asarray(d, dtype=np.float64), np.asarray(Hdeep, dtype=np.float64))
+    shape = direc.shape
+    direc, Ts, d, Hdeep = direc.ravel(), Ts.ravel(), d.ravel(), Hdeep.ravel()
+
+    table = KREFF_TABLE_LOAD()
+    nd = direcRange[2]
+    nl = logdLoRange[2]
+
+    Los = (g / (2.0 * math.pi)) * Ts**2
+    dLo = d / Los
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fi = (direc - direcRange[0]) / (direcRange[1] - direcRange[0]) * (nd - 1)
+        fj = (np.log10(dLo) - logdLoRange[0]) /\
+            (logdLoRange[1] - logdLoRange[0]) * (nl - 1)
+    inside = (fi >= 0.0) & (fi <= nd - 1) & (fj >= 0.0) & (fj <= nl - 1)
+
+    i = np.clip(np.where(inside, fi, 0.0).astype(int), 0, nd - 2)
+    j = np.clip(np.where(inside, fj, 0.0).astype(int), 0, nl - 2)
+    fi = np.where(inside, fi - i, 0.0)
+    fj = np.where(inside, fj - j, 0.0)
+
+    exact = ~inside | (table["cellError"][i, j] > tol)
+
+    sums = table["sums"]
+    sumkr = (1.0 - fi) * (1.0 - fj) * sums[:, i, j] +\
+        fi * (1.0 - fj) * sums[:, i + 1, j] +\
+        (1.0 - fi) * fj * sums[:, i, j + 1] + fi * fj * sums[:, i + 1, j + 1]
+
+    L = d / GODA5(dLo)
+    Kreff = godaKreffIter(sumkr, Ts, Hdeep, L)
+
+    if exact.any():
+        Kreff[exact] = godaKreff(direc[exact], Ts[exact], d[exact],\
+            Hdeep[exact], g)
+
+    if isScalar:
+        return float(Kreff[0])
+
+    return Kreff.reshape(shape)
+# end KREFF_TABLE
+
+# Returns the table, loading it from the cache directory or building and
+# saving it when it is not already in memory
+def KREFF_TABLE_LOAD(cacheDir = None):
+    key = "kreff_table_v%d_%dx%d" % (tableVersion, direcRange[2], logdLoRange[2])
+    if key in kreffTables:
+        return kreffTables[key]
+
+    if cacheDir == None:
+        cacheDir = os.environ.get("ACES_CACHE_DIR",\
+            os.path.join(os.path.expanduser("~"), ".cache", "aces"))
+    filePath = os.path.join(cacheDir, key + ".npz")
+
+    table = None
+    if os.path.isfile(filePath):
+        try:
+            with np.load(filePath) as fileData:
+                table = {"sums": fileData["sums"],\
+                    "cellError": fileData["cellError"]}
+        except (OSError, ValueError, KeyError):
+            table = None
+
+    if table == None:
+        table = kreffTableBuild()
+
+        # Written to a temporary file first so that processes building
+        # the table at the same time do not read a partial file
+        try:
+            os.makedirs(cacheDir, exist_ok=True)
+            tempPath = "%s.%d.tmp.npz" % (os.path.join(cacheDir, key), os.getpid())
+            np.savez(tempPath, sums=table["sums"], cellError=table["cellError"])
+            os.replace(tempPath, filePath)
+        except OSError:
+            pass
+
+    kreffTables[key] = table
+    return table
+# end KREFF_TABLE_LOAD
+
+def KREFF_TABLE_CLEAR():
+    kreffTables.clear()
+
+# Largest error of the cells interpolated at tolerance tol, and the
+# fraction of cells computed exactly instead
+def KREFF_TABLE_ERROR(tol = 1.0e-4):
+    cellError = KREFF_TABLE_LOAD()["cellError"]
+    interpolated = cellError <= tol
+
+    return float(cellError[interpolated].max()), float(1.0 - interpolated.mean())
+
+# Sums of godaKreffSums on the grid, with the largest error of the
+# interpolated Kreff at the centre and edge midpoints of each cell
+def kreffTableBuild():
+    direcGrid = np.linspace(*direcRange)
+    logdLoGrid = np.linspace(*logdLoRange)
+    direcMid = 0.5 * (direcGrid[1:] + direcGrid[:-1])
+    logdLoMid = 0.5 * (logdLoGrid[1:] + logdLoGrid[:-1])
+
+    sums = kreffTableSums(direcGrid, logdLoGrid)
+
+    center = 0.25 * (sums[:, 1:, 1:] + sums[:, :-1, 1:] +\
+        sums[:, 1:, :-1] + sums[:, :-1, :-1])
+    errCenter = np.abs(np.sqrt(center) -\
+        np.sqrt(kreffTableSums(direcMid, logdLoMid))).max(axis=0)
+
+    edge = 0.5 * (sums[:, 1:, :] + sums[:, :-1, :])
+    errDirec = np.abs(np.sqrt(edge) -\
+        np.sqrt(kreffTableSums(direcMid, logdLoGrid))).max(axis=0)
+
+    edge = 0.5 * (sums[:, :, 1:] + sums[:, :, :-1])
+    errdLo = np.abs(np.sqrt(edge) -\
+        np.sqrt(kreffTableSums(direcGrid, logdLoMid))).max(axis=0)
+
+    cellError = np.maximum.reduce([errCenter, errDirec[:, 1:],\
+        errDirec[:, :-1], errdLo[1:, :], errdLo[:-1, :]])
+
+    return {"sums": sums, "cellError": cellError}
+# end kreffTableBuild
+
+# godaKreffSums over a grid of direc and log10(d/Lo), with Lo = 1
+def kreffTableSums(direcGrid, logdLoGrid):
+    direc, logdLo = np.meshgrid(direcGrid, logdLoGrid, indexing="ij")
+    n = direc.size
+
+    sums = godaKreffSums(direc.ravel(), np.ones(n), 10.0**logdLo.ravel(),\
+        2.0 * math.pi)
+
+    return sums.reshape((3,) + direc.shape)
+# end kreffTableSums
@@ -1,6 +1,4 @@
 import math
-import cmath
-from helper_objects import ComplexUtil
 
 # Snell's Law applied to determine deepwater values
 
@@ -14,6 +12,10 @@ from helper_objects import ComplexUtil
 #   OUTPUT
 #   alpha0: deepwater angle of wavecrest
 #   H0: deepwater wave height
+#   errorMsg: error message when the deepwater angle does not exist
+
+# The domain of Snell's law is checked before the angle is computed, so
+# everything is real valued.
 
 def LWTDWS(alpha, c, cg, c0, H):
     alpha0 = None
@@ -22,22 +24,22 @@ def LWTDWS(alpha, c, cg, c0, H):
     
     deg2rad = math.pi / 180.0
 
-    arg = (c0 / c) * cmath.sin(alpha * deg2rad)
-    if ComplexUtil.greaterThanEqual(arg, 1):
+    arg = (c0 / c) * math.sin(alpha * deg2rad)
+    if abs(arg) >= 1:
         errorMsg = "Error: Violation of assumptions for Snells Law"
         return alpha0, H0, errorMsg
 
-    alpha0 = (cmath.asin(arg)) / deg2rad
+    alpha0 = math.asin(arg) / deg2rad
 
-    ksf = cmath.sqrt(c0 / (2 * cg)) # shoaling coefficient
+    ksf = math.sqrt(c0 / (2 * cg)) # shoaling coefficient
     
-    alphaCos = cmath.cos(alpha0 * deg2rad) / cmath.cos(alpha * deg2rad)
-    if ComplexUtil.lessThan(alphaCos, 0):
+    alphaCos = math.cos(alpha0 * deg2rad) / math.cos(alpha * deg2rad)
+    if alphaCos < 0:
         errorMsg = "Error: Alpha1 data out of range"
         return alpha0, H0, errorMsg
     
-    krf = cmath.sqrt(alphaCos) # refraction coefficient
+    krf = math.sqrt(alphaCos) # refraction coefficient
 
     H0 = H / (ksf * krf)
 
-    return alpha0, H0, errorMsg
\ No newline at end of file
+    return alpha0, H0, errorMsg
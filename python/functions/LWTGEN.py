@@ -1,5 +1,5 @@
 import math
-import cmath
+import numpy as np
 from WAVELEN import WAVELEN
 
 # Linear wave theory approximations
@@ -19,7 +19,15 @@ from WAVELEN import WAVELEN
 #   L0: deepwater wave length
 #   reldep: relative depth
 
+# Real valued throughout; 2kh/sinh(2kh) is written with exponentials of
+# -2kh so that it goes to 0 in deep water instead of overflowing. Scalar
+# input returns Python floats, array input float64 arrays.
+
 def LWTGEN(h, T, g):
+    isScalar = np.ndim(h) == 0 and np.ndim(T) == 0
+
+    h, T = np.broadcast_arrays(\
+        np.asarray(h, dtype=np.float64), np.asarray(T, dtype=np.float64))
 
     # General deepwater conditions
     c0 = g * T / (2 * math.pi)
@@ -32,7 +40,12 @@ def LWTGEN(h, T, g):
     reldep = h / L
 
     c = L / T
-    n = 0.5 * (1 + ((2 * k * h) / cmath.sinh(2 * k * h)))
+    kh2 = 2 * k * h
+    n = 0.5 * (1 + 2 * kh2 * np.exp(-kh2) / -np.expm1(-2 * kh2))
     cg = n * c
 
+    if isScalar:
+        return float(c), float(c0), float(cg), float(cg0), float(k),\
+            float(L), float(L0), float(reldep)
+
     return c, c0, cg, cg0, k, L, L0, reldep
@@ -1,6 +1,4 @@
-import cmath
-
-from helper_objects import ComplexUtil
+import numpy as np
 
 # Miscellaneous linear wave theory bulk values
 
@@ -18,18 +16,26 @@ from helper_objects import ComplexUtil
 #   E: mean energy density
 #   P: mean energy flux
 #   Ur: Ursell parameter
-#   setdown: setdown
+#   setdown: setdown (0 where reldep >= 0.5)
+
+# Scalar input returns Python floats, array input float64 arrays.
 
 def LWTTWM(cg, h, H, L, reldep, rho, g, k):
+    isScalar = all([np.ndim(val) == 0 for val in [cg, h, H, L, reldep, k]])
+
+    cg, h, H, L, reldep, k = np.broadcast_arrays(\
+        *[np.asarray(val, dtype=np.float64) for val in [cg, h, H, L, reldep, k]])
 
     E = (1.0 / 8.0) * rho * g * (H**2)
     P = E * cg
     Ur = (H * (L**2)) / (h**3)
 
-#    if reldep < 0.5 or (isinstance(reldep, complex) and abs(reldep) < 0.5):
-    if ComplexUtil.lessThan(reldep, 0.5):
-        setdown = (k * H**2) / (8.0 * cmath.sinh(2 * k * h))
-    else:
-        setdown = 0
+    # sinh(2kh) only where kh < pi
+    shallow = reldep < 0.5
+    setdown = np.where(shallow,\
+        (k * H**2) / (8.0 * np.sinh(np.where(shallow, 2 * k * h, 1.0))), 0.0)
+
+    if isScalar:
+        return float(E), float(P), float(Ur), float(setdown)
 
     return E, P, Ur, setdown
@@ -1,5 +1,5 @@
 import math
-import cmath
+import numpy as np
 
 # Snell's law applied to determine transitional case
 
@@ -16,16 +16,24 @@ import cmath
 #   Kr: refraction coeffieint
 #   Ks: shoaling coefficient
 
+# Real valued throughout (c <= c0 in linear theory, so the sine of the
+# local angle is within [-1, 1]); scalar input returns Python floats,
+# array input float64 arrays.
+
 def LWTTWS(alpha0, c, cg, c0, H0):
+    isScalar = all([np.ndim(val) == 0 for val in [alpha0, c, cg, c0, H0]])
 
     deg2rad = math.pi / 180
 
-    arg = (c / c0) * cmath.sin(alpha0 * deg2rad)
-    alpha = (cmath.asin(arg)) / deg2rad
+    arg = (np.asarray(c, dtype=np.float64) / c0) * np.sin(alpha0 * deg2rad)
+    alpha = np.arcsin(np.clip(arg, -1.0, 1.0)) / deg2rad
 
-    ksf = cmath.sqrt(c0 / (2 * cg))
-    krf = cmath.sqrt(cmath.cos(alpha0 * deg2rad) / cmath.cos(alpha * deg2rad))
+    ksf = np.sqrt(c0 / (2 * np.asarray(cg, dtype=np.float64)))
+    krf = np.sqrt(np.cos(alpha0 * deg2rad) / np.cos(alpha * deg2rad))
 
     H = H0 * ksf * krf
 
+    if isScalar:
+        return float(alpha), float(H), float(krf), float(ksf)
+
     return alpha, H, krf, ksf
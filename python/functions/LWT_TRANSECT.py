@@ -0,0 +1,103 @@
+import math
+import numpy as np
+
+from ERRMASK import ERRMASK_BROKEN, ERRMASK_CODES, ERRMASK_STEEP
+from ERRMASK import ERRCODE_BROKEN, ERRCODE_UNSTABLE, ERRCODE_RANGE
+from ERRWAVBRK3 import ERRWAVBRK3
+from LWTGEN import LWTGEN
+from LWTTWM import LWTTWM
+from LWTTWS import LWTTWS
+
+# Linear wave theory with Snell's law (as in snells_law) along a depth
+# profile. Every known wave (H1, T, d1, alpha1) is taken to deep water
+# once, then shoaled and refracted to every node of the profile, all the
+# waves and nodes at once (shape (number of waves, number of nodes)).
+# Under straight and parallel depth contours the wave at a node depends
+# only on the deepwater wave and the node depth, so the march is a single
+# evaluation over the grid.
+
+# The checks of snells_law are made as masks, in the same order, giving
+# checkIndex:
+#   0 known wave broken (H1 >= 0.78*d1)
+#   1 known wave unstable (ERRSTP)
+#   2 violation of assumptions for Snell's law
+#   3 alpha1 out of range
+#   4 deepwater wave unstable (H0/L0 >= 1/7)
+#   5 subject wave broken (H2 >= Hb of ERRWAVBRK3)
+#   6 subject wave unstable (ERRSTP)
+# Checks 0 to 4 concern the known wave and apply to all its nodes.
+
+#   INPUT (H1, T, d1, alpha1 and m are broadcast to one value per wave)
+#   H1: wave height at known location
+#   T: wave period
+#   d1: water depth at known location
+#   alpha1: wave crest angle at known location (deg)
+#   m: nearshore slope
+#   d2: water depths of the profile nodes (1-d, offshore first)
+#   g: gravitational acceleration
+#   rho: density of water
+
+#   OUTPUT
+#   deepList: deepwater H0, alpha0, L0, c0, cg0, E0, P0, HL and the
+#       breaking height and depth Hb, db, one value per wave
+#   nodeList: H2, alpha2, L2, c2, cg2, E2, P2, Ur2, kr, ks at the nodes
+#   errorCode: ERRCODE_* code of ERRMASK at each node (0 where valid)
+#   checkIndex: first failed check at each node as listed above (-1 where
+#       valid)
+#   breakIndex: first node (from offshore) where the subject wave is
+#       broken, -1 where it does not break
+
+def LWT_TRANSECT(H1, T, d1, alpha1, m, d2, g, rho):
+    H1, T, d1, alpha1, m = [val.ravel() for val in np.broadcast_arrays(\
+        *[np.asarray(val, dtype=np.float64) for val in [H1, T, d1, alpha1, m]])]
+    d2 = np.asarray(d2, dtype=np.float64).ravel()
+
+    deg2rad = math.pi / 180.0
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # Known wave
+        c1, c0, cg1, cg0, k1, L1, L0, reldep1 = LWTGEN(d1, T, g)
+        stable1, steep1, maxstp1 = ERRMASK_STEEP(H1, d1, L1)
+
+        # Deepwater wave (LWTDWS)
+        arg = (c0 / c1) * np.sin(alpha1 * deg2rad)
+        snell = np.abs(arg) < 1.0
+        alpha0 = np.where(snell, np.arcsin(np.where(snell, arg, 0.0)), np.nan) / deg2rad
+
+        ksf = np.sqrt(c0 / (2 * cg1))
+        alphaCos = np.cos(alpha0 * deg2rad) / np.cos(alpha1 * deg2rad)
+        H0 = H1 / (ksf * np.sqrt(alphaCos))
+
+        E0 = (1.0/8.0)*rho*g*(H0**2)
+        P0 = E0*cg0
+        HL = H0/L0
+
+        Hb, db = ERRWAVBRK3(H0, L0, T, m)
+
+        # Subject wave at every node
+        c2, c02, cg2, cg02, k2, L2, L02, reldep2 =\
+            LWTGEN(d2, T[:, np.newaxis], g)
+        alpha2, H2, kr, ks = LWTTWS(alpha0[:, np.newaxis], c2, cg2,\
+            c0[:, np.newaxis], H0[:, np.newaxis])
+        E2, P2, Ur2, setdown2 = LWTTWM(cg2, d2, H2, L2, reldep2, rho, g, k2)
+
+        stable2, steep2, maxstp2 = ERRMASK_STEEP(H2, d2, L2)
+
+    col = (slice(None), np.newaxis)
+    errorCode, checkIndex = ERRMASK_CODES([\
+        (ERRMASK_BROKEN(H1, 0.78*d1)[col], ERRCODE_BROKEN),\
+        (stable1[col], ERRCODE_UNSTABLE),\
+        (snell[col], ERRCODE_RANGE),\
+        (~(alphaCos < 0)[col], ERRCODE_RANGE),\
+        ((HL < (1.0/7.0))[col], ERRCODE_UNSTABLE),\
+        (ERRMASK_BROKEN(H2, Hb[col]), ERRCODE_BROKEN),\
+        (stable2, ERRCODE_UNSTABLE)])
+
+    broken = checkIndex == 5
+    breakIndex = np.where(broken.any(axis=1), np.argmax(broken, axis=1), -1)
+
+    deepList = [H0, alpha0, L0, c0, cg0, E0, P0, HL, Hb, db]
+    nodeList = [H2, alpha2, L2, c2, cg2, E2, P2, Ur2, kr, ks]
+
+    return deepList, nodeList, errorCode, checkIndex, breakIndex
+# end LWT_TRANSECT
@@ -0,0 +1,187 @@
+import math
+import numpy as np
+
+from EQBWLE import EQBWLE
+from EQBWTRCO import EQBWTRCO
+from MADSN2 import MADSN2
+from WAVELEN import WAVELEN
+
+# Predicts wave transmission through rubble-mound breakwaters (MADSEELG)
+# for many cases at once, e.g. a sweep over stone size, porosity and
+# layer thickness. Both fixed-point iterations (the friction angle phi and
+# the head difference across the equivalent rectangular breakwater) are
+# run on all cases together; each case stops iterating when it has
+# converged (or after 21 passes), as the scalar routine does, and the
+# number of passes it took is returned.
+
+#   INPUT (the cases are the trailing dimensions, broadcast against each
+#   other)
+#   H: wave height
+#   T: wave period
+#   d: water depth
+#   hs: height of structure
+#   b: top width of structure
+#   numlay: number of horizontal layers in breakwater
+#   thk: thickness of each layer, shape (numlay, ...)
+#   hlen: length of each material in each layer, shape (nummat, numlay, ...)
+#   nummat: number of materials in the breakwater
+#   diam: mean diameter of the various materials, shape (nummat, ...)
+#   por: porosity of the materials, shape (nummat, ...)
+#   cotssl: slope of the seaward face of the breakwater
+#   nu: kinematic viscosity
+#   g: acceleration of gravity
+
+#   OUTPUT (arrays of the case shape, NaN where T <= tmin)
+#   KTt: wave transmission through structure coefficient
+#   Kto: wave transmission by overtopping coefficient
+#   KT: total wave transmission coefficient
+#   Kr: wave reflection coefficient
+#   Ht: transmitted wave height
+#   L: wave length at structure
+#   tmin: minimum wave period that can be analyzed
+#   phiCount: number of passes of the friction angle iteration
+#   dheCount: number of passes of the head difference iteration
+
+def MADSEELG_ARRAY(H, T, d, hs, b, numlay, thk, hlen, nummat, diam, por, cotssl, nu, g):
+    thk = np.asarray(thk, dtype=np.float64)[:numlay]
+    hlen = np.asarray(hlen, dtype=np.float64)[:nummat, :numlay]
+    diam = np.asarray(diam, dtype=np.float64)[:nummat]
+    por = np.asarray(por, dtype=np.float64)[:nummat]
+
+    shape = np.broadcast_shapes(np.shape(H), np.shape(T), np.shape(d),\
+        np.shape(hs), np.shape(b), np.shape(cotssl), thk.shape[1:],\
+        hlen.shape[2:], diam.shape[1:], por.shape[1:])
+    n = int(np.prod(shape))
+
+    # Cases along a single (last) axis
+    H, T, d, hs, b, cotssl = [np.broadcast_to(val, shape).astype(np.float64).ravel()\
+        for val in [H, T, d, hs, b, cotssl]]
+    thk = caseAxis(thk, 1, shape)
+    hlen = caseAxis(hlen, 2, shape)
+    diam = caseAxis(diam, 1, shape)
+    por = caseAxis(por, 1, shape)
+
+    deg2rads = math.pi / 180.0
+
+    #Porosity of reference material
+    porref = 0.435
+
+    L, ko = WAVELEN(d, T, 50, g)
+
+    #Submerged horizontal length of breakwater
+    lsub = np.where(hs < d, hs*cotssl, d*cotssl)
+
+    tmin = np.sqrt((2.0*math.pi*1.25*lsub)/\
+        (g*np.tanh(2.0*math.pi*d/(1.25*lsub))))
+
+    KTt, Kto, KT, Kr, Ht = [np.full(n, np.nan) for i in range(5)]
+    phiCount = np.zeros(n, dtype=int)
+    dheCount = np.zeros(n, dtype=int)
+
+    # Only the cases that can be analyzed are iterated
+    valid = T > tmin
+    phiCount[valid], dheCount[valid], KTt[valid], Kto[valid], KT[valid],\
+        Kr[valid], Ht[valid] = madseelgIterate(H[valid], T[valid], d[valid],\
+        hs[valid], b[valid], numlay, thk[:, valid], hlen[:, :, valid],\
+        nummat, diam[:, valid], por[:, valid], cotssl[valid], nu, g,\
+        L[valid], ko[valid], lsub[valid], porref, deg2rads)
+
+    return [val.reshape(shape) for val in\
+        [KTt, Kto, KT, Kr, Ht, L, tmin, phiCount, dheCount]]
+# end MADSEELG_ARRAY
+
+# Broadcasts the case dimensions (after the first lead axes) of val to
+# shape and puts them along a single last axis
+def caseAxis(val, lead, shape):
+    caseShape = (1,)*(len(shape) - val.ndim + lead) + val.shape[lead:]
+    val = np.broadcast_to(val.reshape(val.shape[:lead] + caseShape),\
+        val.shape[:lead] + shape)
+
+    return val.reshape(val.shape[:lead] + (-1,))
+# end caseAxis
+
+def madseelgIterate(H, T, d, hs, b, numlay, thk, hlen, nummat, diam, por,\
+    cotssl, nu, g, L, ko, lsub, porref, deg2rads):
+    n = len(H)
+    A = H/2.0 # incident wave amplitude
+
+    #Mean diameter of reference material
+    diamref = diam[0]*0.5
+
+    # begin iterating for phi
+    phi = np.full(n, 5.0*deg2rads)
+    RIi, Ru, fs = np.zeros(n), np.zeros(n), np.zeros(n)
+    phiCount = np.zeros(n, dtype=int)
+    active = np.ones(n, dtype=bool)
+    while np.any(active):
+        RIi[active], Ru[active], fs[active] =\
+            MADSN2(lsub[active], phi[active], ko[active])
+        newphi = 0.29*(diam[0][active]/d[active])**0.2 *\
+            (Ru[active]*2.0*A[active]/(d[active]/cotssl[active]))**0.3 *\
+            fs[active]
+        newphi = np.arctan(newphi)/2.0
+        diff = np.abs(newphi - phi[active])
+
+        phiCount[active] += 1
+        update = phiCount[active] <= 20
+        phi[np.nonzero(active)[0][update]] = newphi[update]
+
+        active[active] = (diff > (10.0**-3)) & update
+    # end while loop
+
+    #find apropriate model correction factor to account for model slope
+    cf = np.where((1.0/cotssl) < 0.4, 1.02,\
+        np.where((1.0/cotssl) > 0.68, 0.89, 1.28 - 0.578*(1.0/cotssl)))
+
+    RIi = RIi*cf
+    AIhomog = RIi*A
+
+    dht = 2.0*Ru*A # head difference across trapezoidal breakwater
+    dhe = dht.copy()
+    Ti, Ri = np.zeros(n), np.zeros(n)
+
+    # begin iterating for recthead to find head difference across equivalent
+    # rectangular breakwater
+    dheCount = np.zeros(n, dtype=int)
+    active = np.ones(n, dtype=bool)
+    while np.any(active):
+        lequiv = EQBWLE(dhe[active], dht[active], d[active], nummat, numlay,\
+            diam[:, active], por[:, active], thk[:, active],\
+            hlen[:, :, active], porref, diamref[active])
+        Ti[active], Ri[active] = EQBWTRCO(porref, ko[active], diamref[active],\
+            AIhomog[active], d[active], nu, lequiv, g)
+        olddhe = dhe[active]
+        dhe[active] = (1.0 + Ri[active])*RIi[active]*A[active]
+        diff = np.abs(olddhe - dhe[active])
+
+        dheCount[active] += 1
+        active[active] = (diff > 0.005) & (dheCount[active] <= 20)
+
+    Kr = Ri*RIi
+    KTt = Ti*RIi
+
+    L0 = (g*(T**2))/(2.0*math.pi)
+
+    surf = (1.0/cotssl)/np.sqrt(H/L0)
+
+    R = H*((0.692*surf)/(1.0 + 0.504*surf))
+
+    freeb = hs - d
+
+    # empirical coefficient
+    c = 0.51 - (0.11*(b/hs))
+
+    Kto = c*(1.0 - (freeb/R))
+
+    # adjust Kto if necessary
+    Kto = np.where(((b/hs) > 0.88) & (freeb < 0.0),\
+        c*(1.0 - (freeb/R)) - ((1.0 - (2.0*c))*(freeb/R)),\
+        np.where(Kto > 1.0, 1.0, np.where((freeb/R) > 1.0, 0.0, Kto)))
+
+    KT = np.sqrt(KTt**2 + Kto**2)
+    KT = np.where(KT > 1.0, 1.0, KT)
+
+    Ht = H*KT
+
+    return phiCount, dheCount, KTt, Kto, KT, Kr, Ht
+# end madseelgIterate
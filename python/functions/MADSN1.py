@@ -1,7 +1,7 @@
-import cmath
+import numpy as np
 
 # Determine transmission and reflection coefficients for crib-style
-# breakwaters
+# breakwaters (nors, fos and nkol may be arrays)
 
 #   INPUT
 #   nors: N/sqrt(S) = 0.45
@@ -16,21 +16,26 @@ import cmath
 #   k: complex wave number
 
 def MADSN1(nors, fos, nkol):
+    isScalar = all([np.ndim(val) == 0 for val in [nors, fos, nkol]])
+
     # intermediate values
-    eps = complex(nors, 0.0)/cmath.sqrt(complex(1,-fos));
-    theta = complex(0.0, 1.0)*complex(nkol, 0.0)/eps;
-
-    c1 = (complex(1.0, 0.0) + eps)**2
-    c2 = (complex(1.0, 0.0) - eps)**2
-    c3 = complex(1.0, 0.0) - eps**2
-    denom = c1*cmath.exp(theta) - c2*cmath.exp(-theta)
- 
+    eps = nors/np.sqrt(1.0 - 1j*np.asarray(fos, dtype=np.float64))
+    theta = 1j*nkol/eps
+
+    c1 = (1.0 + eps)**2
+    c2 = (1.0 - eps)**2
+    c3 = 1.0 - eps**2
+    denom = c1*np.exp(theta) - c2*np.exp(-theta)
+
     # transmission coefficient
-    teq = complex(4.0, 0.0)*eps/denom
-    Ti = abs(teq)
+    teq = 4.0*eps/denom
+    Ti = np.abs(teq)
 
     #reflection coefficient
-    req = (c3*(cmath.exp(theta) - cmath.exp(-theta)))/denom
-    Ri = abs(req)
+    req = (c3*(np.exp(theta) - np.exp(-theta)))/denom
+    Ri = np.abs(req)
+
+    if isScalar:
+        return float(Ti), float(Ri)
 
-    return Ti, Ri
\ No newline at end of file
+    return Ti, Ri
@@ -1,13 +1,14 @@
 import math
-import cmath
+import numpy as np
 import scipy.integrate as integrate
 import scipy.special as sp
 
-from helper_objects import ComplexUtil
-
 # Solves for reflection coefficient, non-dimensional runup amplitude, and
 # friction slope for rough impermeable slopes
 
+# lsub, phi and k may be arrays (broadcast against each other); the
+# friction slope integrals are evaluated for each element in turn
+
 #   INPUT
 #   lsub: water depth x cotangent of structure slope
 #   phi: friction angle [rads]
@@ -19,43 +20,53 @@ from helper_objects import ComplexUtil
 #   sfc: friction slope constant
 
 def MADSN2(lsub, phi, k):
+    isScalar = all([np.ndim(val) == 0 for val in [lsub, phi, k]])
+
+    lsub, phi, k = np.broadcast_arrays(np.asarray(lsub, dtype=np.float64),\
+        np.asarray(phi, dtype=np.float64), np.asarray(k, dtype=np.float64))
+
     L = (2.0*math.pi)/k
     lsol = lsub/L
 
-    fb = math.tan(2.0*phi)
+    fb = np.tan(2.0*phi)
     c1 = 2.0*k*lsub
-    c2 = cmath.sqrt(complex(1.0, -fb))
+    c2 = np.sqrt(1.0 - 1j*fb)
 
-    arg = complex(c1, 0.0)*c2
+    arg = c1*c2
 
     J0 = sp.jv(0.0, arg)
     J1 = sp.jv(1.0, arg)
 
-    c3 = (complex(0.0, 1.0)/c2)*J1
+    c3 = (1j/c2)*J1
 
     denom = J0 + c3
 
-    psi = complex(c1/2.0, 0.0)*c2
+    psi = (c1/2.0)*c2
+
+    req = ((J0 - c3)/denom)*np.exp(1j*c1)
+    R = np.abs(req)
+
+    rueq = np.exp(1j*(c1/2.0))/denom
+    Ru = np.abs(rueq)
 
-    req = ((J0 - c3)/denom)*cmath.exp(complex(0.0, c1))
-    R = abs(req)
+    fsc = np.full(lsub.shape, 0.84242)
+    for i in np.ndindex(lsub.shape):
+        if lsol[i] < 0.05:
+            continue
 
-    rueq = cmath.exp(complex(0.0, c1/2.0))/denom
-    Ru = abs(rueq)
+        topint, err = integrate.quad(integrandTop, 0.0, 1.0, args=(psi[i]))
+        botint, err = integrate.quad(integrandBottom, 0.0, 1.0, args=(psi[i]))
 
-    if ComplexUtil.lessThan(lsol, 0.05):
-        fsc = 0.84242
-    else:
-        topint, err = integrate.quad(integrandTop, 0.0, 1.0, args=(psi))
-        botint, err = integrate.quad(integrandBottom, 0.0, 1.0, args=(psi))
+        fsc[i] = (4.0/(3.0*math.pi))*(topint/botint)
 
-        fsc = (4.0/(3.0*math.pi))*(topint/botint)
+    if isScalar:
+        return float(R), float(Ru), float(fsc)
 
     return R, Ru, fsc
 
 
 def integrandTop(y, psi):
-    return abs((sp.jv(1.0, 2.0*psi*cmath.sqrt(y))/(psi*cmath.sqrt(y)))**3)
+    return abs((sp.jv(1.0, 2.0*psi*np.sqrt(y))/(psi*np.sqrt(y)))**3)
 
 def integrandBottom(y, psi):
-    return abs(y*(sp.jv(1.0, 2.0*psi*cmath.sqrt(y))/(psi*cmath.sqrt(y)))**2)
\ No newline at end of file
+    return abs(y*(sp.jv(1.0, 2.0*psi*np.sqrt(y))/(psi*np.sqrt(y)))**2)
@@ -0,0 +1,83 @@
+import math
+import numpy as np
+
+# Random samples of the driver inputs for Monte Carlo runs, generated
+# lazily in blocks like the designs of SWEEP_DESIGN, so that they can be
+# run by BaseDriver.run_design (or run_monte_carlo) without holding all
+# the samples in memory. Each block is a float64 array with one row per
+# sample and one column per input, in the order of the driver's inputs.
+# The inputs are sampled independently of each other.
+
+#   INPUT
+#   distList: one distribution per input,
+#       ("normal", mean, std)
+#       ("lognormal", mean, std): mean and standard deviation of the
+#                                 input itself (not of its logarithm)
+#       ("weibull", shape, scale) or ("weibull", shape, scale, loc)
+#       ("uniform", min, max)
+#       ("empirical", values): the values are taken as a sample of the
+#                              input and sampled by linear interpolation
+#                              of their quantiles
+#       or a single value for an input that is held fixed
+#   numSamples: number of samples
+#   blockSize: largest number of samples in a block
+#   seed: seed of the random generator
+
+#   OUTPUT
+#   generator of (caseStart, block), caseStart being the sample number of
+#   the first row of the block
+
+def MONTE_CARLO_SAMPLE(distList, numSamples, blockSize = 100000, seed = None):
+    for dist in distList:
+        checkDistribution(dist)
+
+    rng = np.random.default_rng(seed)
+
+    for caseStart in range(0, numSamples, blockSize):
+        numBlock = min(blockSize, numSamples - caseStart)
+
+        block = np.empty((numBlock, len(distList)))
+        for j in range(len(distList)):
+            block[:, j] = sampleDistribution(distList[j], numBlock, rng)
+
+        yield caseStart, block
+# end MONTE_CARLO_SAMPLE
+
+def checkDistribution(dist):
+    if not isinstance(dist, tuple):
+        return
+
+    numArgs = {"normal": [2], "lognormal": [2], "weibull": [2, 3],\
+        "uniform": [2], "empirical": [1]}
+    if dist[0] not in numArgs:
+        raise ValueError("Unknown distribution: %s" % str(dist[0]))
+    if len(dist) - 1 not in numArgs[dist[0]]:
+        raise ValueError("Wrong number of parameters for the %s distribution"\
+            % dist[0])
+    if dist[0] == "lognormal" and not (dist[1] > 0):
+        raise ValueError("The mean of a lognormal distribution must be positive")
+    if dist[0] == "empirical" and len(dist[1]) == 0:
+        raise ValueError("An empirical distribution needs at least one value")
+# end checkDistribution
+
+def sampleDistribution(dist, num, rng):
+    if not isinstance(dist, tuple):
+        return np.full(num, float(dist))
+
+    name = dist[0]
+    if name == "normal":
+        return rng.normal(dist[1], dist[2], num)
+    elif name == "lognormal":
+        sigma2 = math.log(1.0 + (dist[2]/dist[1])**2)
+        return rng.lognormal(math.log(dist[1]) - 0.5*sigma2,\
+            math.sqrt(sigma2), num)
+    elif name == "weibull":
+        loc = dist[3] if len(dist) > 3 else 0.0
+        return loc + dist[2]*rng.weibull(dist[1], num)
+    elif name == "uniform":
+        return rng.uniform(dist[1], dist[2], num)
+    else:
+        values = np.sort(np.asarray(dist[1], dtype=np.float64).ravel())
+        position = rng.random(num)*(len(values) - 1)
+        return np.interp(position, np.arange(len(values)), values)
+# end sampleDistribution
@@ -1,7 +1,10 @@
-import math
+import numpy as np
 
 # Determine wave overtopping rate
 
+# All inputs may be arrays (broadcast against each other), e.g. many
+# runup values or freeboards at once; scalar input returns a scalar.
+
 #  INPUT
 #  H0: deepwater wave height
 #  free: freeboard above still water level (height of structure minus
@@ -17,15 +20,28 @@ import math
 #  qovertop: overtopping rate per unit width of structure
 
 def QOVERT(H0, free, R, Qstar0, alpha, theta, U, g):
+    isScalar = all([np.ndim(val) == 0\
+        for val in [H0, free, R, Qstar0, alpha, theta, U]])
+
+    H0, free, R, Qstar0, alpha, theta, U = np.broadcast_arrays(\
+        *[np.asarray(val, dtype=np.float64)\
+        for val in [H0, free, R, Qstar0, alpha, theta, U]])
 
     prod = Qstar0 * alpha * free * R * theta
+    overtops = ~((prod <= 0) | (R <= free))
+
+    if isScalar and not overtops:
+        return 0
 
-    if prod <= 0 or R <= free:
-        qovertop = 0
-    else:
-        Cw = 1 + (U**2 / 1800) * ((free / R) + 0.1) * math.sin(theta)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        Cw = 1 + (U**2 / 1800) * ((free / R) + 0.1) * np.sin(theta)
 
         arg1 = (R + free) / (R - free)
-        qovertop = Cw * math.sqrt(g * Qstar0 * (H0**3)) * (arg1**(- 0.1085 / alpha))
+        qovertop = Cw * np.sqrt(g * Qstar0 * (H0**3)) * (arg1**(- 0.1085 / alpha))
+
+    qovertop = np.where(overtops, qovertop, 0.0)
+
+    if isScalar:
+        return float(qovertop)
 
     return qovertop
@@ -1,8 +1,17 @@
-import math
+import numpy as np
 from QOVERT import QOVERT
 
 # Determine wave overtopping rate for irregular waves
 
+# The rate is averaged over the runups of the Rayleigh distribution at
+# exceedance probabilities p = i/1000 (i = 1 to 998) when the runup R is
+# below the freeboard, or p = i/200 (i = 1 to 198) otherwise, all
+# quantiles being passed to QOVERT at once. All inputs may be arrays
+# (broadcast against each other) to evaluate many structures or sea
+# states in one call; scalar input returns a float. The cases are taken
+# chunkSize at a time so that the quantile arrays stay small for large
+# inputs (as in Monte Carlo runs).
+
 #   INPUT
 #   H0: deepwater wave height
 #   free: freeboard above still water level (height of structure minus
@@ -17,21 +26,41 @@ from QOVERT import QOVERT
 #   OUTPUT
 #   qovertop: overtopping rate per unit width of structure
 
+chunkSize = 1000
+
 def QOVERT_IRR(H0, free, R, Qstar0, alpha, theta, U, g):
+    isScalar = all([np.ndim(val) == 0\
+        for val in [H0, free, R, Qstar0, alpha, theta, U]])
+
+    H0, free, R, Qstar0, alpha, theta, U = np.broadcast_arrays(\
+        *[np.asarray(val, dtype=np.float64)\
+        for val in [H0, free, R, Qstar0, alpha, theta, U]])
+    shape = R.shape
+    H0, free, R, Qstar0, alpha, theta, U = [val.ravel()\
+        for val in [H0, free, R, Qstar0, alpha, theta, U]]
+
+    qovertop = np.zeros(len(R))
+
+    for isLow, isum, total in [(True, 999, 1000.0), (False, 199, 200.0)]:
+        group = (R < free) == isLow
+        if not group.any():
+            continue
+
+        p = (1.0 / total) * np.arange(1, isum)
+        Rfactor = np.sqrt(np.log(1.0 / p) / 2.0)
+
+        groupIndex = np.nonzero(group)[0]
+        for chunkStart in range(0, len(groupIndex), chunkSize):
+            index = groupIndex[chunkStart:chunkStart + chunkSize]
 
-    if R < free:
-        isum = 999
-        total = 1000.0
-    else:
-        isum = 199
-        total = 200.0
+            Q = QOVERT(H0[index, np.newaxis], free[index, np.newaxis],\
+                Rfactor * R[index, np.newaxis], Qstar0[index, np.newaxis],\
+                alpha[index, np.newaxis], theta[index, np.newaxis],\
+                U[index, np.newaxis], g)
 
-    Q = []
-    for i in range(1, isum):
-        p = (1.0 / total) * i
-        Ri = math.sqrt(math.log(1.0 / p) / 2.0) * R
-        Q.append(QOVERT(H0, free, Ri, Qstar0, alpha, theta, U, g))
+            qovertop[index] = np.sum(Q, axis=1) / isum
 
-    qovertop = sum(Q) / isum
+    if isScalar:
+        return float(qovertop[0])
 
-    return qovertop
+    return qovertop.reshape(shape)
@@ -1,4 +1,5 @@
 import math
+import numpy as np
 
 # Determine runup on a smooth simple slope
 
@@ -13,18 +14,19 @@ import math
 #   runups: runup on a smooth slope
 
 def RUNUPS(H, L, d, theta, xi):
+    isScalar = all([np.ndim(val) == 0 for val in [H, L, d, theta, xi]])
+    H, L, d, theta, xi = np.broadcast_arrays(\
+        *[np.asarray(val, dtype=np.float64) for val in [H, L, d, theta, xi]])
 
     Cp = 1.002 * xi
-    nonlin = (H / L) / (math.tanh(2 * math.pi * d / L)**3)
-    Cnb = 1.087 * math.sqrt(math.pi / (2 * theta)) + 0.775 * nonlin
+    nonlin = (H / L) / (np.tanh(2 * math.pi * d / L)**3)
+    Cnb = 1.087 * np.sqrt(math.pi / (2 * theta)) + 0.775 * nonlin
 
-    if xi <= 2:
-        C = Cp
-    elif xi >= 3.5:
-        C = Cnb
-    else:
-        C = ((3.5 - xi) / 1.5) * Cp + ((xi - 2) / 1.5) * Cnb
+    C = np.where(xi <= 2, Cp, np.where(xi >= 3.5, Cnb,\
+        ((3.5 - xi) / 1.5) * Cp + ((xi - 2) / 1.5) * Cnb))
 
     runups = C * H
 
+    if isScalar:
+        return float(runups)
     return runups
@@ -0,0 +1,103 @@
+import math
+import numpy as np
+
+# Case designs for parametric sweeps, generated lazily in blocks so that
+# designs of millions of cases are never held in memory at once. Each
+# block is a float64 array with one row per case and one column per
+# parameter, in the order of the driver's inputs.
+
+# Full Cartesian (grid) designs take every combination of the parameter
+# values, the last parameter varying fastest; the rows of a block are
+# found from the case numbers with np.unravel_index.
+
+# Latin hypercube designs split the range of every parameter into
+# numCases equal strata and take each stratum exactly once, at a random
+# point within it. The stratum of case i for a parameter is p(i), where p
+# is a keyed pseudo-random permutation of 0 .. numCases - 1, different
+# for every parameter. p(i) is computed from i alone, so no permutation
+# arrays are stored.
+
+#   INPUT
+#   paramList: one entry per parameter,
+#       SWEEP_GRID: a tuple (min, max, num) for num evenly spaced values,
+#                   a list or array of values, or a single value
+#       SWEEP_LHS: a tuple (min, max), or a single value
+#   numCases: number of cases (SWEEP_LHS)
+#   blockSize: largest number of cases in a block
+#   seed: seed of the random generator (SWEEP_LHS)
+
+#   OUTPUT
+#   generator of (caseStart, block), caseStart being the case number of
+#   the first row of the block
+
+def SWEEP_GRID(paramList, blockSize = 100000):
+    valueList = [sweepValues(param) for param in paramList]
+    shape = tuple([len(values) for values in valueList])
+    numCases = SWEEP_GRID_SIZE(paramList)
+
+    for caseStart in range(0, numCases, blockSize):
+        indexList = np.unravel_index(\
+            np.arange(caseStart, min(caseStart + blockSize, numCases)), shape)
+
+        yield caseStart, np.column_stack(\
+            [values[index] for values, index in zip(valueList, indexList)])
+# end SWEEP_GRID
+
+def SWEEP_GRID_SIZE(paramList):
+    return int(np.prod([len(sweepValues(param)) for param in paramList],\
+        dtype=np.int64))
+
+def SWEEP_LHS(paramList, numCases, blockSize = 100000, seed = None):
+    rng = np.random.default_rng(seed)
+    keyList = rng.integers(0, 2**63, size=(len(paramList), 4), dtype=np.uint64)
+
+    boundList = []
+    for param in paramList:
+        if np.ndim(param) == 0:
+            boundList.append((float(param), float(param)))
+        else:
+            boundList.append((float(param[0]), float(param[1])))
+
+    for caseStart in range(0, numCases, blockSize):
+        index = np.arange(caseStart, min(caseStart + blockSize, numCases),\
+            dtype=np.uint64)
+        jitter = rng.random((len(index), len(paramList)))
+
+        block = np.empty((len(index), len(paramList)))
+        for j in range(len(paramList)):
+            stratum = lhsPermute(index, numCases, keyList[j])
+            lo, hi = boundList[j]
+            block[:, j] = lo + (hi - lo)*(stratum + jitter[:, j])/numCases
+
+        yield caseStart, block
+# end SWEEP_LHS
+
+# Values of one grid parameter
+def sweepValues(param):
+    if isinstance(param, tuple):
+        return np.linspace(param[0], param[1], int(param[2]))
+
+    return np.atleast_1d(np.asarray(param, dtype=np.float64))
+
+# Keyed permutation of 0 .. n - 1 applied to the array index: rounds of
+# key xor, multiplication by an odd number and xorshift, each a bijection
+# of the integers of as many bits as n - 1, repeated on the values that
+# fall beyond n - 1 (cycle walking)
+def lhsPermute(index, n, key):
+    bits = max(1, math.ceil(math.log2(max(n, 2))))
+    mask = np.uint64((1 << bits) - 1)
+    shift = np.uint64((bits + 1)//2)
+
+    x = index.copy()
+    todo = np.ones(len(x), dtype=bool)
+    while todo.any():
+        y = x[todo]
+        for roundKey in key:
+            y = ((y ^ (roundKey & mask))*(roundKey | np.uint64(1))) & mask
+            y = y ^ (y >> shift)
+        x[todo] = y
+
+        todo = x >= n
+
+    return x
+# end lhsPermute
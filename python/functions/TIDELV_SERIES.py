@@ -0,0 +1,44 @@
+import math
+import numpy as np
+
+# Vectorized TIDELV. Tide levels for many times and gauges from one
+# (time x constituent) evaluation:
+#   tidelv(t, g) = sum_c fndcst_c*ampl_c*cos(acst_c*t + alpha_cg)
+#                = cos(acst*t) . (f*a*cos(alpha)) - sin(acst*t) . (f*a*sin(alpha))
+
+#   INPUT
+#   t: times since the start of the record [hr], scalar or 1-D array
+#   ampl: constituent amplitudes, shape (ncst,) or (ncst, ngag) when each
+#         gauge has its own amplitudes
+#   alpha: angular arguments [deg], shape (ncst, ngag) as from GAGINI
+#   fndcst: node factors, shape (ncst,)
+#   acst: orbital speeds of constituents [deg/hr], shape (ncst,)
+#   ng: gauge number (1-based) to return, or None for every gauge
+
+#   OUTPUT
+#   tidelv: tide levels, shape (nt,) for one gauge or (nt, ngag)
+
+def TIDELV_SERIES(t, ampl, alpha, fndcst, acst, ng = None):
+    deg2rad = math.pi/180.0
+
+    t = np.atleast_1d(np.asarray(t, dtype=np.float64))
+    alpha = np.asarray(alpha, dtype=np.float64).reshape(len(acst), -1)
+    ampl = np.asarray(ampl, dtype=np.float64).reshape(len(acst), -1)
+    fa = np.asarray(fndcst, dtype=np.float64).reshape(-1, 1)*ampl
+
+    if ng != None:
+        alpha = alpha[:, (ng - 1):ng]
+        if fa.shape[1] > 1:
+            fa = fa[:, (ng - 1):ng]
+
+    cosCoeff = fa*np.cos(alpha*deg2rad)
+    sinCoeff = fa*np.sin(alpha*deg2rad)
+
+    arg = np.outer(t, np.asarray(acst, dtype=np.float64)*deg2rad)
+    tidelv = np.cos(arg).dot(cosCoeff) - np.sin(arg).dot(sinCoeff)
+
+    if ng != None:
+        return tidelv[:, 0]
+
+    return tidelv
+# end TIDELV_SERIES
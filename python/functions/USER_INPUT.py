@@ -2,6 +2,7 @@ import sys
 import os.path
 from helper_objects import FileOutputData
 import numpy as np
+from SWEEP_DESIGN import SWEEP_GRID, SWEEP_GRID_SIZE
 
 # TODO: Move to helper functions
 def GET_INPUT_FUNC():
@@ -11,6 +12,28 @@ def GET_INPUT_FUNC():
         return input
 # end GET_INPUT_FUNC
 
+# Loads a list of data values from a file (separated by commas, spaces or
+# line breaks), checking that every value is in range
+def DATA_FILE(inputPrompt, valueMin, valueMax):
+    print("Loading %s" % (inputPrompt))
+
+    while True:
+        filename = FILE_NAME()
+        with open(filename) as fileData:
+            dataList = np.array(fileData.read().replace(",", " ").split(),\
+                dtype=np.float64)
+
+        outOfRange = (dataList < valueMin) | (dataList > valueMax)
+        if len(dataList) == 0:
+            print("No values found in the file.")
+        elif outOfRange.any():
+            print("Value #%d (%g) must be between %6.2f and %6.2f." %\
+                (np.argmax(outOfRange) + 1, dataList[np.argmax(outOfRange)],\
+                valueMin, valueMax))
+        else:
+            return dataList.tolist()
+# end DATA_FILE
+
 def DATA_VALUE(inputPrompt, valueMin, valueMax):
     inputFunc = GET_INPUT_FUNC()
 
@@ -82,25 +105,51 @@ def METRIC_IMPERIAL():
     while True:
         response = inputFunc("Input in imperial or SI units? (I or S): ")
 
-        if response == "I" or response == "i":
-            return False, 32.17, "ft", "lb"
-        elif response == "S" or response == "s":
-            return True, 9.81, "m", "N"
+        if response in ["I", "i", "S", "s"]:
+            return UNIT_SYSTEM(response)
         else:
             print("I or S only")
 # end METRIC_IMPERIAL
 
-def MULTI_FILE():
+# Reads a comma-separated case file, one case per line. With stream set
+# the cases are returned as a generator that reads the file as it is
+# consumed, otherwise as a list.
+def MULTI_FILE(stream = False):
     filename = FILE_NAME()
 
-    dataOutputList = []
-    with open(filename) as fileData:
-        for line in fileData:
-            dataOutputList.append([float(i) for i in line[:-1].split(",")])
+    if stream:
+        return MULTI_FILE_STREAM(filename)
 
-    return dataOutputList
+    return list(MULTI_FILE_STREAM(filename))
 # end MULTI_FILE
 
+# Parses a comma-separated case file in blocks of at most chunkSize lines,
+# yielding each block as a 2-D float64 array (one row per case). Only one
+# block is held in memory at a time.
+def MULTI_FILE_CHUNKS(filename, chunkSize = 10000):
+    with open(filename) as fileData:
+        while True:
+            lineList = []
+            for line in fileData:
+                if line.strip():
+                    lineList.append(line)
+                    if len(lineList) == chunkSize:
+                        break
+
+            if len(lineList) == 0:
+                return
+
+            yield np.loadtxt(lineList, delimiter=",", ndmin=2)
+# end MULTI_FILE_CHUNKS
+
+# Yields the cases of a comma-separated case file one at a time as lists
+# of floats, parsing the file in blocks with MULTI_FILE_CHUNKS
+def MULTI_FILE_STREAM(filename, chunkSize = 10000):
+    for chunk in MULTI_FILE_CHUNKS(filename, chunkSize):
+        for caseData in chunk.tolist():
+            yield caseData
+# end MULTI_FILE_STREAM
+
 def MULTI_INCR(inputList):
     inputFunc = GET_INPUT_FUNC()
 
@@ -121,37 +170,61 @@ def MULTI_INCR(inputList):
     numCases = DATA_VALUE("the number of cases", 2, 200)
     numCases = int(numCases)
 
-    dataOutputList = []
-    for dataInfo in dataTempList:
-        varMin = dataInfo[0]
-        varMax = dataInfo[1]
-
-        dataOutputList.append(np.linspace(varMin, varMax, numCases))
-    
-    dataOutputListFinal = []
-    for i in range(len(dataOutputList)):
-        for j in range(len(dataOutputList[i])):
-            if i == 0:
-                dataOutputListFinal.append([])
-            dataOutputListFinal[j].append(dataOutputList[i][j])
-
-    return dataOutputListFinal
+    return np.column_stack([np.linspace(varMin, varMax, numCases)\
+        for varMin, varMax in dataTempList]).tolist()
 # end MULTI_INCR
 
-def MULTI_MODE(inputList):
+# Every combination of evenly spaced values of each input (a full
+# Cartesian design). The cases are generated from SWEEP_GRID in blocks as
+# they are taken, so the number of cases is not limited by memory.
+def MULTI_GRID(inputList):
+    paramList = []
+    for field in inputList:
+        fieldMin = DATA_VALUE("minimum " + field.desc,\
+            field.min, field.max)
+
+        if fieldMin == field.max:
+            fieldMax = fieldMin
+            print("Maximum %s automatically set to %.2f" % (field.desc, field.max))
+        else:
+            fieldMax = DATA_VALUE("maximum " + field.desc,\
+                field.min, field.max)
+
+        if fieldMax == fieldMin:
+            numValues = 1
+        else:
+            numValues = int(DATA_VALUE("the number of values of " + field.desc,\
+                1, 1000000))
+
+        paramList.append((fieldMin, fieldMax, numValues))
+
+    print("Number of cases: %d" % SWEEP_GRID_SIZE(paramList))
+
+    return MULTI_GRID_STREAM(paramList)
+# end MULTI_GRID
+
+def MULTI_GRID_STREAM(paramList):
+    for caseStart, block in SWEEP_GRID(paramList, 10000):
+        for caseData in block.tolist():
+            yield caseData
+# end MULTI_GRID_STREAM
+
+def MULTI_MODE(inputList, stream = False):
     inputFunc = GET_INPUT_FUNC()
 
     while True:
-        response = inputFunc("Enter File mode, Random mode or Increment mode (F, R, or I): ")
+        response = inputFunc("Enter File mode, Random mode, Increment mode or Grid mode (F, R, I or G): ")
 
         if response == "F" or response == "f":
-            return MULTI_FILE()
+            return MULTI_FILE(stream)
         elif response == "R" or response == "r":
             return MULTI_RANDOM(inputList)
         elif response == "I" or response == "i":
             return MULTI_INCR(inputList)
+        elif response == "G" or response == "g":
+            return MULTI_GRID(inputList)
         else:
-            print("Must be F, R or I")
+            print("Must be F, R, I or G")
     # end while loop
 # end MULTI_MODE
 
@@ -197,38 +270,18 @@ def ROUGH_SLOPE_COEFFICIENTS(\
     inputFunc = GET_INPUT_FUNC()
 
     conversionKnots2mph = 1.15077945 #1 knots = 1.15077945 mph
-    outputDict = {"numConsts": 0}
+    outputDict = ROUGH_SLOPE_DEFAULTS(\
+        has_rough_slope, has_overtopping, has_runup, inputDict)
 
     if has_rough_slope:
-        outputDict["numConsts"] += 2
-    if has_overtopping:
-        outputDict["numConsts"] += 3
-    if not has_runup:
-        outputDict["numConsts"] += 1
-
-    if has_rough_slope:
-        #Empirical coefficients for rough slope runup
-        outputDict["a"] = 0.956
-        outputDict["b"] = 0.398
-        
         print("a = %-6.4f" % outputDict["a"])
         print("b = %-6.4f" % outputDict["b"])
-    # end if
 
     if has_overtopping:
-        #Empirical coefficients and values for overtopping
-        outputDict["alpha"] = 0.076463
-        outputDict["Qstar0"] = 0.025
-        outputDict["U"] = 35.0*conversionKnots2mph
-        
         print("alpha = %-6.4f" % outputDict["alpha"])
         print("Qstar0 = %-6.4f" % outputDict["Qstar0"])
         print("U = %-6.4f knots" % (outputDict["U"]/conversionKnots2mph))
 
-        if not has_runup and "R_default" in inputDict:
-            outputDict["R"] = inputDict["R_default"]
-    # end if
-
     custom_const = FINITE_CHOICE(\
         "Use default constant values or load from file? (D or F): ",\
         ["D", "d", "F", "f"])
@@ -290,6 +343,9 @@ def ROUGH_SLOPE_COEFFICIENTS(\
                     if not has_runup:
                         outputDict["RList"] =\
                             [caseData[optVarNum] for caseData in fileData]
+                elif inputDict["numCases"] == None:
+                    print("Wrong number of cases. Expected 1 for streamed case files, found %d" %\
+                        len(fileData))
                 else:
                     print("Wrong number of cases. Expected either 1 or %d, found %d" %\
                         (inputDict["numCases"], len(fileData)))
@@ -304,6 +360,41 @@ def ROUGH_SLOPE_COEFFICIENTS(\
     return outputDict
 # end ROUGH_SLOPE_COEFFICIENTS
 
+# Default constants of ROUGH_SLOPE_COEFFICIENTS, without prompting
+def ROUGH_SLOPE_DEFAULTS(\
+    has_rough_slope,\
+    has_overtopping,\
+    has_runup,\
+    inputDict):
+    conversionKnots2mph = 1.15077945 #1 knots = 1.15077945 mph
+    outputDict = {"numConsts": 0}
+
+    if has_rough_slope:
+        outputDict["numConsts"] += 2
+    if has_overtopping:
+        outputDict["numConsts"] += 3
+    if not has_runup:
+        outputDict["numConsts"] += 1
+
+    if has_rough_slope:
+        #Empirical coefficients for rough slope runup
+        outputDict["a"] = 0.956
+        outputDict["b"] = 0.398
+    # end if
+
+    if has_overtopping:
+        #Empirical coefficients and values for overtopping
+        outputDict["alpha"] = 0.076463
+        outputDict["Qstar0"] = 0.025
+        outputDict["U"] = 35.0*conversionKnots2mph
+
+        if not has_runup and "R_default" in inputDict:
+            outputDict["R"] = inputDict["R_default"]
+    # end if
+
+    return outputDict
+# end ROUGH_SLOPE_DEFAULTS
+
 def SALT_FRESH_WATER(isMetric):
     inputFunc = GET_INPUT_FUNC()
 
@@ -311,18 +402,7 @@ def SALT_FRESH_WATER(isMetric):
         "Fresh or Salt water? (F or S): ",\
         ["F", "f", "S", "s"])
 
-    if waterType == "S" or waterType == "s":
-        if isMetric:
-            rho = 1025.09 # kg/m^3, (sea water)
-        else:
-            rho = 1.989 # rho/g = 63.99/32.17 lb sec^2/ft^4 (sea water)
-    else:
-        if isMetric:
-            rho = 999.8 # kg/m^3 ( fresh water)
-        else:
-            rho = 1.940 # rho/g = 62.415475/32.17 lb sec^2/ft^4 (fresh water)
-
-    return waterType, rho
+    return WATER_DENSITY(waterType, isMetric)
 # end SALT_FRESH_WATER
 
 def SINGLE_MULTI_CASE():
@@ -338,4 +418,33 @@ def SINGLE_MULTI_CASE():
             return False
         else:
             print("s or m only\n")
-# end SINGLE_MULTI_CASE
\ No newline at end of file
+# end SINGLE_MULTI_CASE
+
+# Non-interactive counterpart of METRIC_IMPERIAL
+def UNIT_SYSTEM(units):
+    if units == "I" or units == "i":
+        return False, 32.17, "ft", "lb"
+    elif units == "S" or units == "s":
+        return True, 9.81, "m", "N"
+    else:
+        raise ValueError("Units must be I or S, got %r" % (units,))
+# end UNIT_SYSTEM
+
+# Non-interactive counterpart of SALT_FRESH_WATER
+def WATER_DENSITY(waterType, isMetric):
+    if waterType not in ["F", "f", "S", "s"]:
+        raise ValueError("Water type must be F or S, got %r" % (waterType,))
+
+    if waterType == "S" or waterType == "s":
+        if isMetric:
+            rho = 1025.09 # kg/m^3, (sea water)
+        else:
+            rho = 1.989 # rho/g = 63.99/32.17 lb sec^2/ft^4 (sea water)
+    else:
+        if isMetric:
+            rho = 999.8 # kg/m^3 ( fresh water)
+        else:
+            rho = 1.940 # rho/g = 62.415475/32.17 lb sec^2/ft^4 (fresh water)
+
+    return waterType, rho
+# end WATER_DENSITY
@@ -0,0 +1,88 @@
+import math
+import numpy as np
+
+from WAGEOS import WAGEOS
+from WAPBL import WAPBL
+from WASBL import WASBL
+
+# Wind adjustments (WADJ) for a whole record of wind observations at
+# once. The boundary layer solutions (WASBL, WAPBL) iterate all records
+# together, each record leaving the iteration when it has converged.
+
+#   INPUT (scalars or arrays of the record length)
+#   uobs: observed windspeed
+#   zobs: elevation of wind observation
+#   delt: air-sea temperature difference
+#   F: fetch length
+#   tobs: duration of wind observation
+#   tfin: duration of final desired windspeed
+#   latt: Latitude of wind observation
+#   obstyp: Type of wind observation (one type for the whole record)
+#           1 = overwater (shipboard)
+#           2 = overwater (not shipboard)
+#           3 = at shore (off to onshore)
+#           4 = at shore (on to offshore)
+#           5 = over land
+#           6 = geostrophic wind
+#   maxIter: largest number of boundary layer iterations
+
+#   OUTPUT
+#   ue: equivalent neutral windspeed at 10 m elevation and at desired final
+#       duration (NaN where a duration is not > 1 s or the boundary layer
+#       solution did not converge)
+
+def WADJ_SERIES(uobs, zobs, delt, F, tobs, tfin, latt, obstyp, maxIter = 1000):
+    m2cm = 100.0
+
+    uobs, zobs, delt, F, tobs, tfin, latt = np.broadcast_arrays(\
+        *[np.asarray(val, dtype=np.float64)\
+        for val in [uobs, zobs, delt, F, tobs, tfin, latt]])
+
+    if obstyp == 1:
+        #Ship-based wind observations over water
+        u = 1.864*uobs**(7.0/9.0)
+        u10m = WASBL(u*m2cm, delt, zobs*m2cm, maxIter)
+        u10m = u10m / m2cm
+    elif obstyp == 2 or obstyp == 3:
+        #Wind observation over water (not ship-based) or at the shoreline
+        #(wind direction from offshore to onshore)
+        u10m = WASBL(uobs*m2cm, delt, zobs*m2cm, maxIter)
+        u10m = u10m / m2cm
+    elif obstyp == 4 or obstyp == 5:
+        #Winds over land or at the shoreline (wind direction from onshore
+        #to offshore)
+        u = WAGEOS(uobs*m2cm, zobs*m2cm, 30)
+        omega = 7.2921150*10**-5 #Earth's angular velocity (2pi/86164.09)
+        f = 2*omega*np.sin(latt) #Coriolis force
+        u10m = WAPBL(u, delt, f, 0, 0, maxIter)
+        u10m = u10m / m2cm
+    elif obstyp == 6:
+        #Geostrophic winds
+        omega = 2*math.pi / (24*3600) #Earth's angular velocity
+        f = 2*omega*np.sin(latt) #Coriolis force
+        u10m = WAPBL(uobs*m2cm, delt, f, 0, 0, maxIter)
+        u10m = u10m / m2cm
+
+    u10m = np.reshape(u10m, uobs.shape)
+
+    ue = np.where(F < 16000.0, 0.9*u10m, u10m)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        u3600 = np.where(np.isclose(tobs, 3600.0), ue,\
+            ue/durationFactor(tobs))
+
+        ue = np.where(np.isclose(tfin, 3600.0), u3600,\
+            u3600*durationFactor(tfin))
+
+    ue = np.where((tobs > 1.0) & (tfin > 1.0), ue, np.nan)
+
+    return ue
+# end WADJ_SERIES
+
+# Ratio of the windspeed of duration t [s] to the hourly windspeed
+def durationFactor(t):
+    eqshrt = 1.277 + 0.296*np.tanh(0.9*np.log10(45.0/t))
+    eqlong = -0.15*np.log10(t) + 1.5334
+
+    return np.where(t < 3600.0, eqshrt, eqlong)
+# end durationFactor
@@ -1,4 +1,4 @@
-import math
+import numpy as np
 
 # Estimation of geostrophic wind
 
@@ -16,8 +16,9 @@ def WAGEOS(uobs, zobs, z0):
 
 	k = 0.4
 
-	ustar = (k*uobs)/math.log(zobs/z0)
+	# np.log so that uobs and zobs may be arrays
+	ustar = (k*uobs)/np.log(zobs/z0)
 	cdland = 0.00255*z0**0.1639
-	vg = ustar/math.sqrt(cdland)
+	vg = ustar/np.sqrt(cdland)
 
-	return vg
\ No newline at end of file
+	return vg
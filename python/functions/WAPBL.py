@@ -1,103 +1,146 @@
 import math
+import numpy as np
 
 from WAPSI import WAPSI
 
 #Solution of PBL equations for 10 m elevation wind velocity (with known
 #geostrophic wind velocity)
 
+# Scalars or arrays of winds may be given. The nested iterations (friction
+# velocity, stability length and the similarity coefficients A and B) are
+# run for all winds together, each wind leaving a loop when it has
+# converged.
+
 #   INPUT
 #   vg: geostrophic windspeed
 #   delt: air-sea temperature difference
 #   f: Coriolis parameter
 #   H: horizontal temperature gradient
 #   phi: angle between vg and H
+#   maxIter: largest number of iterations of each loop (NaN where not
+#            converged)
 
 #   OUTPUT
 #   gpbl: equivalent neutral windspped at 10 m elevation
 
 
-def WAPBL(vg, delt, f, H, phi):
+def WAPBL(vg, delt, f, H, phi, maxIter = 1000):
+    isScalar = all([np.ndim(val) == 0 for val in [vg, delt, f, H, phi]])
+
+    vg, delt, f, H, phi = [val.ravel().copy() for val in np.broadcast_arrays(\
+        *[np.asarray(val, dtype=np.float64) for val in [vg, delt, f, H, phi]])]
+    n = len(vg)
+
     phi = phi*(math.pi/180.0)
     z = 1000.0
-    diff1 = 100.0
-    diff2 = 100.0
-    diff3 = 100.0
 
-    if abs(delt) > 15.0:
-        delt = 15.0*(abs(delt)/delt)
+    delt = np.where(np.abs(delt) > 15.0, 15.0*np.sign(delt), delt)
 
     k = 0.4
-    L = delt
+    L = delt.copy()
 
     as0 = 0.8
     bs0 = 3.5
     aml = 7.0 - as0
 
-    ab = k*(H/3.0)*math.cos(phi)
-    bb = k*(H/3.0)*math.sin(phi)
+    ab = k*(H/3.0)*np.cos(phi)
+    bb = k*(H/3.0)*np.sin(phi)
     a = as0 + ab
     b = bs0 + bb
 
-    ustar = 0.15*vg/abs(b)
+    ustar = 0.15*vg/np.abs(b)
+    ustarn = np.zeros(n)
 
     c1 = 0.1525
     c2 = 0.0144/980
     c3 = -0.00317
 
-    while diff3 > 0.1:
-        while diff1 > 0.1:
-            z0 = (c1/ustar) + (c2*ustar**2) + c3
-            theta = math.asin(b*ustar/(vg*k))
-            ustarn = k*vg*math.cos(theta)/(math.log(ustar/(f*z0))-a)
-            diff1 = abs(ustarn - ustar)
-            ustar = (ustar + ustarn)/2
-
-            if ustar < 0.0:
-                ustar = 0.1
-                z0 = (c1/ustar) + (c2*ustar**2) + c3
-                gpbl = (ustar/k)*math.log(z/z0)
-                return gpbl
-
-            if abs(b*ustar) > k*vg:
-                ustar = k*vg/abs(b) - 1.0**(-10);
-        # end while loop
-
-        ustar = ustarn
-        z0 = (c1/ustar) + (c2*ustar**2) + c3
-
-        if abs(delt) < 1.0:
-            gpbl = (ustar/k)*math.log(z/z0)
-            return gpbl
-
-        while diff2 > 1.0:
-            lnzz0 = math.log(1005.0/z0)
-            psi = WAPSI((1005.0/L), -7.0)
-            Ln = 1.79*(ustar**2/delt)*(lnzz0 - psi)
-            diff2 = abs(Ln - L)
-            L = Ln
-        # end while loop
-        
-        mu = (k*ustar)/(f*L)
-        if mu <= 0.0:
-            asf = as0 + aml*(1.0 - math.exp(0.015*mu))
-            bsf = bs0 - (bs0 - 0.23)*(1.0 - math.exp(0.03*mu))
-        else:
-            asf = as0 - 0.96*math.sqrt(mu) + math.log(math.sqrt(mu+1.0))
-            bsf = bs0 + 0.7*math.sqrt(mu)
-
-        an = max((asf + ab), -15.0)
-        bn = min((bsf + bb), 15.0)
-
-        diff3 = abs(a - an)
-        a = an
-        b = bn
-        if abs(b*ustar) > k*vg:
-            ustar = k*vg/abs(b) - 1.0**(-10)
-        diff1 = 100.0
-        diff2 = 100.0
-    # end while loop
-
-    z0 = (c1/ustar) + (c2*ustar**2) + c3
-    gpbl = (ustar/k)*math.log(z/z0)
-
-    return gpbl
\ No newline at end of file
+    gpbl = np.full(n, np.nan)
+    done = np.zeros(n, dtype=bool)
+
+    outer = np.arange(n)
+    for count3 in range(maxIter):
+        if len(outer) == 0:
+            break
+
+        inner = outer.copy()
+        for count1 in range(maxIter):
+            if len(inner) == 0:
+                break
+
+            ustarI = ustar[inner]
+            z0 = (c1/ustarI) + (c2*ustarI**2) + c3
+            theta = np.arcsin(b[inner]*ustarI/(vg[inner]*k))
+            ustarn[inner] = k*vg[inner]*np.cos(theta)/\
+                (np.log(ustarI/(f[inner]*z0)) - a[inner])
+            diff1 = np.abs(ustarn[inner] - ustarI)
+            ustarI = (ustarI + ustarn[inner])/2
+
+            # Negative friction velocity, finished with ustar = 0.1
+            negative = ustarI < 0.0
+            if negative.any():
+                ustarI[negative] = 0.1
+                z0 = (c1/0.1) + (c2*0.1**2) + c3
+                gpbl[inner[negative]] = (0.1/k)*math.log(z/z0)
+                done[inner[negative]] = True
+
+            ustarI = np.where(np.abs(b[inner]*ustarI) > k*vg[inner],\
+                k*vg[inner]/np.abs(b[inner]) - 1.0**(-10), ustarI)
+            ustar[inner] = ustarI
+
+            inner = inner[(diff1 > 0.1) & ~negative]
+        # end for loop
+
+        outer = outer[~done[outer]]
+
+        ustar[outer] = ustarn[outer]
+        z0 = (c1/ustar[outer]) + (c2*ustar[outer]**2) + c3
+
+        neutral = np.abs(delt[outer]) < 1.0
+        gpbl[outer[neutral]] = (ustar[outer[neutral]]/k)*np.log(z/z0[neutral])
+        done[outer[neutral]] = True
+        outer = outer[~neutral]
+        z0 = z0[~neutral]
+
+        lnzz0 = np.log(1005.0/z0)
+        inner = np.arange(len(outer))
+        for count2 in range(maxIter):
+            if len(inner) == 0:
+                break
+
+            rec = outer[inner]
+            psi = WAPSI((1005.0/L[rec]), -7.0)
+            Ln = 1.79*(ustar[rec]**2/delt[rec])*(lnzz0[inner] - psi)
+            diff2 = np.abs(Ln - L[rec])
+            L[rec] = Ln
+            inner = inner[diff2 > 1.0]
+        # end for loop
+
+        with np.errstate(invalid="ignore"):
+            mu = (k*ustar[outer])/(f[outer]*L[outer])
+            asf = np.where(mu <= 0.0, as0 + aml*(1.0 - np.exp(0.015*mu)),\
+                as0 - 0.96*np.sqrt(mu) + np.log(np.sqrt(mu + 1.0)))
+            bsf = np.where(mu <= 0.0, bs0 - (bs0 - 0.23)*(1.0 - np.exp(0.03*mu)),\
+                bs0 + 0.7*np.sqrt(mu))
+
+        an = np.maximum((asf + ab[outer]), -15.0)
+        bn = np.minimum((bsf + bb[outer]), 15.0)
+
+        diff3 = np.abs(a[outer] - an)
+        a[outer] = an
+        b[outer] = bn
+        ustar[outer] = np.where(np.abs(bn*ustar[outer]) > k*vg[outer],\
+            k*vg[outer]/np.abs(bn) - 1.0**(-10), ustar[outer])
+
+        # Converged
+        finished = outer[~(diff3 > 0.1)]
+        z0 = (c1/ustar[finished]) + (c2*ustar[finished]**2) + c3
+        gpbl[finished] = (ustar[finished]/k)*np.log(z/z0)
+
+        outer = outer[diff3 > 0.1]
+    # end for loop
+
+    if isScalar:
+        return float(gpbl[0])
+
+    return gpbl
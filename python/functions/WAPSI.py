@@ -1,22 +1,31 @@
 import math
+import numpy as np
 
 from WASHR import WASHR
 
 #   INPUT
-#   arg: ratio of observed wind elevation over stability length
+#   arg: ratio of observed wind elevation over stability length, scalar
+#        or array
 #   c: multiple coefficient for arg (if arg >0)
 
 #   OUTPUT
 #   psi: universal similarity function 
 
 def WAPSI(arg, c):
-	if arg > 0:
-	    psi = c*arg
-	else:
-	    phi = WASHR(arg)
-	    psi = 1.0 - phi - 3*math.log(phi) +\
-	    	2.0*math.log((1.0 + phi)/2.0) +\
-	    	2.0*math.atan(phi) - (math.pi/2.0) +\
-	    	math.log((1.0 + phi**2)/2.0)
-
-	return psi
\ No newline at end of file
+	isScalar = np.ndim(arg) == 0
+	arg = np.atleast_1d(np.asarray(arg, dtype=np.float64))
+
+	psi = c*arg
+
+	unstable = ~(arg > 0)
+	if unstable.any():
+		phi = WASHR(arg[unstable])
+		psi[unstable] = 1.0 - phi - 3*np.log(phi) +\
+			2.0*np.log((1.0 + phi)/2.0) +\
+			2.0*np.arctan(phi) - (math.pi/2.0) +\
+			np.log((1.0 + phi**2)/2.0)
+
+	if isScalar:
+		return float(psi[0])
+
+	return psi
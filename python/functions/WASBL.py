@@ -1,59 +1,85 @@
-import math
+import numpy as np
 
 from WAPSI import WAPSI
 
 # Solution in the constant stress region
 
+# Scalars or arrays of observations may be given; each observation is
+# iterated until its own friction velocity (and stability length) have
+# converged, so a whole wind record is solved at once.
+
 #   INPUT
 #   delt: air-sea temperature difference
 #   uobs: observed wind speed
 #   zobs: elevation of wind observation
+#   maxIter: largest number of iterations (NaN where not converged)
 
 #   OUTPUT
 #   sbl10m: equivalent neutral windspeed at 10 m elevation 
 
-def WASBL(uobs, delt, zobs):
-	diff1 = 100.0
-	diff2 = 100.0
+def WASBL(uobs, delt, zobs, maxIter = 1000):
+	isScalar = all([np.ndim(val) == 0 for val in [uobs, delt, zobs]])
+
+	uobs, delt, zobs = [val.ravel() for val in np.broadcast_arrays(\
+		np.asarray(uobs, dtype=np.float64), np.asarray(delt, dtype=np.float64),\
+		np.asarray(zobs, dtype=np.float64))]
+	n = len(uobs)
+
+	diff2 = np.full(n, 100.0)
 
-	L = delt
+	L = delt.copy()
 	z = 1000.0 #10 m in cm
 	k = 0.4 #von Karman constant
 
 	ustar = uobs*(z / zobs)**(-1.0/7.0)
 	cd = 0.001*(0.75 + 0.067*0.01*uobs)
-	ustar = math.sqrt(cd)*ustar
+	ustar = np.sqrt(cd)*ustar
 
-	if delt > 0.0:
-		ustar = 0.8*ustar
-	else:
-		ustar = 1.2*ustar
+	ustar = np.where(delt > 0.0, 0.8*ustar, 1.2*ustar)
 
 	c1 = 0.1525
 	c2 = 0.019/980.0
 	c3 = -0.00371
 
-	while diff1 > 0.1:
-		z0 = (c1/ustar) + (c2*ustar**2) + c3
-		lnzzo = math.log(zobs/z0)
-		if abs(delt) < 1.0:
-			psi = 0.0
-		else:
-			while diff2 > 1.0:
-				psi = WAPSI((zobs/L), -1.5)
-				Lnew = 1.79*(ustar**2/delt)*(lnzzo - psi)
-				diff2 = abs(Lnew - L)
-				if diff2 > 1.0:
-					L = Lnew
-			# end while loop
-		# end if
-
-		ustarn = (uobs*k)/(lnzzo - psi)
-		diff1 = abs(ustar - ustarn)
-		if diff1 > 0.1:
-			ustar = (ustar + ustarn)/2.0
-	# end while loop
-
-	sbl10m = (ustar/k)*math.log(z/z0)
-
-	return sbl10m
\ No newline at end of file
+	z0 = np.zeros(n)
+	psi = np.zeros(n)
+	neutral = np.abs(delt) < 1.0
+
+	active = np.arange(n)
+	for count in range(maxIter):
+		if len(active) == 0:
+			break
+
+		ustarA = ustar[active]
+		z0[active] = (c1/ustarA) + (c2*ustarA**2) + c3
+		lnzzo = np.log(zobs[active]/z0[active])
+
+		# The stability length is only iterated until it first converges;
+		# later passes reuse the last psi
+		inner = np.flatnonzero(~neutral[active] & (diff2[active] > 1.0))
+		for count2 in range(maxIter):
+			if len(inner) == 0:
+				break
+
+			rec = active[inner]
+			psi[rec] = WAPSI((zobs[rec]/L[rec]), -1.5)
+			Lnew = 1.79*(ustar[rec]**2/delt[rec])*(lnzzo[inner] - psi[rec])
+			diff2[rec] = np.abs(Lnew - L[rec])
+			L[rec] = np.where(diff2[rec] > 1.0, Lnew, L[rec])
+			inner = inner[diff2[rec] > 1.0]
+		# end for loop
+		psi[active[inner]] = np.nan
+
+		ustarn = (uobs[active]*k)/(lnzzo - psi[active])
+		diff1 = np.abs(ustarA - ustarn)
+		ustar[active] = np.where(diff1 > 0.1, (ustarA + ustarn)/2.0, ustarA)
+		active = active[diff1 > 0.1]
+	# end for loop
+	ustar[active] = np.nan
+
+	sbl10m = (ustar/k)*np.log(z/z0)
+
+	if isScalar:
+		return float(sbl10m[0])
+
+	return sbl10m
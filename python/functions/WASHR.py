@@ -1,16 +1,36 @@
+import numpy as np
+
 #   INPUT
-#   arg: ratio of observed wind elevation over stability length
+#   arg: ratio of observed wind elevation over stability length (<= 0),
+#        scalar or array
+#   maxIter: largest number of iterations (NaN where not converged)
+
+#   OUTPUT
+#   phiu: dimensionless wind shear
+
+def WASHR(arg, maxIter = 1000):
+	isScalar = np.ndim(arg) == 0
+	arg = np.atleast_1d(np.asarray(arg, dtype=np.float64))
 
-def WASHR(arg):
-	Ri = arg
+	Ri = arg.copy()
 	Rinew = arg*(1.0 - 18.0*Ri)**(1.0/4.0)
-	diff = abs(Rinew - Ri)
+	diff = np.abs(Rinew - Ri)
 
-	while diff > 0.001:
-	    Ri = Rinew
-	    Rinew = arg*(1.0 - 18.0*Ri)**(1.0/4.0)
-	    diff = abs(Rinew - Ri)
+	# Each value is iterated until its own change is small
+	it = np.flatnonzero(diff > 0.001)
+	for count in range(maxIter):
+		if len(it) == 0:
+			break
+
+		Ri[it] = Rinew[it]
+		Rinew[it] = arg[it]*(1.0 - 18.0*Ri[it])**(1.0/4.0)
+		diff = np.abs(Rinew[it] - Ri[it])
+		it = it[diff > 0.001]
+	Rinew[it] = np.nan
 
 	phiu = 1.0/(1.0 - 18.0*Rinew)**(1.0/4.0)
 
-	return phiu
\ No newline at end of file
+	if isScalar:
+		return float(phiu[0])
+
+	return phiu
@@ -1,43 +1,79 @@
 import math
-import cmath
 import numpy as np
+from DISPERSION_TABLE import DISPERSION_TABLE, DISPERSION_TABLE_IN_USE
 
 #
 # function wavelength(d,T,n,g);
 #
-# n = # of iterations
+# Solves the linear dispersion relation w^2 = g*k*tanh(k*d) for the
+# wavelength. The relation is written in terms of x = k*d and y = ko*d,
+#   x*tanh(x) = y
+# and solved by Newton iteration, seeded with the explicit approximation
+# of the 1984 SPM (p. 2-7). The seed is within a few percent everywhere,
+# so convergence to the tolerance normally takes 3 or 4 iterations. When
+# the dispersion table is switched on (DISPERSION_TABLE_USE) x is
+# interpolated from it instead, within about 4e-12.
 #
-# d = depth, this can be an array
-# T = period
-# n = number of iterations
-# g = 32.2lb/ft^2 or 9.81N/m^2
+#   INPUT
+#   d: water depth, scalar or array
+#   T: wave period, scalar or array (broadcast against d)
+#   n: maximum number of Newton iterations
+#   g: 32.17 ft/s^2 or 9.81 m/s^2
+#   tol: relative convergence tolerance on k*d
+#
+#   OUTPUT
+#   L: wavelength (0 where d <= 0)
+#   k: wave number (inf where d <= 0)
+#
+# Scalar input returns Python floats, array input returns float64 arrays
+# of the broadcast shape.
+
+def WAVELEN(d, T, n, g, tol = 1.0e-12):
+    isScalar = np.ndim(d) == 0 and np.ndim(T) == 0
+
+    if DISPERSION_TABLE_IN_USE():
+        if isScalar:
+            d = float(d)
+            if d <= 0.0:
+                return 0.0, math.inf
+
+            k = DISPERSION_TABLE(4.0 * math.pi**2 * d / (g * float(T)**2)) / d
+            return 2.0 * math.pi / k, k
+
+        d, T = np.broadcast_arrays(\
+            np.asarray(d, dtype=np.float64), np.asarray(T, dtype=np.float64))
+        wet = d > 0.0
 
-def WAVELEN(d, T, n, g):
-    Leck = (g * (T**2) * 0.5 / math.pi) * cmath.sqrt(math.tanh(4.0 * math.pi * math.pi * d / (T * T * g))) # 1984 SPM, p.2-7
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x = DISPERSION_TABLE(np.where(wet, 4.0 * math.pi**2 * d / (g * T**2), 1.0))
+            k = np.where(wet, x / np.where(wet, d, 1.0), np.inf)
+            L = np.where(wet, 2.0 * math.pi / k, 0.0)
 
-    L1 = Leck
+        return L, k
+
+    d, T = np.broadcast_arrays(\
+        np.asarray(d, dtype=np.float64), np.asarray(T, dtype=np.float64))
+
+    Lo = g * T**2 * 0.5 / math.pi
+    wet = d > 0.0
+    y = np.where(wet, 2.0 * math.pi * d / Lo, 1.0)
+
+    # 1984 SPM, p.2-7
+    x = y / np.sqrt(np.tanh(y))
 
     for i in range(n):
-        if np.isclose(L1, 0.0):
-            L2 = (g * (T**2) * 0.5 / math.pi)
-        else:
-            L2 = (g * (T**2) * 0.5 / math.pi) * cmath.tanh(2.0 * math.pi * d / L1)
-        L1 = L2 # redo
-
-    L = L2
-    if np.isclose(L, 0.0):
-        k = float('inf')
-    else:
-        k = 2.0 * math.pi / L
-
-    # if isinstance(d, list):
-    #     ko = [index for index, value in enumerate(d) if value <= 0.0]
-    #     for index in ko:
-    #         L[index] = 0.0
-    # else:
-    #     if d <= 0.0:
-    #         L[0] = 0.0;
-    if d <= 0.0:
-        L = 0.0
+        t = np.tanh(x)
+        dx = (x * t - y) / (t + x * (1.0 - t * t))
+        x = x - dx
+
+        if np.all(np.abs(dx) <= tol * x):
+            break
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        k = np.where(wet, x / np.where(wet, d, 1.0), np.inf)
+        L = np.where(wet, 2.0 * math.pi / k, 0.0)
+
+    if isScalar:
+        return float(L), float(k)
 
     return L, k
@@ -1,21 +1,67 @@
-from helper_objects import ComplexUtil
+import numpy as np
 
 from WFVW2 import WFVW2
 from WFVW3 import WFVW3
 from WFVW4 import WFVW4
 
-def WFVW1(d, H, x, L, ww):
-    N = 90
+# Nonbreaking wave pressure, force and moment on a vertical wall by the
+# Miche-Rundgren and Sainflou methods. d, H, x and L may be arrays (see
+# WFVW_ARRAY); the recommended method is only printed for a single wave.
+
+#   INPUT
+#   d: water depth
+#   H: incident wave height
+#   x: wave reflection coefficient
+#   L: wavelength
+#   ww: unit weight of water
+#   N: number of vertical intervals of the pressure profiles
+
+#   OUTPUT
+#   MR, S: Miche-Rundgren and Sainflou values (height above bottom, force
+#       and moment with the crest at the wall, then with the trough)
+#   MRintc, MRintt, Sintc, Sintt: profiles with crest, trough at wall
+#       (elevation, wave pressure, hydrostatic pressure, total pressure,
+#       incremental moment)
+
+def WFVW1(d, H, x, L, ww, N = 90):
+    MR, S, ycm, ytm, pcm, ptm, mcm, mtm, ycs, yts, pcs, pts, mcs, mts =\
+        wfvwIntegrate(d, H, x, L, ww, N)
+
+    if np.ndim(MR[1]) == 0:
+        if MR[1] < S[1] and MR[2] < S[2]: #Equation delivering lowest result should be used in design
+            print('Miche-Rundgren is recommendend for this case.')
+        else:
+            print('Sainflou is recommended for this case.')
 
+    #Seperates wave pressure and hydrostatic pressure
+    hpcm, wpcm = WFVW4(N, ycm, pcm, ww)
+
+    hptm, wptm = WFVW4(N, ytm, ptm, ww)
+
+    hpcs, wpcs = WFVW4(N, ycs, pcs, ww)
+
+    hpts, wpts = WFVW4(N, yts, pts, ww)
+
+    MRintc = [ycm, wpcm, hpcm, pcm, mcm]
+    MRintt = [ytm, wptm, hptm, ptm, mtm]
+
+    Sintc = [ycs, wpcs, hpcs, pcs, mcs]
+    Sintt = [yts, wpts, hpts, pts, mts]
+
+    return MR, S, MRintc, MRintt, Sintc, Sintt
+# end WFVW1
+
+# Profiles of both methods and their integrals
+def wfvwIntegrate(d, H, x, L, ww, N):
     #Pressure values included hydrostatic pressure
     ycm, ytm, pcm, ptm, mcm, mtm = WFVW2(N, d, L, H, x, ww, 0)
 
     ycs, yts, pcs, pts, mcs, mts = WFVW2(N, d, L, H, x, ww, 1)
 
-    ycrm = ycm[N] + d
+    # Crest at Wall
+    ycrm = ycm[..., N] + d
     ycrs = ycrm
 
-    # Crest at Wall
     # Integrate for Miche-Rundgren force value
     fcrm = WFVW3(N, ycm, pcm)
 
@@ -29,7 +75,7 @@ def WFVW1(d, H, x, L, ww):
     mcrs = WFVW3(N, ycs, mcs)
 
     # Trough at Wall
-    ytrm = ytm[N] + d
+    ytrm = ytm[..., N] + d
     ytrs = ytrm
 
     # Integrate for Miche-Rundgren force value
@@ -44,28 +90,14 @@ def WFVW1(d, H, x, L, ww):
     #Integrate for Sainfluo moment value
     mtrs = WFVW3(N, yts, mts)
 
-    if ComplexUtil.lessThan(fcrm, fcrs) and\
-        ComplexUtil.lessThan(mcrm, mcrs): #Equation delivering lowest result should be used in design
-        print('Miche-Rundgren is recommendend for this case.')
-    else:
-        print('Sainflou is recommended for this case.')
+    if np.ndim(fcrm) == 0:
+        ycrm = float(ycrm)
+        ytrm = float(ytrm)
+        ycrs = ycrm
+        ytrs = ytrm
 
     MR = [ycrm, fcrm, mcrm, ytrm, ftrm, mtrm]
     S = [ycrs, fcrs, mcrs, ytrs, ftrs, mtrs]
 
-    #Seperates wave pressure and hydrostatic pressure
-    hpcm, wpcm = WFVW4(N, ycm, pcm, ww)
-
-    hptm, wptm = WFVW4(N, ytm, ptm, ww)
-
-    hpcs, wpcs = WFVW4(N, ycs, pcs, ww)
-
-    hpts, wpts = WFVW4(N, yts, pts, ww)
-
-    MRintc = [ycm, wpcm, hpcm, pcm, mcm]
-    MRintt = [ytm, wptm, hptm, ptm, mtm]
-
-    Sintc = [ycs, wpcs, hpcs, pcs, mcs]
-    Sintt = [yts, wpts, hpts, pts, mts]
-
-    return MR, S, MRintc, MRintt, Sintc, Sintt
\ No newline at end of file
+    return MR, S, ycm, ytm, pcm, ptm, mcm, mtm, ycs, yts, pcs, pts, mcs, mts
+# end wfvwIntegrate
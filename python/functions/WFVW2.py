@@ -1,73 +1,92 @@
 import math
-import cmath
+import numpy as np
+
+# Elevation, pressure and incremental moment profiles on the wall when the
+# crest and the trough are at the wall, at N + 1 levels from the bottom
+# (index 0) to the sea water level (index N, where the elevation is the
+# Miche-Rundgren sea surface for both methods). All levels are computed
+# at once; d, L, H and x may be arrays, giving profiles of shape
+# shape + (N + 1,).
+
+#   INPUT
+#   N: number of vertical intervals
+#   d: water depth
+#   L: wavelength
+#   H: incident wave height
+#   x: wave reflection coefficient
+#   ww: unit weight of water
+#   method: 0 = Miche-Rundgren, 1 = Sainflou
+
+#   OUTPUT
+#   yc, yt: elevation with crest, trough at wall
+#   pc, pt: pressure (including hydrostatic) with crest, trough at wall
+#   mc, mt: incremental moment about the bottom with crest, trough at wall
 
 def WFVW2(N, d, L, H, x, ww, method):
+    d, L, H, x = [np.asarray(val, dtype=np.float64)[..., np.newaxis]\
+        for val in np.broadcast_arrays(d, L, H, x)]
+
     dd = d / N
-    yo = 0.0
     k = 2 * math.pi / L
 
-    yc = [0.0 for i in range(N + 1)]
-    yt = [0.0 for i in range(N + 1)]
-    pc = [0.0 for i in range(N + 1)]
-    pt = [0.0 for i in range(N + 1)]
-    mc = [0.0 for i in range(N + 1)]
-    mt = [0.0 for i in range(N + 1)]
+    # yo from 0 at the surface down to -d, in the same steps of dd as the
+    # levels are walked
+    yo = np.concatenate([np.zeros(dd.shape),\
+        np.cumsum(np.broadcast_to(-dd, dd.shape[:-1] + (N,)), axis=-1)],\
+        axis=-1)
 
     #Miche-Rundgren Method
-    cosh1 = cmath.cosh(k * d)
-    sinh1 = cmath.sinh(k * d)
-    tanh1 = cmath.tanh(k * d)
+    cosh1 = np.cosh(k * d)
+    sinh1 = np.sinh(k * d)
+    tanh1 = np.tanh(k * d)
 
     theta1 = 1.0 + 3.0 / (4.0 * sinh1**2) - 1.0 / (4.0 * cosh1**2)
     theta2 = 3.0 / (4.0 * sinh1**2) + 1.0 / (4.0 * cosh1**2)
 
-    for i in range(N + 1):
-        cosh2 = cmath.cosh(k * (d + yo))
-        cosh3 = cmath.cosh(k * (2 * d + yo))
-        cosh4 = cmath.cosh(k * yo)
-        sinh2 = cmath.sinh(k * (d + yo))
-        sinh3 = cmath.sinh(k * (2 * d + yo))
-        sinh4 = cmath.sinh(k * yo)
-#        F4  =  sinh4 / sinh1 / cosh1
-#        F3  =  sinh4 / sinh1 / sinh1
-#        F7  =  (1 - 1 / (4 * cosh1 * cosh1)) * cosh3 - 2 * tanh1 * sinh3 + 75 * (cosh4 / (sinh1 * sinh1) - 2 * cosh2 / cosh1)
-#        F8  =  cosh3 / (4 * cosh1 * cosh1) - 2 * tanh1 * sinh3 + 75 * (cosh4 / (sinh1 * sinh1) - 2 * cosh2 / cosh1)
-        j = N - i
+    cosh2 = np.cosh(k * (d + yo))
+    cosh3 = np.cosh(k * (2 * d + yo))
+    cosh4 = np.cosh(k * yo)
+    sinh2 = np.sinh(k * (d + yo))
+    sinh3 = np.sinh(k * (2 * d + yo))
+    sinh4 = np.sinh(k * yo)
 
-        #Sea surface elevation when crest and trough at wall (y0 = 0)
-        #Miche-Rundgren valid for both methods
-        if i == 0:
-            ycb = yo + (H / 2) * (1 + x) * (sinh2 / sinh1) + (math.pi * H / 4) * (H / L) * (sinh2 / sinh1) * (cosh2 / sinh1) * ((1 + x)**2 * theta1 + (1 - x)**2 * theta2)
-            ytb = yo - (H / 2) * (1 + x) * (sinh2 / sinh1) + (math.pi * H / 4) * (H / L) * (sinh2 / sinh1) * (cosh2 / sinh1) * ((1 + x)**2 * theta1 + (1 - x)**2 * theta2)
+    #Sea surface elevation when crest and trough at wall (y0 = 0)
+    #Miche-Rundgren valid for both methods
+    ymr1 = (H / 2) * (1 + x) * (sinh2 / sinh1)
+    ymr2 = (math.pi * H / 4) * (H / L) * (sinh2 / sinh1) * (cosh2 / sinh1) * ((1 + x)**2 * theta1 + (1 - x)**2 * theta2)
+    ycb = yo[..., 0] + ymr1[..., 0] + ymr2[..., 0]
+    ytb = yo[..., 0] - ymr1[..., 0] + ymr2[..., 0]
 
-        if method == 0: #Miche-Rundgren (method = 0)
-            yc[j] = yo + (H / 2) * (1 + x) * (sinh2 / sinh1) + (math.pi * H / 4) * (H / L) * (sinh2 / sinh1) * (cosh2 / sinh1) * ((1 + x)**2 * theta1 + (1 - x)**2 * theta2)
-            yt[j] = yo - (H / 2) * (1 + x) * (sinh2 / sinh1) + (math.pi * H / 4) * (H / L) * (sinh2 / sinh1) * (cosh2 / sinh1) * ((1 + x)**2 * theta1 + (1 - x)**2 * theta2)
+    if method == 0: #Miche-Rundgren (method = 0)
+        yc = yo + ymr1 + ymr2
+        yt = yo - ymr1 + ymr2
 
-            theta3 = (1 - 1 / (4 * cosh1**2)) * cosh3 - 2 * tanh1 * sinh3 + (3 / 4) * (cosh4 / sinh1**2 - 2 * cosh2 / cosh1)
-            theta4 = cosh3 / (4 * cosh1**2) - 2 * tanh1 * sinh3 + (3 / 4) * (cosh4 / (sinh1**2) - 2 * cosh2 / cosh1)
+        theta3 = (1 - 1 / (4 * cosh1**2)) * cosh3 - 2 * tanh1 * sinh3 + (3 / 4) * (cosh4 / sinh1**2 - 2 * cosh2 / cosh1)
+        theta4 = cosh3 / (4 * cosh1**2) - 2 * tanh1 * sinh3 + (3 / 4) * (cosh4 / (sinh1**2) - 2 * cosh2 / cosh1)
 
-            pcr = -yo - (H / 2) * (1 + x) * sinh4 / (sinh1 * cosh1) - (math.pi * H / 4) * (H / L) * (sinh4 / sinh1**2) * ((1 + x)**2 * theta3 + (1 - x)**2 * theta4)
-            pc[j] = ww * pcr
+        pcr = -yo - (H / 2) * (1 + x) * sinh4 / (sinh1 * cosh1) - (math.pi * H / 4) * (H / L) * (sinh4 / sinh1**2) * ((1 + x)**2 * theta3 + (1 - x)**2 * theta4)
+        pc = ww * pcr
 
-            ptr = -yo + (H / 2) * (1 + x) * sinh4 / (sinh1 * cosh1) - (math.pi * H / 4) * (H / L) * (sinh4 / sinh1**2) * ((1 + x)**2 * theta3 + (1 - x)**2 * theta4)
-            pt[j] = ww * ptr
-        else: #Sainflou (method = 1)
-            yc[j] = yo + H * (sinh2 / sinh1) + math.pi * H * (H / L) * (sinh2 / sinh1) * (cosh2 / sinh1) #vertical elevation when crest at wall
-            yt[j] = yo - H * (sinh2 / sinh1) + math.pi * H * (H / L) * (sinh2 / sinh1) * (cosh2 / sinh1) #vertical elevation when trough at wall
+        ptr = -yo + (H / 2) * (1 + x) * sinh4 / (sinh1 * cosh1) - (math.pi * H / 4) * (H / L) * (sinh4 / sinh1**2) * ((1 + x)**2 * theta3 + (1 - x)**2 * theta4)
+        pt = ww * ptr
+    else: #Sainflou (method = 1)
+        yc = yo + H * (sinh2 / sinh1) + math.pi * H * (H / L) * (sinh2 / sinh1) * (cosh2 / sinh1) #vertical elevation when crest at wall
+        yt = yo - H * (sinh2 / sinh1) + math.pi * H * (H / L) * (sinh2 / sinh1) * (cosh2 / sinh1) #vertical elevation when trough at wall
 
-            pcr = -yo - H * (sinh4 / (sinh1 * cosh1)) #pressure when crest at wall
-            pc[j] = pcr * ww
+        pcr = -yo - H * (sinh4 / (sinh1 * cosh1)) #pressure when crest at wall
+        pc = pcr * ww
 
-            ptr = -yo + H * (sinh4 / (sinh1 * cosh1)) #pressure when trough at wall
-            pt[j] = ptr * ww
+        ptr = -yo + H * (sinh4 / (sinh1 * cosh1)) #pressure when trough at wall
+        pt = ptr * ww
 
-        mc[j] = pc[j] * (yc[j] + d) #incremental moment for cresh
-        mt[j] = pt[j] * (yt[j] + d) #incremental moment for trough
+    mc = pc * (yc + d) #incremental moment for cresh
+    mt = pt * (yt + d) #incremental moment for trough
 
-        yo = yo - dd
+    # Levels from the bottom up
+    yc, yt, pc, pt, mc, mt = [val[..., ::-1].copy()\
+        for val in [yc, yt, pc, pt, mc, mt]]
 
-    yc[N] = ycb
-    yt[N] = ytb
+    yc[..., N] = ycb
+    yt[..., N] = ytb
 
-    return yc, yt, pc, pt, mc, mt
\ No newline at end of file
+    return yc, yt, pc, pt, mc, mt
@@ -1,41 +1,58 @@
-import math
+import numpy as np
+
+# Integral of y over x by the trapezoid rule with the cubic spline
+# correction, -h^3/24*(s_i + s_i+1) per interval, s being the second
+# derivatives of the natural cubic spline through the points. The spline
+# equations are tridiagonal and are solved directly (Thomas algorithm).
+# x and y may have leading dimensions (one profile per sea state), giving
+# an array of integrals; the points are along the last axis.
+
+#   INPUT
+#   N: number of vertical intervals (points 0 to N - 1 are integrated)
+#   x: abscissae
+#   y: values
+
+#   OUTPUT
+#   inte: integral
 
 def WFVW3(N, x, y):
-    eps = 1.0 * 10**(-6)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
     nn = N - 1
-    s = [0.0 for i in range(N)]
-    g = [0.0 for i in range(nn)]
-    work = [0.0 for i in range(nn)]
-
-    for i in range(1, nn):
-        xi = x[i]
-        xim1 = x[i - 1]
-        xip1 = x[i + 1]
-        yi = y[i]
-        yim1 = y[i - 1]
-        yip1 = y[i + 1]
-        xx = xi - xim1
-        h = xip1 - xim1
-        work[i] = 0.5 * xx / h
-        T = ((yip1 - yi) / (xip1 - xi) - (yi - yim1) / xx) / h
-        s[i] = 2.0 * T
-        g[i] = 3.0 * T
-
-    w = 8.0 - 4.0 * math.sqrt(3)
-
-    u = 100.0
-    while u > eps:
-        u = 0.0
-        for i in range(1, nn):
-            T = w * (-s[i] - work[i] * s[i - 1] - (0.5 - work[i]) * s[i + 1] + g[i])
-            h = abs(T)
-            if h > u:
-                u = h
-            s[i] = s[i] + T
-
-    inte = 0.0
-    for i in range(nn):
-        h = x[i + 1] - x[i]
-        inte = (inte + 0.5 * h * (y[i] + y[i + 1])) - (1.0 / 24.0 * h**3 * (s[i] + s[i + 1]))
-
-    return inte
\ No newline at end of file
+
+    xi = x[..., 1:nn]
+    xim1 = x[..., 0:nn - 1]
+    xip1 = x[..., 2:nn + 1]
+    yi = y[..., 1:nn]
+    yim1 = y[..., 0:nn - 1]
+    yip1 = y[..., 2:nn + 1]
+    xx = xi - xim1
+    h = xip1 - xim1
+    work = 0.5 * xx / h
+    T = ((yip1 - yi) / (xip1 - xi) - (yi - yim1) / xx) / h
+    g = 3.0 * T
+
+    # s[i] + work[i]*s[i - 1] + (0.5 - work[i])*s[i + 1] = g[i], with
+    # s[0] = s[nn] = 0
+    cp = np.zeros(g.shape)
+    dp = np.zeros(g.shape)
+    cp[..., 0] = 0.5 - work[..., 0]
+    dp[..., 0] = g[..., 0]
+    for i in range(1, nn - 1):
+        m = 1.0 - work[..., i] * cp[..., i - 1]
+        cp[..., i] = (0.5 - work[..., i]) / m
+        dp[..., i] = (g[..., i] - work[..., i] * dp[..., i - 1]) / m
+
+    s = np.zeros(x.shape[:-1] + (N,))
+    s[..., nn - 1] = dp[..., nn - 2]
+    for i in range(nn - 2, 0, -1):
+        s[..., i] = dp[..., i - 1] - cp[..., i - 1] * s[..., i + 1]
+
+    h = x[..., 1:N] - x[..., 0:nn]
+    inte = np.sum(0.5 * h * (y[..., 0:nn] + y[..., 1:N]) -\
+        (1.0 / 24.0 * h**3 * (s[..., 0:nn] + s[..., 1:N])), axis=-1)
+
+    if np.ndim(inte) == 0:
+        return float(inte)
+
+    return inte
@@ -1,21 +1,19 @@
-from helper_objects import ComplexUtil
+import numpy as np
 
 # Input value 'p' includes hydrostatic pressure
 # To define wave pressure 'wp' remove hydrostatic pressue from values of
 # 'p' below SWL. Pressure is the same above SWL for both values (0).
 # Hydrostatic pressue is waves & hydrostatic pressure minus wave pressure.
 # Hydrostatic pressue increases from 0 at SWL to rho*g*d at the bottom.
+# y and p may be arrays of profiles (levels along the last axis).
 
 def WFVW4(N, y, p, ww):
-    wp = [0.0 for i in range(N + 1)]
-    hp = [0.0 for i in range(N + 1)]
-    
-    for i in range(N + 1):
-        if y[i].real < 0.0:
-            wp[i] = p[i] + ww * y[i].real
-            hp[i] = p[i] - wp[i]
-        else:
-            wp[i] = p[i]
-            hp[i] = 0.0
-    
-    return hp, wp
\ No newline at end of file
+    y = np.asarray(y, dtype=np.float64)
+    p = np.asarray(p, dtype=np.float64)
+
+    belowSWL = y < 0.0
+
+    wp = np.where(belowSWL, p + ww * y, p)
+    hp = np.where(belowSWL, p - wp, 0.0)
+
+    return hp, wp
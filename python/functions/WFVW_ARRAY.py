@@ -0,0 +1,41 @@
+import numpy as np
+
+from WAVELEN import WAVELEN
+from WFVW1 import wfvwIntegrate
+
+# Nonbreaking wave forces and moments on a vertical wall (WFVW1) for many
+# waves at once, e.g. the design envelope of a wall over a set of sea
+# states. The pressure profiles of all waves are computed together and
+# integrated along the levels; the profiles themselves are not returned.
+
+#   INPUT (d, H, T and x are broadcast against each other)
+#   d: water depth
+#   H: incident wave height
+#   T: wave period
+#   x: wave reflection coefficient
+#   ww: unit weight of water
+#   g: gravitational acceleration
+#   N: number of vertical intervals of the pressure profiles
+
+#   OUTPUT
+#   MR, S: Miche-Rundgren and Sainflou values, shape (6,) + shape of the
+#       input, in the order of WFVW1 (height above bottom, force and
+#       moment with the crest at the wall, then with the trough)
+#   useMR: True where Miche-Rundgren is recommended (lower force and
+#       moment with the crest at the wall)
+
+def WFVW_ARRAY(d, H, T, x, ww, g, N = 90):
+    d, H, T, x = np.broadcast_arrays(np.asarray(d, dtype=np.float64),\
+        np.asarray(H, dtype=np.float64), np.asarray(T, dtype=np.float64),\
+        np.asarray(x, dtype=np.float64))
+
+    L, k = WAVELEN(d, T, 50, g)
+
+    MR, S = wfvwIntegrate(d, H, x, L, ww, N)[:2]
+    MR = np.array(MR)
+    S = np.array(S)
+
+    useMR = (MR[1] < S[1]) & (MR[2] < S[2])
+
+    return MR, S, useMR
+# end WFVW_ARRAY
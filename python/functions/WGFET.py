@@ -1,97 +1,126 @@
 import math
+import numpy as np
+
+from helper_objects import LruCache
 
 # Determine "representative" fetch and wave direction
 
+# The radial fetches are interpolated to whole degrees around the compass
+# and smoothed with a 15 degree moving window (wgfetSmooth), after which
+# the representative fetch of every whole-degree wind direction is found
+# at once (wgfetSearch). The result depends on the wind direction only
+# through round(wdir), so WGFET_ROSE computes it for the 361 whole-degree
+# directions of a site (0 to 360 deg) once and keeps it in a bounded LRU
+# cache; a wind record then only looks it up at round(wdir).
+
 #   INPUT
 #   ang1: angle of first radial fetch
 #   dang: angle increment between radials
-#   wdir: wind direction approach
+#   wdir: wind direction approach (scalar or array)
 #   x: radial fetch length at given angles
 
 #   OUTPUT
 #   F: representative fetch length
 #   phi: angle between wind and wave directions
 #   theta: angle of wave direction (relative to North)
+#   (NaN where there is no fetch within 90 deg of the wind direction)
+
+# cos(phi)**0.44 for phi = 0 to 90 deg
+cosWeight = np.array([math.cos(phi*(math.pi / 180.0))**0.44\
+	for phi in range(91)])
+
+fetchRoseCache = LruCache(64)
 
 def WGFET(ang1, dang, wdir, x):
-	#Interpolate radial fetch lengths around the compass
-	# Values are interpolated at whole degress so dang >=1
+	xfin = wgfetSmooth(ang1, dang, x)
+
+	if np.ndim(wdir) == 0:
+		F, phi, theta = wgfetSearch(xfin, [int(round(wdir))])
+		if np.isnan(F[0]):
+			return math.nan, math.nan, math.nan
+
+		return float(F[0]), int(phi[0]), int(theta[0])
+
+	return wgfetSearch(xfin, np.round(wdir).astype(int))
+# end WGFET
 
+# F, phi and theta for wind directions of 0 to 360 deg (indexed by the
+# direction), computed once for each set of radial fetches
+def WGFET_ROSE(ang1, dang, x):
+	key = (float(ang1), float(dang), tuple([float(val) for val in x]))
+	return fetchRoseCache.get(key, wgfetRose)
+# end WGFET_ROSE
+
+def WGFET_ROSE_CLEAR():
+	fetchRoseCache.clear()
+
+def wgfetRose(ang1, dang, x):
+	return wgfetSearch(wgfetSmooth(ang1, dang, x), np.arange(361))
+
+# Radial fetch lengths interpolated at whole degrees (so dang >= 1) and
+# averaged over the 15 degrees centred on each
+def wgfetSmooth(ang1, dang, x):
+	x = np.asarray(x, dtype=np.float64)
 	nang = len(x) #length of radial fetches
 	angn = ang1 + (nang - 1)*dang
 	angnm = angn - dang
 	nangm = nang - 1
-	angle = ang1
-	i = 0
-
-	fa = []
-	for j in range(nang):
-		fa.append(angle + j*dang)
-
-	xx = [0.0 for j in range(360)]
-	xfin = [0.0 for j in range(360)]
-
-	for deg in range(int(round(ang1)), int(round(angn)) + 1):
-		ideg = deg
-		if ideg < 0:
-			ideg += 360
-		if ideg >= 360:
-			ideg -= 360
-
-		if deg <= ang1:
-			xx[ideg - 1] = x[0]
-		elif deg >= angn:
-			xx[ideg - 1] = x[nang - 1]
-		else:
-			if deg > fa[i + 1]:
-				angle = min(angnm, angle + dang)
-				i = min(nangm - 1, i + 1)
-			tmp = (x[i + 1] - x[i])/dang
-			xx[ideg - 1] = x[i] + tmp*(deg - angle)
-	# end for loop
-
-	for i in range(360):
-		sumx = 0.0
-
-		for j in range(15):
-			k = i - 7 + j
-			if k < 0:
-				k += 360
-			if k >= 360:
-				k -= 360
-
-			sumx += xx[k]
-
-		xfin[i] = sumx / 15.0
-	# end for loop
-
-	iwdir = int(round(wdir))
-	if iwdir < 0:
-		iwdir += 360
-	pmax = 0.0
-
-	for i in range(91):
-		k = iwdir + i - 1
-		if k >= 360:
-			k -= 360
-
-		km = iwdir - i - 1
-
-		if km < 0:
-			km += 360
-
-		if xfin[k] < xfin[km]:
-			k = km
-
-		ftmp = max(xfin[k], 0.0)
-		phitmp = i
-		ptmp = ftmp**0.28 * math.cos(phitmp*(math.pi / 180.0))**0.44
-
-		if ptmp > pmax:
-			pmax = ptmp
-			phi = phitmp
-			theta = k + 1
-			F = ftmp
-	# end for loop
-
-	return F, phi, theta
\ No newline at end of file
+
+	fa = ang1 + np.arange(nang)*dang
+
+	deg = np.arange(int(round(ang1)), int(round(angn)) + 1)
+
+	# Segment of each degree, fa[i] < deg <= fa[i + 1], starting at the
+	# angle reached by adding dang to ang1 once per segment
+	i = np.clip(np.searchsorted(fa, deg) - 1, 0, nangm - 1)
+	angle = np.minimum(angnm,\
+		np.cumsum(np.concatenate([[ang1], np.full(nangm - 1, dang)])))[i]
+	tmp = (x[i + 1] - x[i])/dang
+
+	xdeg = np.where(deg <= ang1, x[0],\
+		np.where(deg >= angn, x[nang - 1], x[i] + tmp*(deg - angle)))
+
+	ideg = np.where(deg < 0, deg + 360, np.where(deg >= 360, deg - 360, deg))
+
+	# Later degrees overwrite earlier ones wrapping onto the same index
+	xx = np.zeros(360)
+	xx[ideg - 1] = xdeg
+
+	# Circular moving average, summed in the same order for every degree
+	xfin = np.zeros(360)
+	for j in range(15):
+		xfin = xfin + np.roll(xx, 7 - j)
+
+	return xfin / 15.0
+# end wgfetSmooth
+
+# Representative fetch for each whole-degree wind direction in iwdir: the
+# radial within 90 deg of the wind (the longer of the two at each angle)
+# maximizing F**0.28 * cos(phi)**0.44
+def wgfetSearch(xfin, iwdir):
+	iwdir = np.asarray(iwdir)
+	iwdir = np.where(iwdir < 0, iwdir + 360, iwdir)
+
+	i = np.arange(91)
+	k = iwdir[:, np.newaxis] + i - 1
+	k = np.where(k >= 360, k - 360, k)
+
+	km = iwdir[:, np.newaxis] - i - 1
+	km = np.where(km < 0, km + 360, km)
+
+	k = np.where(xfin[k] < xfin[km], km, k)
+
+	ftmp = np.maximum(xfin[k], 0.0)
+	ptmp = ftmp**0.28 * cosWeight
+
+	# First angle with the largest (positive) value
+	best = np.argmax(ptmp, axis=1)
+	row = np.arange(len(iwdir))
+	hasFetch = ptmp[row, best] > 0.0
+
+	F = np.where(hasFetch, ftmp[row, best], np.nan)
+	phi = np.where(hasFetch, best, np.nan)
+	theta = np.where(hasFetch, k[row, best] + 1, np.nan)
+
+	return F, phi, theta
+# end wgfetSearch
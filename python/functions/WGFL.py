@@ -1,6 +1,6 @@
-import math
+import numpy as np
 
-# Fetch-limited wave growth estimates
+# Fetch-limited wave growth estimates (u, F and d may be arrays)
 
 #   INPUT
 #   u: wind velocity
@@ -28,16 +28,16 @@ def WGFL(u, F, d, g, wgtyp):
         Tfl = 0.2857*(u/g)*xbar**(1.0/3.0)
     elif wgtyp == 2:
         #Open water - shallow
-        c1 = math.tanh(((0.0016/0.283)*xbar**0.5)/\
-            math.tanh(0.530*dbar**0.75))
-        c2 = math.tanh(0.530*dbar**0.75)
+        c1 = np.tanh(((0.0016/0.283)*xbar**0.5)/\
+            np.tanh(0.530*dbar**0.75))
+        c2 = np.tanh(0.530*dbar**0.75)
         c3 = (u**2/g)*0.283
         
         Hfl = c1*c2*c3
         
-        c1 = math.tanh(((0.2857/7.54)*xbar**0.333)/\
-            math.tanh(0.833*dbar**0.375))
-        c2 = math.tanh(0.833*dbar**0.375)
+        c1 = np.tanh(((0.2857/7.54)*xbar**0.333)/\
+            np.tanh(0.833*dbar**0.375))
+        c2 = np.tanh(0.833*dbar**0.375)
         c3 = (u/g)*7.54
         
         Tfl = c1*c2*c3;
@@ -49,16 +49,16 @@ def WGFL(u, F, d, g, wgtyp):
     else:
         #Restricted fetch - shallow
         #u=uacos(phi)
-        c1=math.tanh(((0.0015/0.283)*xbar**0.5)/\
-            math.tanh(0.530*dbar**0.75))
-        c2 = math.tanh(0.530*dbar**0.75)
+        c1=np.tanh(((0.0015/0.283)*xbar**0.5)/\
+            np.tanh(0.530*dbar**0.75))
+        c2 = np.tanh(0.530*dbar**0.75)
         c3 = (u**2/g)*0.283
         
         Hfl = c1*c2*c3
         
-        c1 = math.tanh(((0.3704/7.54)*xbar**0.28)/\
-            math.tanh(0.833*dbar**0.375))
-        c2 = math.tanh(0.833*dbar**0.375)
+        c1 = np.tanh(((0.3704/7.54)*xbar**0.28)/\
+            np.tanh(0.833*dbar**0.375))
+        c2 = np.tanh(0.833*dbar**0.375)
         c3 = (u/g)*7.54
         
         Tfl = c1*c2*c3
@@ -0,0 +1,91 @@
+import math
+import numpy as np
+
+from WGDL import WGDL
+from WGFD import WGFD
+from WGFL import WGFL
+
+# Simple wave growth equations (WGRO) for a whole record of winds at once
+# (calculated in metric units)
+
+#   INPUT (scalars or arrays of the record length)
+#   d: average water depth across fetch
+#   F: wind fetch length
+#   phi: angle between winds and waves
+#   tfin: wind duration
+#   ue: equivalent neutral windspeed (at 10 m)
+#   wgtyp: wave-growth equation type (one type for the whole record)
+#           1 = open water (deep)
+#           2 = open water (shallow)
+#           3 = restricted fetch (deep)
+#           4 = restricted fetch (shallow)
+
+#   OUTPUT
+#   ua: adjusted windspeed
+#   Hmo: estimated wave height (NaN where the wave is broken, wgtyp 2)
+#   Tp: estimated wave period (NaN where the wave is broken, wgtyp 2)
+#   wgcode: index of the message in wgroMessages describing the wave
+#       growth type
+
+wgroMessages = ["Deepwater fetch-limited", "Deepwater duration-limited",\
+    "Deepwater full-developed", "Shallow water fetch-limited",\
+    "Error: Wave broken"]
+
+def WGRO_SERIES(d, F, phi, tfin, ue, wgtyp):
+    g = 9.81
+
+    d, F, phi, tfin, ue = np.broadcast_arrays(\
+        *[np.asarray(val, dtype=np.float64) for val in [d, F, phi, tfin, ue]])
+
+    ua = ue*np.sqrt(0.75 + 0.067*ue)
+
+    if wgtyp > 2:
+        cosphi = np.cos(phi*math.pi/180.0)
+        uecos = ue*cosphi
+        uacos = ua*cosphi
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if wgtyp == 1 or wgtyp == 3:
+            #Deep water: determine min duration required for fetch-limited
+            #conditions and check for fetch-limited or duration-limited
+            if wgtyp == 1:
+                durfl = 68.8*(F**(2.0/3.0)/(g**(1.0/3.0)*ua**(1.0/3.0)))
+                u, uFd = ua, ue
+            else:
+                durfl = 51.09*(F**0.72/(g**0.28*uacos**0.44))
+                u, uFd = uacos, uecos
+
+            Hfl, Tfl = WGFL(u, F, d, g, wgtyp)
+            Hdl, Tdl = WGDL(u, tfin, g, wgtyp)
+
+            isFetchLimited = tfin > durfl
+            Hmo = np.where(isFetchLimited, Hfl, Hdl)
+            Tp = np.where(isFetchLimited, Tfl, Tdl)
+            wgcode = np.where(isFetchLimited, 0, 1)
+
+            #Check for full-developed conditions
+            Hfd, Tfd = WGFD(uFd, g)
+
+            isFullDeveloped = (Hmo > Hfd) | (Tp > Tfd)
+            Hmo = np.where(isFullDeveloped, Hfd, Hmo)
+            Tp = np.where(isFullDeveloped, Tfd, Tp)
+            wgcode = np.where(isFullDeveloped, 2, wgcode)
+        else:
+            #Shallow water
+            if wgtyp == 2:
+                Hmo, Tp = WGFL(ua, F, d, g, wgtyp)
+            else:
+                Hmo, Tp = WGFL(uacos, F, d, g, wgtyp)
+
+            wgcode = np.full(Hmo.shape, 3)
+
+            #Breaking check (ERRWAVBRK1 with the 0.78 index); as in WGRO,
+            #only the open water form rejects broken waves
+            if wgtyp == 2:
+                isBroken = ~(Hmo < 0.78*d)
+                Hmo = np.where(isBroken, np.nan, Hmo)
+                Tp = np.where(isBroken, np.nan, Tp)
+                wgcode = np.where(isBroken, 4, wgcode)
+
+    return ua, Hmo, Tp, wgcode
+# end WGRO_SERIES
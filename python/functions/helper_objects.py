@@ -1,3 +1,7 @@
+import collections
+import math
+import numpy as np
+
 class BaseField(object):
     def __init__(self, desc, min, max):
         self.desc = desc
@@ -15,44 +19,354 @@ class FileOutputData(object):
         self.fileDesc = None
 # end FileOutputData
 
-class ComplexUtil(object):
-    def getCompVal(num):
-        if isinstance(num, complex):
-            return abs(num)
+# Bounded least-recently-used cache with hit/miss counters
+class LruCache(object):
+    def __init__(self, maxSize):
+        self.maxSize = maxSize
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    # Returns the cached value for key, calling func(*key) on a miss
+    def get(self, key, func):
+        if key in self.entries:
+            self.hits += 1
+            value = self.entries.pop(key)
         else:
-            return num
-    # end getCompVal
-    
-    def lessThan(num1, num2):
-        compVal1 = ComplexUtil.getCompVal(num1)
-        compVal2 = ComplexUtil.getCompVal(num2)
-        
-        return compVal1 < compVal2
-    # end lessThan
-    
-    def lessThanEqual(num1, num2):
-        compVal1 = ComplexUtil.getCompVal(num1)
-        compVal2 = ComplexUtil.getCompVal(num2)
-        
-        return compVal1 <= compVal2
-    # end lessThanEqual
-
-    def greaterThan(num1, num2):
-        compVal1 = ComplexUtil.getCompVal(num1)
-        compVal2 = ComplexUtil.getCompVal(num2)
-        
-        return compVal1 > compVal2
-    # end greaterThan
-    
-    def greaterThanEqual(num1, num2):
-        compVal1 = ComplexUtil.getCompVal(num1)
-        compVal2 = ComplexUtil.getCompVal(num2)
-        
-        return compVal1 >= compVal2
-    # end greaterThan
-    
-    def getDisplayVal(num):
-        if not isinstance(num, complex):
-            return num
-        
-        return num.real
+            self.misses += 1
+            value = func(*key)
+            if self.maxSize <= 0:
+                return value
+            self.trim(self.maxSize - 1)
+
+        self.entries[key] = value
+        return value
+
+    def resize(self, maxSize):
+        self.maxSize = maxSize
+        self.trim(maxSize)
+
+    def trim(self, maxSize):
+        while len(self.entries) > max(maxSize, 0):
+            self.entries.popitem(last = False)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses,\
+            "size": len(self.entries), "maxSize": self.maxSize}
+# end LruCache
+
+# Running reduction of the results of a sweep (BaseDriver.run_design),
+# block by block: the numbers of cases, of valid cases (errorCode 0) and
+# of each error code, the smallest and largest value of every numeric
+# output over the valid cases, and the valid case with the smallest value
+# of the target output (largest with maximize). With envelopeParam (an
+# input column) and envelopeEdges (bin edges of that input, as for
+# np.digitize) the smallest and largest values are also kept per bin, as
+# envelopes against that input.
+class SweepReducer(object):
+    def __init__(self, target = None, maximize = False,\
+        envelopeParam = None, envelopeEdges = None):
+        self.target = target
+        self.maximize = maximize
+        self.envelopeParam = envelopeParam
+        if envelopeEdges is not None:
+            self.envelopeEdges = np.asarray(envelopeEdges, dtype=np.float64)
+        else:
+            self.envelopeEdges = None
+
+        self.numCases = 0
+        self.numValid = 0
+        self.errorCounts = {}
+        self.minDict = {}
+        self.maxDict = {}
+        self.envelopeMinDict = {}
+        self.envelopeMaxDict = {}
+        self.best = None
+
+    # inputs: design block (one row per case), records: run_batch records
+    # of the block
+    def update(self, caseStart, inputs, records):
+        inputs = np.asarray(inputs)
+        errorCode = np.asarray(records["errorCode"])
+        self.numCases += len(errorCode)
+        for code, count in zip(*np.unique(errorCode, return_counts=True)):
+            self.errorCounts[int(code)] = self.errorCounts.get(int(code), 0) + int(count)
+
+        valid = errorCode == 0
+        self.numValid += int(np.count_nonzero(valid))
+        if not valid.any():
+            return
+
+        if self.envelopeParam is not None:
+            binIndex = np.digitize(inputs[valid, self.envelopeParam],\
+                self.envelopeEdges)
+            numBins = len(self.envelopeEdges) + 1
+
+        for name in records.dtype.names:
+            if name == "errorCode" or records.dtype[name].kind not in "fiu":
+                continue
+
+            values = np.asarray(records[name][valid], dtype=np.float64)
+            if np.isnan(values).all():
+                continue
+
+            self.minDict[name] = np.fmin(self.minDict.get(name, np.nan),\
+                np.nanmin(values))
+            self.maxDict[name] = np.fmax(self.maxDict.get(name, np.nan),\
+                np.nanmax(values))
+
+            if self.envelopeParam is not None:
+                np.fmin.at(self.envelopeMinDict.setdefault(name,\
+                    np.full(numBins, np.nan)), binIndex, values)
+                np.fmax.at(self.envelopeMaxDict.setdefault(name,\
+                    np.full(numBins, np.nan)), binIndex, values)
+
+        if self.target is not None and self.target in records.dtype.names:
+            values = np.where(valid,\
+                np.asarray(records[self.target], dtype=np.float64), np.nan)
+            if self.maximize:
+                values = -values
+
+            if not np.isnan(values).all():
+                i = int(np.nanargmin(values))
+                if self.best is None or values[i] < self.best["key"]:
+                    self.best = {"key": values[i], "case": caseStart + i,\
+                        "inputs": inputs[i].copy(),\
+                        "record": dict([(name, records[name][i])\
+                        for name in records.dtype.names])}
+    # end update
+
+    def result(self):
+        resultDict = {"numCases": self.numCases, "numValid": self.numValid,\
+            "errorCounts": dict(self.errorCounts),\
+            "min": dict(self.minDict), "max": dict(self.maxDict)}
+
+        if self.envelopeParam is not None:
+            resultDict["envelopeEdges"] = self.envelopeEdges
+            resultDict["envelopeMin"] = dict(self.envelopeMinDict)
+            resultDict["envelopeMax"] = dict(self.envelopeMaxDict)
+
+        if self.best is not None:
+            resultDict["best"] = {"case": self.best["case"],\
+                "inputs": self.best["inputs"], "record": self.best["record"]}
+
+        return resultDict
+    # end result
+# end SweepReducer
+
+# Streaming quantile sketch of a sample (a merging t-digest). The values
+# are kept as centroids (mean, weight) of adjacent values; a batch of
+# values, or another digest, is merged in by sorting all the centroids
+# and grouping them by the integer part of the scale function
+#   k(q) = compression*log(q/(1 - q))/(4*log(n/compression) + 24)
+# at their cumulative fraction q. The clusters are smallest in the tails,
+# so extreme quantiles and small exceedance probabilities keep about the
+# same relative accuracy as the median, and the number of centroids stays
+# of the order of compression whatever the number of values n.
+class QuantileDigest(object):
+    def __init__(self, compression = 500):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.count = 0
+        self.min = np.nan
+        self.max = np.nan
+
+    # NaN values are left out
+    def add(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+
+        self.count += len(values)
+        self.min = np.fmin(self.min, values.min())
+        self.max = np.fmax(self.max, values.max())
+        self.compress(np.concatenate([self.means, values]),\
+            np.concatenate([self.weights, np.ones(len(values))]))
+
+    def merge(self, other):
+        if other.count == 0:
+            return
+
+        self.count += other.count
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        self.compress(np.concatenate([self.means, other.means]),\
+            np.concatenate([self.weights, other.weights]))
+
+    def compress(self, means, weights):
+        order = np.argsort(means, kind="stable")
+        means = means[order]
+        weights = weights[order]
+
+        total = weights.sum()
+        q = (np.cumsum(weights) - 0.5*weights) / total
+        norm = self.compression /\
+            (4.0*math.log(max(total / self.compression, 1.0)) + 24.0)
+        k = np.floor(norm*np.log(q / (1.0 - q)))
+
+        start = np.concatenate([[0], np.nonzero(np.diff(k))[0] + 1])
+        self.weights = np.add.reduceat(weights, start)
+        self.means = np.add.reduceat(means*weights, start) / self.weights
+    # end compress
+
+    # Values at the fractions q, interpolated between the centroids
+    def quantile(self, q):
+        position, means = self.interpolationPoints()
+        x = np.interp(np.asarray(q, dtype=np.float64)*self.count,\
+            position, means)
+
+        if np.ndim(q) == 0:
+            return float(x)
+        return x
+
+    # Fraction of the values not greater than x
+    def cdf(self, x):
+        position, means = self.interpolationPoints()
+        p = np.interp(np.asarray(x, dtype=np.float64), means, position,\
+            left=0.0, right=float(self.count)) / self.count
+
+        if np.ndim(x) == 0:
+            return float(p)
+        return p
+
+    def exceedance(self, x):
+        return 1.0 - self.cdf(x)
+
+    def interpolationPoints(self):
+        if self.count == 0:
+            return np.array([0.0]), np.array([np.nan])
+
+        position = np.cumsum(self.weights) - 0.5*self.weights
+        return np.concatenate([[0.0], position, [float(self.count)]]),\
+            np.concatenate([[self.min], self.means, [self.max]])
+# end QuantileDigest
+
+# Running reduction of the results of a Monte Carlo run
+# (BaseDriver.run_monte_carlo or run_design), in bounded memory: the
+# numbers of samples, of valid samples (errorCode 0) and of each error
+# code, and for each output in outputList (every float output by default)
+# over the valid samples the count, mean, standard deviation, smallest
+# and largest values, a QuantileDigest giving the quantiles and
+# exceedance probabilities, and exact exceedance counts of the
+# thresholds listed for it in thresholdDict. Exceedance probabilities are
+# fractions of the valid samples of the output.
+# Each block is first reduced on its own (blockReduction) and then merged,
+# so that blocks reduced in worker processes give the same result as a
+# serial run.
+class MonteCarloReducer(object):
+    def __init__(self, outputList = None,\
+        quantiles = (0.01, 0.05, 0.5, 0.95, 0.99), thresholdDict = None,\
+        compression = 500):
+        self.outputList = outputList
+        self.quantiles = quantiles
+        if thresholdDict is None:
+            thresholdDict = {}
+        self.thresholdDict = thresholdDict
+        self.compression = compression
+
+        self.numCases = 0
+        self.numValid = 0
+        self.errorCounts = {}
+        self.statDict = {}
+
+    def emptyCopy(self):
+        return MonteCarloReducer(self.outputList, self.quantiles,\
+            self.thresholdDict, self.compression)
+
+    # inputs: sample block (one row per sample), records: run_block (or
+    # run_batch) records of the block
+    def update(self, caseStart, inputs, records):
+        self.merge(self.blockReduction(caseStart, inputs, records))
+
+    def blockReduction(self, caseStart, inputs, records):
+        reducer = self.emptyCopy()
+
+        errorCode = np.asarray(records["errorCode"])
+        reducer.numCases = len(errorCode)
+        for code, count in zip(*np.unique(errorCode, return_counts=True)):
+            reducer.errorCounts[int(code)] = int(count)
+
+        valid = errorCode == 0
+        reducer.numValid = int(np.count_nonzero(valid))
+
+        outputList = self.outputList
+        if outputList is None:
+            outputList = [name for name in records.dtype.names\
+                if records.dtype[name].kind == "f"]
+
+        for name in outputList:
+            values = np.asarray(records[name][valid], dtype=np.float64)
+            values = values[~np.isnan(values)]
+
+            stat = {"count": len(values), "mean": 0.0, "M2": 0.0,\
+                "digest": QuantileDigest(self.compression),\
+                "exceedCount": np.array([np.count_nonzero(values > threshold)\
+                for threshold in self.thresholdDict.get(name, [])],\
+                dtype=np.int64)}
+            if len(values) > 0:
+                stat["mean"] = values.mean()
+                stat["M2"] = np.sum((values - stat["mean"])**2)
+                stat["digest"].add(values)
+
+            reducer.statDict[name] = stat
+
+        return reducer
+    # end blockReduction
+
+    def merge(self, other):
+        self.numCases += other.numCases
+        self.numValid += other.numValid
+        for code, count in other.errorCounts.items():
+            self.errorCounts[code] = self.errorCounts.get(code, 0) + count
+
+        for name, otherStat in other.statDict.items():
+            if name not in self.statDict:
+                self.statDict[name] = otherStat
+                continue
+
+            stat = self.statDict[name]
+            count = stat["count"] + otherStat["count"]
+            if otherStat["count"] > 0:
+                delta = otherStat["mean"] - stat["mean"]
+                stat["M2"] = stat["M2"] + otherStat["M2"] +\
+                    delta**2*stat["count"]*otherStat["count"]/count
+                stat["mean"] = stat["mean"] + delta*otherStat["count"]/count
+            stat["count"] = count
+            stat["digest"].merge(otherStat["digest"])
+            stat["exceedCount"] = stat["exceedCount"] + otherStat["exceedCount"]
+    # end merge
+
+    def quantile(self, name, q):
+        return self.statDict[name]["digest"].quantile(q)
+
+    def exceedance(self, name, x):
+        return self.statDict[name]["digest"].exceedance(x)
+
+    def result(self):
+        outputDict = {}
+        for name, stat in self.statDict.items():
+            count = stat["count"]
+            digest = stat["digest"]
+
+            outputDict[name] = {"count": count,\
+                "mean": stat["mean"] if count > 0 else np.nan,\
+                "std": math.sqrt(stat["M2"]/(count - 1)) if count > 1 else np.nan,\
+                "min": digest.min, "max": digest.max,\
+                "quantiles": dict([(q, digest.quantile(q))\
+                for q in self.quantiles]),\
+                "exceedance": dict([(threshold,\
+                exceedCount/count if count > 0 else np.nan)\
+                for threshold, exceedCount in zip(\
+                self.thresholdDict.get(name, []), stat["exceedCount"])])}
+
+        return {"numCases": self.numCases, "numValid": self.numValid,\
+            "errorCounts": dict(self.errorCounts), "outputs": outputDict}
+    # end result
+# end MonteCarloReducer